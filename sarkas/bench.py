@@ -0,0 +1,616 @@
+"""
+Benchmark suite of the main kernels of Sarkas.
+
+The kernels are timed on synthetic versions of the OCP, YOCP, binary Yukawa and magnetized OCP systems of
+``docs/examples``. The number of particles, the cut-off radius, the PPPM mesh and the number of numba threads can be
+swept and the results are saved to a JSON file with the time per particle per step of each kernel, so that regressions
+and speedups can be tracked across versions. Example ::
+
+    python -m sarkas.bench --systems ocp yocp --num_ptcls 1000 8000 --threads 1 4 --output bench.json
+
+The ``--imports`` flag adds the time needed to import the main modules in a new interpreter, and the optional
+dependencies that each import loads.
+
+"""
+import json
+import platform
+import subprocess
+import sys
+from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+from copy import deepcopy
+from datetime import datetime
+from io import StringIO
+from itertools import product
+from os import cpu_count
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from warnings import warn
+
+import numba
+import numpy
+import yaml
+from numpy import pi
+
+from .processes import Simulation
+from .tools.observables import (
+    ElectricCurrent,
+    MeanSquaredDisplacement,
+    RadialDistributionFunction,
+    StaticStructureFactor,
+    VelocityAutoCorrelationFunction,
+)
+from .utilities.timing import SarkasTimer
+
+# Input files of the synthetic systems. The cut-off radius, ``rc``, is in units of the Wigner-Seitz radius, the Ewald
+# parameter, ``pppm_alpha_ewald``, in units of its inverse and ``num`` is the fraction of the particles of each species.
+SYSTEMS = {
+    "ocp": {
+        "Particles": [
+            {
+                "Species": {
+                    "name": "H",
+                    "number_density": 1.62e30,
+                    "mass": 1.673e-27,
+                    "num": 1.0,
+                    "Z": 1.0,
+                    "temperature": 5.263632e03,
+                }
+            }
+        ],
+        "Potential": {
+            "type": "Coulomb",
+            "method": "pppm",
+            "rc": 6.24,
+            "pppm_mesh": [64, 64, 64],
+            "pppm_aliases": [3, 3, 3],
+            "pppm_cao": 6,
+            "pppm_alpha_ewald": 0.561,
+        },
+        "Integrator": {"type": "Verlet", "dt": 1.193536e-17},
+        "Parameters": {"units": "mks"},
+    },
+    "yocp": {
+        "Particles": [
+            {
+                "Species": {
+                    "name": "C",
+                    "number_density": 1.13666931822e23,
+                    "mass": 2.0089e-23,
+                    "num": 1.0,
+                    "Z": 1.976599,
+                    "temperature": 5.0e03,
+                }
+            }
+        ],
+        "Potential": {"type": "Yukawa", "method": "PP", "rc": 6.0},
+        "Integrator": {"type": "Verlet", "dt": 5.0e-17},
+        "Parameters": {"units": "cgs"},
+    },
+    "bym": {
+        "Particles": [
+            {
+                "Species": {
+                    "name": "C",
+                    "number_density": 1.0e30,
+                    "atomic_weight": 12.011,
+                    "num": 0.5,
+                    "Z": 6.0,
+                    "temperature": 1.02e05,
+                }
+            },
+            {
+                "Species": {
+                    "name": "O",
+                    "number_density": 1.0e30,
+                    "atomic_weight": 16,
+                    "num": 0.5,
+                    "Z": 8.0,
+                    "temperature": 1.02e05,
+                }
+            },
+        ],
+        "Potential": {"type": "Yukawa", "method": "PP", "rc": 5.0, "electron_temperature_eV": 10.0},
+        "Integrator": {"type": "Verlet", "dt": 1.074182e-17},
+        "Parameters": {"units": "mks"},
+    },
+    "mocp": {
+        "Particles": [
+            {
+                "Species": {
+                    "name": "H",
+                    "number_density": 1.62e30,
+                    "mass": 1.673e-27,
+                    "num": 1.0,
+                    "Z": 1.0,
+                    "temperature_eV": 0.286965,
+                }
+            }
+        ],
+        "Potential": {
+            "type": "Coulomb",
+            "method": "pppm",
+            "rc": 4.16,
+            "pppm_mesh": [64, 64, 64],
+            "pppm_aliases": [3, 3, 3],
+            "pppm_cao": 6,
+            "pppm_alpha_ewald": 0.901,
+        },
+        "Integrator": {"type": "magnetic_verlet", "dt": 1.10e-17, "electrostatic_equilibration": False},
+        "Parameters": {"units": "mks", "magnetized": True, "magnetic_field": [0.0, 0.0, 17.0e6]},
+    },
+}
+
+KERNELS = ["pp", "pm", "green_function", "integrator", "dump", "observables"]
+
+INTEGRATORS = ["verlet", "langevin"]
+
+MAGNETIC_INTEGRATORS = ["magnetic_verlet", "magnetic_pos_verlet", "magnetic_boris", "cyclotronic"]
+
+OBSERVABLES = {
+    "rdf": (RadialDistributionFunction, {"rdf_method": "positions", "no_bins": 100}),
+    "ssf": (StaticStructureFactor, {"max_k_harmonics": [5, 5, 5], "kt_method": "mesh"}),
+    "vacf": (VelocityAutoCorrelationFunction, {}),
+    "msd": (MeanSquaredDisplacement, {}),
+    "ec": (ElectricCurrent, {}),
+}
+
+
+# Modules whose import is timed
+IMPORT_MODULES = ["sarkas.processes", "sarkas.tools.observables"]
+
+# Optional dependencies that should be loaded only when needed
+LAZY_MODULES = ["IPython", "fmm3dpy", "matplotlib", "pandas", "pyfftw", "pyfiglet", "seaborn", "tables"]
+
+
+def system_input(system: str, num_ptcls: int, rc: float = None, mesh: int = None, no_dumps: int = 20) -> dict:
+    """
+    Create the input dictionary of a synthetic system.
+
+    Parameters
+    ----------
+    system : str
+        Name of the system, one of the keys of :data:`SYSTEMS`.
+
+    num_ptcls : int
+        Total number of particles.
+
+    rc : float, optional
+        Cut-off radius in units of the Wigner-Seitz radius. Default = ``None``, i.e. the value of :data:`SYSTEMS`.
+
+    mesh : int, optional
+        Number of PPPM mesh points per dimension. Default = ``None``, i.e. the value of :data:`SYSTEMS`.
+
+    no_dumps : int
+        Number of production dumps. Default = 20.
+
+    Returns
+    -------
+    inputs : dict
+        Nested dictionary with the same structure of a YAML input file.
+
+    """
+    if system not in SYSTEMS:
+        raise ValueError(f"Unknown system {system}. Choose from {list(SYSTEMS.keys())}.")
+
+    inputs = deepcopy(SYSTEMS[system])
+    species = [sp["Species"] for sp in inputs["Particles"]]
+    total_density = sum(sp["number_density"] for sp in species)
+    a_ws = (3.0 / (4.0 * pi * total_density)) ** (1.0 / 3.0)
+
+    # Split the particles among the species. The last one takes the remainder.
+    remaining = num_ptcls
+    for sp in species[:-1]:
+        sp["num"] = int(round(sp["num"] * num_ptcls))
+        remaining -= sp["num"]
+    species[-1]["num"] = remaining
+
+    potential = inputs["Potential"]
+    potential["rc"] = (rc if rc else potential["rc"]) * a_ws
+    if potential["method"] == "pppm":
+        potential["pppm_alpha_ewald"] /= a_ws
+        if mesh:
+            potential["pppm_mesh"] = [mesh, mesh, mesh]
+
+    inputs["Integrator"].update(
+        {"equilibration_steps": 0, "production_steps": no_dumps, "eq_dump_step": 1, "prod_dump_step": 1}
+    )
+    inputs["Parameters"].update(
+        {"load_method": "random_no_reject", "boundary_conditions": "periodic", "rand_seed": 123456789}
+    )
+
+    return inputs
+
+
+def time_kernel(kernel, repeats: int, timer: SarkasTimer) -> numpy.ndarray:
+    """
+    Time the calls of a kernel. The first call is not timed as it includes the numba compilation.
+
+    Parameters
+    ----------
+    kernel : callable
+        Function without arguments.
+
+    repeats : int
+        Number of timed calls.
+
+    timer : :class:`sarkas.utilities.timing.SarkasTimer`
+        Timer.
+
+    Returns
+    -------
+    times : numpy.ndarray
+        Time of each call in seconds.
+
+    """
+    kernel()
+    times = numpy.zeros(repeats)
+    for i in range(repeats):
+        timer.start()
+        kernel()
+        times[i] = timer.stop() * 1.0e-09
+
+    return times
+
+
+def write_dumps(sim, no_dumps: int, timer: SarkasTimer) -> numpy.ndarray:
+    """
+    Evolve the system writing a production dump at each step.
+
+    Parameters
+    ----------
+    sim : :class:`sarkas.processes.Simulation`
+        Simulation.
+
+    no_dumps : int
+        Number of dumps.
+
+    timer : :class:`sarkas.utilities.timing.SarkasTimer`
+        Timer.
+
+    Returns
+    -------
+    times : numpy.ndarray
+        Time of each dump in seconds.
+
+    """
+    times = numpy.zeros(no_dumps)
+    for it in range(no_dumps):
+        sim.integrator.update(sim.particles)
+        timer.start()
+        sim.io.dump("production", sim.particles, it)
+        times[it] = timer.stop() * 1.0e-09
+
+    return times
+
+
+def benchmark_system(
+    system: str,
+    num_ptcls: int,
+    rc: float = None,
+    mesh: int = None,
+    kernels: list = None,
+    threads: list = None,
+    repeats: int = 5,
+    no_dumps: int = 20,
+) -> list:
+    """
+    Benchmark the kernels of a synthetic system.
+
+    Parameters
+    ----------
+    system : str
+        Name of the system, one of the keys of :data:`SYSTEMS`.
+
+    num_ptcls : int
+        Total number of particles.
+
+    rc : float, optional
+        Cut-off radius in units of the Wigner-Seitz radius.
+
+    mesh : int, optional
+        Number of PPPM mesh points per dimension.
+
+    kernels : list, optional
+        Kernels to time. Default = :data:`KERNELS`.
+
+    threads : list, optional
+        Numbers of numba threads. Default = ``[numba.config.NUMBA_NUM_THREADS]``.
+
+    repeats : int
+        Number of timed calls of each kernel. Default = 5.
+
+    no_dumps : int
+        Number of dumps written for the observables. Default = 20.
+
+    Returns
+    -------
+    results : list
+        One dictionary per kernel and number of threads.
+
+    """
+    kernels = kernels if kernels else KERNELS
+    threads = threads if threads else [numba.config.NUMBA_NUM_THREADS]
+    timer = SarkasTimer()
+
+    tmp_dir = mkdtemp(prefix="sarkas_bench_")
+    inputs = system_input(system, num_ptcls, rc, mesh, no_dumps)
+    inputs["IO"] = {"verbose": False, "simulations_dir": tmp_dir, "job_dir": system, "job_id": system}
+    input_file = join(tmp_dir, f"{system}.yaml")
+    with open(input_file, "w") as f:
+        yaml.dump(inputs, f, sort_keys=False)
+
+    results = []
+    try:
+        sim = Simulation(input_file)
+        sim.setup(read_yaml=True)
+        potential = sim.potential
+
+        config = {
+            "system": system,
+            "num_ptcls": sim.parameters.total_num_ptcls,
+            "rc_a_ws": potential.rc / sim.parameters.a_ws,
+            "mesh": int(potential.pppm_mesh[0]) if potential.pppm_on else None,
+            "cao": int(potential.pppm_cao[0]) if potential.pppm_on else None,
+        }
+
+        def record(kernel, variant, nthreads, times, steps=1):
+            results.append(
+                {
+                    "kernel": kernel,
+                    "variant": variant,
+                    **config,
+                    "threads": nthreads,
+                    "repeats": len(times),
+                    "time_min_s": times.min(),
+                    "time_mean_s": times.mean(),
+                    "time_std_s": times.std(),
+                    "ns_per_particle_step": times.min() * 1.0e09 / (config["num_ptcls"] * steps),
+                }
+            )
+
+        integrators = INTEGRATORS + (MAGNETIC_INTEGRATORS if sim.parameters.magnetized else [])
+        sim.integrator.langevin_gamma = 0.01 * sim.parameters.total_plasma_frequency
+
+        for nthreads in threads:
+            numba.set_num_threads(nthreads)
+
+            # The linked list is used also when rc is reduced to half of the box length
+            if "pp" in kernels and potential.method in ["pp", "pppm"]:
+                times = time_kernel(lambda: potential.update_linked_list(sim.particles), repeats, timer)
+                record("pp", potential.type, nthreads, times)
+
+            if "pm" in kernels and potential.pppm_on:
+                times = time_kernel(lambda: potential.update_pm(sim.particles), repeats, timer)
+                record("pm", potential.type, nthreads, times)
+
+            if "green_function" in kernels and potential.pppm_on:
+                record("green_function", potential.type, nthreads, time_kernel(potential.pppm_setup, repeats, timer))
+
+            if "integrator" in kernels:
+                for int_type in integrators:
+                    update = sim.integrator.type_setup(int_type)
+                    record("integrator", int_type, nthreads, time_kernel(lambda: update(sim.particles), repeats, timer))
+                sim.integrator.update = sim.integrator.type_setup(sim.integrator.type)
+
+            if "dump" in kernels or "observables" in kernels:
+                dump_times = write_dumps(sim, no_dumps, timer)
+                if "dump" in kernels:
+                    record("dump", "production", nthreads, dump_times)
+
+            if "observables" in kernels:
+                for name, (obs_class, attributes) in OBSERVABLES.items():
+                    obs = obs_class()
+                    obs.from_dict(deepcopy(attributes))
+
+                    def compute():
+                        # Silence the progress bars and the timing messages of the observable
+                        with redirect_stdout(StringIO()), redirect_stderr(StringIO()):
+                            obs.setup(sim.parameters, resume=False)
+                            obs.compute()
+
+                    record("observables", name, nthreads, time_kernel(compute, repeats, timer), steps=no_dumps)
+    finally:
+        rmtree(tmp_dir, ignore_errors=True)
+
+    return results
+
+
+def benchmark_imports(modules: list = None, repeats: int = 5) -> list:
+    """
+    Time the import of modules in a new interpreter. The first import is not timed as it may read the files from
+    disk or compile the numba kernels that are not cached.
+
+    Parameters
+    ----------
+    modules : list, optional
+        Names of the modules. Default = :data:`IMPORT_MODULES`.
+
+    repeats : int
+        Number of timed imports. Default = 5.
+
+    Returns
+    -------
+    results : list
+        One dictionary per module with the import times and the modules of :data:`LAZY_MODULES` that are loaded.
+
+    """
+    modules = modules if modules else IMPORT_MODULES
+    results = []
+    for module in modules:
+        code = (
+            f"import json, sys, time\n"
+            f"t0 = time.perf_counter()\n"
+            f"import {module}\n"
+            f"t1 = time.perf_counter()\n"
+            f"print(json.dumps([t1 - t0, [m for m in {LAZY_MODULES} if m in sys.modules]]))"
+        )
+        times = numpy.zeros(repeats)
+        for i in range(-1, repeats):
+            out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+            tme, loaded = json.loads(out.splitlines()[-1])
+            if i >= 0:
+                times[i] = tme
+
+        results.append(
+            {
+                "kernel": "import",
+                "variant": module,
+                "repeats": repeats,
+                "time_min_s": times.min(),
+                "time_mean_s": times.mean(),
+                "time_std_s": times.std(),
+                "loaded_modules": loaded,
+            }
+        )
+
+    return results
+
+
+def metadata() -> dict:
+    """Versions of the main packages and information on the machine."""
+    from . import __version__
+
+    return {
+        "sarkas": __version__,
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "numba": numba.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": cpu_count(),
+        "numba_num_threads": numba.config.NUMBA_NUM_THREADS,
+        "date": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def run_benchmarks(
+    systems: list = None,
+    num_ptcls: list = None,
+    rcs: list = None,
+    meshes: list = None,
+    kernels: list = None,
+    threads: list = None,
+    repeats: int = 5,
+    no_dumps: int = 20,
+    output: str = None,
+    imports: bool = False,
+) -> dict:
+    """
+    Benchmark the kernels over all the combinations of systems, number of particles, cut-off radii and meshes.
+
+    Parameters
+    ----------
+    systems : list, optional
+        Names of the systems. Default = all the keys of :data:`SYSTEMS`.
+
+    num_ptcls : list, optional
+        Total numbers of particles. Default = ``[1000]``.
+
+    rcs : list, optional
+        Cut-off radii in units of the Wigner-Seitz radius. Default = the values of :data:`SYSTEMS`.
+
+    meshes : list, optional
+        PPPM mesh points per dimension. Default = the values of :data:`SYSTEMS`. Ignored for PP systems.
+
+    kernels : list, optional
+        Kernels to time. Default = :data:`KERNELS`.
+
+    threads : list, optional
+        Numbers of numba threads. Values larger than ``numba.config.NUMBA_NUM_THREADS`` are skipped.
+
+    repeats : int
+        Number of timed calls of each kernel. Default = 5.
+
+    no_dumps : int
+        Number of dumps written for the observables. Default = 20.
+
+    output : str, optional
+        Path of the JSON file. Default = ``None``, i.e. the results are not saved.
+
+    imports : bool
+        Time also the import of :data:`IMPORT_MODULES`, see :func:`benchmark_imports`. Default = False.
+
+    Returns
+    -------
+    data : dict
+        Metadata and results.
+
+    """
+    systems = systems if systems else list(SYSTEMS.keys())
+    num_ptcls = num_ptcls if num_ptcls else [1000]
+    rcs = rcs if rcs else [None]
+    meshes = meshes if meshes else [None]
+
+    if threads:
+        if max(threads) > numba.config.NUMBA_NUM_THREADS:
+            warn(
+                f"Only {numba.config.NUMBA_NUM_THREADS} numba threads are available. "
+                f"Larger values are skipped.",
+                category=RuntimeWarning,
+            )
+        threads = [t for t in threads if t <= numba.config.NUMBA_NUM_THREADS]
+
+    data = {"metadata": metadata(), "results": []}
+    if imports:
+        print("Benchmarking imports")
+        results = benchmark_imports(repeats=repeats)
+        for res in results:
+            print(f"  {res['variant']:>25}: {res['time_min_s']:.3f} s, loads {res['loaded_modules']}")
+        data["results"] += results
+
+    for system, num, rc, mesh in product(systems, num_ptcls, rcs, meshes):
+        # The mesh does not matter for PP systems
+        if SYSTEMS[system]["Potential"]["method"] != "pppm":
+            if mesh != meshes[0]:
+                continue
+            mesh = None
+
+        print(f"Benchmarking {system}: N = {num}, rc = {rc}, mesh = {mesh}")
+        results = benchmark_system(system, num, rc, mesh, kernels, threads, repeats, no_dumps)
+        for res in results:
+            print(
+                f"  {res['kernel']:>15} {res['variant']:>20} threads = {res['threads']:>3}: "
+                f"{res['time_min_s']:.4e} s, {res['ns_per_particle_step']:.2f} ns/particle/step"
+            )
+        data["results"] += results
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(data, f, indent=2)
+
+    return data
+
+
+def main(argv: list = None):
+    """Command line interface of the benchmark suite."""
+    parser = ArgumentParser(prog="python -m sarkas.bench", description="Benchmark the kernels of Sarkas.")
+    parser.add_argument("--systems", nargs="+", choices=list(SYSTEMS.keys()), help="Systems to benchmark.")
+    parser.add_argument("--kernels", nargs="+", choices=KERNELS, help="Kernels to time.")
+    parser.add_argument("--num_ptcls", nargs="+", type=int, default=[1000], help="Total numbers of particles.")
+    parser.add_argument("--rc", nargs="+", type=float, help="Cut-off radii in units of the Wigner-Seitz radius.")
+    parser.add_argument("--mesh", nargs="+", type=int, help="PPPM mesh points per dimension.")
+    parser.add_argument("--threads", nargs="+", type=int, help="Numbers of numba threads.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of timed calls of each kernel.")
+    parser.add_argument("--dumps", type=int, default=20, help="Number of dumps written for the observables.")
+    parser.add_argument("--output", default="sarkas_bench.json", help="Path of the JSON file.")
+    parser.add_argument("--imports", action="store_true", help="Time also the import of the main modules.")
+    args = parser.parse_args(argv)
+
+    run_benchmarks(
+        systems=args.systems,
+        num_ptcls=args.num_ptcls,
+        rcs=args.rc,
+        meshes=args.mesh,
+        kernels=args.kernels,
+        threads=args.threads,
+        repeats=args.repeats,
+        no_dumps=args.dumps,
+        output=args.output,
+        imports=args.imports,
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
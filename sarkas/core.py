@@ -172,6 +172,15 @@ class Parameters:
     measure : bool
         Flag for production phase.
 
+    rdf_in_loop : bool
+        Flag for accumulating the RDF histograms in the force loop during the production phase. Default = True.
+        Set it to False to save time if the RDF is calculated from the positions,
+        see :attr:`sarkas.tools.observables.RadialDistributionFunction.rdf_method`.
+
+    profile : bool
+        Flag for timing the sections of the evolve loop, i.e. forces, boundary conditions, thermostat and dumps.
+        The breakdown is printed at the end of each phase and saved to a JSON file. Default = False.
+
     verbose : bool
         Flag for screen output.
 
@@ -282,9 +291,11 @@ class Parameters:
         self.job_dir = None
         self.log_file = None
         self.measure = False
+        self.rdf_in_loop = True
         self.magnetized = False
         self.plot_style = None
         self.pre_run = False
+        self.profile = False
         self.threading = False
         self.simulations_dir = "Simulations"
         self.production_dir = "Production"
@@ -2,16 +2,12 @@
 Module handling the potential class.
 """
 from copy import deepcopy
-from fmm3dpy import hfmm3d, lfmm3d
 from numpy import array, inf, int64, ndarray, pi, sqrt, tanh
 from warnings import warn
 
 from ..utilities.exceptions import AlgorithmWarning
 from ..utilities.fdints import fdm1h, invfd1h
-from .force_pm import force_optimized_green_function as gf_opt
-from .force_pm import update as pm_update
-from .force_pp import update as pp_update
-from .force_pp import update_0D as pp_update_0D
+from .force_pp import specialized_kernels
 
 
 class Potential:
@@ -61,9 +57,21 @@ class Potential:
     pbox_volume : float
         Pointer to :attr:`sarkas.core.Parameters.pbox_lengths`
 
+    pppm_approx_err : float
+        Force error due to the approximation of erfc in the short-range force when :attr:`precision` is `"fast"`,
+        see :func:`sarkas.utilities.maths.force_error_approx_erfc`.
+
     pppm_on : bool
         Flag for turning on the PPPM algorithm.
 
+    precision : str
+        Precision of the short-range forces of the PPPM algorithm for the coulomb and yukawa potentials. \n
+        Choices = `["exact", "fast"]`. \n
+        `"exact"` = erfc and exp of the math library (default).
+        `"fast"` = approximation of erfc with relative error smaller than
+        :data:`sarkas.utilities.maths.ERFC_APPROX_RTOL` that shares the exponentials with the derivative of erfc,
+        see :func:`sarkas.utilities.maths.erfc_exp_approx`.
+
     QFactor : float
         Sum of the squared of the charges.
 
@@ -105,8 +113,10 @@ class Potential:
     pppm_cao: ndarray = array([3, 3, 3], dtype=int64)
     pppm_mesh: ndarray = array([8, 8, 8], dtype=int64)
     pppm_h_array: ndarray = array([1.0, 1.0, 1.0], dtype=float)
+    pppm_approx_err: float = 0.0
     pppm_pm_err: float = 0.0
     pppm_pp_err: float = 0.0
+    precision: str = "exact"
     QFactor: float = 0.0
     rc: float = None
     num_species: ndarray = None
@@ -384,6 +394,8 @@ class Potential:
             print(f"                                        ~ 1/{inv_halpha[0]}, 1/{inv_halpha[1]}, 1/{inv_halpha[2]}")
             print(f"PP Force Error = {self.pppm_pp_err:.6e}")
             print(f"PM Force Error = {self.pppm_pm_err:.6e}")
+            if self.precision == "fast":
+                print(f"Fast erfc Force Error = {self.pppm_approx_err:.6e}")
 
         print(f"Tot Force Error = {self.force_error:.6e}")
 
@@ -442,6 +454,7 @@ class Potential:
 
     def pppm_setup(self):
         """Calculate the pppm parameters."""
+        from .force_pm import force_optimized_green_function as gf_opt
 
         # Change lists to numpy arrays for Numba compatibility
         if isinstance(self.pppm_mesh, list):
@@ -496,7 +509,7 @@ class Potential:
         self.pppm_pm_err /= self.box_volume ** (2.0 / 3.0)
 
         # Total Force Error
-        self.force_error = sqrt(self.pppm_pm_err**2 + self.pppm_pp_err**2)
+        self.force_error = sqrt(self.pppm_pm_err**2 + self.pppm_pp_err**2 + self.pppm_approx_err**2)
 
     def pretty_print(self):
         """Print potential information in a user-friendly way."""
@@ -518,6 +531,18 @@ class Potential:
         # Enforce consistency
         self.type = self.type.lower()
         self.method = self.method.lower()
+        self.precision = self.precision.lower()
+
+        if self.precision not in ["exact", "fast"]:
+            raise ValueError(f"Unknown precision {self.precision}. Choose from ['exact', 'fast'].")
+
+        if self.precision == "fast" and (self.method != "pppm" or self.type not in ["coulomb", "yukawa"]):
+            warn(
+                "\nThe fast precision is available only for the coulomb and yukawa potentials with pppm. "
+                "I will use the exact forces.",
+                category=AlgorithmWarning,
+            )
+            self.precision = "exact"
 
         self.copy_params(params)
         self.type_setup(species)
@@ -598,6 +623,7 @@ class Potential:
             Particles data.
 
         """
+        pp_update, _ = specialized_kernels(self.force)
         ptcls.potential_energy, ptcls.acc, ptcls.virial = pp_update(
             ptcls.pos,
             ptcls.id,
@@ -605,7 +631,6 @@ class Potential:
             self.box_lengths,
             self.rc,
             self.matrix,
-            self.force,
             self.measure,
             ptcls.rdf_hist,
         )
@@ -626,6 +651,7 @@ class Potential:
             Particles data.
 
         """
+        _, pp_update_0D = specialized_kernels(self.force)
         ptcls.potential_energy, ptcls.acc, ptcls.virial = pp_update_0D(
             ptcls.pos,
             ptcls.id,
@@ -633,7 +659,6 @@ class Potential:
             self.box_lengths,
             self.rc,
             self.matrix,
-            self.force,
             self.measure,
             ptcls.rdf_hist,
         )
@@ -652,6 +677,9 @@ class Potential:
             Particles' data
 
         """
+        # Imported here, and not at the top of the module, since it loads pyfftw
+        from .force_pm import update as pm_update
+
         U_long, acc_l_r = pm_update(
             ptcls.pos,
             ptcls.charges,
@@ -696,6 +724,7 @@ class Potential:
             Particles' data
 
         """
+        from fmm3dpy import lfmm3d
 
         out_fmm = lfmm3d(eps=self.fmm_precision, sources=ptcls.pos.transpose(), charges=ptcls.charges, pg=2)
 
@@ -713,6 +742,8 @@ class Potential:
             Particles' data
 
         """
+        from fmm3dpy import hfmm3d
+
         out_fmm = hfmm3d(
             eps=self.fmm_precision,
             zk=1j / self.screening_length,
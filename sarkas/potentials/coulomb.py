@@ -27,7 +27,7 @@ from numba import jit
 from numba.core.types import float64, UniTuple
 from numpy import exp, inf, pi, sqrt, zeros
 
-from ..utilities.maths import force_error_analytic_pp
+from ..utilities.maths import erfc_exp_approx, force_error_analytic_pp, force_error_approx_erfc
 
 
 def update_params(potential):
@@ -62,13 +62,24 @@ def update_params(potential):
         potential.pppm_pp_err = force_error_analytic_pp(
             potential.type, potential.rc, potential.screening_length, potential.pppm_alpha_ewald, rescaling_constant
         )
+        potential.pppm_approx_err = 0.0
+        if potential.precision == "fast":
+            potential.force = coulomb_force_pppm_fast
+            potential.pppm_approx_err = force_error_approx_erfc(
+                potential.type,
+                potential.rc,
+                potential.screening_length,
+                potential.pppm_alpha_ewald,
+                potential.a_rs,
+                rescaling_constant,
+            )
         # # PP force error calculation. Note that the equation was derived for a single component plasma.
         # alpha_times_rcut = -((potential.pppm_alpha_ewald * potential.rc) ** 2)
         # potential.pppm_pp_err = 2.0 * exp(alpha_times_rcut) / sqrt(potential.rc)
         # potential.pppm_pp_err *= sqrt(potential.total_num_ptcls) * potential.a_ws ** 2 / sqrt(potential.pbox_volume)
 
 
-@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True)
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
 def coulomb_force_pppm(r_in, pot_matrix):
     """
     Numba'd function to calculate the potential and force between two particles when the pppm algorithm is chosen.
@@ -117,7 +128,56 @@ def coulomb_force_pppm(r_in, pot_matrix):
     return U, fr
 
 
-@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True)
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
+def coulomb_force_pppm_fast(r_in, pot_matrix):
+    """
+    Numba'd function to calculate the potential and force between two particles when the pppm algorithm is chosen
+    with the fast precision. Same as :func:`coulomb_force_pppm` with the approximation of erfc of
+    :func:`sarkas.utilities.maths.erfc_exp_approx`, which shares the gaussian with the derivative of erfc.
+
+    Parameters
+    ----------
+    r_in : float
+        Distance between two particles.
+
+    pot_matrix : numpy.ndarray
+        It contains potential dependent variables.\n
+        Shape = (3, :attr:`sarkas.core.Parameters.num_species`, :attr:`sarkas.core.Parameters.num_species`) .
+
+    Returns
+    -------
+    U : float
+        Potential value.
+
+    fr : float
+        Force between two particles.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> r = 2.0
+    >>> pot_matrix = np.array([ 1.0, 0.5, 0.0])
+    >>> coulomb_force_pppm_fast(r, pot_matrix)
+    (0.07864959848600482, 0.1431016735981511)
+
+    """
+
+    # Short-range cutoff to deal with divergence of the Coulomb potential
+    rs = pot_matrix[2]
+    # Branchless programming
+    r = r_in * (r_in >= rs) + rs * (r_in < rs)
+
+    alpha = pot_matrix[1]  # Ewald parameter alpha
+    erfc_ar, gauss_ar = erfc_exp_approx(alpha * r)
+    U = pot_matrix[0] * erfc_ar / r
+    f1 = erfc_ar / (r * r)
+    f2 = (2.0 * alpha / sqrt(pi) / r) * gauss_ar
+    fr = pot_matrix[0] * (f1 + f2)
+
+    return U, fr
+
+
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
 def coulomb_force(r_in, pot_matrix):
     """
     Numba'd function to calculate the bare coulomb potential and force between two particles.
@@ -210,7 +210,7 @@ def update_params(potential, params):
     )
 
 
-@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True)
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
 def egs_force(r_in, pot_matrix):
     """
     Numba'd function to calculate the potential and force between particles using the EGS Potential.
@@ -9,7 +9,7 @@ from numpy.fft import fftshift, ifftshift
 from pyfftw.builders import fftn, ifftn
 
 
-@jit(float64[:](int64, float64), nopython=True)
+@jit(float64[:](int64, float64), nopython=True, cache=True)
 def assgnmnt_func(cao, x):
     """
     Calculate the charge assignment function as given in Ref.:cite:`Deserno1998`
@@ -72,7 +72,7 @@ def assgnmnt_func(cao, x):
     elif cao == 7:
 
         W[0] = (
-            1.0 - 12.0 * x + 60.0 * x * 2 - 160.0 * x**3 + 240.0 * x**4 - 192.0 * x**5 + 64.0 * x**6
+            1.0 - 12.0 * x + 60.0 * x**2 - 160.0 * x**3 + 240.0 * x**4 - 192.0 * x**5 + 64.0 * x**6
         ) / 46080.0
 
         W[1] = (
@@ -115,6 +115,7 @@ def assgnmnt_func(cao, x):
         int64[:],  # pshift
     ),
     nopython=True,
+    cache=True,
 )
 def calc_acc_pm(E_x_r, E_y_r, E_z_r, mesh_pos, mesh_points, q_over_m, cao, mesh_sz, mid, pshift):
     """
@@ -235,7 +236,11 @@ def calc_acc_pm(E_x_r, E_y_r, E_z_r, mesh_pos, mesh_points, q_over_m, cao, mesh_
     return acc
 
 
-@jit(float64[:, :, :](float64[:, :], int64[:, :], float64[:], int64[:], int64[:], float64[:], int64[:]), nopython=True)
+@jit(
+    float64[:, :, :](float64[:, :], int64[:, :], float64[:], int64[:], int64[:], float64[:], int64[:]),
+    nopython=True,
+    cache=True,
+)
 def calc_charge_dens(mesh_pos, mesh_points, charges, cao, mesh_sz, mid, pshift):
     """
     Assigns Charges to Mesh Points.
@@ -344,6 +349,7 @@ def calc_charge_dens(mesh_pos, mesh_points, charges, cao, mesh_sz, mid, pshift):
 @jit(
     UniTuple(complex128[:, :, :], 3)(complex128[:, :, :], float64[:, :], float64[:, :], float64[:, :, :]),
     nopython=True,
+    cache=True,
 )
 def calc_field(phi_k, kx_v, ky_v, kz_v):
     """
@@ -383,7 +389,7 @@ def calc_field(phi_k, kx_v, ky_v, kz_v):
     return E_kx, E_ky, E_kz
 
 
-@jit(Tuple((float64[:, :], int64[:, :]))(float64[:, :], float64[:], int64[:]), nopython=True)
+@jit(Tuple((float64[:, :], int64[:, :]))(float64[:, :], float64[:], int64[:]), nopython=True, cache=True)
 def calc_mesh_coord(pos, h_array, cao):
     """
     Calculate the particles positions with respect to the mesh and their closest point on the mesh.
@@ -420,7 +426,7 @@ def calc_mesh_coord(pos, h_array, cao):
     return mesh_pos, mesh_points.astype(int64)
 
 
-@jit(UniTuple(float64[:, :], 3)(int64[:], int64[:], float64[:]), nopython=True)
+@jit(UniTuple(float64[:, :], 3)(int64[:], int64[:], float64[:]), nopython=True, cache=True)
 def create_k_aliases(aliases, mesh_sizes, non_zero_box_lengths):
     """Calculate the alias arrays of the reciprocal space arrays for anti-aliasing.
 
@@ -478,7 +484,7 @@ def create_k_aliases(aliases, mesh_sizes, non_zero_box_lengths):
     return kx_M, ky_M, kz_M
 
 
-@jit(Tuple((float64[:, :], float64[:, :], float64[:, :, :]))(int64[:], float64[:]), nopython=True)
+@jit(Tuple((float64[:, :], float64[:, :], float64[:, :, :]))(int64[:], float64[:]), nopython=True, cache=True)
 def create_k_arrays(mesh_sizes, non_zero_box_lengths):
     """Calculate the reciprocal space arrays.
 
@@ -536,6 +542,7 @@ def create_k_arrays(mesh_sizes, non_zero_box_lengths):
         float64, float64, float64, float64[:], float64[:], float64[:], float64[:], int64[:], float64, float64, float64
     ),
     nopython=True,
+    cache=True,
 )
 def sum_over_aliases(kx, ky, kz, kx_M, ky_M, kz_M, h_array, p, four_pi, alpha_sq, kappa_sq):
     """
@@ -621,6 +628,7 @@ def sum_over_aliases(kx, ky, kz, kx_M, ky_M, kz_M, h_array, p, four_pi, alpha_sq
         float64[:], float64[:], int64[:], int64[:], int64[:], float64[:]
     ),
     nopython=True,
+    cache=True,
 )
 def force_optimized_green_function(box_lengths, h_array, mesh_sizes, aliases, p, constants):
     """
@@ -731,7 +739,7 @@ def force_optimized_green_function(box_lengths, h_array, mesh_sizes, aliases, p,
     return G_k, kx_v, ky_v, kz_v, PM_err
 
 
-@jit(Tuple((float64[:], int64[:]))(int64[:]), nopython=True)
+@jit(Tuple((float64[:], int64[:]))(int64[:]), nopython=True, cache=True)
 def mesh_point_shift(cao):
     """
     Calculate the required shift based on the parity of the charge assignment orders.
@@ -2,21 +2,174 @@
 Module for handling Particle-Particle interaction.
 """
 
-from numba import jit
-from numba.core.types import float64, int64, Tuple
-from numpy import arange, sqrt, zeros, zeros_like
+from functools import lru_cache
+from numba import jit, literally
+from numba.core.types import float64, int64, IntegerLiteral, Tuple
+from numba.extending import overload
+from numpy import arange, empty, sqrt, zeros, zeros_like
+
+from .coulomb import coulomb_force, coulomb_force_pppm, coulomb_force_pppm_fast
+from .egs import egs_force
+from .hs_yukawa import hs_yukawa_force
+from .lennardjones import lj_force
+from .moliere import moliere_force
+from .qsp import deutsch_force, hansen_force, kelbg_force
+from .yukawa import yukawa_force, yukawa_force_pppm, yukawa_force_pppm_fast
+
+# Pair forces of the potentials. The kernels of this module receive the index of the force in this tuple instead of the
+# force function and are compiled for each index. Unlike a function, an integer literal is the same in every process,
+# hence the compiled kernels can be cached on disk.
+PAIR_FORCES = (
+    coulomb_force,
+    coulomb_force_pppm,
+    coulomb_force_pppm_fast,
+    deutsch_force,
+    egs_force,
+    hansen_force,
+    hs_yukawa_force,
+    kelbg_force,
+    lj_force,
+    moliere_force,
+    yukawa_force,
+    yukawa_force_pppm,
+    yukawa_force_pppm_fast,
+)
+
+
+def pair_force_id(force) -> int:
+    """
+    Index of a pair force in :data:`PAIR_FORCES`.
+
+    Parameters
+    ----------
+    force : func
+        Potential and force values.
+
+    Returns
+    -------
+    : int
+        Index of ``force``.
+
+    Raises
+    ------
+    ValueError
+        If ``force`` is not in :data:`PAIR_FORCES`.
+
+    """
+    if force not in PAIR_FORCES:
+        raise ValueError(f"{force} is not a supported pair force. Add it to sarkas.potentials.force_pp.PAIR_FORCES.")
+
+    return PAIR_FORCES.index(force)
+
+
+def pair_force(force_id, r, pot_matrix):
+    """
+    Calculate the potential and the force of a pair with the pair force of index ``force_id``. In jitted code
+    ``force_id`` must be a literal, see :func:`pair_force_overload`.
+
+    Parameters
+    ----------
+    force_id : int
+        Index of the force in :data:`PAIR_FORCES`.
+
+    r : float
+        Distance between the two particles.
+
+    pot_matrix : numpy.ndarray
+        Potential parameters of the pair.
+
+    Returns
+    -------
+    : tuple
+        Potential and force values.
+
+    """
+    return PAIR_FORCES[force_id](r, pot_matrix)
+
+
+@overload(pair_force)
+def pair_force_overload(force_id, r, pot_matrix):
+    """Numba implementation of :func:`pair_force`. The force is resolved at compile time from the literal index."""
+    if isinstance(force_id, IntegerLiteral):
+        force = PAIR_FORCES[force_id.literal_value]
+
+        def impl(force_id, r, pot_matrix):
+            return force(r, pot_matrix)
+
+        return impl
+
+
+@jit(nopython=True, cache=True)
+def pair_records(potential_matrix):
+    """
+    Rearrange the potential parameters in contiguous records, one per pair of species, so that the parameters of a
+    pair are read from consecutive memory locations in the interaction loops.
+
+    Parameters
+    ----------
+    potential_matrix : numpy.ndarray
+        Potential parameters. Shape = (``num_params``, ``num_species``, ``num_species``).
+
+    Returns
+    -------
+    pair_params : numpy.ndarray
+        Parameters of each pair. Shape = (``num_species``, ``num_species``, ``num_params``).
+
+    """
+    num_params, num_species = potential_matrix.shape[0], potential_matrix.shape[1]
+    pair_params = empty((num_species, num_species, num_params))
+    for id_i in range(num_species):
+        for id_j in range(num_species):
+            for k in range(num_params):
+                pair_params[id_i, id_j, k] = potential_matrix[k, id_i, id_j]
+
+    return pair_params
 
 
-@jit(nopython=True)
-def update_0D(pos, p_id, p_mass, box_lengths, rc, potential_matrix, force, measure, rdf_hist):
+@lru_cache(maxsize=None)
+def specialized_kernels(force) -> tuple:
+    """
+    Create the kernels of the linked cell list and of the brute force algorithms specialized for a pair force. The
+    index of the force is a constant of the new kernels, hence they are compiled with the force inlined and cached on
+    disk like the other kernels. They are created only once per force.
+
+    Parameters
+    ----------
+    force : func
+        Potential and force values. It must be in :data:`PAIR_FORCES`.
+
+    Returns
+    -------
+    update_force : func
+        :func:`update` with the arguments ``(pos, p_id, p_mass, box_lengths, rc, potential_matrix, measure, rdf_hist)``.
+
+    update_0D_force : func
+        :func:`update_0D` with the same arguments of ``update_force``.
+
+    """
+    force_id = pair_force_id(force)
+
+    @jit(nopython=True, cache=True)
+    def update_force(pos, p_id, p_mass, box_lengths, rc, potential_matrix, measure, rdf_hist):
+        return update(pos, p_id, p_mass, box_lengths, rc, potential_matrix, force_id, measure, rdf_hist)
+
+    @jit(nopython=True, cache=True)
+    def update_0D_force(pos, p_id, p_mass, box_lengths, rc, potential_matrix, measure, rdf_hist):
+        return update_0D(pos, p_id, p_mass, box_lengths, rc, potential_matrix, force_id, measure, rdf_hist)
+
+    return update_force, update_0D_force
+
+
+@jit(nopython=True, cache=True)
+def update_0D(pos, p_id, p_mass, box_lengths, rc, potential_matrix, force_id, measure, rdf_hist):
     """
     Updates particles' accelerations when the cutoff radius :math:`r_c` is half the box's length, :math:`r_c = L/2`
     For no sub-cell. All ptcls within :math:`r_c = L/2` participate for force calculation. Cost ~ O(N^2)
 
     Parameters
     ----------
-    force: func
-        Potential and force values.
+    force_id: int
+        Index of the pair force in :data:`PAIR_FORCES`.
 
     potential_matrix: numpy.ndarray
         Potential parameters.
@@ -68,25 +221,18 @@ def update_0D(pos, p_id, p_mass, box_lengths, rc, potential_matrix, force, measu
     rdf_nbins = rdf_hist.shape[0]
     dr_rdf = Lh[:actual_dimensions].prod() ** (1.0 / actual_dimensions) / float(rdf_nbins)
 
+    pair_params = pair_records(potential_matrix)
+
     for i in range(N):
         for j in range(i + 1, N):
             dx = pos[i, 0] - pos[j, 0]
             dy = pos[i, 1] - pos[j, 1]
             dz = pos[i, 2] - pos[j, 2]
 
-            dx2 = box_lengths[0] - dx * (dx >= Lh[0]) + dx * (dx <= -Lh[0])
-            dy2 = box_lengths[1] - dy * (dy >= Lh[1]) + dy * (dy <= -Lh[1])
-            dz2 = box_lengths[2] - dz * (dz >= Lh[2]) + dz * (dz <= -Lh[2])
-
-            # if dy >= Lh[1]:
-            #     dy = Lv[1] - dy
-            # elif dy <= -Lh:
-            #     dy = Lv[1] + dy
-            #
-            # if dz >= Lh[2]:
-            #     dz = Lv[2] - dz
-            # elif dz <= -Lh:
-            #     dz = Lv[2] + dz
+            # Minimum image convention
+            dx2 = dx - box_lengths[0] * (dx >= Lh[0]) + box_lengths[0] * (dx <= -Lh[0])
+            dy2 = dy - box_lengths[1] * (dy >= Lh[1]) + box_lengths[1] * (dy <= -Lh[1])
+            dz2 = dz - box_lengths[2] * (dz >= Lh[2]) + box_lengths[2] * (dz <= -Lh[2])
 
             # Compute distance between particles i and j
             r = sqrt(dx2 * dx2 + dy2 * dy2 + dz2 * dz2)
@@ -96,27 +242,30 @@ def update_0D(pos, p_id, p_mass, box_lengths, rc, potential_matrix, force, measu
             # These definitions are needed due to numba
             # see https://github.com/numba/numba/issues/5881
             if measure and rdf_bin < rdf_nbins:
-                rdf_hist[rdf_bin, id_j, id_j] += 1
+                rdf_hist[rdf_bin, id_i, id_j] += 1
 
             if 0.0 < r < rc:
                 mass_i = p_mass[i]
                 mass_j = p_mass[j]
 
-                p_matrix = potential_matrix[:, id_i, id_j]
+                p_matrix = pair_params[id_i, id_j]
                 # Compute the short-ranged force
-                pot, fr = force(r, p_matrix)
+                pot, fr = pair_force(literally(force_id), r, p_matrix)
                 fr /= r
                 U_s_r += pot
 
                 # Update the acceleration for i particles in each dimension
 
-                acc_ix = dx2 * fr / mass_i
-                acc_iy = dy2 * fr / mass_i
-                acc_iz = dz2 * fr / mass_i
+                fr_i = fr / mass_i
+                fr_j = fr / mass_j
 
-                acc_jx = dx2 * fr / mass_j
-                acc_jy = dy2 * fr / mass_j
-                acc_jz = dz2 * fr / mass_j
+                acc_ix = dx2 * fr_i
+                acc_iy = dy2 * fr_i
+                acc_iz = dz2 * fr_i
+
+                acc_jx = dx2 * fr_j
+                acc_jy = dy2 * fr_j
+                acc_jz = dz2 * fr_j
 
                 acc_s_r[i, 0] += acc_ix
                 acc_s_r[i, 1] += acc_iy
@@ -141,15 +290,15 @@ def update_0D(pos, p_id, p_mass, box_lengths, rc, potential_matrix, force, measu
     return U_s_r, acc_s_r, virial
 
 
-@jit(nopython=True)
-def update(pos, p_id, p_mass, box_lengths, rc, potential_matrix, force, measure, rdf_hist):
+@jit(nopython=True, cache=True)
+def update(pos, p_id, p_mass, box_lengths, rc, potential_matrix, force_id, measure, rdf_hist):
     """
     Update the force on the particles based on a linked cell-list (LCL) algorithm.
 
     Parameters
     ----------
-    force: func
-        Potential and force values.
+    force_id: int
+        Index of the pair force in :data:`PAIR_FORCES`.
 
     potential_matrix: numpy.ndarray
         Potential parameters.
@@ -195,15 +344,26 @@ def update(pos, p_id, p_mass, box_lengths, rc, potential_matrix, force, measure,
     head, ls_array = create_head_list_arrays(pos, cell_lengths, cells_per_dim)
 
     U_s_r, acc_s_r, virial = particles_interaction_loop(
-        pos, p_mass, p_id, potential_matrix, rc, measure, force, rdf_hist, head, ls_array, cells_per_dim, box_lengths
+        pos,
+        p_mass,
+        p_id,
+        pair_records(potential_matrix),
+        rc,
+        measure,
+        literally(force_id),
+        rdf_hist,
+        head,
+        ls_array,
+        cells_per_dim,
+        box_lengths,
     )
 
     return U_s_r, acc_s_r, virial
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def particles_interaction_loop(
-    pos, p_mass, p_id, potential_matrix, rc, measure, force, rdf_hist, head, ls_array, cells_per_dim, box_lengths
+    pos, p_mass, p_id, pair_params, rc, measure, force_id, rdf_hist, head, ls_array, cells_per_dim, box_lengths
 ):
     """
     Update the force on the particles based on a linked cell-list (LCL) algorithm.
@@ -219,8 +379,8 @@ def particles_interaction_loop(
     p_id: numpy.ndarray
         Id of each particle
 
-    potential_matrix: numpy.ndarray
-        Potential parameters.
+    pair_params: numpy.ndarray
+        Potential parameters of each pair of species, see :func:`pair_records`.
 
     rc: float
         Cut-off radius.
@@ -228,8 +388,8 @@ def particles_interaction_loop(
     measure : bool
         Boolean for rdf calculation.
 
-    force: func
-        Potential and force values.
+    force_id: int
+        Index of the pair force in :data:`PAIR_FORCES`.
 
     rdf_hist : numpy.ndarray
         Radial Distribution function array.
@@ -268,7 +428,6 @@ def particles_interaction_loop(
     """
 
     # Declare parameters
-    rshift = zeros(3)  # Shifts for array flattening
     acc_s_r = zeros_like(pos)
 
     # Virial term for the viscosity calculation
@@ -318,10 +477,10 @@ def particles_interaction_loop(
                     #     cz_shift = 0
                     #     rshift[2] = 0.0
                     cz_shift = 0 + d3_max * (cz_N < 0) - cells_per_dim[2] * (cz_N >= cells_per_dim[2])
-                    rshift[2] = 0.0 - box_lengths[2] * (cz_N < 0) + box_lengths[2] * (cz_N >= cells_per_dim[2])
+                    rshift_z = 0.0 - box_lengths[2] * (cz_N < 0) + box_lengths[2] * (cz_N >= cells_per_dim[2])
                     # Note: In lower dimension systems (2D, 1D)
                     # cz_shift will be 1, 0, -1. This will cancel later on when cz_N + cz_shift = (-1 + 1, 0 + 0, 1 - 1)
-                    # Similarly rshift[2] = 0.0 in all cases since box_lengths[2] == 0
+                    # Similarly rshift_z = 0.0 in all cases since box_lengths[2] == 0
 
                     for cy_N in range(cy - 1, (cy + 2) * d2_min):
                         # y cells
@@ -337,7 +496,7 @@ def particles_interaction_loop(
                         #     rshift[1] = 0.0
 
                         cy_shift = 0 + d2_max * (cy_N < 0) - cells_per_dim[1] * (cy_N >= cells_per_dim[1])
-                        rshift[1] = 0.0 - box_lengths[1] * (cy_N < 0) + box_lengths[1] * (cy_N >= cells_per_dim[1])
+                        rshift_y = 0.0 - box_lengths[1] * (cy_N < 0) + box_lengths[1] * (cy_N >= cells_per_dim[1])
 
                         for cx_N in range(cx - 1, (cx + 2) * d1_min):
                             # x cells
@@ -353,7 +512,7 @@ def particles_interaction_loop(
                             #     rshift[0] = 0.0
 
                             cx_shift = 0 + cells_per_dim[0] * (cx_N < 0) - cells_per_dim[0] * (cx_N >= cells_per_dim[0])
-                            rshift[0] = 0.0 - box_lengths[0] * (cx_N < 0) + box_lengths[0] * (cx_N >= cells_per_dim[0])
+                            rshift_x = 0.0 - box_lengths[0] * (cx_N < 0) + box_lengths[0] * (cx_N >= cells_per_dim[0])
 
                             # Compute the location of the N-th cell based on shifts
                             c_N = (
@@ -380,42 +539,45 @@ def particles_interaction_loop(
                                         # print("         rshift", rshift)
 
                                         # Compute the difference in positions for the i-th and j-th particles
-                                        dx = pos[i, 0] - (pos[j, 0] + rshift[0])
-                                        dy = pos[i, 1] - (pos[j, 1] + rshift[1])
-                                        dz = pos[i, 2] - (pos[j, 2] + rshift[2])
+                                        dx = pos[i, 0] - (pos[j, 0] + rshift_x)
+                                        dy = pos[i, 1] - (pos[j, 1] + rshift_y)
+                                        dz = pos[i, 2] - (pos[j, 2] + rshift_z)
                                         # print("         distances", dx, dy, dz)
 
                                         # Compute distance between particles i and j
                                         r = sqrt(dx**2 + dy**2 + dz**2)
-                                        rdf_bin = int(r / dr_rdf)
                                         id_i = p_id[i]
                                         id_j = p_id[j]
                                         # These definitions are needed due to numba
                                         # see https://github.com/numba/numba/issues/5881
 
-                                        if measure and rdf_bin < rdf_nbins:
-                                            rdf_hist[rdf_bin, id_i, id_j] += 1
+                                        if measure:
+                                            rdf_bin = int(r / dr_rdf)
+                                            if rdf_bin < rdf_nbins:
+                                                rdf_hist[rdf_bin, id_i, id_j] += 1
 
                                         # If below the cutoff radius, compute the force
                                         if r < rc:
-                                            p_matrix = potential_matrix[:, id_i, id_j]
+                                            p_matrix = pair_params[id_i, id_j]
                                             # neighbors[i, j] = j
 
                                             # Compute the short-ranged force
-                                            pot, fr = force(r, p_matrix)
+                                            pot, fr = pair_force(literally(force_id), r, p_matrix)
                                             fr /= r
                                             U_s_r += pot
 
                                             # Update the acceleration for i particles in each dimension
 
-                                            acc_s_r[i, 0] += dx * fr / p_mass[i]
-                                            acc_s_r[i, 1] += dy * fr / p_mass[i]
-                                            acc_s_r[i, 2] += dz * fr / p_mass[i]
+                                            fr_i = fr / p_mass[i]
+                                            fr_j = fr / p_mass[j]
+                                            acc_s_r[i, 0] += dx * fr_i
+                                            acc_s_r[i, 1] += dy * fr_i
+                                            acc_s_r[i, 2] += dz * fr_i
 
                                             # Apply Newton's 3rd law to update acceleration on j particles
-                                            acc_s_r[j, 0] -= dx * fr / p_mass[j]
-                                            acc_s_r[j, 1] -= dy * fr / p_mass[j]
-                                            acc_s_r[j, 2] -= dz * fr / p_mass[j]
+                                            acc_s_r[j, 0] -= dx * fr_j
+                                            acc_s_r[j, 1] -= dy * fr_j
+                                            acc_s_r[j, 2] -= dz * fr_j
 
                                             # Since we have the info already calculate the virial
                                             virial[0, 0, i] += dx * dx * fr
@@ -437,7 +599,7 @@ def particles_interaction_loop(
     return U_s_r, acc_s_r, virial
 
 
-@jit(Tuple((int64[:], float64[:]))(float64[:], float64), nopython=True)
+@jit(Tuple((int64[:], float64[:]))(float64[:], float64), nopython=True, cache=True)
 def create_cells_array(box_lengths, cutoff):
     """
     Calculate the number of cells per dimension and their lengths.
@@ -479,7 +641,7 @@ def create_cells_array(box_lengths, cutoff):
     return cells_per_dim, cell_length_per_dim
 
 
-@jit(Tuple((int64[:], int64[:]))(float64[:, :], float64[:], int64[:]), nopython=True)
+@jit(Tuple((int64[:], int64[:]))(float64[:, :], float64[:], int64[:]), nopython=True, cache=True)
 def create_head_list_arrays(pos, cell_lengths, cells):
     # Loop over all particles and place them in cells
     ls = arange(pos.shape[0])  # List of particle indices in a given cell
@@ -506,15 +668,15 @@ def create_head_list_arrays(pos, cell_lengths, cells):
     return head, ls
 
 
-@jit(nopython=True)
-def calculate_virial(pos, p_id, box_lengths, rc, potential_matrix, force):
+@jit(nopython=True, cache=True)
+def calculate_virial(pos, p_id, box_lengths, rc, potential_matrix, force_id):
     """
     Update the force on the particles based on a linked cell-list (LCL) algorithm.
 
     Parameters
     ----------
-    force: tuple, float
-        Potential and force values.
+    force_id: int
+        Index of the pair force in :data:`PAIR_FORCES`.
 
     potential_matrix: array
         Potential parameters.
@@ -537,13 +699,13 @@ def calculate_virial(pos, p_id, box_lengths, rc, potential_matrix, force):
     """
     # Declare parameters
     N = pos.shape[0]  # Number of particles
-    rshift = zeros(3)  # Shifts for array flattening
     # Virial term for the viscosity calculation
     virial = zeros((3, 3, N))
     # Total number of cells in volume
     cells_per_dim, cell_lengths = create_cells_array(box_lengths, rc)
 
     head, ls_array = create_head_list_arrays(pos, cell_lengths, cells_per_dim)
+    pair_params = pair_records(potential_matrix)
 
     # Loop over all cells in x, y, and z direction
     for cx in range(cells_per_dim[0]):
@@ -568,7 +730,7 @@ def calculate_virial(pos, p_id, box_lengths, rc, potential_matrix, force):
                     #     cz_shift = 0
                     #     rshift[2] = 0.0
                     cz_shift = 0 + cells_per_dim[2] * (cz_N < 0) - cells_per_dim[2] * (cz_N >= cells_per_dim[2])
-                    rshift[2] = 0.0 - box_lengths[2] * (cz_N < 0) + box_lengths[2] * (cz_N >= cells_per_dim[2])
+                    rshift_z = 0.0 - box_lengths[2] * (cz_N < 0) + box_lengths[2] * (cz_N >= cells_per_dim[2])
 
                     for cy_N in range(cy - 1, cy + 2):
                         # y cells
@@ -584,7 +746,7 @@ def calculate_virial(pos, p_id, box_lengths, rc, potential_matrix, force):
                         #     rshift[1] = 0.0
 
                         cy_shift = 0 + cells_per_dim[1] * (cy_N < 0) - cells_per_dim[1] * (cy_N >= cells_per_dim[1])
-                        rshift[1] = 0.0 - box_lengths[1] * (cy_N < 0) + box_lengths[1] * (cy_N >= cells_per_dim[1])
+                        rshift_y = 0.0 - box_lengths[1] * (cy_N < 0) + box_lengths[1] * (cy_N >= cells_per_dim[1])
 
                         for cx_N in range(cx - 1, cx + 2):
                             # x cells
@@ -600,7 +762,7 @@ def calculate_virial(pos, p_id, box_lengths, rc, potential_matrix, force):
                             #     rshift[0] = 0.0
 
                             cx_shift = 0 + cells_per_dim[0] * (cx_N < 0) - cells_per_dim[0] * (cx_N >= cells_per_dim[0])
-                            rshift[0] = 0.0 - box_lengths[0] * (cx_N < 0) + box_lengths[0] * (cx_N >= cells_per_dim[0])
+                            rshift_x = 0.0 - box_lengths[0] * (cx_N < 0) + box_lengths[0] * (cx_N >= cells_per_dim[0])
 
                             # Compute the location of the N-th cell based on shifts
                             c_N = (
@@ -623,19 +785,19 @@ def calculate_virial(pos, p_id, box_lengths, rc, potential_matrix, force):
                                     if i < j:
 
                                         # Compute the difference in positions for the i-th and j-th particles
-                                        dx = pos[i, 0] - (pos[j, 0] + rshift[0])
-                                        dy = pos[i, 1] - (pos[j, 1] + rshift[1])
-                                        dz = pos[i, 2] - (pos[j, 2] + rshift[2])
+                                        dx = pos[i, 0] - (pos[j, 0] + rshift_x)
+                                        dy = pos[i, 1] - (pos[j, 1] + rshift_y)
+                                        dz = pos[i, 2] - (pos[j, 2] + rshift_z)
 
                                         # Compute distance between particles i and j
                                         r = sqrt(dx**2 + dy**2 + dz**2)
 
                                         # If below the cutoff radius, compute the force
                                         if r < rc:
-                                            p_matrix = potential_matrix[:, p_id[i], p_id[j]]
+                                            p_matrix = pair_params[p_id[i], p_id[j]]
 
                                             # Compute the short-ranged force
-                                            pot, fr = force(r, p_matrix)
+                                            pot, fr = pair_force(literally(force_id), r, p_matrix)
                                             fr /= r
 
                                             virial[0, 0, i] += dx * dx * fr
@@ -31,7 +31,7 @@ from warnings import warn
 from ..utilities.maths import force_error_analytic_lcl
 
 
-@njit
+@njit(cache=True)
 def hs_yukawa_force(r, pot_matrix):
     """
     Calculates Potential and Force between two particles.
@@ -62,7 +62,7 @@ def hs_yukawa_force(r, pot_matrix):
     return U, force
 
 
-@njit
+@njit(cache=True)
 def force_deriv(r, pot_matrix):
     """Calculate the second derivative of the potential.
 
@@ -102,7 +102,7 @@ def update_params(potential):
     )
 
 
-@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True)
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
 def lj_force(r_in, pot_matrix):
     """
     Numba'd function to calculate the PP force between particles using Lennard-Jones Potential.
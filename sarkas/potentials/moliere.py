@@ -76,7 +76,7 @@ def update_params(potential):
     )
 
 
-@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True)
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
 def moliere_force(r, pot_matrix):
     """
     Numba'd function to calculate the PP force between particles using the Moliere Potential.
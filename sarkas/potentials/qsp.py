@@ -195,7 +195,7 @@ def update_params(potential, species):
         )
 
 
-@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True)
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
 def deutsch_force(r_in, pot_matrix):
     """
     Calculate Deutsch QSP Force between two particles.
@@ -252,7 +252,7 @@ def deutsch_force(r_in, pot_matrix):
     return U, force
 
 
-@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True)
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
 def pauli_force(r, pot_matrix):
     """
     Calculate Pauli term of the QSP potential
@@ -288,7 +288,7 @@ def pauli_force(r, pot_matrix):
     return U_pauli, f_pauli
 
 
-@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True)
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
 def hansen_force(r_in, pot_matrix):
     """
     Calculate Deutsch QSP Force between two particles.
@@ -346,7 +346,7 @@ def hansen_force(r_in, pot_matrix):
     return U, force
 
 
-@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True)
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
 def kelbg_force(r_in, pot_matrix):
     """
     Calculates the QSP Force between two particles when the pppm algorithm is chosen.
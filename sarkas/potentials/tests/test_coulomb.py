@@ -1,6 +1,7 @@
-from numpy import array, isclose, pi
+from numpy import allclose, array, isclose, linspace, pi
 
-from ..coulomb import coulomb_force, coulomb_force_pppm
+from ...utilities.maths import ERFC_APPROX_RTOL
+from ..coulomb import coulomb_force, coulomb_force_pppm, coulomb_force_pppm_fast
 
 
 def test_coulomb_force():
@@ -27,6 +28,17 @@ def test_coulomb_force_pppm():
     assert isclose(force, 0.14310167611771996)
 
 
+def test_coulomb_force_pppm_fast():
+    """Test the fast pp part of the coulomb force against the exact one."""
+    for alpha in [0.3, 0.6, 1.2]:
+        pot_mat = array([1.0, alpha, 0.001])
+        exact = array([coulomb_force_pppm(r, pot_mat) for r in linspace(0.0, 8.0, 801)])
+        fast = array([coulomb_force_pppm_fast(r, pot_mat) for r in linspace(0.0, 8.0, 801)])
+
+        # Only erfc is approximated, hence the relative errors of both terms are bounded
+        assert allclose(fast, exact, rtol=ERFC_APPROX_RTOL, atol=0.0)
+
+
 # def test_update_params():
 #     # TODO: write a test for update_params
 #     pass
@@ -1,24 +1,30 @@
 from numpy import (
+    allclose,
     arange,
     array,
     dtype,
     exp,
     imag,
+    int64,
     isclose,
     meshgrid,
     mod,
     ndarray,
+    ones,
     pi,
     real,
+    rint,
     sin,
     sqrt,
+    where,
     zeros,
     zeros_like,
 )
 from numpy.random import default_rng
 from scipy.constants import epsilon_0
 
-from ..force_pp import create_cells_array, create_head_list_arrays
+from ..force_pp import create_cells_array, create_head_list_arrays, pair_records, specialized_kernels
+from ..yukawa import yukawa_force
 
 
 def create_hexagonal_lattice(Nx, Ny, perturb):
@@ -172,3 +178,80 @@ def test_create_head_list_arrays():
     assert isclose(head, array([4, 6, 7, 8, 13, 15, 16, 18, 19]))
 
     assert isclose(ls_array, array([-50, -50, 1, -50, 0, 2, 5, 3, -50, -50, 9, -50, -50, 10, -50, 11, 12, 14, 17, -50]))
+
+
+def test_specialized_kernels():
+    """Test the linked cell list kernel specialized for the Yukawa force against a direct sum over all pairs."""
+
+    N = 100
+    box_lengths = array([10.0, 10.0, 10.0])
+    rc = 3.0
+    pos = default_rng(123456789).uniform(low=0.0, high=box_lengths[0], size=(N, 3))
+    p_id = zeros(N, dtype=int64)
+    p_mass = ones(N)
+    # Charge product, screening parameter and short-range cutoff
+    potential_matrix = zeros((3, 1, 1))
+    potential_matrix[0] = 1.0
+    potential_matrix[1] = 0.5
+    rdf_hist = zeros((10, 1, 1))
+
+    update, update_0D = specialized_kernels(yukawa_force)
+    assert specialized_kernels(yukawa_force) == (update, update_0D)
+
+    U, acc, _ = update(pos, p_id, p_mass, box_lengths, rc, potential_matrix, False, rdf_hist)
+
+    # Direct sum with the minimum image convention
+    dist = pos[:, None, :] - pos[None, :, :]
+    dist -= box_lengths * rint(dist / box_lengths)
+    r = sqrt((dist**2).sum(axis=-1))
+    mask = (r > 0.0) & (r < rc)
+    r_in = where(mask, r, 1.0)
+    U_pair = where(mask, exp(-0.5 * r_in) / r_in, 0.0)
+    f_pair = U_pair * (1.0 / r_in + 0.5) / r_in
+
+    assert isclose(U, 0.5 * U_pair.sum())
+    assert allclose(acc, (f_pair[:, :, None] * dist).sum(axis=1))
+
+
+def test_pair_records():
+    """Test that the parameters of each pair of species are contiguous."""
+
+    potential_matrix = arange(12.0).reshape((3, 2, 2))
+    pair_params = pair_records(potential_matrix)
+
+    assert pair_params.shape == (2, 2, 3)
+    assert pair_params[0, 1].flags["C_CONTIGUOUS"]
+    assert (pair_params[1, 0] == potential_matrix[:, 1, 0]).all()
+
+
+def test_specialized_kernels_species():
+    """Test the linked cell list and the brute force kernels of a binary mixture against a direct sum."""
+
+    N = 100
+    box_lengths = array([10.0, 10.0, 10.0])
+    rc = 4.0
+    pos = default_rng(123456789).uniform(low=0.0, high=box_lengths[0], size=(N, 3))
+    p_id = mod(arange(N), 2)
+    p_mass = where(p_id == 0, 1.0, 4.0)
+    charges = where(p_id == 0, 1.0, 2.0)
+    # Charge product, screening parameter and short-range cutoff of each pair of species
+    potential_matrix = zeros((3, 2, 2))
+    potential_matrix[0] = array([[1.0, 2.0], [2.0, 4.0]])
+    potential_matrix[1] = 0.5
+    rdf_hist = zeros((10, 2, 2))
+
+    # Direct sum with the minimum image convention
+    dist = pos[:, None, :] - pos[None, :, :]
+    dist -= box_lengths * rint(dist / box_lengths)
+    r = sqrt((dist**2).sum(axis=-1))
+    mask = (r > 0.0) & (r < rc)
+    r_in = where(mask, r, 1.0)
+    U_pair = where(mask, charges[:, None] * charges[None, :] * exp(-0.5 * r_in) / r_in, 0.0)
+    f_pair = U_pair * (1.0 / r_in + 0.5) / r_in
+    acc_direct = (f_pair[:, :, None] * dist).sum(axis=1) / p_mass[:, None]
+
+    for kernel in specialized_kernels(yukawa_force):
+        U, acc, _ = kernel(pos, p_id, p_mass, box_lengths, rc, potential_matrix, False, rdf_hist)
+
+        assert isclose(U, 0.5 * U_pair.sum())
+        assert allclose(acc, acc_direct)
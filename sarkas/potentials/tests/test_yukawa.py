@@ -1,6 +1,7 @@
-from numpy import array, isclose
+from numpy import abs, array, exp, isclose, linspace
 
-from ..yukawa import yukawa_force, yukawa_force_pppm
+from ...utilities.maths import ERFC_APPROX_RTOL
+from ..yukawa import yukawa_force, yukawa_force_pppm, yukawa_force_pppm_fast
 
 
 def test_yukawa_force():
@@ -27,6 +28,20 @@ def test_yukawa_force_pppm():
     assert isclose(force, 0.18025091684402375)
 
 
+def test_yukawa_force_pppm_fast():
+    """Test the fast pp part of the yukawa force against the exact one."""
+    r = linspace(0.0, 8.0, 801)
+    for kappa, alpha in [(0.5, 0.3), (1.0, 0.6), (2.0, 1.2)]:
+        pot_mat = array([1.0, kappa, alpha, 0.001])
+        exact = array([yukawa_force_pppm(x, pot_mat) for x in r])
+        fast = array([yukawa_force_pppm_fast(x, pot_mat) for x in r])
+
+        assert abs(fast[:, 0] / exact[:, 0] - 1.0).max() < ERFC_APPROX_RTOL
+        # The terms of the force with erfc have opposite signs for kappa r > 1. Compare with the bare yukawa force.
+        scale = exp(-kappa * r.clip(0.001)) / r.clip(0.001) * (1.0 / r.clip(0.001) + kappa)
+        assert (abs(fast[:, 1] - exact[:, 1]) / scale).max() < ERFC_APPROX_RTOL
+
+
 # def test_update_params():
 #     # TODO: write a test for update_params
 #     pass
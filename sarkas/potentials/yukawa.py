@@ -29,10 +29,10 @@ from numba.core.types import float64, UniTuple
 from numpy import exp, pi, sqrt, zeros
 from warnings import warn
 
-from ..utilities.maths import force_error_analytic_lcl, force_error_analytic_pp
+from ..utilities.maths import erfc_exp_approx, force_error_analytic_lcl, force_error_analytic_pp, force_error_approx_erfc
 
 
-@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True)
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
 def yukawa_force_pppm(r_in, pot_matrix):
     """
     Numba'd function to calculate Potential and Force between two particles when the pppm algorithm is chosen.
@@ -92,7 +92,67 @@ def yukawa_force_pppm(r_in, pot_matrix):
     return U, fr
 
 
-@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True)
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
+def yukawa_force_pppm_fast(r_in, pot_matrix):
+    """
+    Numba'd function to calculate Potential and Force between two particles when the pppm algorithm is chosen with the
+    fast precision. Same as :func:`yukawa_force_pppm` with the approximation of erfc of
+    :func:`sarkas.utilities.maths.erfc_exp_approx`, which shares the gaussians with the derivatives of erfc, and with
+    a single exponential for :math:`e^{\\pm \\kappa r}`.
+
+    Parameters
+    ----------
+    r_in : float
+        Distance between two particles.
+
+    pot_matrix : numpy.ndarray
+        It contains potential dependent variables. \n
+        Shape = (4, :attr:`sarkas.core.Parameters.num_species`, :attr:`sarkas.core.Parameters.num_species`)
+
+    Returns
+    -------
+    U : float
+        Potential value
+
+    fr : float
+        Force between two particles calculated using eq.(22) in :cite:`Dharuman2017`.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> r = 2.0
+    >>> pot_matrix = np.array([ 1.0, 0.5, 0.25,  0.0001])
+    >>> yukawa_force_pppm_fast(r, pot_matrix)
+    (0.16287409848395534, 0.1802509135898888)
+
+    """
+    kappa = pot_matrix[1]
+    alpha = pot_matrix[2]  # Ewald parameter alpha
+
+    # Short-range cutoff to deal with divergence of the Coulomb potential
+    rs = pot_matrix[-1]
+    # Branchless programming
+    r = r_in * (r_in >= rs) + rs * (r_in < rs)
+
+    half_kappa_alpha = 0.5 * kappa / alpha
+    alpha_r = alpha * r
+    exp_plus = exp(kappa * r)
+    exp_minus = 1.0 / exp_plus
+    erfc_plus, gauss_plus = erfc_exp_approx(alpha_r + half_kappa_alpha)
+    erfc_minus, gauss_minus = erfc_exp_approx(alpha_r - half_kappa_alpha)
+
+    U = pot_matrix[0] * (0.5 / r) * (exp_plus * erfc_plus + exp_minus * erfc_minus)
+    # Derivative of the exponential term and 1/r
+    f1 = (0.5 / r) * exp_plus * erfc_plus * (1.0 / r - kappa)
+    f2 = (0.5 / r) * exp_minus * erfc_minus * (1.0 / r + kappa)
+    # Derivative of erfc(a r) = 2a/sqrt(pi) e^{-a^2 r^2}* (x/r)
+    f3 = (alpha / sqrt(pi) / r) * (gauss_plus * exp_plus + gauss_minus * exp_minus)
+    fr = pot_matrix[0] * (f1 + f2 + f3)
+
+    return U, fr
+
+
+@jit(UniTuple(float64, 2)(float64, float64[:]), nopython=True, cache=True)
 def yukawa_force(r_in, pot_matrix):
     """
     Numba'd function to calculate Potential and Force between two particles.
@@ -135,7 +195,7 @@ def yukawa_force(r_in, pot_matrix):
     return U, force
 
 
-@jit(float64(float64, float64[:]), nopython=True)
+@jit(float64(float64, float64[:]), nopython=True, cache=True)
 def force_deriv(r, pot_matrix):
     """Numba'd function to calculate the second derivative of the potential.
 
@@ -204,6 +264,17 @@ def update_params(potential):
         potential.pppm_pp_err = force_error_analytic_pp(
             potential.type, potential.rc, potential.screening_length, potential.pppm_alpha_ewald, rescaling_constant
         )
+        potential.pppm_approx_err = 0.0
+        if potential.precision == "fast":
+            potential.force = yukawa_force_pppm_fast
+            potential.pppm_approx_err = force_error_approx_erfc(
+                potential.type,
+                potential.rc,
+                potential.screening_length,
+                potential.pppm_alpha_ewald,
+                potential.a_rs,
+                rescaling_constant,
+            )
 
         # PP force error calculation. Note that the equation was derived for a single component plasma.
         # kappa_over_alpha = -0.25 * (potential.matrix[1, 0, 0] / potential.matrix[2, 0, 0]) ** 2
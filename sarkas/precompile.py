@@ -0,0 +1,148 @@
+"""
+Warm the on-disk cache of the numba kernels so that new processes do not compile them again.
+
+Importing a module compiles, or loads from the cache, its kernels with an explicit signature, e.g. the PM, integrator
+and thermostat kernels. The particle-particle kernels are specialized for the pair force of each potential, see
+:func:`sarkas.potentials.force_pp.specialized_kernels`, and are compiled here for the chosen potential types. Example ::
+
+    python -m sarkas.precompile yukawa coulomb
+    python -m sarkas.precompile --input input_file.yaml
+
+The cache is stored in the ``__pycache__`` directories of the package, or in ``NUMBA_CACHE_DIR`` if they are not
+writable. Numba checks only the source file of the cached kernel, hence after editing a pair force the ``*.nbi`` and
+``*.nbc`` files of ``force_pp`` must be deleted.
+"""
+import sys
+from argparse import ArgumentParser
+from importlib import import_module
+
+import yaml
+from numpy import array, int64, ones, zeros
+from numpy.random import default_rng
+
+from .potentials.coulomb import coulomb_force, coulomb_force_pppm, coulomb_force_pppm_fast
+from .potentials.egs import egs_force
+from .potentials.force_pp import specialized_kernels
+from .potentials.hs_yukawa import hs_yukawa_force
+from .potentials.lennardjones import lj_force
+from .potentials.moliere import moliere_force
+from .potentials.qsp import deutsch_force, hansen_force, kelbg_force
+from .potentials.yukawa import yukawa_force, yukawa_force_pppm, yukawa_force_pppm_fast
+from .utilities.timing import SarkasTimer
+
+# Modules whose kernels have an explicit signature.
+MODULES = [
+    "sarkas.potentials.force_pm",
+    "sarkas.time_evolution.integrators",
+    "sarkas.time_evolution.thermostats",
+    "sarkas.utilities.fdints",
+]
+
+# Pair forces that each potential type can use.
+POTENTIAL_FORCES = {
+    "coulomb": (coulomb_force, coulomb_force_pppm, coulomb_force_pppm_fast),
+    "yukawa": (yukawa_force, yukawa_force_pppm, yukawa_force_pppm_fast),
+    "egs": (egs_force,),
+    "lj": (lj_force,),
+    "moliere": (moliere_force,),
+    "qsp": (deutsch_force, hansen_force, kelbg_force),
+    "hs_yukawa": (hs_yukawa_force,),
+}
+
+
+def potential_types(input_files: list) -> list:
+    """
+    Read the potential types of YAML input files.
+
+    Parameters
+    ----------
+    input_files : list
+        Paths of the YAML input files.
+
+    Returns
+    -------
+    types : list
+        Potential type of each file.
+
+    """
+    types = []
+    for filename in input_files:
+        with open(filename, "r") as stream:
+            inputs = yaml.safe_load(stream)
+        types.append(inputs["Potential"]["type"].lower())
+
+    return types
+
+
+def precompile(potentials: list = None, verbose: bool = True):
+    """
+    Compile the kernels of :data:`MODULES` and the particle-particle kernels of the pair forces of the given potential
+    types and store them in the cache. The latter are called on a few particles with arrays of the same types used in
+    a simulation.
+
+    Parameters
+    ----------
+    potentials : list, optional
+        Potential types. Default = all the keys of :data:`POTENTIAL_FORCES`.
+
+    verbose : bool
+        Print the compilation time of each potential. Default = True.
+
+    Raises
+    ------
+    ValueError
+        If a potential type is not supported.
+
+    """
+    potentials = potentials if potentials else list(POTENTIAL_FORCES.keys())
+    for pot in potentials:
+        if pot not in POTENTIAL_FORCES:
+            raise ValueError(f"Unknown potential type {pot}. Choose from {list(POTENTIAL_FORCES.keys())}.")
+
+    timer = SarkasTimer()
+    timer.start()
+    for module in MODULES:
+        import_module(module)
+    tme = timer.stop()
+    if verbose:
+        print(f"{'modules':>10}: {tme * 1.0e-09:.2f} sec")
+
+    num_ptcls = 64
+    box_lengths = array([4.0, 4.0, 4.0])
+    pos = default_rng(0).uniform(0.0, 4.0, (num_ptcls, 3))
+    p_id = zeros(num_ptcls, dtype=int64)
+    p_mass = ones(num_ptcls)
+    # The values do not matter, the shape is the largest of the potentials' matrices
+    potential_matrix = ones((7, 1, 1))
+    rdf_hist = zeros((10, 1, 1))
+
+    for pot in potentials:
+        timer.start()
+        for force in POTENTIAL_FORCES[pot]:
+            update_force, update_0D_force = specialized_kernels(force)
+            # Linked cell list with 3 cells per dimension and brute force
+            update_force(pos, p_id, p_mass, box_lengths, 1.2, potential_matrix, False, rdf_hist)
+            update_0D_force(pos, p_id, p_mass, box_lengths, 2.0, potential_matrix, False, rdf_hist)
+        tme = timer.stop()
+        if verbose:
+            print(f"{pot:>10}: {tme * 1.0e-09:.2f} sec")
+
+
+def main(argv: list = None):
+    """Command line interface of :func:`precompile`."""
+    parser = ArgumentParser(
+        prog="sarkas_precompile", description="Compile and cache the numba kernels of Sarkas for the given potentials."
+    )
+    parser.add_argument(
+        "potentials", nargs="*", help=f"Potential types. Default = all of {list(POTENTIAL_FORCES.keys())}."
+    )
+    parser.add_argument("-i", "--input", nargs="+", default=[], help="YAML input files whose potentials are compiled.")
+    args = parser.parse_args(argv)
+
+    potentials = args.potentials + potential_types(args.input)
+    # Keep the order and remove duplicates
+    precompile(list(dict.fromkeys(potentials)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
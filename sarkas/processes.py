@@ -1,37 +1,44 @@
 """
 Module handling stages of an MD run: PreProcessing, Simulation, PostProcessing.
+
+The plotting libraries, pandas and the postprocessing modules are imported in the methods that use them, so that
+importing this module, e.g. to run a simulation, does not load them.
 """
-import pandas as pd
-from IPython import get_ipython
+import yaml
 from threading import Thread
 
-if get_ipython().__class__.__name__ == "ZMQInteractiveShell":
+from .utilities.io import in_notebook
+
+if in_notebook():
     from tqdm import tqdm_notebook as tqdm
     from tqdm.notebook import trange
 else:
     from tqdm import tqdm, trange
 
-import matplotlib.pyplot as plt
-from matplotlib.cm import get_cmap, ScalarMappable
-from matplotlib.colors import LogNorm
 from numpy import (
     arange,
+    argsort,
     array,
+    inf,
     int64,
+    isfinite,
     linspace,
     log2,
     log10,
     logspace,
+    mean,
     meshgrid,
+    ones,
     sqrt,
+    unique,
+    unravel_index,
+    where,
     zeros,
 )
 from os import listdir, mkdir
 from os import remove as os_remove
 from os import stat as os_stat
-from os.path import exists, join
-from pandas import DataFrame, read_csv
-from seaborn import scatterplot
+from os.path import basename, exists, join, splitext
 from warnings import warn
 
 from .core import Parameters
@@ -39,23 +46,17 @@ from .particles import Particles
 from .plasma import Species
 from .potentials.core import Potential
 from .time_evolution.integrators import Integrator
-from .tools.observables import (
-    CurrentCorrelationFunction,
-    DiffusionFlux,
-    DynamicStructureFactor,
-    ElectricCurrent,
-    PressureTensor,
-    RadialDistributionFunction,
-    StaticStructureFactor,
-    Thermodynamics,
-    VelocityAutoCorrelationFunction,
-    VelocityDistribution,
-)
 
 # Sarkas modules
+from .utilities.exceptions import AlgorithmWarning
 from .utilities.io import InputOutput
-from .utilities.maths import force_error_analytic_pp, force_error_approx_pppm
-from .utilities.timing import SarkasTimer
+from .utilities.maths import (
+    force_error_analytic_pp,
+    force_error_approx_erfc,
+    force_error_approx_pm,
+    force_error_approx_pppm,
+)
+from .utilities.timing import SarkasProfiler, SarkasTimer
 
 
 class Process:
@@ -93,6 +94,13 @@ class Process:
     io : :class:`sarkas.utilities.io.InputOutput`
         Class handling the IO in Sarkas.
 
+    accumulators : list
+        In-situ accumulators fed during the production phase, e.g. the
+        :class:`sarkas.tools.observables.Observable` with ``on_the_fly = True``. An accumulator must have the attribute
+        ``sample_step`` and the methods ``setup(params, phase)``, ``init_on_the_fly()``, ``sample(ptcls, it)``,
+        and ``finalize()``. ``sample`` is called every ``sample_step`` timesteps and ``finalize`` once the phase is over.
+        They are not used in a production restart.
+
     """
 
     def __init__(self, input_file: str = None):
@@ -103,6 +111,7 @@ class Process:
         self.species = []
         self.threads_ls = []
         self.observables_list = []
+        self.accumulators = []
         self.input_file = input_file
         self.timer = SarkasTimer()
         self.io = InputOutput(process=self.__name__)
@@ -144,6 +153,20 @@ class Process:
                     self.parameters.electron_temperature_eV = self.potential.electron_temperature_eV
 
         if self.__name__ != "simulation":
+            from .tools.observables import (
+                CurrentCorrelationFunction,
+                DiffusionFlux,
+                DynamicStructureFactor,
+                ElectricCurrent,
+                MeanSquaredDisplacement,
+                PressureTensor,
+                RadialDistributionFunction,
+                StaticStructureFactor,
+                Thermodynamics,
+                VelocityAutoCorrelationFunction,
+                VelocityDistribution,
+            )
+
             self.observables_list = []
 
             for observable in dics["Observables"]:
@@ -177,6 +200,11 @@ class Process:
                         self.vacf = VelocityAutoCorrelationFunction()
                         if sub_dict:
                             self.vacf.from_dict(sub_dict)
+                    elif key == "MeanSquaredDisplacement":
+                        self.observables_list.append("msd")
+                        self.msd = MeanSquaredDisplacement()
+                        if sub_dict:
+                            self.msd.from_dict(sub_dict)
                     elif key == "VelocityDistribution":
                         self.observables_list.append("vd")
                         self.vm = VelocityDistribution()
@@ -201,6 +229,26 @@ class Process:
             if "TransportCoefficients" in dics.keys():
                 self.transport_dict = dics["TransportCoefficients"].copy()
 
+            if "PostProcessing" in dics.keys():
+                self.workers = dics["PostProcessing"].get("workers", 1)
+
+        else:
+            # Observables calculated during the production phase instead of from the dumps
+            self.accumulators = []
+
+            for observable in dics.get("Observables", []):
+                for key, sub_dict in observable.items():
+                    if sub_dict and sub_dict.get("on_the_fly"):
+                        # The postprocessing module is loaded only if it is needed during the simulation
+                        from .tools import observables
+
+                        if not getattr(getattr(observables, key, None), "on_the_fly_capable", False):
+                            raise ValueError(f"{key} cannot be calculated on the fly.")
+
+                        obs = getattr(observables, key)()
+                        obs.from_dict(sub_dict)
+                        self.accumulators.append(obs)
+
     def evolve_loop(self, phase, thermalization, it_start, it_end, dump_step) -> None:
         """
         Evolve the system forward in time.
@@ -224,12 +272,17 @@ class Process:
             Interval for dumping data.
 
         """
+        accumulators = self.accumulators if phase == "production" else []
 
         for it in trange(it_start, it_end, disable=not self.parameters.verbose):
             # Calculate the Potential energy and update particles' data
 
             self.integrator.update(self.particles)
 
+            for acc in accumulators:
+                if (it + 1) % acc.sample_step == 0:
+                    acc.sample(self.particles, it + 1)
+
             if (it + 1) % dump_step == 0:
                 self.io.dump(phase, self.particles, it + 1)
 
@@ -262,11 +315,17 @@ class Process:
             Interval for dumping data.
 
         """
+        accumulators = self.accumulators if phase == "production" else []
+
         for it in trange(it_start, it_end, disable=not self.parameters.verbose):
             # Calculate the Potential energy and update particles' data
 
             self.integrator.update(self.particles)
 
+            for acc in accumulators:
+                if (it + 1) % acc.sample_step == 0:
+                    acc.sample(self.particles, it + 1)
+
             if (it + 1) % dump_step == 0:
                 th = Thread(
                     target=self.io.dump,
@@ -291,6 +350,68 @@ class Process:
 
         self.threads_ls.clear()
 
+    def evolve_profiled(self, phase, thermalization, it_start, it_end, dump_step) -> None:
+        """
+        Evolve the system forward in time timing the sections of each step. The methods of the integrator, of the
+        potential and of the io class called in the loop are wrapped with the timers of a
+        :class:`sarkas.utilities.timing.SarkasProfiler`. Their breakdown is printed at the end of the phase and saved
+        to a JSON file. It is used instead of :meth:`sarkas.processes.Process.evolve_loop` when
+        ``parameters.profile = True``. With ``parameters.threading = True`` the dumps are not timed.
+
+        Parameters
+        ----------
+        phase: str
+            Indicates the stage of the simulation used for saving dumps in the right directory. \n
+            Choices = ("equilibration", "production", "magnetization")
+
+        thermalization : bool
+            Indicates whether to apply the thermostat or not.
+
+        it_start: int
+            Initial timestep of the loop.
+
+        it_end: int
+            Final timestep of the loop.
+
+        dump_step: int
+            Interval for dumping data.
+
+        """
+        profiler = SarkasProfiler()
+        profiler.wrap(self.integrator, "update", "Integrator")
+        profiler.wrap(self.integrator, "update_accelerations", "Accelerations", parent="Integrator")
+        # The integrator calls update_pppm which calls the PP and PM parts through the instance
+        if self.potential.pppm_on:
+            profiler.wrap(self.potential, "update_linked_list", "PP Force", parent="Accelerations")
+            profiler.wrap(self.potential, "update_pm", "PM Force", parent="Accelerations")
+        profiler.wrap(self.integrator, "enforce_bc", "Boundary Conditions", parent="Integrator")
+        # Placeholder, it is calculated at the end of the loop
+        profiler.record("Drift and Kick", 0, 0, parent="Integrator")
+        profiler.wrap(self.integrator, "thermostate", "Thermostat")
+        # With threading the dumps are saved by other threads in parallel to the loop, hence they are not timed.
+        # Their cost is in "Other", e.g. waiting for the last threads at the end of the loop.
+        if not self.parameters.threading:
+            profiler.wrap(self.io, "dump", "Dump")
+
+        evolve = self.evolve_loop_threading if self.parameters.threading else self.evolve_loop
+        t0 = self.timer.current()
+        try:
+            evolve(phase, thermalization, it_start, it_end, dump_step)
+        finally:
+            profiler.unwrap()
+        total = self.timer.current() - t0
+
+        sections = profiler.sections
+        steps = sections["Integrator"][1]
+        # Drift and kick of the integrator, i.e. the time of its update not spent in the wrapped methods
+        drift_kick = sections["Integrator"][0] - sections["Accelerations"][0] - sections["Boundary Conditions"][0]
+        profiler.record("Drift and Kick", drift_kick, steps, parent="Integrator")
+        # Everything else in the loop, e.g. the accumulators of the on-the-fly observables
+        loop = sum(sections[label][0] for label in ["Integrator", "Thermostat", "Dump"] if label in sections)
+        profiler.record("Other", total - loop, steps)
+
+        self.io.profile_summary(phase, profiler.breakdown(total), total, steps, self.parameters.total_num_ptcls)
+
     def initialization(self) -> None:
         """Initialize all classes."""
 
@@ -336,6 +457,8 @@ class Process:
         time_end = self.timer.current()
 
         self.evolve = self.evolve_loop_threading if self.parameters.threading else self.evolve_loop
+        if self.parameters.profile:
+            self.evolve = self.evolve_profiled
 
         # Print timing
         self.io.time_stamp("Particles Initialization", self.timer.time_division(time_ptcls - t0))
@@ -418,6 +541,17 @@ class Process:
                             self.species.append(spec)
 
                 if class_name == "Observables":
+                    from .tools.observables import (
+                        CurrentCorrelationFunction,
+                        DynamicStructureFactor,
+                        ElectricCurrent,
+                        MeanSquaredDisplacement,
+                        RadialDistributionFunction,
+                        StaticStructureFactor,
+                        Thermodynamics,
+                        VelocityAutoCorrelationFunction,
+                        VelocityDistribution,
+                    )
 
                     for observable in class_attr:
                         for key, sub_dict in observable.items():
@@ -443,6 +577,10 @@ class Process:
                                 self.vacf = VelocityAutoCorrelationFunction()
                                 if sub_dict:
                                     self.vacf.from_dict(sub_dict)
+                            if key == "MeanSquaredDisplacement":
+                                self.msd = MeanSquaredDisplacement()
+                                if sub_dict:
+                                    self.msd.from_dict(sub_dict)
                             if key == "VelocityDistribution":
                                 self.vm = VelocityDistribution()
                                 if sub_dict:
@@ -487,6 +625,8 @@ class Process:
             self.initialization()
 
         if self.parameters.plot_style:
+            import matplotlib.pyplot as plt
+
             plt.style.use(self.parameters.plot_style)
 
 
@@ -499,14 +639,32 @@ class PostProcess(Process):
     input_file : str
         Path to the YAML input file.
 
+    Attributes
+    ----------
+    workers : int
+        Number of processes calculating the slices, or reading the runs, of the observables in parallel. It is read
+        from the ``workers`` key of the ``PostProcessing`` section of the YAML file. Observables with a larger
+        ``workers`` keep their own. Default = 1.
+
     """
 
     def __init__(self, input_file: str = None):
         self.__name__ = "postprocessing"
+        self.workers = 1
         super().__init__(input_file)
 
     def run(self):
         """Calculate all the observables from the YAML input file."""
+        from .tools.observables import (
+            DiffusionFlux,
+            ElectricCurrent,
+            MeanSquaredDisplacement,
+            PressureTensor,
+            RadialDistributionFunction,
+            stream_dumps,
+            Thermodynamics,
+            VelocityAutoCorrelationFunction,
+        )
 
         if len(self.observables_list) == 0:
             # Make Temperature and Energy plots
@@ -520,58 +678,87 @@ class PostProcess(Process):
             self.rdf.setup(self.parameters)
             self.rdf.parse()
         else:
+            # Observables that can be fed one dump at a time, grouped by the dumps they read.
+            streams = {}
             for obs in self.observables_list:
                 # Check that the observable is actually there
                 if obs in self.__dict__.keys():
+                    self.__dict__[obs].workers = max(self.workers, self.__dict__[obs].workers)
                     self.__dict__[obs].setup(self.parameters)
                     if obs == "therm":
                         self.therm.temp_energy_plot(self)
                     else:
                         self.io.postprocess_info(self, write_to_file=True, observable=obs)
-                        self.__dict__[obs].compute()
-
-                # Calculate transport coefficients
-                if hasattr(self, "transport_dict"):
-                    from .tools.transport import TransportCoefficients
-
-                    tc = TransportCoefficients(self.parameters)
-
-                    for coeff in self.transport_dict:
-
-                        for key, coeff_kwargs in coeff.items():
-
-                            if key.lower() == "diffusion":
-                                # Calculate if not already
-                                if not self.vacf:
-                                    self.vacf = VelocityAutoCorrelationFunction()
-                                    self.vacf.setup(self.parameters)
-                                    # Use parse in case you calculated it already
-                                    self.vacf.parse()
+                        if self.__dict__[obs].on_the_fly:
+                            # Already calculated during the production phase
+                            self.__dict__[obs].parse()
+                        elif self.__dict__[obs].stream_observable:
+                            stream_key = (self.__dict__[obs].dump_dir, self.__dict__[obs].dump_step)
+                            streams.setdefault(stream_key, []).append(self.__dict__[obs])
+                        else:
+                            self.__dict__[obs].compute()
+
+            # Read each dump only once and push it to all the observables that need it.
+            for stream_observables in streams.values():
+                if len(stream_observables) > 1:
+                    stream_dumps(stream_observables)
+                else:
+                    stream_observables[0].compute()
+
+            # Calculate transport coefficients
+            if hasattr(self, "transport_dict"):
+                from .tools.transport import TransportCoefficients
+
+                tc = TransportCoefficients(self.parameters)
+
+                for coeff in self.transport_dict:
+
+                    for key, coeff_kwargs in coeff.items():
+                        # Options of the cumulative integration of the ACFs, e.g. stop_at_plateau
+                        if coeff_kwargs:
+                            tc.__dict__.update({k: v for k, v in coeff_kwargs.items() if k != "method"})
+
+                        if key.lower() == "diffusion" and coeff_kwargs and coeff_kwargs.get("method") == "einstein":
+                            # Einstein relation from the mean squared displacement
+                            if not getattr(self, "msd", None):
+                                self.msd = MeanSquaredDisplacement()
+                                self.msd.setup(self.parameters)
+                                self.msd.parse()
+
+                            tc.diffusion(observable=self.msd)
+
+                        elif key.lower() == "diffusion":
+                            # Calculate if not already
+                            if not self.vacf:
+                                self.vacf = VelocityAutoCorrelationFunction()
+                                self.vacf.setup(self.parameters)
+                                # Use parse in case you calculated it already
+                                self.vacf.parse()
 
-                                tc.diffusion(observable=self.vacf)
+                            tc.diffusion(observable=self.vacf)
 
-                            elif key.lower() == "interdiffusion":
-                                if not self.diff_flux:
-                                    self.diff_flux = DiffusionFlux()
-                                    self.diff_flux.setup(self.parameters)
-                                    self.diff_flux.parse()
+                        elif key.lower() == "interdiffusion":
+                            if not self.diff_flux:
+                                self.diff_flux = DiffusionFlux()
+                                self.diff_flux.setup(self.parameters)
+                                self.diff_flux.parse()
 
-                                tc.interdiffusion(self.diff_flux)
+                            tc.interdiffusion(self.diff_flux)
 
-                            elif key.lower() == "viscosity":
-                                if not self.p_tensor:
-                                    self.p_tensor = PressureTensor()
-                                    self.p_tensor.setup(self.parameters)
-                                    self.p_tensor.parse()
-                                tc.viscosity(self.p_tensor)
+                        elif key.lower() == "viscosity":
+                            if not self.p_tensor:
+                                self.p_tensor = PressureTensor()
+                                self.p_tensor.setup(self.parameters)
+                                self.p_tensor.parse()
+                            tc.viscosity(self.p_tensor)
 
-                            elif key.lower() == "electricalconductivity":
-                                if not self.ec:
-                                    self.ec = ElectricCurrent()
-                                    self.ec.setup(self.parameters)
-                                    self.ec.parse()
+                        elif key.lower() == "electricalconductivity":
+                            if not self.ec:
+                                self.ec = ElectricCurrent()
+                                self.ec.setup(self.parameters)
+                                self.ec.parse()
 
-                                tc.electrical_conductivity(self.ec)
+                            tc.electrical_conductivity(self.ec)
 
     def setup_from_simulation(self, simulation):
         """
@@ -694,6 +881,114 @@ class PreProcess(Process):
             alphas * potential_copy.a_ws,
         )
 
+    def fit_pppm_cost_model(self, loops: int = 3):
+        """
+        Fit the cost models of the PP and PM accelerations
+
+        .. math::
+            t_{\\rm pp}(N_c) = a_0 + a_1 \\frac{N^2}{N_c^3}, \\quad
+            t_{\\rm pm}(M, p) = b_0 + b_1 N p^3 + b_2 M^3 \\log_2 M^3,
+
+        where :math:`N` is the number of particles, :math:`N_c` the number of cells per dimension, :math:`M` the number
+        of mesh points per dimension and :math:`p` the charge assignment order. The non-negative coefficients are fitted
+        to the times of three cell numbers and four pairs of mesh and cao, instead of the full grid of
+        :meth:`timing_study_calculation`. The Green's function of the PM samples is calculated without aliases, since
+        these change its accuracy but not the cost of :meth:`sarkas.potentials.core.Potential.update_pm`.
+
+        Parameters
+        ----------
+        loops : int
+            Number of timed calls of each sample, after a first call that includes the numba compilation. Default = 3.
+
+        Returns
+        -------
+        pp_coeffs : numpy.ndarray
+            Coefficients :math:`a_0, a_1` in seconds.
+
+        pm_coeffs : numpy.ndarray
+            Coefficients :math:`b_0, b_1, b_2` in seconds.
+
+        """
+        from scipy.optimize import nnls
+
+        num_ptcls = self.parameters.total_num_ptcls
+        min_length = self.potential.box_lengths[self.potential.box_lengths > 0.0].min()
+
+        cells = unique(self.pp_cells[[0, len(self.pp_cells) // 2, -1]])
+        pp_times = zeros(len(cells))
+        for ic, cell in enumerate(cells):
+            self.potential.rc = min_length / cell
+            self.potential.update_linked_list(self.particles)
+            self.timer.start()
+            for _ in range(loops):
+                self.potential.update_linked_list(self.particles)
+            pp_times[ic] = self.timer.stop() * 1.0e-9 / loops
+
+        meshes, caos = self.pm_meshes, self.pm_caos
+        pm_samples = [
+            (meshes[0], caos[0]),
+            (meshes[-1], caos[0]),
+            (meshes[0], caos[-1]),
+            (meshes[len(meshes) // 2], caos[len(caos) // 2]),
+        ]
+        pm_times = zeros(len(pm_samples))
+        aliases = self.potential.pppm_aliases.copy()
+        self.potential.pppm_aliases = array([0, 0, 0], dtype=int64)
+        for ism, (mesh, cao) in enumerate(pm_samples):
+            self.potential.pppm_mesh = mesh * array([1, 1, 1], dtype=int64)
+            self.potential.pppm_cao = cao * array([1, 1, 1], dtype=int64)
+            self.potential.pppm_setup()
+            self.potential.update_pm(self.particles)
+            self.timer.start()
+            for _ in range(loops):
+                self.potential.update_pm(self.particles)
+            pm_times[ism] = self.timer.stop() * 1.0e-9 / loops
+        self.potential.pppm_aliases = aliases
+
+        pp_basis = array([ones(len(cells)), num_ptcls**2 / cells**3.0]).transpose()
+        pm_basis = array(
+            [[1.0, num_ptcls * cao**3.0, mesh**3.0 * log2(mesh**3.0)] for mesh, cao in pm_samples], dtype=float
+        )
+        # Normalize the columns for a well conditioned fit
+        pp_norm, pm_norm = pp_basis.max(axis=0), pm_basis.max(axis=0)
+        pp_coeffs = nnls(pp_basis / pp_norm, pp_times)[0] / pp_norm
+        pm_coeffs = nnls(pm_basis / pm_norm, pm_times)[0] / pm_norm
+
+        return pp_coeffs, pm_coeffs
+
+    def predict_pppm_time(self, pp_coeffs, pm_coeffs, cells, mesh_points, cao):
+        """
+        Predict the time of the PPPM acceleration with the cost models of :meth:`fit_pppm_cost_model`.
+
+        Parameters
+        ----------
+        pp_coeffs : numpy.ndarray
+            Coefficients of the PP cost model in seconds.
+
+        pm_coeffs : numpy.ndarray
+            Coefficients of the PM cost model in seconds.
+
+        cells : int, numpy.ndarray
+            Number of cells per dimension.
+
+        mesh_points : int, numpy.ndarray
+            Total number of mesh points.
+
+        cao : int, numpy.ndarray
+            Charge assignment order.
+
+        Returns
+        -------
+        : float, numpy.ndarray
+            Predicted time in seconds. The arrays are broadcast against each other.
+
+        """
+        num_ptcls = self.parameters.total_num_ptcls
+        pp_time = pp_coeffs[0] + pp_coeffs[1] * num_ptcls**2 / cells**3.0
+        pm_time = pm_coeffs[0] + pm_coeffs[1] * num_ptcls * cao**3.0 + pm_coeffs[2] * mesh_points * log2(mesh_points)
+
+        return pp_time + pm_time
+
     def green_function_timer(self):
         """Time Potential setup."""
 
@@ -740,6 +1035,8 @@ class PreProcess(Process):
         """
         Make a dual plot of the fitted functions.
         """
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(1, 2, figsize=(12, 7))
         ax[0].plot(pm_xdata, pm_times.mean(axis=-1), "o", label="Measured times")
         # ax[0].plot(pm_xdata, quadratic(pm_xdata, *pm_opt), '--r', label="Fit $f(x) = a + b x + c x^2$")
@@ -807,6 +1104,9 @@ class PreProcess(Process):
 
     def make_lagrangian_plot(self):
         "TODO: complete this."
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import LogNorm
+
         c_mesh, m_mesh = meshgrid(self.pp_cells, self.pm_meshes)
         fig = plt.figure()
         ax = fig.add_subplot(111)  # projection='3d')
@@ -848,6 +1148,8 @@ class PreProcess(Process):
             Force error matrix.
 
         """
+        import matplotlib.pyplot as plt
+
         # Plot the results
         fig_path = self.pppm_plots_dir
 
@@ -904,6 +1206,9 @@ class PreProcess(Process):
         total_force_error: numpy.ndarray
             Force error matrix.
         """
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import LogNorm
+
         # Plot the results
         fig_path = self.pppm_plots_dir
 
@@ -936,7 +1241,7 @@ class PreProcess(Process):
         fig.tight_layout()
         fig.savefig(join(fig_path, "ClrMap_ForceError_" + self.io.job_id + ".png"))
 
-    def make_timing_plots(self, data_df: DataFrame = None):
+    def make_timing_plots(self, data_df: "DataFrame" = None):
         """
         Makes a figure with three subplots of the CPU times vs PPPM parameters.\n
         The first plot is PP acc time vs the number of cells at different Mesh sizes.\n
@@ -952,6 +1257,9 @@ class PreProcess(Process):
             :meth:`sarkas.processes.PreProcess.timing_study_calculation` to calculate the data. Default is `None`.
 
         """
+        import matplotlib.pyplot as plt
+        from pandas import read_csv
+        from seaborn import scatterplot
 
         if not data_df:
             try:
@@ -982,7 +1290,7 @@ class PreProcess(Process):
 
         print(f"\nFigures can be found in {self.pppm_plots_dir}")
 
-    def make_force_v_timing_plot(self, data_df: DataFrame = None):
+    def make_force_v_timing_plot(self, data_df: "DataFrame" = None):
         """Make contour maps of the force error and total acc time as functions of LCL cells and PM meshes for each
         charge assignment order sequence.
 
@@ -993,6 +1301,10 @@ class PreProcess(Process):
             :meth:`sarkas.processes.PreProcess.timing_study_calculation` to calculate the data. Default is `None`.
 
         """
+        import matplotlib.pyplot as plt
+        from matplotlib.cm import get_cmap, ScalarMappable
+        from matplotlib.colors import LogNorm
+        from pandas import read_csv
         from scipy.interpolate import griddata
 
         fig_path = self.pppm_plots_dir
@@ -1074,6 +1386,181 @@ class PreProcess(Process):
             ax2.set(xlabel="Mesh size", title=f"Timing Map @ cao = {cao}")
             fig.savefig(join(fig_path, f"ForceErrorMap_v_Timing_cao_{cao}_{self.io.job_id}.png"))
 
+    def optimize_pppm(self, force_error: float = None, loops: int = 3, no_alphas: int = 64, no_checks: int = 5):
+        """
+        Choose the PPPM parameters that minimize the predicted time of the acceleration under a force error target and
+        write them to a tuned YAML input file, see :meth:`write_tuned_input`.
+
+        The time of each combination of cells, mesh and cao is predicted by the cost model of
+        :meth:`fit_pppm_cost_model`. The cutoff radius is the side of the cells. The force error of each combination of
+        Ewald parameter, cutoff, mesh and cao is estimated with the analytic approximations of :cite:`Dharuman2017`,
+        :func:`sarkas.utilities.maths.force_error_analytic_pp` and
+        :func:`sarkas.utilities.maths.force_error_approx_pm`, plus the error of the approximation of erfc,
+        :func:`sarkas.utilities.maths.force_error_approx_erfc`, if the precision of the potential is `"fast"`. The PM
+        error is the root mean square of the errors of the mesh spacings of the three axes. The ``no_checks`` fastest
+        combinations below the target are checked in order with the PM error of the optimized Green's function, see
+        :meth:`sarkas.potentials.core.Potential.pppm_setup`, and the first one below the target is chosen.
+
+        The input parameters are a candidate too. If their force error is below the target, only the combinations
+        predicted to be faster are checked and, if none of them is below the target, the input parameters are kept and
+        the tuned input file is not written.
+
+        Parameters
+        ----------
+        force_error : float, optional
+            Target of the total force error. Default = ``None``, the force error of the input parameters.
+
+        loops : int
+            Number of timed calls of each sample of the cost model. Default = 3.
+
+        no_alphas : int
+            Number of Ewald parameters in the search, log-spaced so that :math:`1 \\leq \\alpha r_c - \\kappa/2\\alpha
+            \\leq 5`. Combinations with :math:`\\alpha r_c - \\kappa/2\\alpha < 1` are excluded since the approximation
+            of the PP error does not hold. Default = 64.
+
+        no_checks : int
+            Maximum number of combinations checked with the optimized Green's function. Default = 5.
+
+        Returns
+        -------
+        tuned_input_file : str
+            Path to the tuned YAML input file. ``None`` if the input parameters are kept.
+
+        """
+        if self.potential.method != "pppm" or self.potential.type not in ["coulomb", "yukawa", "qsp"]:
+            raise ValueError("The PPPM optimizer is available only for the coulomb, yukawa and qsp potentials with pppm.")
+
+        print("\n\n{:=^70} \n".format(" PPPM Optimization "))
+
+        input_rc = self.potential.rc
+        input_mesh = self.potential.pppm_mesh.copy()
+        input_alpha = self.potential.pppm_alpha_ewald
+        input_cao = self.potential.pppm_cao.copy()
+        # Force error of the input parameters with the optimized Green's function
+        input_error = self.potential.force_error
+        if force_error is None:
+            force_error = input_error
+
+        num_ptcls = self.parameters.total_num_ptcls
+        a_ws = self.parameters.a_ws
+        box_lengths = self.potential.box_lengths
+        min_length = box_lengths[box_lengths > 0.0].min()
+        # Same range of cells as the timing study
+        max_cells = int(0.5 * min_length / a_ws)
+        if max_cells != self.pp_cells[-1]:
+            self.pp_cells = arange(3, max(max_cells, 4), dtype=int64)
+
+        pp_coeffs, pm_coeffs = self.fit_pppm_cost_model(loops=loops)
+
+        # Error models. Axes: alpha, cells, cao, mesh
+        rcuts = min_length / self.pp_cells
+        kappa = 1.0 / self.potential.screening_length if self.potential.type == "yukawa" else 0.0
+        # Range of 1 <= alpha r_c - kappa / (2 alpha) <= 5
+        alpha_min = (1.0 + sqrt(1.0 + 2.0 * kappa * rcuts.max())) / (2.0 * rcuts.max())
+        alpha_max = (5.0 + sqrt(25.0 + 2.0 * kappa * rcuts.min())) / (2.0 * rcuts.min())
+        alphas = logspace(log10(alpha_min), log10(alpha_max), no_alphas)
+        rescaling_constant = sqrt(num_ptcls) * a_ws**2 / sqrt(self.potential.pbox_volume)
+        pp_errors = force_error_analytic_pp(
+            self.potential.type, rcuts[None, :], self.potential.screening_length, alphas[:, None], rescaling_constant
+        )
+        # The approximation is the asymptotic expansion of erfc(alpha r_c - kappa / (2 alpha))
+        pp_errors = where(alphas[:, None] * rcuts[None, :] - 0.5 * kappa / alphas[:, None] >= 1.0, pp_errors, inf)
+        if self.potential.precision == "fast":
+            approx_errors = force_error_approx_erfc(
+                self.potential.type,
+                rcuts[None, :],
+                self.potential.screening_length,
+                alphas[:, None],
+                self.potential.a_rs,
+                rescaling_constant,
+            )
+            pp_errors = sqrt(pp_errors**2 + approx_errors**2)
+        # Mesh spacings of each axis in units of a_ws. Axes: dimension, mesh
+        h_a = box_lengths[box_lengths > 0.0, None] / self.pm_meshes[None, :] / a_ws
+        pm_errors = zeros((no_alphas, len(self.pm_caos), len(self.pm_meshes)))
+        for ia, alpha in enumerate(alphas):
+            for ic, cao in enumerate(self.pm_caos):
+                pm_errors[ia, ic] = sqrt(mean(force_error_approx_pm(kappa * a_ws, cao, h_a, alpha * a_ws) ** 2, axis=0))
+        pm_errors *= sqrt(self.parameters.total_num_density * a_ws**3)
+
+        total_errors = sqrt(pp_errors[:, :, None, None] ** 2 + pm_errors[:, None, :, :] ** 2)
+        total_times = self.predict_pppm_time(
+            pp_coeffs,
+            pm_coeffs,
+            self.pp_cells[None, :, None, None],
+            self.pm_meshes[None, None, None, :] ** 3.0,
+            self.pm_caos[None, None, :, None],
+        )
+        total_times = where(total_errors <= force_error, total_times, inf)
+
+        input_cells = max(int(min_length / input_rc), 1)
+        input_time = self.predict_pppm_time(pp_coeffs, pm_coeffs, input_cells, input_mesh.prod(), input_cao[0])
+
+        if not isfinite(total_times).any() and input_error > force_error:
+            raise ValueError(f"No combination of the PPPM parameters has a force error below {force_error:.4e}.")
+
+        # Check the fastest combinations with the force error of the optimized Green's function. None is the input.
+        chosen = None
+        most_accurate = (None, input_error)
+        for index in argsort(total_times, axis=None)[:no_checks]:
+            ia, icell, icao, imesh = unravel_index(index, total_times.shape)
+            if not isfinite(total_times[ia, icell, icao, imesh]):
+                break
+            # Only the combinations faster than the input are an improvement
+            if input_error <= force_error and total_times[ia, icell, icao, imesh] >= input_time:
+                break
+            self.potential.rc = rcuts[icell]
+            self.potential.pppm_alpha_ewald = alphas[ia]
+            self.potential.pppm_mesh = self.pm_meshes[imesh] * array([1, 1, 1], dtype=int64)
+            self.potential.pppm_cao = self.pm_caos[icao] * array([1, 1, 1], dtype=int64)
+            self.potential.pot_update_params(self.potential)
+            self.potential.pppm_setup()
+            if self.potential.force_error <= force_error:
+                chosen = (ia, icell, icao, imesh)
+                break
+            if self.potential.force_error < most_accurate[1]:
+                most_accurate = ((ia, icell, icao, imesh), self.potential.force_error)
+
+        if chosen is None and input_error > force_error:
+            warn(
+                f"\nNone of the fastest combinations has a force error below {force_error:.4e}. "
+                f"The most accurate one is chosen.",
+                category=RuntimeWarning,
+            )
+            chosen = most_accurate[0]
+
+        tuned_input_file = None
+        print(f"\nForce error target = {force_error:.4e}")
+        if chosen is None:
+            print(
+                f"Predicted acceleration time of the input = {input_time:.4e} [s]\n"
+                "No improvement was found: none of the faster combinations has a force error below the target. "
+                "The input parameters are kept and the tuned input file is not written."
+            )
+        else:
+            ia, icell, icao, imesh = chosen
+            self.potential.rc = rcuts[icell]
+            self.potential.pppm_alpha_ewald = alphas[ia]
+            self.potential.pppm_mesh = self.pm_meshes[imesh] * array([1, 1, 1], dtype=int64)
+            self.potential.pppm_cao = self.pm_caos[icao] * array([1, 1, 1], dtype=int64)
+            self.potential.pot_update_params(self.potential)
+            self.potential.pppm_setup()
+
+            self.io.timing_study(self)
+            print(f"Predicted acceleration time: input = {input_time:.4e} [s], tuned = {total_times[chosen]:.4e} [s]")
+
+            tuned_input_file = self.write_tuned_input()
+            print(f"The tuned input file is saved in {tuned_input_file}")
+
+        # Reset the original values.
+        self.potential.rc = input_rc
+        self.potential.pppm_mesh = input_mesh
+        self.potential.pppm_alpha_ewald = input_alpha
+        self.potential.pppm_cao = input_cao
+        self.potential.setup(self.parameters, self.species)
+
+        return tuned_input_file
+
     def postproc_estimates(self):
 
         # POST- PROCESSING
@@ -1158,6 +1645,7 @@ class PreProcess(Process):
         timing: bool = True,
         timing_study: bool = False,
         pppm_estimate: bool = False,
+        pppm_optimize: bool = False,
         postprocessing: bool = False,
         remove: bool = False,
     ):
@@ -1178,6 +1666,9 @@ class PreProcess(Process):
         pppm_estimate : bool
             Flag for showing the force error plots in case of pppm algorithm.
 
+        pppm_optimize : bool
+            Flag for choosing the PPPM parameters with :meth:`optimize_pppm`. Default = False.
+
         postprocessing : bool
             Flag for calculating Post processing parameters.
 
@@ -1185,6 +1676,7 @@ class PreProcess(Process):
             Flag for removing energy files and dumps created during times estimation. Default = False.
 
         """
+        import matplotlib.pyplot as plt
 
         # Clean everything
         plt.close("all")
@@ -1208,6 +1700,9 @@ class PreProcess(Process):
             self.make_force_v_timing_plot()
             print(f"\nFigures can be found in {self.pppm_plots_dir}")
 
+        if pppm_optimize:
+            self.optimize_pppm()
+
         if postprocessing:
             self.postproc_estimates()
 
@@ -1383,6 +1878,7 @@ class PreProcess(Process):
 
     def timing_study_calculation(self):
         """Estimate the best number of mesh points and cutoff radius."""
+        from pandas import DataFrame
 
         self.pppm_plots_dir = join(self.io.preprocessing_dir, "PPPM_Plots")
         if not exists(self.pppm_plots_dir):
@@ -1447,8 +1943,20 @@ class PreProcess(Process):
                         rescaling_constant,
                     )
 
+                    if self.potential.precision == "fast":
+                        self.potential.pppm_approx_err = force_error_approx_erfc(
+                            self.potential.type,
+                            self.potential.rc,
+                            self.potential.screening_length,
+                            self.potential.pppm_alpha_ewald,
+                            self.potential.a_rs,
+                            rescaling_constant,
+                        )
+
                     # Note: the PM error does not depend on rc. Only on alpha and it is given by G_k
-                    self.potential.force_error = sqrt(self.potential.pppm_pp_err**2 + self.potential.pppm_pm_err**2)
+                    self.potential.force_error = sqrt(
+                        self.potential.pppm_pp_err**2 + self.potential.pppm_pm_err**2 + self.potential.pppm_approx_err**2
+                    )
 
                     # The PP acceleration does not depend on cao.
                     # However, it still needs to be in its loop for updating the dataframe.
@@ -1620,6 +2128,44 @@ class PreProcess(Process):
         #                    self.timer.time_division(self.predicted_times * (self.parameters.equilibration_steps
         #                                                                     + self.parameters.production_steps)))
 
+    def write_tuned_input(self, filename: str = None):
+        """
+        Write a copy of the YAML input file with the current cutoff radius, Ewald parameter, mesh and cao of the
+        potential.
+
+        Parameters
+        ----------
+        filename : str, optional
+            Path of the tuned input file. Default = ``<input name>_tuned.yaml`` in the preprocessing directory.
+
+        Returns
+        -------
+        filename : str
+            Path of the tuned input file.
+
+        """
+        if filename is None:
+            input_name = splitext(basename(self.input_file))[0]
+            filename = join(self.io.preprocessing_dir, f"{input_name}_tuned.yaml")
+
+        with open(self.input_file, "r") as stream:
+            dics = yaml.load(stream, Loader=yaml.FullLoader)
+
+        dics["Potential"].update(
+            {
+                "method": "pppm",
+                "rc": float(self.potential.rc),
+                "pppm_alpha_ewald": float(self.potential.pppm_alpha_ewald),
+                "pppm_mesh": [int(m) for m in self.potential.pppm_mesh],
+                "pppm_cao": [int(p) for p in self.potential.pppm_cao],
+            }
+        )
+
+        with open(filename, "w") as stream:
+            yaml.dump(dics, stream, sort_keys=False)
+
+        return filename
+
 
 class Simulation(Process):
     """
@@ -1719,14 +2265,40 @@ class Simulation(Process):
 
         it_start = self.check_restart(phase="production")
 
+        if it_start and self.accumulators:
+            # The samples before the restart are lost and finalize would overwrite the output of the previous run
+            warn(
+                "\nThe observables calculated on the fly cannot be resumed in a production restart. "
+                "They will be calculated from the dumps in the post-processing.",
+                category=AlgorithmWarning,
+            )
+            self.accumulators = []
+
         self.integrator.update = self.integrator.type_setup(self.integrator.production_type)
         # Update measurement flag for rdf.
-        self.potential.measure = True
+        self.potential.measure = self.parameters.rdf_in_loop
+
+        for acc in self.accumulators:
+            acc.setup(self.parameters, phase="production")
+            acc.init_on_the_fly()
+        if self.accumulators:
+            from .tools.observables import Observable, share_kt_data
+
+            # In-situ Fourier space observables with the same k-space setup calculate n(k,t) and v(k,t) only once
+            share_kt_data([acc for acc in self.accumulators if isinstance(acc, Observable)])
+        # The starting configuration is the first sample, as it is the first dump
+        for acc in self.accumulators:
+            acc.sample(self.particles, it_start)
+
         self.timer.start()
         self.evolve("production", False, it_start, self.parameters.production_steps, self.parameters.prod_dump_step)
         time_eq = self.timer.stop()
         self.io.time_stamp("Production", self.timer.time_division(time_eq))
 
+        # Save the observables calculated on the fly
+        for acc in self.accumulators:
+            acc.finalize()
+
     def run(self) -> None:
         """Run the simulation."""
         time0 = self.timer.current()
@@ -0,0 +1,40 @@
+import json
+from os.path import join
+
+from ..bench import main
+
+
+def test_bench_smoke(tmp_path):
+    """Run the benchmark suite on a tiny system and check the content of the JSON file."""
+    output = join(tmp_path, "bench.json")
+    main(
+        [
+            "--systems",
+            "yocp",
+            "--kernels",
+            "pp",
+            "integrator",
+            "dump",
+            "--num_ptcls",
+            "128",
+            "--repeats",
+            "1",
+            "--dumps",
+            "2",
+            "--output",
+            output,
+        ]
+    )
+
+    with open(output, "r") as f:
+        data = json.load(f)
+
+    assert {"sarkas", "python", "numpy", "numba", "numba_num_threads"} <= set(data["metadata"].keys())
+    assert {res["kernel"] for res in data["results"]} == {"pp", "integrator", "dump"}
+    for res in data["results"]:
+        assert res["system"] == "yocp"
+        assert res["num_ptcls"] == 128
+        # The dump kernel times each dump
+        assert res["repeats"] == (2 if res["kernel"] == "dump" else 1)
+        assert res["time_min_s"] > 0.0
+        assert res["ns_per_particle_step"] > 0.0
@@ -0,0 +1,20 @@
+import json
+import subprocess
+import sys
+from os.path import abspath, dirname, join
+
+# Modules that sarkas.processes must load only when they are needed
+LAZY_MODULES = ["fmm3dpy", "h5py", "matplotlib", "tables", "sarkas.tools.observables"]
+
+
+def test_processes_lazy_imports():
+    """Test that importing sarkas.processes does not load plotting, FMM, HDF and postprocessing modules."""
+    code = (
+        "import json, sys\n"
+        "import sarkas.processes\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES} if m in sys.modules]))"
+    )
+    # Run from the directory containing the package also when it is not installed
+    root = abspath(join(dirname(__file__), "..", ".."))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root).stdout
+    assert json.loads(out.splitlines()[-1]) == []
@@ -0,0 +1,31 @@
+import pytest
+from os.path import join
+
+from ..precompile import main, potential_types, precompile
+
+
+def test_precompile(capsys):
+    """Compile the kernels of a potential and check that the time of each step is printed."""
+    precompile(["yukawa"])
+    out = capsys.readouterr().out
+    assert "modules:" in out
+    assert "yukawa:" in out
+
+
+def test_precompile_unknown():
+    """Test that an unknown potential type raises an error before compiling."""
+    with pytest.raises(ValueError):
+        precompile(["yukawa", "unknown"], verbose=False)
+
+
+def test_precompile_main(tmp_path, capsys):
+    """Test that the potentials of the command line and of the input files are compiled once."""
+    input_file = join(tmp_path, "input.yaml")
+    with open(input_file, "w") as f_yaml:
+        f_yaml.write("Potential:\n    type: Coulomb\n    method: pppm\n")
+
+    assert potential_types([input_file]) == ["coulomb"]
+    main(["coulomb", "lj", "-i", input_file])
+    out = capsys.readouterr().out
+    assert out.count("coulomb:") == 1
+    assert out.count("lj:") == 1
@@ -0,0 +1,104 @@
+from numpy import array, int64
+from os.path import join
+
+from ..processes import PreProcess
+
+# Small Yukawa OCP with PPPM parameters more accurate, and slower, than needed
+TINY_PPPM_INPUT = """
+Particles:
+    - Species:
+        name: H
+        num: 512
+        Z: 1.0
+        number_density: 1.62e+32
+        mass: 1.673e-27
+        temperature_eV: 0.5
+
+Potential:
+    type: Yukawa
+    screening_length_type: "thomas-fermi"
+    electron_temperature_eV: 1.25e+3
+    method: pppm
+    rc: 5.0e-11
+    pppm_mesh: [32, 32, 32]
+    pppm_aliases: [3, 3, 3]
+    pppm_cao: 6
+    pppm_alpha_ewald: 7.0e+10
+
+Integrator:
+    type: verlet
+    dt: 2.000e-18
+    thermalization: no
+    boundary_conditions: periodic
+
+Parameters:
+    units: mks
+    load_method: random_no_reject
+    rand_seed: 42
+    equilibration_steps: 2
+    production_steps: 2
+    eq_dump_step: 1
+    prod_dump_step: 1
+
+IO:
+    verbose: no
+    simulations_dir: {simulations_dir}
+    job_dir: tiny_pppm
+
+Observables:
+  - Thermodynamics:
+      phase: production
+"""
+
+
+def test_optimize_pppm(tmp_path):
+    """Test that the tuned PPPM parameters meet the force error target and are predicted to be faster."""
+    input_file = join(tmp_path, "tiny_pppm.yaml")
+    with open(input_file, "w") as f_yaml:
+        f_yaml.write(TINY_PPPM_INPUT.format(simulations_dir=join(tmp_path, "Simulations")))
+
+    force_error = 1.0e-04
+    preproc = PreProcess(input_file)
+    preproc.setup(read_yaml=True)
+    preproc.pm_meshes = array([8, 12, 16, 24, 32], dtype=int64)
+
+    # Keep the fitted coefficients to compare the predicted times
+    fit_pppm_cost_model = preproc.fit_pppm_cost_model
+    coeffs = []
+
+    def fit_and_keep(loops):
+        coeffs.append(fit_pppm_cost_model(loops=loops))
+        return coeffs[-1]
+
+    preproc.fit_pppm_cost_model = fit_and_keep
+
+    input_rc = preproc.potential.rc
+    input_mesh = preproc.potential.pppm_mesh.copy()
+    input_cao = preproc.potential.pppm_cao[0]
+    input_error = preproc.potential.force_error
+    tuned_input_file = preproc.optimize_pppm(force_error=force_error, loops=1)
+
+    # The potential of the input is restored
+    assert preproc.potential.rc == input_rc
+    assert (preproc.potential.pppm_mesh == input_mesh).all()
+
+    if tuned_input_file is None:
+        # No improvement, the input is kept
+        assert input_error <= force_error
+        return
+
+    tuned = PreProcess(tuned_input_file)
+    tuned.setup(read_yaml=True)
+    assert tuned.potential.force_error <= force_error
+
+    pp_coeffs, pm_coeffs = coeffs[0]
+    min_length = preproc.potential.box_lengths.min()
+    input_time = preproc.predict_pppm_time(pp_coeffs, pm_coeffs, int(min_length / input_rc), input_mesh.prod(), input_cao)
+    tuned_time = preproc.predict_pppm_time(
+        pp_coeffs,
+        pm_coeffs,
+        round(min_length / tuned.potential.rc),
+        tuned.potential.pppm_mesh.prod(),
+        tuned.potential.pppm_cao[0],
+    )
+    assert tuned_time <= input_time
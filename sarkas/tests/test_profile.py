@@ -0,0 +1,140 @@
+import json
+from numpy import isclose
+from os.path import exists, join
+
+from ..processes import Simulation
+
+# Small Yukawa OCP with PP profiled in both phases
+TINY_PROFILE_INPUT = """
+Particles:
+    - Species:
+        name: H
+        num: 64
+        Z: 1.0
+        number_density: 1.62e+30
+        mass: 1.673e-27
+        temperature_eV: 0.5
+
+Potential:
+    type: Yukawa
+    screening_length_type: "thomas-fermi"
+    electron_temperature_eV: 10.0
+    method: pp
+    rc: 1.0e-10
+
+Integrator:
+    type: verlet
+    dt: 1.0e-17
+    thermostat_type: Berendsen
+    thermalization_timestep: 0
+    berendsen_tau: 10.0
+    boundary_conditions: periodic
+
+Parameters:
+    units: mks
+    load_method: random_no_reject
+    rand_seed: 42
+    equilibration_steps: 10
+    production_steps: 20
+    eq_dump_step: 5
+    prod_dump_step: 2
+    profile: yes
+
+IO:
+    verbose: no
+    simulations_dir: {simulations_dir}
+    job_dir: tiny_profile
+    job_id: tiny
+
+Observables:
+  - Thermodynamics:
+      phase: production
+"""
+
+
+def test_profile_json(tmp_path):
+    """Test the keys and the counters of the JSON files of the profiled phases."""
+    input_file = join(tmp_path, "tiny_profile.yaml")
+    with open(input_file, "w") as f_yaml:
+        f_yaml.write(TINY_PROFILE_INPUT.format(simulations_dir=join(tmp_path, "Simulations")))
+
+    sim = Simulation(input_file)
+    sim.setup(read_yaml=True)
+    sim.run()
+
+    for phase, steps, dump_step in [("equilibration", 10, 5), ("production", 20, 2)]:
+        fldr = sim.io.equilibration_dir if phase == "equilibration" else sim.io.production_dir
+        filename = join(fldr, phase.capitalize() + "Profile_tiny.json")
+        assert exists(filename)
+        with open(filename, "r") as f:
+            data = json.load(f)
+
+        assert set(data.keys()) == {"phase", "timesteps", "num_ptcls", "time_s", "ns_per_particle_step", "sections"}
+        assert data["phase"] == phase
+        assert data["timesteps"] == steps
+        assert data["num_ptcls"] == 64
+        assert data["time_s"] > 0.0
+
+        sections = data["sections"]
+        for sec in sections.values():
+            assert set(sec.keys()) == {
+                "calls",
+                "time_s",
+                "time_per_call_us",
+                "parent",
+                "depth",
+                "percentage",
+                "percentage_of_total",
+            }
+        # PP only, the PP and PM parts of PPPM are not timed
+        assert set(sections.keys()) == {
+            "Integrator",
+            "Accelerations",
+            "Boundary Conditions",
+            "Drift and Kick",
+            "Thermostat",
+            "Dump",
+            "Other",
+        }
+        assert sections["Integrator"]["calls"] == steps
+        assert sections["Accelerations"]["calls"] == steps
+        assert sections["Boundary Conditions"]["calls"] == steps
+        # The thermostat is applied only in the equilibration
+        assert sections["Thermostat"]["calls"] == (steps if phase == "equilibration" else 0)
+        # The dump of the initial state is saved before the loop
+        assert sections["Dump"]["calls"] == steps // dump_step
+
+        assert sections["Accelerations"]["parent"] == "Integrator"
+        assert sections["Accelerations"]["depth"] == 1
+        assert sections["Integrator"]["parent"] is None
+        assert sections["Integrator"]["depth"] == 0
+
+        # Without threading the top level sections add up to the total
+        top = [sec["percentage"] for sec in sections.values() if sec["depth"] == 0]
+        assert isclose(sum(top), 100.0)
+        children = [sec["percentage"] for sec in sections.values() if sec["parent"] == "Integrator"]
+        assert isclose(sum(children), 100.0)
+
+
+def test_profile_threading(tmp_path):
+    """Test that the dumps saved by other threads are not timed."""
+    input_file = join(tmp_path, "tiny_profile.yaml")
+    with open(input_file, "w") as f_yaml:
+        f_yaml.write(
+            TINY_PROFILE_INPUT.format(simulations_dir=join(tmp_path, "Simulations")).replace(
+                "    profile: yes\n", "    profile: yes\n    threading: yes\n"
+            )
+        )
+
+    sim = Simulation(input_file)
+    sim.setup(read_yaml=True)
+    assert sim.parameters.threading
+    sim.run()
+
+    with open(join(sim.io.production_dir, "ProductionProfile_tiny.json"), "r") as f:
+        sections = json.load(f)["sections"]
+
+    assert "Dump" not in sections
+    assert sections["Integrator"]["calls"] == 20
+    top = [sec["percentage"] for sec in sections.values() if sec["depth"] == 0]
+    assert isclose(sum(top), 100.0)
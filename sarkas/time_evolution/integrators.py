@@ -1085,7 +1085,7 @@ class Integrator:
             print(f"exp( - gamma N dt) = 0.001 ==> N = {N:.4f}")
 
 
-@jit(void(float64[:, :], float64[:], float64[:], int64[:], float64), nopython=True)
+@jit(void(float64[:, :], float64[:], float64[:], int64[:], float64), nopython=True, cache=True)
 def berendsen(vel, T_desired, T, species_np, tau):
     """
     Numba'd function to update particle velocity based on Berendsen thermostat :cite:`Berendsen1984`.
@@ -1125,7 +1125,7 @@ def berendsen(vel, T_desired, T, species_np, tau):
         species_start += num
 
 
-@jit(void(float64[:, :], float64[:, :], float64[:]), nopython=True)
+@jit(void(float64[:, :], float64[:, :], float64[:]), nopython=True, cache=True)
 def enforce_pbc(pos, cntr, box_vector) -> None:
     """
     Numba'd function to enforce periodic boundary conditions.
@@ -1157,7 +1157,7 @@ def enforce_pbc(pos, cntr, box_vector) -> None:
                 cntr[p, d] -= 1
 
 
-@jit(void(float64[:, :], float64[:, :], float64[:, :], float64[:], float64[:]), nopython=True)
+@jit(void(float64[:, :], float64[:, :], float64[:, :], float64[:], float64[:]), nopython=True, cache=True)
 def enforce_abc(pos, vel, acc, charges, box_vector) -> None:
     """
     Numba'd function to enforce absorbing boundary conditions.
@@ -1199,7 +1199,7 @@ def enforce_abc(pos, vel, acc, charges, box_vector) -> None:
                 charges[p] = 0.0
 
 
-@jit(void(float64[:, :], float64[:, :], float64[:], float64), nopython=True)
+@jit(void(float64[:, :], float64[:, :], float64[:], float64), nopython=True, cache=True)
 def enforce_rbc(pos, vel, box_vector, dt) -> None:
     """
     Numba'd function to enforce reflecting boundary conditions.
@@ -210,7 +210,7 @@ class Thermostat:
         berendsen(ptcls.vel, self.temperatures, T, self.species_num, self.relaxation_timestep, self.relaxation_rate, it)
 
 
-@jit(void(float64[:, :], float64[:], float64[:], int64[:], int64, float64, int64), nopython=True)
+@jit(void(float64[:, :], float64[:], float64[:], int64[:], int64, float64, int64), nopython=True, cache=True)
 def berendsen(vel, T_desired, T, species_np, therm_timestep, tau, it):
     """
     Numba'd function to update particle velocity based on Berendsen thermostat :cite:`Berendsen1984`.
@@ -8,6 +8,7 @@ __all__ = [
     "DiffusionFlux",
     "DynamicStructureFactor",
     "ElectricCurrent",
+    "MeanSquaredDisplacement",
     "PressureTensor",
     "RadialDistributionFunction",
     "StaticStructureFactor",
@@ -22,6 +23,7 @@ from .observables import (
     DiffusionFlux,
     DynamicStructureFactor,
     ElectricCurrent,
+    MeanSquaredDisplacement,
     Observable,
     PressureTensor,
     RadialDistributionFunction,
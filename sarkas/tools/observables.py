@@ -1,54 +1,82 @@
 """
 Module for calculating physical quantities from Sarkas checkpoints.
 """
-from IPython import get_ipython
+from hashlib import sha256
 
-if get_ipython().__class__.__name__ == "ZMQInteractiveShell":
+from ..utilities.io import in_notebook
+
+if in_notebook():
     from tqdm import tqdm_notebook as tqdm
 else:
     from tqdm import tqdm
 
-import matplotlib.pyplot as plt
 import pandas as pd
-import scipy.stats as scp_stats
-from matplotlib.gridspec import GridSpec
-from numba import njit
+from numba import get_num_threads, njit, prange
 from numpy import append as np_append
 from numpy import (
+    arange,
     argsort,
     array,
+    asarray,
+    ceil,
+    column_stack,
     complex128,
     concatenate,
+    diff,
+    einsum,
     exp,
+    floor,
     format_float_scientific,
+    full,
     histogram,
+    identity,
+    indices,
+    int64,
     isfinite,
+    linspace,
     load,
     log,
+    maximum,
+    nan,
     ndarray,
+    ones,
     pi,
     real,
     repeat,
     savez,
+    sinc,
     sqrt,
     trapz,
+    triu_indices,
     unique,
+    where,
     zeros,
 )
+from numpy.lib.format import open_memmap
+from numpy.lib.stride_tricks import sliding_window_view
 from numpy.polynomial import hermite_e
 from os import listdir, mkdir
-from os import remove as os_remove
+from os import stat as os_stat
 from os.path import exists as os_path_exists
 from os.path import join as os_path_join
 from pandas import concat, DataFrame, HDFStore, MultiIndex, read_csv, read_hdf, Series
 from pickle import dump
 from pickle import load as pickle_load
-from scipy.fft import fft, fftfreq, fftshift
+from scipy.fft import fft, fftfreq, fftn, fftshift, irfft, next_fast_len, rfft
 from scipy.linalg import norm
 from scipy.special import erfc, factorial
-from seaborn import histplot as sns_histplot
 
-from ..utilities.maths import correlationfunction
+from .. import __version__
+from ..potentials.force_pm import calc_charge_dens, calc_mesh_coord, mesh_point_shift
+from ..utilities.maths import (
+    batched_correlationfunction,
+    blocking_analysis,
+    correlationfunction,
+    integrated_autocorrelation_time,
+    mean_squared_displacement,
+    MultipleTauCorrelator,
+)
+from ..utilities.parallel import process_map, SharedArray
 from ..utilities.timing import SarkasTimer
 
 UNITS = [
@@ -177,6 +205,18 @@ class Observable:
     max_k_harmonics : list
         Maximum number of :math:`\\mathbf{k}` harmonics to calculate along each dimension.
 
+    kt_method : str
+        Method for calculating :math:`n(\\mathbf k, t)` and :math:`v(\\mathbf k, t)`. Choices = ["direct", "mesh"].
+        "direct" sums the phase factors of each particle, see :func:`calc_nk_frames`. "mesh" assigns the particles to a
+        mesh and uses an FFT, see :func:`calc_nk_mesh`. Default = "direct".
+
+    kt_cao : int
+        Charge assignment order of the "mesh" method. Default = 7.
+
+    kt_mesh_sizes : numpy.ndarray
+        Number of mesh points in each direction of the "mesh" method. Default = ``None``, i.e. four times the Nyquist
+        limit of ``max_k_harmonics``.
+
     phase : str
         Phase to analyze.
 
@@ -203,11 +243,20 @@ class Observable:
     k_file : str
         Path to the npz file storing the :math:`k` vector values.
 
+    nkt : numpy.ndarray
+        Fourier transform of density fluctuations :math:`n(\\mathbf k, t)`.
+        Shape = (``no_slices``, ``no_species``, ``slice_steps``, ``no_k``).
+
     nkt_hdf_file : str
-        Path to the npy file containing the Fourier transform of density fluctuations. :math:`n(\\mathbf k, t)`.
+        Path to the HDF5 file containing the Fourier transform of density fluctuations. :math:`n(\\mathbf k, t)`.
+
+    vkt : numpy.ndarray
+        Fourier transform of longitudinal and transverse velocity fluctuations :math:`\\mathbf v(\\mathbf k, t)`.
+        Shape = (``no_slices``, 4, ``no_species``, ``slice_steps``, ``no_k``).
 
-    vkt_file : str
-        Path to the npz file containing the Fourier transform of velocity fluctuations. :math:`\\mathbf v(\\mathbf k, t)`.
+    vkt_hdf_file : str
+        Path to the HDF5 file containing the Fourier transform of velocity fluctuations.
+        :math:`\\mathbf v(\\mathbf k, t)`.
 
     k_space_dir : str
         Directory where :math:`\\mathbf {k}` data is stored.
@@ -229,8 +278,79 @@ class Observable:
         If True, `runs` needs be specified. It will collect data from all runs and stored them in a large ndarray to
         be averaged over.
 
+    stream_observable: bool
+        Flag indicating whether the observable can be fed one dump at a time via :meth:`consume` and :meth:`finalize`.
+        See :func:`sarkas.tools.observables.stream_dumps`.
+
+    frame_keys: list
+        Keys of the dump's data needed by :meth:`consume`, e.g. ``["time", "vel"]``.
+
+    on_the_fly: bool
+        Flag for calculating the observable during the production phase from the particles' data, sampled every
+        ``sample_step`` timesteps via :meth:`sample`, instead of reading the dumps. Available for the observables with
+        ``on_the_fly_capable = True``. Default = False.
+
+    on_the_fly_capable: bool
+        Class flag indicating whether the observable can be calculated on the fly. It is checked by
+        :meth:`sarkas.processes.Process.common_parser` when the accumulators are built.
+
+    sample_step: int
+        Number of timesteps between two samples of an on-the-fly observable. Default = None, i.e. every timestep
+        for the observables with a correlator and ``prod_dump_step`` for the others.
+
+    correlator_observable: bool
+        Flag indicating whether the on-the-fly observable correlates its signal with a
+        :class:`sarkas.utilities.maths.MultipleTauCorrelator`, as :class:`ElectricCurrent`, :class:`DiffusionFlux`, and
+        :class:`PressureTensor` do. These define the methods ``correlator_pairs``, ``correlator_signal`` and
+        ``calc_correlator_slice_data``. The other observables treat each sample as a dump and push it to
+        :meth:`consume`.
+
+    correlator_block_length: int
+        Number of samples stored in each level of the on-the-fly correlator. Lags shorter than this are exact.
+        Default = 16.
+
+    correlator_averaging: int
+        Number of samples averaged when passing to the next level of the on-the-fly correlator. Default = 2.
+
+    grab_block_size: int
+        Number of dumps read at once by :meth:`iter_sim_data`. Default = 100.
+
+    grab_dtype: str
+        Data type of the particles' data collected by :meth:`grab_sim_data` and :meth:`iter_sim_data`, e.g.
+        "float32" halves the memory. Default = "float64".
+
+    grab_memmap: bool
+        Flag for storing the array of :meth:`grab_sim_data` in a memory-mapped ``.npy`` file in ``saving_dir``
+        instead of memory. The file is not removed. Default = False.
+
+    resumable: bool
+        Flag indicating whether the observable stores each slice in :attr:`dataframe_slices`
+        (:attr:`dataframe_acf_slices`), hence it can reuse the slices saved by a previous calculation.
+        Fourier space observables reuse the slices of :math:`n(\\mathbf k, t)` and :math:`v(\\mathbf k, t)`.
+
+    resume: bool
+        Flag for reusing the slices saved by a previous calculation whose hashes in the cache manifest match the
+        current ones, see :meth:`cache_manifest`. Only the missing or changed slices are calculated. Default = True.
+
+    cached_slices: list
+        Indices of the slices read from disk instead of being calculated.
+
+    workers: int
+        Number of processes calculating the slices, or reading the runs, in parallel. See :func:`stream_dumps`.
+        Default = 1.
+
+    parallel_slices: bool
+        Flag indicating whether the slices of the observable can be calculated by independent processes, see
+        :func:`stream_slice`. The slices are fed by the base :meth:`consume` and they are stored in new columns of the
+        dataframes or in the arrays of :meth:`slice_arrays`.
+
+    pool_slices: list
+        Indices of the slices calculated by the process pool of :func:`stream_dumps`.
+
     """
 
+    on_the_fly_capable = False
+
     def __init__(self):
         self.postprocessing_dir = None
         self.mag_no_dumps = None
@@ -260,12 +380,46 @@ class Observable:
         self.max_k_harmonics = None
         self.max_aa_ka_value = None
         self.kw_observable = False
+        self.kt_method = "direct"
+        self.kt_cao = 7
+        self.kt_mesh_sizes = None
         self.dim_labels = ["X", "Y", "Z"]
         self.acf_observable = False
+        # Streaming attributes
+        self.stream_observable = False
+        self.frame_keys = ["time"]
+        self.frames_consumed = 0
+        self.nkt_flag = False
+        self.vkt_flag = False
+        self.nkt_stream = False
+        self.vkt_stream = False
+        self.nkt = None
+        self.vkt = None
         self.dataframe = None
         self.dataframe_slices = None
         self.dataframe_acf = None
         self.dataframe_acf_slices = None
+        # On-the-fly attributes
+        self.on_the_fly = False
+        self.sample_step = None
+        self.correlator_observable = False
+        self.correlator_block_length = 16
+        self.correlator_averaging = 2
+        self.samples_taken = 0
+        self.slice_samples = None
+        self.slice_correlator = None
+        # Raw data attributes
+        self.grab_block_size = 100
+        self.grab_dtype = "float64"
+        self.grab_memmap = False
+        # Cache attributes
+        self.resumable = False
+        self.resume = True
+        self.cached_slices = []
+        # Parallel attributes
+        self.workers = 1
+        self.parallel_slices = False
+        self.pool_slices = []
 
     def __repr__(self):
         sortedDict = dict(sorted(self.__dict__.items(), key=lambda x: x[0].lower()))
@@ -289,6 +443,10 @@ class Observable:
         del state["dataframe_slices"]
         del state["dataframe_acf"]
         del state["dataframe_acf_slices"]
+        # The Fourier space data is stored in its own file
+        state["nkt"] = None
+        state["vkt"] = None
+        state["slice_correlator"] = None
 
         return state
 
@@ -298,6 +456,70 @@ class Observable:
         # Restore the previously deleted dataframes.
         self.parse()
 
+    def cache_inputs(self):
+        """Return the inputs the data of each slice depends on.
+
+        Returns
+        -------
+        inputs : dict
+            Code version, dumps, slices boundaries, species, and :math:`k` vectors of Fourier space observables.
+
+        """
+        inputs = {
+            "code_version": __version__,
+            "observable": self.__long_name__,
+            "dump_dir": self.dump_dir,
+            "dump_step": self.dump_step,
+            "slice_steps": self.slice_steps,
+            "dt": self.dt,
+            "dimensions": self.dimensions,
+            "species_num": list(self.species_num),
+            "box_lengths": list(self.box_lengths),
+        }
+        if self.k_observable:
+            inputs["angle_averaging"] = self.angle_averaging
+            inputs["max_k_harmonics"] = list(self.max_k_harmonics)
+            inputs["max_aa_harmonics"] = None if self.max_aa_harmonics is None else list(self.max_aa_harmonics)
+            inputs["kt_method"] = self.kt_method
+            if self.kt_method == "mesh":
+                inputs["kt_mesh_sizes"] = None if self.kt_mesh_sizes is None else list(self.kt_mesh_sizes)
+                inputs["kt_cao"] = self.kt_cao
+
+        return inputs
+
+    def cache_manifest(self):
+        """
+        Hash the inputs of the observable and the dumps of each slice. The hash of a slice changes if the inputs, the
+        dump range, or the size and modification time of any of its dumps change, e.g. after re-running the
+        simulation. Extending the production phase adds new slices without changing the old ones, as long as
+        ``slice_steps`` does not change.
+
+        Returns
+        -------
+        manifest : dict
+            ``"inputs"`` is the hash of :meth:`cache_inputs`. ``"slices"`` is the list of the slices' hashes,
+            ``None`` if a dump is missing.
+
+        """
+        inputs_hash = sha256(repr(sorted(self.cache_inputs().items())).encode()).hexdigest()
+
+        slices = []
+        for isl in range(self.no_slices):
+            slice_hash = sha256(inputs_hash.encode())
+            dumps = range(isl * self.slice_steps, (isl + 1) * self.slice_steps)
+            slice_hash.update(f"{dumps.start}-{dumps.stop}".encode())
+            try:
+                for it in dumps:
+                    dump = it * self.dump_step
+                    dump_stat = os_stat(os_path_join(self.dump_dir, "checkpoint_" + str(dump) + ".npz"))
+                    slice_hash.update(f"{dump_stat.st_size}-{dump_stat.st_mtime_ns}".encode())
+            except FileNotFoundError:
+                slices.append(None)
+                continue
+            slices.append(slice_hash.hexdigest())
+
+        return {"inputs": inputs_hash, "slices": slices}
+
     def calc_k_data(self):
         """Calculate and save Fourier space data."""
 
@@ -350,144 +572,131 @@ class Observable:
             Default = False.
 
         """
-        start_slice = 0
-        end_slice = self.slice_steps * self.dump_step
         if nkt_flag:
-            nkt_dataframe = DataFrame()
+            start_slice = 0
+            end_slice = self.slice_steps * self.dump_step
+            self.nkt = zeros((self.no_slices, self.num_species, self.slice_steps, len(self.k_list)), dtype=complex128)
+            cached_slices = self.kt_cached_slices("nkt") if self.resume else []
             tinit = self.timer.current()
             for isl in range(self.no_slices):
+                if isl in cached_slices:
+                    self.nkt[isl] = self.read_kt_data("nkt", isl)
+                    start_slice += self.slice_steps * self.dump_step
+                    end_slice += self.slice_steps * self.dump_step
+                    continue
                 print("\nCalculating n(k,t) for slice {}/{}.".format(isl + 1, self.no_slices))
-                nkt = calc_nkt(
+                self.nkt[isl] = calc_nkt(
                     self.dump_dir,
                     (start_slice, end_slice, self.slice_steps),
                     self.dump_step,
                     self.species_num,
                     self.k_list,
+                    self.box_lengths,
                     self.verbose,
+                    mesh_sizes=self.kt_mesh_sizes if self.kt_method == "mesh" else None,
+                    cao=self.kt_mesh_cao if self.kt_method == "mesh" else None,
                 )
                 start_slice += self.slice_steps * self.dump_step
                 end_slice += self.slice_steps * self.dump_step
-                # n(k,t).shape = [no_species, time, k vectors]
-
-                slc_column = "slice {}".format(isl + 1)
-                for isp, sp_name in enumerate(self.species_names):
-                    df_columns = [
-                        slc_column + "_{}_k = [{}, {}, {}]".format(sp_name, *self.k_harmonics[ik, :-2].astype(int))
-                        for ik in range(len(self.k_harmonics))
-                    ]
-                    # df_columns = [time_column, *k_columns]
-                    nkt_dataframe = concat([nkt_dataframe, DataFrame(nkt[isp, :, :], columns=df_columns)], axis=1)
-
-            tuples = [tuple(c.split("_")) for c in nkt_dataframe.columns]
-            nkt_dataframe.columns = MultiIndex.from_tuples(tuples, names=["slices", "species", "harmonics"])
-
-            # Sample nkt_dataframe
-            # slices slice 1
-            # species H
-            # harmonics k = [0, 0, 1] | k = [0, 1, 0] | ...
-
-            # Save the data and append metadata
-            if os_path_exists(self.nkt_hdf_file):
-                os_remove(self.nkt_hdf_file)
-
-            hfile = HDFStore(self.nkt_hdf_file, mode="w")
-            hfile.put("nkt", nkt_dataframe)
-            # This metadata is needed to check if I need to recalculate
-            metadata = {
-                "no_slices": self.no_slices,
-                "max_k_harmonics": self.max_k_harmonics,
-                "angle_averaging": self.angle_averaging,
-            }
 
-            hfile.get_storer("nkt").attrs.metadata = metadata
-            hfile.close()
+            self.save_kt_data(nkt=self.nkt)
 
             tend = self.timer.current()
             self.time_stamp("n(k,t) Calculation", self.timer.time_division(tend - tinit))
 
         if vkt_flag:
-            vkt_dataframe = DataFrame()
+            start_slice = 0
+            end_slice = self.slice_steps * self.dump_step
+            self.vkt = zeros(
+                (self.no_slices, 4, self.num_species, self.slice_steps, len(self.k_list)), dtype=complex128
+            )
+            cached_slices = self.kt_cached_slices("vkt") if self.resume else []
             tinit = self.timer.current()
             for isl in range(self.no_slices):
+                if isl in cached_slices:
+                    self.vkt[isl] = self.read_kt_data("vkt", isl)
+                    start_slice += self.slice_steps * self.dump_step
+                    end_slice += self.slice_steps * self.dump_step
+                    continue
                 print(
                     "\nCalculating longitudinal and transverse "
                     "velocity fluctuations v(k,t) for slice {}/{}.".format(isl + 1, self.no_slices)
                 )
-                vkt, vkt_i, vkt_j, vkt_k = calc_vkt(
+                self.vkt[isl] = calc_vkt(
                     self.dump_dir,
                     (start_slice, end_slice, self.slice_steps),
                     self.dump_step,
                     self.species_num,
                     self.k_list,
+                    self.box_lengths,
                     self.verbose,
+                    mesh_sizes=self.kt_mesh_sizes if self.kt_method == "mesh" else None,
+                    cao=self.kt_mesh_cao if self.kt_method == "mesh" else None,
                 )
                 start_slice += self.slice_steps * self.dump_step
                 end_slice += self.slice_steps * self.dump_step
 
-                slc_column = "slice {}".format(isl + 1)
-                for isp, sp_name in enumerate(self.species_names):
-                    df_columns = [
-                        slc_column
-                        + "_Longitudinal_{}_k = [{}, {}, {}]".format(sp_name, *self.k_harmonics[ik, :-2].astype(int))
-                        for ik in range(len(self.k_harmonics))
-                    ]
-                    # df_columns = [time_column, *k_columns]
-                    vkt_dataframe = concat([vkt_dataframe, DataFrame(vkt[isp, :, :], columns=df_columns)], axis=1)
-                    df_columns = [
-                        slc_column
-                        + "_Transverse i_{}_k = [{}, {}, {}]".format(sp_name, *self.k_harmonics[ik, :-2].astype(int))
-                        for ik in range(len(self.k_harmonics))
-                    ]
-                    vkt_dataframe = concat([vkt_dataframe, DataFrame(vkt_i[isp, :, :], columns=df_columns)], axis=1)
-                    df_columns = [
-                        slc_column
-                        + "_Transverse j_{}_k = [{}, {}, {}]".format(sp_name, *self.k_harmonics[ik, :-2].astype(int))
-                        for ik in range(len(self.k_harmonics))
-                    ]
-                    vkt_dataframe = concat([vkt_dataframe, DataFrame(vkt_j[isp, :, :], columns=df_columns)], axis=1)
-
-                    df_columns = [
-                        slc_column
-                        + "_Transverse k_{}_k = [{}, {}, {}]".format(sp_name, *self.k_harmonics[ik, :-2].astype(int))
-                        for ik in range(len(self.k_harmonics))
-                    ]
-                    vkt_dataframe = concat([vkt_dataframe, DataFrame(vkt_k[isp, :, :], columns=df_columns)], axis=1)
-
-            # Full string: slice 1_Longitudinal_He_k = [1, 0, 0]
-            tuples = [tuple(c.split("_")) for c in vkt_dataframe.columns]
-            vkt_dataframe.columns = MultiIndex.from_tuples(tuples, names=["slices", "species", "direction", "harmonics"])
-
-            # Sample nkt_dataframe
-            # slices slice 1
-            # species H
-            # direction Longitudinal/Transverse
-            # harmonics k = [0, 0, 1] | k = [0, 1, 0] | ...
-
-            if os_path_exists(self.vkt_hdf_file):
-                os_remove(self.vkt_hdf_file)
-            # Save the data and append metadata
-            hfile = HDFStore(self.vkt_hdf_file, mode="w")
-            hfile.put("vkt", vkt_dataframe)
-            # This metadata is needed to check if I need to recalculate
-            metadata = {
-                "no_slices": self.no_slices,
-                "max_k_harmonics": self.max_k_harmonics,
-                "angle_averaging": self.angle_averaging,
-            }
-
-            hfile.get_storer("vkt").attrs.metadata = metadata
-            hfile.close()
+            self.save_kt_data(vkt=self.vkt)
 
             tend = self.timer.current()
             self.time_stamp("v(k,t) Calculation", self.timer.time_division(tend - tinit))
 
-            # savez(self.vkt_file + '_slice_' + str(isl) + '.npz',
-            #          longitudinal=vkt,
-            #          transverse_i=vkt_i,
-            #          transverse_j=vkt_j,
-            #          transverse_k=vkt_k,
-            #          max_harmonics=self.max_k_harmonics,
-            #          angle_averaging=self.angle_averaging)
+    def calc_slice_data(self, isl: int, time: ndarray):
+        """Store the :math:`n(\\mathbf k, t)` and :math:`v(\\mathbf k, t)` of a slice streamed via :meth:`consume`.
+
+        Particle observables override this method to calculate their slice data.
+
+        Parameters
+        ----------
+        isl : int
+            Slice index.
+
+        time : numpy.ndarray
+            Time array of the slice.
+
+        """
+        if self.nkt_stream:
+            self.nkt[isl] = self.slice_nkt
+
+        if self.vkt_stream:
+            self.vkt[isl] = self.slice_vkt
+
+    def consume(self, frame: dict):
+        """
+        Push the data of a single dump into the observable's per-slice accumulators.
+
+        Dumps must be consumed in order, starting from the first dump of the phase. When the last dump of a slice is
+        consumed the slice data is calculated by :meth:`calc_slice_data`. Dumps beyond the last slice, or belonging to
+        one of the :attr:`cached_slices` or :attr:`pool_slices`, are ignored.
+
+        Parameters
+        ----------
+        frame : dict
+            Dump's data. It must contain at least the keys in :attr:`frame_keys`.
+
+        """
+        isl, it = divmod(self.frames_consumed, self.slice_steps)
+        self.frames_consumed += 1
+
+        if isl >= self.no_slices or isl in self.cached_slices or isl in self.pool_slices:
+            return
+
+        if it == 0:
+            self.slice_time = zeros(self.slice_steps)
+            self.init_slice_data()
+
+        self.slice_time[it] = frame["time"]
+        self.update_slice_data(frame, it)
+
+        if it == self.slice_steps - 1:
+            if isl == 0 and not self.k_observable:
+                self.dataframe["Time"] = self.slice_time.copy()
+                self.dataframe_slices["Time"] = self.slice_time.copy()
+                if self.acf_observable:
+                    self.dataframe_acf["Time"] = self.slice_time.copy()
+                    self.dataframe_acf_slices["Time"] = self.slice_time.copy()
+
+            self.calc_slice_data(isl, self.slice_time)
 
     def create_dirs_filenames(self):
         # Saving Directory
@@ -518,6 +727,26 @@ class Observable:
                 self.saving_dir, self.__long_name__.replace(" ", "") + "ACF_slices_" + self.job_id + ".h5"
             )
 
+    def finalize(self):
+        """Complete the calculation of an observable whose dumps have been streamed via :meth:`consume`.
+
+        Fourier space observables save the streamed :math:`n(\\mathbf k, t)` and :math:`v(\\mathbf k, t)` and then call
+        ``compute``, which will find them on disk. The other observables average over the slices and save the data.
+
+        """
+        if self.k_observable:
+            self.save_kt_data(
+                nkt=self.nkt if self.nkt_stream else None, vkt=self.vkt if self.vkt_stream else None
+            )
+            self.compute()
+            return
+
+        self.average_slices_data()
+        self.save_hdf()
+
+        tend = self.timer.current()
+        self.time_stamp(self.__long_name__ + " Calculation", self.timer.time_division(tend - self.stream_t0))
+
     def from_dict(self, input_dict: dict):
         """
         Update attributes from input dictionary.
@@ -530,9 +759,134 @@ class Observable:
         """
         self.__dict__.update(input_dict)
 
+    def skip_to_first_slice(self):
+        """Set the counter of consumed dumps to the first dump of the first slice that is neither in
+        :attr:`cached_slices` nor in :attr:`pool_slices`."""
+
+        first_slice = 0
+        while first_slice in self.cached_slices or first_slice in self.pool_slices:
+            first_slice += 1
+        self.frames_consumed = first_slice * self.slice_steps
+
+    def slice_arrays(self):
+        """Return the names of the arrays, whose first axis is the slice, where :meth:`calc_slice_data` stores the
+        data of each slice. The workers of :func:`stream_dumps` write them in shared memory.
+
+        Returns
+        -------
+        names : list
+            Attributes' names.
+
+        """
+        names = []
+        if self.k_observable and self.nkt_stream:
+            names.append("nkt")
+        if self.k_observable and self.vkt_stream:
+            names.append("vkt")
+
+        return names
+
+    def species_samples_start(self):
+        """Return the start index of each species along the last axis of :meth:`grab_sim_data`'s array.
+
+        Each species holds ``runs * inv_dim * species_num`` samples, i.e. the data of each run one after the other.
+
+        """
+        return self.runs * self.inv_dim * self.species_index_start
+
+    def arrange_species_samples(self, data: ndarray, out: ndarray, run: int = 0):
+        """Place the particles' data of a dump in the samples layout of :meth:`grab_sim_data`.
+
+        The particles are species sorted, hence each species is a contiguous slice of ``data``.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            Particles' data of a dump, e.g. velocities. Shape = (``total_num_ptcls``, 3).
+
+        out : numpy.ndarray
+            Array where to store the samples. Shape = (``dim``, ``runs * inv_dim * total_num_ptcls``).
+
+        run : int
+            Index of the run the dump belongs to. Default = 0.
+
+        """
+        samples_start = self.species_samples_start()
+        for sp, sp_num in enumerate(self.species_num):
+            ptcls = data[self.species_index_start[sp] : self.species_index_start[sp + 1], : self.dimensions]
+            start_indx = samples_start[sp] + self.inv_dim * sp_num * run
+            end_indx = start_indx + self.inv_dim * sp_num
+            if self.dimensional_average:
+                # data = ( v1_x, v1_y, v1_z,
+                #          v2_x, v2_y, v2_z,
+                #          ...)
+                # The flatten array would like this
+                # flattened = ( v1_x, v2_x, v3_x, ..., v1_y, v2_y, v3_y, ..., v1_z, v2_z, v3_z, ...)
+                out[0, start_indx:end_indx] = ptcls.flatten("F")
+            else:
+                out[:, start_indx:end_indx] = ptcls.transpose()
+
+    def iter_sim_data(self, pva: str = "vel", block_size: int = None):
+        """Read in particles data in blocks of dumps.
+
+        Only a block of ``grab_block_size`` dumps is in memory at once, hence the consumers can process a long
+        simulation blockwise, see :meth:`VelocityDistribution.compute`.
+
+        Parameters
+        ----------
+        pva : str
+            Key of the data to be collected. Options ["pos", "vel", "acc"], Default = "vel"
+
+        block_size : int, optional
+            Number of dumps in each block. Default = :attr:`sarkas.tools.observables.Observable.grab_block_size`.
+
+        Yields
+        ------
+        time : numpy.ndarray
+            Time of the dumps in the block.
+
+        data : numpy.ndarray
+            Array with shape (``block_size``, :attr:`sarkas.tools.observables.Observable.dim`,
+            ``runs * inv_dim * total_num_ptcls``) and type
+            :attr:`sarkas.tools.observables.Observable.grab_dtype`. See :meth:`grab_sim_data`.
+
+        """
+        if block_size is None:
+            block_size = self.grab_block_size
+
+        no_samples = self.runs * self.inv_dim * self.total_num_ptcls
+        for start in tqdm(range(0, self.no_dumps, block_size), disable=(not self.verbose), desc="Blocks Loop"):
+            stop = min(start + block_size, self.no_dumps)
+            time = zeros(stop - start)
+            data = zeros((stop - start, self.dim, no_samples), dtype=self.grab_dtype)
+            if self.workers > 1 and len(self.dump_dirs_list) > 1:
+                # Each run is read by a worker and stored in its samples of the shared block
+                shared_data = SharedArray(data.shape, data.dtype)
+                state = observable_state(self)
+                tasks = [(state, r, start, stop, pva, shared_data) for r in range(len(self.dump_dirs_list))]
+                time = process_map(read_sim_data_run, tasks, self.workers)[0]
+                yield time, shared_data.close()
+                continue
+
+            # Loop over the runs
+            for r, dump_dir_r in enumerate(self.dump_dirs_list):
+                # Loop over the timesteps
+                for it in range(start, stop):
+                    # Read data from file
+                    datap = load_from_restart(dump_dir_r, int(it * self.dump_step))
+                    self.arrange_species_samples(datap[pva], data[it - start], run=r)
+                    time[it - start] = datap["time"]
+
+            yield time, data
+
     def grab_sim_data(self, pva: str = "vel"):
         """Read in particles data into one large array.
 
+        The array is filled in blocks by :meth:`iter_sim_data`. If
+        :attr:`sarkas.tools.observables.Observable.grab_memmap` is `True` the array is a memory-mapped ``.npy`` file,
+        ``{pva}_data_{job_id}.npy``, in :attr:`sarkas.tools.observables.Observable.saving_dir`. The file is left there
+        as the array is backed by it, remove it, e.g. ``os.remove(data_all.filename)``, once the array is not needed.
+
         Parameters
         ----------
         pva : str
@@ -550,62 +904,239 @@ class Observable:
         `.dim` = 1 if :attr:`sarkas.tools.observables.Observable.dimensional_average = True` otherwise equals the number
         of dimensions, (e.g. 3D : 3) `.runs` is the number of runs to be averaged over. Default = 1. `.inv_dim` is
         the else option of `dim`. If `dim = 1` then `.inv_dim = .dimensions` and viceversa.
-
+        The samples of each species start at :meth:`species_samples_start`.
 
         """
 
-        # Velocity array for storing simulation data
-        data_all = zeros((self.no_dumps, self.dim, self.runs * self.inv_dim * self.total_num_ptcls))
+        shape = (self.no_dumps, self.dim, self.runs * self.inv_dim * self.total_num_ptcls)
+        if self.grab_memmap:
+            data_all = open_memmap(
+                os_path_join(self.saving_dir, f"{pva}_data_{self.job_id}.npy"),
+                mode="w+",
+                dtype=self.grab_dtype,
+                shape=shape,
+            )
+        else:
+            data_all = zeros(shape, dtype=self.grab_dtype)
         time = zeros(self.no_dumps)
 
         print("\nCollecting data from snapshots ...")
-        if self.dimensional_average:
-            # Loop over the runs
-            for r, dump_dir_r in enumerate(tqdm(self.dump_dirs_list, disable=(not self.verbose), desc="Runs Loop")):
-                # Loop over the timesteps
-                for it in tqdm(range(self.no_dumps), disable=(not self.verbose), desc="Timestep Loop"):
-                    # Read data from file
-                    dump = int(it * self.dump_step)
-                    datap = load_from_restart(dump_dir_r, dump)
-                    # Loop over the particles' species
-                    for sp_indx, (sp_name, sp_num) in enumerate(zip(self.species_names, self.species_num)):
-                        # Calculate the correct start and end index for storage
-                        start_indx = self.species_index_start[sp_indx] + self.inv_dim * sp_num * r
-                        end_indx = self.species_index_start[sp_indx] + self.inv_dim * sp_num * (r + 1)
-                        # Use a mask to grab only the selected species and flatten along the first axis
-                        # data = ( v1_x, v1_y, v1_z,
-                        #          v2_x, v2_y, v2_z,
-                        #          v3_x, v3_y, v3_z,
-                        #          ...)
-                        # The flatten array would like this
-                        # flattened = ( v1_x, v2_x, v3_x, ..., v1_y, v2_y, v3_y, ..., v1_z, v2_z, v3_z, ...)
-                        mask = datap["names"] == sp_name
-                        data_all[it, 0, start_indx:end_indx] = datap[pva][mask].flatten("F")
-
-                    time[it] = datap["time"]
-
-        else:  # Dimensional Average = False
-            # Loop over the runs
-            for r, dump_dir_r in enumerate(tqdm(self.dump_dirs_list, disable=(not self.verbose), desc="Runs Loop")):
-                # Loop over the timesteps
-                for it in tqdm(range(self.no_dumps), disable=(not self.verbose), desc="Timestep Loop"):
-                    # Read data from file
-                    dump = int(it * self.dump_step)
-                    datap = load_from_restart(dump_dir_r, dump)
-                    # Loop over the particles' species
-                    for sp_indx, (sp_name, sp_num) in enumerate(zip(self.species_names, self.species_num)):
-                        # Calculate the correct start and end index for storage
-                        start_indx = self.species_index_start[sp_indx] + self.inv_dim * sp_num * r
-                        end_indx = self.species_index_start[sp_indx] + self.inv_dim * sp_num * (r + 1)
-                        # Use a mask to grab only the selected species and transpose the array to put dimensions first
-                        for d in range(self.dimensions):
-                            mask = datap["names"] == sp_name
-                            data_all[it, d, start_indx:end_indx] = datap[pva][mask][:, d]
-
-                    time[it] = datap["time"]
+        start = 0
+        for time_block, data_block in self.iter_sim_data(pva=pva):
+            stop = start + len(time_block)
+            time[start:stop] = time_block
+            data_all[start:stop] = data_block
+            start = stop
 
         return time, data_all
 
+    def init_on_the_fly(self):
+        """Prepare the observable to be fed every ``sample_step`` timesteps of the production phase via :meth:`sample`.
+
+        The phase is divided into ``no_slices`` slices of ``slice_steps * dump_step`` timesteps. Observables with a
+        correlator have a :class:`sarkas.utilities.maths.MultipleTauCorrelator` for each slice, hence only
+        :math:`O(\\log T)` memory is needed to reach lags of :math:`T` timesteps. Their channels are stored also at each
+        ``dump_step`` for the non-ACF dataframes. The other observables use the samples in place of the dumps, see
+        :meth:`setup_init`. Once the phase is over :meth:`finalize` saves the data in the same files as ``compute``.
+
+        Raises
+        ------
+        ValueError
+            If the ``dump_step`` of an observable with a correlator is not a multiple of ``sample_step``.
+
+        """
+        if self.correlator_observable and self.dump_step % self.sample_step:
+            raise ValueError(
+                f"The dump step {self.dump_step} of {self.__long_name__} is not a multiple of "
+                f"the sampling interval {self.sample_step}."
+            )
+
+        self.slice_samples = self.slice_steps * self.dump_step // self.sample_step
+        self.samples_taken = 0
+        self.save_pickle()
+        self.init_stream()
+
+    def init_slice_data(self):
+        """Allocate the arrays storing the :math:`n(\\mathbf k, t)` and :math:`v(\\mathbf k, t)` of a streamed slice.
+
+        Particle observables override this method to allocate their own slice arrays.
+
+        """
+        if self.nkt_stream:
+            self.slice_nkt = zeros((self.num_species, self.slice_steps, len(self.k_list)), dtype=complex128)
+
+        if self.vkt_stream:
+            # Longitudinal, Transverse i, Transverse j, Transverse k
+            self.slice_vkt = zeros((4, self.num_species, self.slice_steps, len(self.k_list)), dtype=complex128)
+
+    def init_stream(self):
+        """Reset the counter of consumed dumps and the timer, and read the :attr:`cached_slices`.
+        Called by :func:`stream_dumps` before the first dump.
+
+        The counter starts at the first dump of the first slice to calculate. :func:`stream_dumps` starts reading
+        from the earliest of these dumps among its observables.
+
+        """
+
+        self.stream_t0 = self.timer.current()
+        self.cached_slices = []
+        self.pool_slices = []
+        use_cache = self.resume and not self.on_the_fly
+
+        if self.k_observable:
+            # Stream only the Fourier space data that is not on disk already.
+            nkt_cached = self.kt_cached_slices("nkt") if self.nkt_flag and use_cache else []
+            vkt_cached = self.kt_cached_slices("vkt") if self.vkt_flag and use_cache else []
+            self.nkt_stream = self.nkt_flag and not (use_cache and self.kt_data_is_current("nkt"))
+            self.vkt_stream = self.vkt_flag and not (use_cache and self.kt_data_is_current("vkt"))
+
+            all_slices = list(range(self.no_slices))
+            self.cached_slices = [
+                isl
+                for isl in all_slices
+                if isl in (nkt_cached if self.nkt_stream else all_slices)
+                and isl in (vkt_cached if self.vkt_stream else all_slices)
+            ]
+            no_k = len(self.k_list)
+            if self.nkt_stream:
+                self.nkt = zeros((self.no_slices, self.num_species, self.slice_steps, no_k), dtype=complex128)
+                for isl in self.cached_slices:
+                    self.nkt[isl] = self.read_kt_data("nkt", isl)
+            if self.vkt_stream:
+                self.vkt = zeros((self.no_slices, 4, self.num_species, self.slice_steps, no_k), dtype=complex128)
+                for isl in self.cached_slices:
+                    self.vkt[isl] = self.read_kt_data("vkt", isl)
+
+        elif self.resumable and use_cache:
+            self.cached_slices = self.read_cached_slices()
+
+        self.skip_to_first_slice()
+
+    def kt_data_is_current(self, key: str):
+        """
+        Check whether the time dependent Fourier space data on disk matches the current k-space setup.
+
+        Parameters
+        ----------
+        key : str
+            Either "nkt" or "vkt".
+
+        Returns
+        -------
+        _ : bool
+            True if the data exists, it was calculated with the same number of slices, and the hashes of all its
+            slices match the current ones, see :meth:`kt_cached_slices`.
+
+        """
+        from tables import open_file as tables_open_file
+
+        try:
+            with tables_open_file(self.nkt_hdf_file if key == "nkt" else self.vkt_hdf_file, mode="r") as h5file:
+                no_slices = h5file.get_node("/", key).attrs.metadata["no_slices"]
+        except (OSError, LookupError, AttributeError):
+            # Missing file, missing node, or file written by an older version of Sarkas
+            return False
+
+        return no_slices == self.no_slices and len(self.kt_cached_slices(key)) == self.no_slices
+
+    def kt_cached_slices(self, key: str):
+        """
+        Find the slices of the time dependent Fourier space data on disk that can be reused.
+
+        Parameters
+        ----------
+        key : str
+            Either "nkt" or "vkt".
+
+        Returns
+        -------
+        cached_slices : list
+            Indices of the slices whose hash in the metadata matches the current one, see :meth:`cache_manifest`.
+
+        """
+        from tables import open_file as tables_open_file
+
+        hdf_file = self.nkt_hdf_file if key == "nkt" else self.vkt_hdf_file
+        try:
+            with tables_open_file(hdf_file, mode="r") as h5file:
+                metadata = h5file.get_node("/", key).attrs.metadata
+            saved_slices = metadata["slice_hashes"]
+        except (OSError, LookupError, AttributeError):
+            # Missing file, missing node, or file written by an older version of Sarkas
+            return []
+
+        current_slices = self.cache_manifest()["slices"]
+        return [
+            isl
+            for isl, slice_hash in enumerate(current_slices[: len(saved_slices)])
+            if slice_hash is not None and slice_hash == saved_slices[isl]
+        ]
+
+    def kt_data_slice(self, key: str, slice_index: int):
+        """
+        Grab one slice of the time dependent Fourier space data. The data in memory is used if it was just calculated,
+        otherwise the slice is read from disk via :meth:`read_kt_data`.
+
+        Parameters
+        ----------
+        key : str
+            Either "nkt" or "vkt".
+
+        slice_index : int
+            Slice index.
+
+        Returns
+        -------
+        kt_data : numpy.ndarray
+            :math:`n(\\mathbf k, t)` or :math:`v(\\mathbf k, t)` of the slice, see :meth:`save_kt_data` for the shape.
+
+        """
+        kt_data = self.nkt if key == "nkt" else self.vkt
+        shape = (self.no_slices, self.num_species, self.slice_steps, len(self.k_list))
+        if key == "vkt":
+            shape = (self.no_slices, 4, *shape[1:])
+
+        if kt_data is not None and kt_data.shape == shape:
+            return kt_data[slice_index]
+
+        return self.read_kt_data(key, slice_index)
+
+    def kt_dataframe(self, key: str = "nkt"):
+        """
+        Create a dataframe view of the time dependent Fourier space data. Rows are time steps.
+
+        Parameters
+        ----------
+        key : str
+            Either "nkt" or "vkt". Default = "nkt".
+
+        Returns
+        -------
+        kt_df : pandas.DataFrame
+            Columns' levels are ``slices``, ``species``, ``harmonics`` for :math:`n(\\mathbf k, t)`, and ``slices``,
+            ``direction``, ``species``, ``harmonics`` for :math:`v(\\mathbf k, t)`.
+
+        """
+        kt_data = self.read_kt_data(key)
+        slices = ["slice {}".format(isl + 1) for isl in range(kt_data.shape[0])]
+        harmonics = ["k = [{}, {}, {}]".format(*hrm[:-2].astype(int)) for hrm in self.k_harmonics]
+
+        if key == "nkt":
+            levels = [slices, self.species_names, harmonics]
+            names = ["slices", "species", "harmonics"]
+        else:
+            levels = [slices, ["Longitudinal", "Transverse i", "Transverse j", "Transverse k"], self.species_names]
+            levels.append(harmonics)
+            names = ["slices", "direction", "species", "harmonics"]
+
+        # Move the time axis first and flatten the others
+        kt_data = kt_data.transpose(kt_data.ndim - 2, *range(kt_data.ndim - 2), kt_data.ndim - 1)
+        kt_df = DataFrame(
+            kt_data.reshape(kt_data.shape[0], -1), columns=MultiIndex.from_product(levels, names=names)
+        )
+
+        return kt_df
+
     def parse(self):
         """
         Grab the pandas dataframe from the saved csv file. If file does not exist call ``compute``.
@@ -672,7 +1203,7 @@ class Observable:
 
     def parse_kt_data(self, nkt_flag: bool = False, vkt_flag: bool = False):
         """
-        Read in the precomputed time dependent Fourier space data. Recalculate if not.
+        Read in the precomputed time dependent Fourier space data. Recalculate if not, or if :attr:`resume` is False.
 
         Parameters
         ----------
@@ -685,58 +1216,11 @@ class Observable:
             Default = False.
 
         """
-        if nkt_flag:
-            try:
-                # Check that what was already calculated is correct
-                with HDFStore(self.nkt_hdf_file, mode="r") as nkt_hfile:
-                    metadata = nkt_hfile.get_storer("nkt").attrs.metadata
-
-                if metadata["no_slices"] == self.no_slices:
-                    # Check for the correct number of k values
-                    if metadata["angle_averaging"] == self.angle_averaging:
-                        # Check for the correct max harmonics
-                        comp = self.max_k_harmonics == metadata["max_k_harmonics"]
-                        if not comp.all():
-                            self.calc_kt_data(nkt_flag=True)
-                    else:
-                        self.calc_kt_data(nkt_flag=True)
-                else:
-                    self.calc_kt_data(nkt_flag=True)
+        if nkt_flag and not (self.resume and self.kt_data_is_current("nkt")):
+            self.calc_kt_data(nkt_flag=True)
 
-                # elif metadata['max_k_harmonics']
-                #
-                # if self.angle_averaging == nkt_data["angle_averaging"]:
-                #
-                #     comp = self.max_k_harmonics == nkt_data["max_harmonics"]
-                #     if not comp.all():
-                #         self.calc_kt_data(nkt_flag=True)
-                # else:
-                #     self.calc_kt_data(nkt_flag=True)
-
-            except OSError:
-                self.calc_kt_data(nkt_flag=True)
-
-        if vkt_flag:
-
-            try:
-                # Check that what was already calculated is correct
-                with HDFStore(self.vkt_hdf_file, mode="r") as vkt_hfile:
-                    metadata = vkt_hfile.get_storer("vkt").attrs.metadata
-
-                if metadata["no_slices"] == self.no_slices:
-                    # Check for the correct number of k values
-                    if metadata["angle_averaging"] == self.angle_averaging:
-                        # Check for the correct max harmonics
-                        comp = self.max_k_harmonics == metadata["max_k_harmonics"]
-                        if not comp.all():
-                            self.calc_kt_data(vkt_flag=True)
-                    else:
-                        self.calc_kt_data(vkt_flag=True)
-                else:
-                    self.calc_kt_data(vkt_flag=True)
-
-            except OSError:
-                self.calc_kt_data(vkt_flag=True)
+        if vkt_flag and not (self.resume and self.kt_data_is_current("vkt")):
+            self.calc_kt_data(vkt_flag=True)
 
     def plot(self, scaling: tuple = None, acf: bool = False, figname: str = None, show: bool = False, **kwargs):
         """
@@ -813,38 +1297,196 @@ class Observable:
 
         return axes_handle
 
-    def read_pickle(self):
-        """Read the observable's info from the pickle file."""
-        self.filename_pickle = os_path_join(self.saving_dir, self.__long_name__.replace(" ", "") + ".pickle")
-        with open(self.filename_pickle, "rb") as pkl_data:
-            data = pickle_load()
-        self.from_dict(data.__dict__)
+    def read_cached_slices(self):
+        """
+        Read the slices saved by a previous calculation whose hashes match the current ones, see
+        :meth:`cache_manifest`. The slices' columns are copied into :attr:`dataframe_slices`
+        (:attr:`dataframe_acf_slices`) and the other slices are dropped.
 
-    def save_hdf(self):
+        Returns
+        -------
+        cached_slices : list
+            Indices of the slices read from disk.
 
-        # Create the columns for the HDF df
-        if not self.k_observable:
-            if not isinstance(self.dataframe_slices.columns, MultiIndex):
-                self.dataframe_slices.columns = MultiIndex.from_tuples(
-                    [tuple(c.split("_")) for c in self.dataframe_slices.columns]
-                )
+        """
+        try:
+            with HDFStore(self.filename_hdf_slices, mode="r") as store:
+                saved = store.get_storer(self.__name__).attrs.cache_manifest
+                dataframe_slices = store[self.__name__]
+            if self.acf_observable:
+                dataframe_acf_slices = read_hdf(self.filename_hdf_acf_slices, mode="r", key=self.__name__)
+        except (OSError, KeyError, AttributeError):
+            # Missing file or file saved without manifest
+            return []
+
+        manifest = self.cache_manifest()
+        if saved["inputs"] != manifest["inputs"]:
+            return []
+
+        cached_slices = [
+            isl
+            for isl, slice_hash in enumerate(manifest["slices"][: len(saved["slices"])])
+            if slice_hash is not None and slice_hash == saved["slices"][isl]
+        ]
+        if not cached_slices:
+            return []
+
+        # Back to the columns' names used by calc_slice_data
+        slices_names = ["slice {}".format(isl) for isl in cached_slices]
+        dfs = [dataframe_slices, dataframe_acf_slices] if self.acf_observable else [dataframe_slices]
+        for i, df in enumerate(dfs):
+            df.columns = ["_".join(c for c in col if isinstance(c, str) and c) for col in df.columns]
+            dfs[i] = df[[col for col in df.columns if col == "Time" or col.split("_")[-1] in slices_names]]
+
+        self.dataframe_slices = dfs[0].copy()
+        self.dataframe["Time"] = self.dataframe_slices["Time"].to_numpy()
+        if self.acf_observable:
+            self.dataframe_acf_slices = dfs[1].copy()
+            self.dataframe_acf["Time"] = self.dataframe_acf_slices["Time"].to_numpy()
 
-        if not isinstance(self.dataframe.columns, MultiIndex):
-            self.dataframe.columns = MultiIndex.from_tuples([tuple(c.split("_")) for c in self.dataframe.columns])
+        return cached_slices
 
-        # Sort the index for speed
+    def read_kt_data(self, key: str, slice_index: int = None):
+        """
+        Read the time dependent Fourier space data saved by :meth:`save_kt_data`.
+
+        Parameters
+        ----------
+        key : str
+            Either "nkt" or "vkt".
+
+        slice_index : int, optional
+            Read only this slice. Default = ``None``, read all the slices.
+
+        Returns
+        -------
+        kt_data : numpy.ndarray
+            :math:`n(\\mathbf k, t)` or :math:`v(\\mathbf k, t)`, see :meth:`save_kt_data` for the shape.
+            The first axis is missing if ``slice_index`` is given.
+
+        """
+        from tables import open_file as tables_open_file
+
+        hdf_file = self.nkt_hdf_file if key == "nkt" else self.vkt_hdf_file
+        with tables_open_file(hdf_file, mode="r") as h5file:
+            kt_array = h5file.get_node("/", key)
+            if slice_index is None:
+                return kt_array.read()
+
+            return kt_array[slice_index]
+
+    def read_pickle(self):
+        """Read the observable's info from the pickle file."""
+        self.filename_pickle = os_path_join(self.saving_dir, self.__long_name__.replace(" ", "") + ".pickle")
+        with open(self.filename_pickle, "rb") as pkl_data:
+            data = pickle_load()
+        self.from_dict(data.__dict__)
+
+    def sample(self, ptcls, it: int):
+        """
+        Push the particles' data of a sampled timestep into the observable.
+
+        Observables with a correlator pass it to :meth:`sample_correlator`, the others build the same frame a dump
+        would provide and pass it to :meth:`consume`.
+
+        Parameters
+        ----------
+        ptcls : :class:`sarkas.particles.Particles`
+            Particles' data.
+
+        it : int
+            Timestep number.
+
+        """
+        if self.correlator_observable:
+            self.sample_correlator(ptcls, it)
+        else:
+            # The dumps store the periodic boundary crossings of the particles as "cntr"
+            attributes = {"cntr": "pbc_cntr"}
+            frame = {key: getattr(ptcls, attributes.get(key, key)) for key in self.frame_keys if key != "time"}
+            frame["time"] = it * self.dt
+            self.consume(frame)
+
+    def sample_correlator(self, ptcls, it: int):
+        """
+        Push the particles' data of a sampled timestep into the on-the-fly correlator of the current slice.
+
+        When the last sample of a slice is taken the slice data is calculated by :meth:`calc_correlator_slice_data`.
+        Samples beyond the last slice are ignored.
+
+        Parameters
+        ----------
+        ptcls : :class:`sarkas.particles.Particles`
+            Particles' data.
+
+        it : int
+            Timestep number.
+
+        """
+        isl, step = divmod(self.samples_taken, self.slice_samples)
+        self.samples_taken += 1
+
+        if isl >= self.no_slices:
+            return
+
+        if step == 0:
+            no_channels, pair_a, pair_b = self.correlator_pairs()
+            self.slice_correlator = MultipleTauCorrelator(
+                no_channels,
+                pair_a,
+                pair_b,
+                self.slice_samples,
+                self.correlator_block_length,
+                self.correlator_averaging,
+            )
+            self.slice_time = zeros(self.slice_steps)
+            self.slice_signal = zeros((self.slice_steps, no_channels))
+
+        signal = self.correlator_signal(ptcls)
+        self.slice_correlator.add(signal)
+
+        idump, rem = divmod(step * self.sample_step, self.dump_step)
+        if rem == 0:
+            self.slice_time[idump] = it * self.dt
+            self.slice_signal[idump] = signal
+
+        if step == self.slice_samples - 1:
+            if isl == 0:
+                lag_time = self.slice_correlator.lags() * self.sample_step * self.dt
+                self.dataframe["Time"] = self.slice_time.copy()
+                self.dataframe_slices["Time"] = self.slice_time.copy()
+                self.dataframe_acf["Time"] = lag_time
+                self.dataframe_acf_slices["Time"] = lag_time.copy()
+
+            self.calc_correlator_slice_data(isl, self.slice_signal, self.slice_correlator)
+
+    def save_hdf(self):
+        """
+        Save the dataframes into HDF files. The cache manifest of a resumable observable is stored as an attribute of
+        the slices' dataframe, see :meth:`read_cached_slices`. The slices' files are not rewritten if all the slices
+        were read from disk.
+
+        """
+
+        # Create the columns for the HDF df
+        if not self.k_observable:
+            if not isinstance(self.dataframe_slices.columns, MultiIndex):
+                self.dataframe_slices.columns = MultiIndex.from_tuples(
+                    [tuple(c.split("_")) for c in self.dataframe_slices.columns]
+                )
+
+        if not isinstance(self.dataframe.columns, MultiIndex):
+            self.dataframe.columns = MultiIndex.from_tuples([tuple(c.split("_")) for c in self.dataframe.columns])
+
+        # Sort the index for speed
         # see https://stackoverflow.com/questions/54307300/what-causes-indexing-past-lexsort-depth-warning-in-pandas
         self.dataframe = self.dataframe.sort_index()
         self.dataframe_slices = self.dataframe_slices.sort_index()
 
-        # TODO: Fix this hack. We should be able to add data to HDF instead of removing it and rewriting it.
-        # Save the data.
-        if os_path_exists(self.filename_hdf_slices):
-            os_remove(self.filename_hdf_slices)
-        self.dataframe_slices.to_hdf(self.filename_hdf_slices, mode="w", key=self.__name__)
-
-        if os_path_exists(self.filename_hdf):
-            os_remove(self.filename_hdf)
+        # Save the data. Mode "w" overwrites the previous file.
+        new_slices = len(self.cached_slices) < self.no_slices
+        if new_slices:
+            self.dataframe_slices.to_hdf(self.filename_hdf_slices, mode="w", key=self.__name__)
         self.dataframe.to_hdf(self.filename_hdf, mode="w", key=self.__name__)
 
         if self.acf_observable:
@@ -862,13 +1504,53 @@ class Observable:
             self.dataframe_acf = self.dataframe_acf.sort_index()
             self.dataframe_acf_slices = self.dataframe_acf_slices.sort_index()
 
-            if os_path_exists(self.filename_hdf_acf):
-                os_remove(self.filename_hdf_acf)
             self.dataframe_acf.to_hdf(self.filename_hdf_acf, mode="w", key=self.__name__)
+            if new_slices:
+                self.dataframe_acf_slices.to_hdf(self.filename_hdf_acf_slices, mode="w", key=self.__name__)
+
+        if self.resumable and new_slices and not self.on_the_fly:
+            # The manifest is written last, a calculation interrupted while saving will not be reused
+            with HDFStore(self.filename_hdf_slices, mode="a") as store:
+                store.get_storer(self.__name__).attrs.cache_manifest = self.cache_manifest()
+
+    def save_kt_data(self, nkt: ndarray = None, vkt: ndarray = None):
+        """
+        Save the time dependent Fourier space data into chunked HDF5 arrays with the metadata needed by
+        :meth:`parse_kt_data`. The harmonics of the :math:`k` vectors are stored in the same file in the array
+        ``k_harmonics``.
+
+        Parameters
+        ----------
+        nkt : numpy.ndarray, optional
+            :math:`n(\\mathbf k, t)`. Shape = (``no_slices``, ``no_species``, ``slice_steps``, ``no_k``).
 
-            if os_path_exists(self.filename_hdf_acf_slices):
-                os_remove(self.filename_hdf_acf_slices)
-            self.dataframe_acf_slices.to_hdf(self.filename_hdf_acf_slices, mode="w", key=self.__name__)
+        vkt : numpy.ndarray, optional
+            :math:`v(\\mathbf k, t)`. Shape = (``no_slices``, 4, ``no_species``, ``slice_steps``, ``no_k``),
+            where the second axis is longitudinal and transverse i, j, k.
+
+        """
+        from tables import open_file as tables_open_file
+
+        # This metadata is needed to check if I need to recalculate
+        metadata = {
+            "no_slices": self.no_slices,
+            "max_k_harmonics": self.max_k_harmonics,
+            "angle_averaging": self.angle_averaging,
+            "kt_method": self.kt_method,
+            "slice_hashes": self.cache_manifest()["slices"],
+        }
+
+        for key, data, hdf_file in [("nkt", nkt, self.nkt_hdf_file), ("vkt", vkt, self.vkt_hdf_file)]:
+            if data is None:
+                continue
+
+            with tables_open_file(hdf_file, mode="w") as h5file:
+                # One chunk per slice and species, i.e. the block needed by calc_Skw
+                chunkshape = (1,) * (data.ndim - 2) + data.shape[-2:]
+                kt_array = h5file.create_carray("/", key, obj=data, chunkshape=chunkshape)
+                kt_array.attrs.metadata = metadata
+                kt_array.attrs.species_names = list(self.species_names)
+                h5file.create_array("/", "k_harmonics", obj=self.k_harmonics)
 
     def save_pickle(self):
         """Save the observable's info into a pickle file."""
@@ -1003,6 +1685,20 @@ class Observable:
                 self.max_aa_ka_value = 2.0 * pi * self.a_ws * norm(self.max_aa_harmonics / self.box_lengths)
                 self.max_ka_value = 2.0 * pi * self.a_ws * self.max_k_harmonics[0] / self.box_lengths[0]
 
+            if self.kt_method not in ["direct", "mesh"]:
+                raise ValueError("kt_method not available. Choose from ['direct', 'mesh']. Note case sensitivity.")
+
+            if self.kt_method == "mesh":
+                # Mesh sizes at four times the Nyquist limit. No mesh along the missing dimension of 2D simulations.
+                has_mesh = self.box_lengths > 0.0
+                if self.kt_mesh_sizes is None:
+                    self.kt_mesh_sizes = [
+                        next_fast_len(4 * (2 * int(n) + 1)) if flag else 1
+                        for n, flag in zip(self.max_k_harmonics, has_mesh)
+                    ]
+                self.kt_mesh_sizes = array(self.kt_mesh_sizes, dtype=int64)
+                self.kt_mesh_cao = array([self.kt_cao if flag else 1 for flag in has_mesh], dtype=int64)
+
             # Create paths for files
             self.k_space_dir = os_path_join(self.postprocessing_dir, "k_space_data")
             self.k_file = os_path_join(self.k_space_dir, "k_arrays.npz")
@@ -1039,6 +1735,16 @@ class Observable:
             self.no_steps = self.magnetization_steps
             self.dump_dir = self.mag_dump_dir
 
+        if self.on_the_fly and self.phase == "production":
+            # The dumps are not there yet. The samples take their place, apart from the observables with a correlator
+            # which store their channels at each dump_step.
+            if self.sample_step is None:
+                self.sample_step = 1 if self.correlator_observable else self.dump_step
+            if not self.correlator_observable:
+                self.dump_step = self.sample_step
+            # Same as the number of dump files, the initial configuration included
+            self.no_dumps = int(self.no_steps / self.dump_step) + 1
+
         # Needed for preprocessing pretty print
         self.slice_steps = (
             int(self.no_steps / self.dump_step / self.no_slices)
@@ -1148,6 +1854,40 @@ class Observable:
             self.dataframe_acf = DataFrame()
             self.dataframe_acf_slices = DataFrame()
 
+    def update_slice_data(self, frame: dict, it: int):
+        """Calculate :math:`n(\\mathbf k, t)` and :math:`v(\\mathbf k, t)` of a streamed dump.
+
+        Particle observables override this method to copy the needed data into their slice arrays.
+
+        Parameters
+        ----------
+        frame : dict
+            Dump's data.
+
+        it : int
+            Index of the dump within the slice.
+
+        """
+        pos = frame["pos"][None, :, :]
+        if self.nkt_stream:
+            if self.kt_method == "mesh":
+                nkt = calc_nk_mesh(
+                    pos, self.species_num, self.k_list, self.box_lengths, self.kt_mesh_sizes, self.kt_mesh_cao
+                )
+            else:
+                nkt = calc_nk_frames(pos, self.species_num, self.k_list, self.box_lengths)
+            self.slice_nkt[:, it, :] = nkt[:, 0, :]
+
+        if self.vkt_stream:
+            vel = frame["vel"][None, :, :]
+            if self.kt_method == "mesh":
+                vkt = calc_vk_mesh(
+                    pos, vel, self.species_num, self.k_list, self.box_lengths, self.kt_mesh_sizes, self.kt_mesh_cao
+                )
+            else:
+                vkt = calc_vk_frames(pos, vel, self.species_num, self.k_list, self.box_lengths)
+            self.slice_vkt[:, :, it, :] = vkt[:, :, 0, :]
+
 
 class CurrentCorrelationFunction(Observable):
     """
@@ -1193,12 +1933,18 @@ class CurrentCorrelationFunction(Observable):
 
     """
 
+    on_the_fly_capable = True
+
     def __init__(self):
         super().__init__()
         self.__name__ = "ccf"
         self.__long_name__ = "Current Correlation Function"
         self.k_observable = True
         self.kw_observable = True
+        self.stream_observable = True
+        self.vkt_flag = True
+        self.frame_keys = ["time", "pos", "vel"]
+        self.parallel_slices = True
 
     @setup_doc
     def setup(self, params, phase: str = None, no_slices: int = None, **kwargs):
@@ -1221,21 +1967,9 @@ class CurrentCorrelationFunction(Observable):
 
         tinit = self.timer.current()
 
-        vkt_df = read_hdf(self.vkt_hdf_file, mode="r", key="vkt")
-        # Containers
-        vkt = zeros((self.num_species, self.slice_steps, len(self.k_list)), dtype=complex128)
-        vkt_i = zeros((self.num_species, self.slice_steps, len(self.k_list)), dtype=complex128)
-        vkt_j = zeros((self.num_species, self.slice_steps, len(self.k_list)), dtype=complex128)
-        vkt_k = zeros((self.num_species, self.slice_steps, len(self.k_list)), dtype=complex128)
-
         for isl in range(self.no_slices):
-
-            # Put data in the container to pass
-            for sp, sp_name in enumerate(self.species_names):
-                vkt[sp] = array(vkt_df["slice {}".format(isl + 1)]["Longitudinal"][sp_name])
-                vkt_i[sp] = array(vkt_df["slice {}".format(isl + 1)]["Transverse i"][sp_name])
-                vkt_j[sp] = array(vkt_df["slice {}".format(isl + 1)]["Transverse j"][sp_name])
-                vkt_k[sp] = array(vkt_df["slice {}".format(isl + 1)]["Transverse k"][sp_name])
+            # Longitudinal, Transverse i, j, k. Shape = (no_species, slice_steps, no_k)
+            vkt, vkt_i, vkt_j, vkt_k = self.kt_data_slice("vkt", isl)
 
             # Calculate Lkw and Tkw
             Lkw = calc_Skw(vkt, self.k_list, self.species_num, self.slice_steps, self.dt, self.dump_step)
@@ -1302,14 +2036,14 @@ class CurrentCorrelationFunction(Observable):
                 ]
 
                 # Mean: level = 1 corresponds to averaging all the k harmonics with the same magnitude
-                df_mean = self.dataframe_slices["Longitudinal"][comp_name].mean(level=1, axis="columns")
+                df_mean = self.dataframe_slices["Longitudinal"][comp_name].T.groupby(level=1, sort=False).mean().T
                 df_mean = df_mean.rename(col_mapper(df_mean.columns, ka_columns), axis=1)
                 # Std
                 ka_columns = [
                     "Longitudinal_" + comp_name + "_Std_ka{} = {:.4f}".format(ik + 1, ka)
                     for ik, ka in enumerate(self.ka_values)
                 ]
-                df_std = self.dataframe_slices["Longitudinal"][comp_name].std(level=1, axis="columns")
+                df_std = self.dataframe_slices["Longitudinal"][comp_name].T.groupby(level=1, sort=False).std().T
                 df_std = df_std.rename(col_mapper(df_std.columns, ka_columns), axis=1)
 
                 self.dataframe = concat([self.dataframe, df_mean, df_std], axis=1)
@@ -1322,14 +2056,14 @@ class CurrentCorrelationFunction(Observable):
                 ]
 
                 # Mean: level = 1 corresponds to averaging all the k harmonics with the same magnitude
-                tdf_mean = self.dataframe_slices["Transverse"][comp_name].mean(level=1, axis="columns")
+                tdf_mean = self.dataframe_slices["Transverse"][comp_name].T.groupby(level=1, sort=False).mean().T
                 tdf_mean = tdf_mean.rename(col_mapper(tdf_mean.columns, ka_columns), axis=1)
                 # Std
                 ka_columns = [
                     "Transverse_" + comp_name + "_Std_ka{} = {:.4f}".format(ik + 1, ka)
                     for ik, ka in enumerate(self.ka_values)
                 ]
-                tdf_std = self.dataframe_slices["Transverse"][comp_name].std(level=1, axis="columns")
+                tdf_std = self.dataframe_slices["Transverse"][comp_name].T.groupby(level=1, sort=False).std().T
                 tdf_std = tdf_std.rename(col_mapper(tdf_std.columns, ka_columns), axis=1)
 
                 self.dataframe = concat([self.dataframe, tdf_mean, tdf_std], axis=1)
@@ -1416,11 +2150,18 @@ class DiffusionFlux(Observable):
 
     """
 
+    on_the_fly_capable = True
+
     def __init__(self):
         super().__init__()
         self.__name__ = "diff_flux"
         self.__long_name__ = "Diffusion Flux"
         self.acf_observable = True
+        self.resumable = True
+        self.stream_observable = True
+        self.frame_keys = ["time", "vel"]
+        self.correlator_observable = True
+        self.parallel_slices = True
 
     @setup_doc
     def setup(self, params, phase: str = None, no_slices: int = None, **kwargs):
@@ -1442,57 +2183,165 @@ class DiffusionFlux(Observable):
     @compute_doc
     def compute(self):
 
-        start_slice = 0
-        end_slice = self.slice_steps * self.dump_step
-        time = zeros(self.slice_steps)
-        # Initialize timer
-        t0 = self.timer.current()
+        stream_dumps([self])
+
+    def init_slice_data(self):
+        """Allocate the array storing the particles' velocities of a slice."""
+        self.slice_vel = zeros((self.dimensions, self.slice_steps, self.total_num_ptcls))
+
+    def update_slice_data(self, frame: dict, it: int):
+        """Copy the particles' velocities of a dump into the slice array.
+
+        Parameters
+        ----------
+        frame : dict
+            Dump's data.
+
+        it : int
+            Index of the dump within the slice.
+
+        """
+        for d in range(self.dimensions):
+            self.slice_vel[d, it, :] = frame["vel"][:, d]
+
+    def calc_slice_data(self, isl: int, time: ndarray):
+        """Calculate the diffusion fluxes and their ACF of a slice and add them to the slices dataframes.
+
+        Parameters
+        ----------
+        isl : int
+            Slice index.
+
+        time : numpy.ndarray
+            Time array of the slice.
+
+        """
+        # This returns two arrays
+        # diff_fluxes = array of shape (no_fluxes, no_dim, no_dumps_per_slice)
+        # df_acf = array of shape (no_fluxes_acf, no_dim + 1, no_dumps_per_slice)
+        diff_fluxes, df_acf = calc_diff_flux_acf(
+            self.slice_vel, self.species_num, self.species_concentrations, self.species_masses
+        )
+
+        self.store_slice_data(isl, diff_fluxes, df_acf)
+
+    def calc_correlator_slice_data(self, isl: int, signal: ndarray, correlator: MultipleTauCorrelator):
+        """Calculate the diffusion fluxes and their ACF of a slice from the on-the-fly correlator.
+
+        The fluxes are linear combinations of the velocity fields of each species, see
+        :func:`calc_diff_flux_acf`, hence their ACFs are the same combinations of the correlation functions of the
+        velocity fields.
+
+        Parameters
+        ----------
+        isl : int
+            Slice index.
+
+        signal : numpy.ndarray
+            Velocity field of each species at each dump of the slice.
+            Shape = (``slice_steps``, ``num_species * dimensions``)
+
+        correlator : :class:`sarkas.utilities.maths.MultipleTauCorrelator`
+            Correlator of the slice.
+
+        """
+        # Coefficients of the velocity fields in the diffusion fluxes and in the relative fluxes, eq.(3.5) in Zhou
+        m_bar = self.species_masses @ self.species_concentrations
+        delta_ab = identity(self.num_species)[:-1]
+        jr_coeff = delta_ab - self.species_concentrations[:-1, None]
+        flux_coeff = (m_bar * delta_ab - self.species_concentrations[:-1, None] * self.species_masses[None, :]) * (
+            self.species_masses[:-1, None] / m_bar
+        )
+
+        tot_vel = signal.reshape(-1, self.num_species, self.dimensions).transpose(1, 2, 0)
+        diff_fluxes = (flux_coeff @ tot_vel.reshape(self.num_species, -1)).reshape(self.no_fluxes, self.dimensions, -1)
+
+        # Shape = (num_species, num_species, dimensions, no_lags)
+        corr = correlator.correlation().reshape(self.num_species, self.num_species, self.dimensions, -1)
+        jr_acf = einsum("ij,kl,jldt->ikdt", jr_coeff, jr_coeff, corr)
+
+        df_acf = zeros((self.no_fluxes_acf, self.dimensions + 1, corr.shape[-1]))
+        df_acf[:, : self.dimensions] = jr_acf.reshape(self.no_fluxes_acf, self.dimensions, -1)
+        df_acf[:, -1] = df_acf[:, : self.dimensions].sum(axis=1)
+
+        self.store_slice_data(isl, diff_fluxes, df_acf)
+
+    def correlator_pairs(self):
+        """Return the channels of the on-the-fly correlator, i.e. the velocity field of each species in each
+        direction, and the pairs of species to correlate in each direction.
+
+        Returns
+        -------
+        no_channels : int
+            Number of channels of the signal.
 
+        pair_a : numpy.ndarray
+            Channel of the later sample of each pair.
+
+        pair_b : numpy.ndarray
+            Channel of the earlier sample of each pair.
+
+        """
+        sp_a, sp_b, dim = indices((self.num_species, self.num_species, self.dimensions)).reshape(3, -1)
+
+        return self.num_species * self.dimensions, sp_a * self.dimensions + dim, sp_b * self.dimensions + dim
+
+    def correlator_signal(self, ptcls):
+        """Calculate the velocity field of each species.
+
+        Parameters
+        ----------
+        ptcls : :class:`sarkas.particles.Particles`
+            Particles' data.
+
+        Returns
+        -------
+        signal : numpy.ndarray
+            Sum of the particles' velocities of each species. Shape = (``num_species * dimensions``,)
+
+        """
+        signal = zeros((self.num_species, self.dimensions))
+        for sp, sp_start in enumerate(self.species_index_start[:-1]):
+            sp_end = self.species_index_start[sp + 1]
+            signal[sp] = ptcls.vel[sp_start:sp_end, : self.dimensions].sum(axis=0)
+
+        return signal.ravel()
+
+    def store_slice_data(self, isl, diff_fluxes, df_acf):
+        """Add the diffusion fluxes and their ACF of a slice to the slices dataframes.
+
+        Parameters
+        ----------
+        isl : int
+            Slice index.
+
+        diff_fluxes : numpy.ndarray
+            Diffusion fluxes. Shape = (``no_fluxes``, ``dimensions``, ``slice_steps``)
+
+        df_acf : numpy.ndarray
+            ACF of the relative diffusion fluxes. Shape = (``no_fluxes_acf``, ``dimensions + 1``, ``no_lags``)
+
+        """
         df_str = "Diffusion Flux"
         df_acf_str = "Diffusion Flux ACF"
 
-        for isl in range(self.no_slices):
-            print("\nCalculating diffusion flux and its acf for slice {}/{}.".format(isl + 1, self.no_slices))
-            # Parse the particles from the dump files
-            vel = zeros((self.dimensions, self.slice_steps, self.total_num_ptcls))
-            #
-            # print("\nParsing particles' velocities.")
-            for it, dump in enumerate(
-                tqdm(range(start_slice, end_slice, self.dump_step), desc="Read in data", disable=not self.verbose)
-            ):
-                datap = load_from_restart(self.dump_dir, dump)
-                time[it] = datap["time"]
-                vel[0, it, :] = datap["vel"][:, 0]
-                vel[1, it, :] = datap["vel"][:, 1]
-                vel[2, it, :] = datap["vel"][:, 2]
-            #
-            if isl == 0:
-                self.dataframe["Time"] = time
-                self.dataframe_slices["Time"] = time
-                self.dataframe_acf["Time"] = time
-                self.dataframe_acf_slices["Time"] = time
-
-            # This returns two arrays
-            # diff_fluxes = array of shape (no_fluxes, no_dim, no_dumps_per_slice)
-            # df_acf = array of shape (no_fluxes_acf, no_dim + 1, no_dumps_per_slice)
-            diff_fluxes, df_acf = calc_diff_flux_acf(
-                vel, self.species_num, self.species_concentrations, self.species_masses
-            )
+        # # Store the data
+        for i, flux in enumerate(diff_fluxes):
+            self.dataframe_slices[df_str + " {}_X_slice {}".format(i, isl)] = flux[0, :]
+            self.dataframe_slices[df_str + " {}_Y_slice {}".format(i, isl)] = flux[1, :]
+            self.dataframe_slices[df_str + " {}_Z_slice {}".format(i, isl)] = flux[2, :]
 
-            # # Store the data
-            for i, flux in enumerate(diff_fluxes):
-                self.dataframe_slices[df_str + " {}_X_slice {}".format(i, isl)] = flux[0, :]
-                self.dataframe_slices[df_str + " {}_Y_slice {}".format(i, isl)] = flux[1, :]
-                self.dataframe_slices[df_str + " {}_Z_slice {}".format(i, isl)] = flux[2, :]
+        for i, flux_acf in enumerate(df_acf):
+            self.dataframe_acf_slices[df_acf_str + " {}_X_slice {}".format(i, isl)] = flux_acf[0, :]
+            self.dataframe_acf_slices[df_acf_str + " {}_Y_slice {}".format(i, isl)] = flux_acf[1, :]
+            self.dataframe_acf_slices[df_acf_str + " {}_Z_slice {}".format(i, isl)] = flux_acf[2, :]
+            self.dataframe_acf_slices[df_acf_str + " {}_Total_slice {}".format(i, isl)] = flux_acf[3, :]
 
-            for i, flux_acf in enumerate(df_acf):
-                self.dataframe_acf_slices[df_acf_str + " {}_X_slice {}".format(i, isl)] = flux_acf[0, :]
-                self.dataframe_acf_slices[df_acf_str + " {}_Y_slice {}".format(i, isl)] = flux_acf[1, :]
-                self.dataframe_acf_slices[df_acf_str + " {}_Z_slice {}".format(i, isl)] = flux_acf[2, :]
-                self.dataframe_acf_slices[df_acf_str + " {}_Total_slice {}".format(i, isl)] = flux_acf[3, :]
+    def average_slices_data(self):
+        """Average and std over the slices."""
 
-            start_slice += self.slice_steps * self.dump_step
-            end_slice += self.slice_steps * self.dump_step
+        df_str = "Diffusion Flux"
+        df_acf_str = "Diffusion Flux ACF"
 
         # Average and std over the slices
         for i in range(self.no_fluxes):
@@ -1527,10 +2376,6 @@ class DiffusionFlux(Observable):
                 axis=1
             )
 
-        self.save_hdf()
-        tend = self.timer.current()
-        self.time_stamp("Diffusion Flux and its ACF Calculation", self.timer.time_division(tend - t0))
-
     def pretty_print(self):
         """Print observable parameters for help in choice of simulation parameters."""
 
@@ -1561,14 +2406,41 @@ class DynamicStructureFactor(Observable):
     .. math::
         n_{A}(\\mathbf k,t) = \\sum^{N_{A}}_{j} e^{-i \\mathbf k \\cdot \\mathbf r_j(t)} .
 
+    Attributes
+    ----------
+    estimator : str
+        Spectral estimator. ``"periodogram"`` (default) takes the raw periodogram of each of the ``no_slices``
+        non-overlapping slices. ``"welch"`` stitches the slices back together and averages the tapered periodograms of
+        overlapping windows spanning the whole production phase.
+
+    window_length : int
+        Number of dumps in each Welch window. Default = ``None``, i.e. :py:attr:`~.slice_steps`.
+
+    window_overlap : float
+        Fraction of ``window_length`` shared by consecutive Welch windows. Default = 0.5.
+
+    window_taper : str, tuple
+        Taper applied to each Welch window, any window accepted by :func:`scipy.signal.get_window`. Default = ``"hann"``.
+        Use ``"boxcar"`` together with ``window_overlap = 0`` for Bartlett's method.
+
     """
 
+    on_the_fly_capable = True
+
     def __init__(self):
         super().__init__()
         self.__name__ = "dsf"
         self.__long_name__ = "Dynamic Structure Factor"
         self.kw_observable = True
         self.k_observable = True
+        self.stream_observable = True
+        self.nkt_flag = True
+        self.frame_keys = ["time", "pos"]
+        self.estimator = "periodogram"
+        self.window_length = None
+        self.window_overlap = 0.5
+        self.window_taper = "hann"
+        self.parallel_slices = True
 
     @setup_doc
     def setup(self, params, phase: str = None, no_slices: int = 1, **kwargs):
@@ -1581,8 +2453,15 @@ class DynamicStructureFactor(Observable):
 
         # Update the attribute with the passed arguments
         self.__dict__.update(kwargs.copy())
+
+        if self.estimator not in ["periodogram", "welch"]:
+            raise ValueError(f"Unknown DSF estimator '{self.estimator}'. Choose between 'periodogram' and 'welch'.")
+
         self.update_finish()
 
+        if self.estimator == "welch":
+            self.update_welch_window()
+
     @compute_doc
     def compute(self):
 
@@ -1590,18 +2469,31 @@ class DynamicStructureFactor(Observable):
         self.parse_kt_data(nkt_flag=True)
 
         tinit = self.timer.current()
-        nkt_df = read_hdf(self.nkt_hdf_file, mode="r", key="nkt")
-        for isl in range(0, self.no_slices):
-            # Initialize container
-            nkt = zeros((self.num_species, self.slice_steps, len(self.k_list)), dtype=complex128)
-            for sp, sp_name in enumerate(self.species_names):
-                nkt[sp] = array(nkt_df["slice {}".format(isl + 1)][sp_name])
-
-            # Calculate Skw
-            Skw_all = calc_Skw(nkt, self.k_list, self.species_num, self.slice_steps, self.dt, self.dump_step)
+        if self.estimator == "welch":
+            # Stitch the slices back into the full production n(k,t). Shape = (no_species, no_dumps, no_k)
+            nkt = concatenate([self.kt_data_slice("nkt", isl) for isl in range(self.no_slices)], axis=1)
+            # Tapered periodograms of all the windows at once. Shape = (no_windows, no_skw, no_k, window_length)
+            Skw_slices = calc_Skw_welch(
+                nkt, self.species_num, self.welch_window(), self.window_hop, self.dt, self.dump_step
+            )
+            slc_columns = ["window {}".format(iw + 1) for iw in range(self.no_windows)]
+        else:
+            # Shape of each nkt = (no_species, slice_steps, no_k)
+            Skw_slices = (
+                calc_Skw(
+                    self.kt_data_slice("nkt", isl),
+                    self.k_list,
+                    self.species_num,
+                    self.slice_steps,
+                    self.dt,
+                    self.dump_step,
+                )
+                for isl in range(self.no_slices)
+            )
+            slc_columns = ["slice {}".format(isl + 1) for isl in range(self.no_slices)]
 
+        for slc_column, Skw_all in zip(slc_columns, Skw_slices):
             # Create the dataframe's column names
-            slc_column = "slice {}".format(isl + 1)
             ka_columns = ["ka = {:.8f}".format(ka) for ik, ka in enumerate(self.ka_values)]
             # Save the full Skw into a Dataframe
             sp_indx = 0
@@ -1636,11 +2528,11 @@ class DynamicStructureFactor(Observable):
                 # Rename the columns with values of ka
                 ka_columns = [skw_name + "_Mean_ka{} = {:.4f}".format(ik + 1, ka) for ik, ka in enumerate(self.ka_values)]
                 # Mean: level = 1 corresponds to averaging all the k harmonics with the same magnitude
-                df_mean = self.dataframe_slices[skw_name].mean(level=1, axis="columns")
+                df_mean = self.dataframe_slices[skw_name].T.groupby(level=1, sort=False).mean().T
                 df_mean = df_mean.rename(col_mapper(df_mean.columns, ka_columns), axis=1)
                 # Std
                 ka_columns = [skw_name + "_Std_ka{} = {:.4f}".format(ik + 1, ka) for ik, ka in enumerate(self.ka_values)]
-                df_std = self.dataframe_slices[skw_name].std(level=1, axis="columns")
+                df_std = self.dataframe_slices[skw_name].T.groupby(level=1, sort=False).std().T
                 df_std = df_std.rename(col_mapper(df_std.columns, ka_columns), axis=1)
 
                 self.dataframe = concat([self.dataframe, df_mean, df_std], axis=1)
@@ -1662,7 +2554,13 @@ class DynamicStructureFactor(Observable):
         print("\nFrequency Space Parameters:")
         print("\tNo. of slices = {}".format(self.no_slices))
         print("\tNo. dumps per slice = {}".format(self.slice_steps))
-        print("\tFrequency step dw = 2 pi (no_slices * prod_dump_step)/(production_steps * dt)")
+        if self.estimator == "welch":
+            print("\tWelch estimator: taper = {}, overlap = {}".format(self.window_taper, self.window_overlap))
+            print("\tNo. of windows = {}".format(self.no_windows))
+            print("\tNo. dumps per window = {}".format(self.window_length))
+            print("\tFrequency step dw = 2 pi / (window_length * prod_dump_step * dt)")
+        else:
+            print("\tFrequency step dw = 2 pi (no_slices * prod_dump_step)/(production_steps * dt)")
         print("\tdw = {:1.4f} w_p = {:1.4e} [rad/s]".format(self.w_min / self.total_plasma_frequency, self.w_min))
         print("\tMaximum Frequency w_max = 2 pi /(prod_dump_step * dt)")
         print("\tw_max = {:1.4f} w_p = {:1.4e} [rad/s]".format(self.w_max / self.total_plasma_frequency, self.w_max))
@@ -1703,15 +2601,72 @@ class DynamicStructureFactor(Observable):
         print("\nTotal number of k values to calculate = {}".format(len(self.k_list)))
         print("No. of unique ka values to calculate = {}".format(len(self.ka_values)))
 
+    def update_welch_window(self):
+        """Check the Welch window parameters and update the frequency grid accordingly.
+
+        Raises
+        ------
+        ValueError
+            If the window length or the overlap are not compatible with the number of production dumps.
+
+        """
+        no_dumps = self.no_slices * self.slice_steps
+
+        if self.window_length is None:
+            self.window_length = self.slice_steps
+        self.window_length = int(self.window_length)
+
+        if not 2 <= self.window_length <= no_dumps:
+            raise ValueError(
+                f"The Welch window_length = {self.window_length} must be between 2 and the number of dumps {no_dumps}."
+            )
+        if not 0.0 <= self.window_overlap < 1.0:
+            raise ValueError(f"The Welch window_overlap = {self.window_overlap} must be in [0, 1).")
+
+        # Check the taper now rather than at the end of the n(k,t) calculation
+        self.welch_window()
+
+        self.window_hop = max(1, int(round(self.window_length * (1.0 - self.window_overlap))))
+        self.no_windows = (no_dumps - self.window_length) // self.window_hop + 1
+
+        dt_r = self.dt * self.dump_step
+        self.w_min = 2.0 * pi / (self.window_length * dt_r)
+        self.frequencies = fftshift(2.0 * pi * fftfreq(self.window_length, dt_r))
+
+        self.save_pickle()
+
+    def welch_window(self):
+        """Return the taper of the Welch windows.
+
+        Returns
+        -------
+        numpy.ndarray
+            Window weights. Shape = (``window_length``,)
+
+        """
+        from scipy.signal import get_window
+
+        # Tuples, e.g. ("kaiser", 8.0), become lists when read from yaml
+        taper = tuple(self.window_taper) if isinstance(self.window_taper, list) else self.window_taper
+
+        return get_window(taper, self.window_length)
+
 
 class ElectricCurrent(Observable):
     """Electric Current Auto-correlation function."""
 
+    on_the_fly_capable = True
+
     def __init__(self):
         super().__init__()
         self.__name__ = "ec"
         self.__long_name__ = "Electric Current"
         self.acf_observable = True
+        self.resumable = True
+        self.stream_observable = True
+        self.frame_keys = ["time", "vel"]
+        self.correlator_observable = True
+        self.parallel_slices = True
 
     @setup_doc
     def setup(self, params, phase: str = None, no_slices: int = None, **kwargs):
@@ -1729,133 +2684,360 @@ class ElectricCurrent(Observable):
     @compute_doc
     def compute(self):
 
-        # Initialize timer
-        t0 = self.timer.current()
-        self.calculate_run_slices_data()
-        tend = self.timer.current()
-        self.time_stamp("Electric Current Calculation", self.timer.time_division(tend - t0))
+        stream_dumps([self])
 
-    def calculate_run_slices_data(self):
+    def init_slice_data(self):
+        """Allocate the array storing the particles' velocities of a slice."""
+        self.slice_vel = zeros((self.dimensions, self.slice_steps, self.total_num_ptcls))
 
-        start_slice = 0
-        end_slice = self.slice_steps * self.dump_step
-        time = zeros(self.slice_steps)
+    def update_slice_data(self, frame: dict, it: int):
+        """Copy the particles' velocities of a dump into the slice array.
 
-        # Loop over the slices of each run
-        for isl in range(self.no_slices):
-            print(f"\nCalculating electric current and its acf for slice {isl + 1}/{self.no_slices}.")
-            # Parse the particles from the dump files
-            vel = zeros((self.dimensions, self.slice_steps, self.total_num_ptcls))
-            #
-            # print("\nParsing particles' velocities.")
-            for it, dump in enumerate(
-                tqdm(range(start_slice, end_slice, self.dump_step), desc="Read in data", disable=not self.verbose)
-            ):
-                datap = load_from_restart(self.dump_dir, dump)
-                time[it] = datap["time"]
-                for d in range(self.dimensions):
-                    vel[d, it, :] = datap["vel"][:, d]
-            #
-            if isl == 0:
-                self.dataframe["Time"] = time.copy()
-                self.dataframe_acf["Time"] = time.copy()
-                self.dataframe_slices["Time"] = time.copy()
-                self.dataframe_acf_slices["Time"] = time.copy()
+        Parameters
+        ----------
+        frame : dict
+            Dump's data.
 
-            species_current, total_current = calc_elec_current(vel, self.species_charges, self.species_num)
+        it : int
+            Index of the dump within the slice.
 
-            # Store species data
-            for i, sp_name in enumerate(self.species_names):
-                sp_col_str = f"{sp_name} " + self.__long_name__
-                sp_col_str_acf = f"{sp_name} " + self.__long_name__ + " ACF"
-                sp_tot_acf = zeros(total_current.shape[1])
-                for d in range(self.dimensions):
-                    dl = self.dim_labels[d]
+        """
+        for d in range(self.dimensions):
+            self.slice_vel[d, it, :] = frame["vel"][:, d]
 
-                    self.dataframe_slices[sp_col_str + f"_{dl}_slice {isl}"] = species_current[i, d, :]
-                    # Calculate ACF
-                    sp_acf_dim = correlationfunction(species_current[i, d, :], species_current[i, d, :])
-                    self.dataframe_acf_slices[sp_col_str_acf + f"_{dl}_slice {isl}"] = sp_acf_dim
+    def calc_slice_data(self, isl: int, time: ndarray):
+        """Calculate the electric current and its ACF of a slice and add them to the slices dataframes.
 
-                    sp_tot_acf += sp_acf_dim
+        Parameters
+        ----------
+        isl : int
+            Slice index.
 
-                # Store ACF
-                self.dataframe_acf_slices[sp_col_str_acf + f"_Total_slice {isl}"] = sp_tot_acf
+        time : numpy.ndarray
+            Time array of the slice.
 
-            # Total current and its ACF
-            tot_acf = zeros(total_current.shape[1])
-            for d in range(self.dimensions):
-                dl = self.dim_labels[d]
-                col_str = self.__long_name__ + f"_{dl}_slice {isl}"
-                col_str_acf = self.__long_name__ + f" ACF_{dl}_slice {isl}"
-                self.dataframe_slices[col_str] = total_current[d, :]
-                # Calculate ACF
-                tot_acf_dim = correlationfunction(total_current[d, :], total_current[d, :])
-                tot_acf += tot_acf_dim
-                self.dataframe_acf_slices[col_str_acf] = tot_acf_dim
+        """
+        species_current, total_current = calc_elec_current(self.slice_vel, self.species_charges, self.species_num)
 
-            self.dataframe_acf_slices[self.__long_name__ + f" ACF_Total_slice {isl}"] = tot_acf
+        species_acf = zeros(species_current.shape)
+        total_acf = zeros(total_current.shape)
+        for d in range(self.dimensions):
+            for i in range(self.num_species):
+                species_acf[i, d] = correlationfunction(species_current[i, d, :], species_current[i, d, :])
+            total_acf[d] = correlationfunction(total_current[d, :], total_current[d, :])
 
-            start_slice += self.slice_steps * self.dump_step
-            end_slice += self.slice_steps * self.dump_step
+        self.store_slice_data(isl, species_current, total_current, species_acf, total_acf)
 
-        self.average_slices_data()
+    def calc_correlator_slice_data(self, isl: int, signal: ndarray, correlator: MultipleTauCorrelator):
+        """Calculate the electric current and its ACF of a slice from the on-the-fly correlator.
 
-        self.save_hdf()
+        Parameters
+        ----------
+        isl : int
+            Slice index.
 
-    def average_slices_data(self):
-        """Average and std over the slices."""
+        signal : numpy.ndarray
+            Electric current of each species at each dump of the slice.
+            Shape = (``slice_steps``, ``num_species * dimensions``)
 
-        # Species data
-        for i, sp_name in enumerate(self.species_names):
-            col_str = f"{sp_name} " + self.__long_name__
-            col_str_acf = f"{sp_name} " + self.__long_name__ + " ACF"
+        correlator : :class:`sarkas.utilities.maths.MultipleTauCorrelator`
+            Correlator of the slice.
 
-            for d in range(self.dimensions):
-                dl = self.dim_labels[d]
-                dim_col_str = [col_str + f"_{dl}_slice {isl}" for isl in range(self.no_slices)]
-                self.dataframe[col_str + f"_{dl}_Mean"] = self.dataframe_slices[dim_col_str].mean(axis=1)
-                self.dataframe[col_str + f"_{dl}_Std"] = self.dataframe_slices[dim_col_str].std(axis=1)
+        """
+        species_current = signal.reshape(-1, self.num_species, self.dimensions).transpose(1, 2, 0)
+        total_current = species_current.sum(axis=0)
 
-                # ACF averages
-                dim_col_str_acf = [col_str_acf + f"_{dl}_slice {isl}" for isl in range(self.no_slices)]
+        # Shape = (num_species, num_species, dimensions, no_lags)
+        corr = correlator.correlation().reshape(self.num_species, self.num_species, self.dimensions, -1)
+        species_acf = corr[arange(self.num_species), arange(self.num_species)]
+        total_acf = corr.sum(axis=(0, 1))
 
-                self.dataframe_acf[col_str_acf + f"_{dl}_Mean"] = self.dataframe_acf_slices[dim_col_str_acf].mean(axis=1)
-                self.dataframe_acf[col_str_acf + f"_{dl}_Std"] = self.dataframe_acf_slices[dim_col_str_acf].std(axis=1)
+        self.store_slice_data(isl, species_current, total_current, species_acf, total_acf)
 
-            tot_col_str = [col_str_acf + f"_Total_slice {isl}" for isl in range(self.no_slices)]
-            self.dataframe_acf[col_str + "_Total_Mean"] = self.dataframe_acf_slices[tot_col_str].mean(axis=1)
-            self.dataframe_acf[col_str + "_Total_Std"] = self.dataframe_acf_slices[tot_col_str].std(axis=1)
+    def correlator_pairs(self):
+        """Return the channels of the on-the-fly correlator, i.e. the current of each species in each direction,
+        and the pairs of species to correlate in each direction.
 
-        # Average and std over the slices
-        # Total Current data
-        for d in range(self.dimensions):
-            dl = self.dim_labels[d]
-            dim_col_str = [self.__long_name__ + f"_{dl}_slice {isl}" for isl in range(self.no_slices)]
-            dim_col_str_acf = [self.__long_name__ + f" ACF_{dl}_slice {isl}" for isl in range(self.no_slices)]
+        Returns
+        -------
+        no_channels : int
+            Number of channels of the signal.
 
-            self.dataframe[self.__long_name__ + f"_{dl}_Mean"] = self.dataframe_slices[dim_col_str].mean(axis=1)
-            self.dataframe[self.__long_name__ + f"_{dl}_Std"] = self.dataframe_slices[dim_col_str].std(axis=1)
-            # ACF
-            self.dataframe_acf[self.__long_name__ + f"_{dl}_Mean"] = self.dataframe_acf_slices[dim_col_str_acf].mean(
-                axis=1
-            )
-            self.dataframe_acf[self.__long_name__ + f"_{dl}_Std"] = self.dataframe_acf_slices[dim_col_str_acf].std(axis=1)
+        pair_a : numpy.ndarray
+            Channel of the later sample of each pair.
+
+        pair_b : numpy.ndarray
+            Channel of the earlier sample of each pair.
+
+        """
+        # All the pairs of species are needed for the ACF of the total current
+        sp_a, sp_b, dim = indices((self.num_species, self.num_species, self.dimensions)).reshape(3, -1)
+
+        return self.num_species * self.dimensions, sp_a * self.dimensions + dim, sp_b * self.dimensions + dim
+
+    def correlator_signal(self, ptcls):
+        """Calculate the electric current of each species.
+
+        Parameters
+        ----------
+        ptcls : :class:`sarkas.particles.Particles`
+            Particles' data.
+
+        Returns
+        -------
+        signal : numpy.ndarray
+            Electric current of each species in each direction. Shape = (``num_species * dimensions``,)
+
+        """
+        signal = zeros((self.num_species, self.dimensions))
+        for sp, (q_sp, sp_start) in enumerate(zip(self.species_charges, self.species_index_start[:-1])):
+            sp_end = self.species_index_start[sp + 1]
+            signal[sp] = q_sp * ptcls.vel[sp_start:sp_end, : self.dimensions].sum(axis=0)
+
+        return signal.ravel()
+
+    def store_slice_data(self, isl, species_current, total_current, species_acf, total_acf):
+        """Add the electric current and its ACF of a slice to the slices dataframes.
+
+        Parameters
+        ----------
+        isl : int
+            Slice index.
+
+        species_current : numpy.ndarray
+            Electric current of each species. Shape = (``num_species``, ``dimensions``, ``slice_steps``)
+
+        total_current : numpy.ndarray
+            Total electric current. Shape = (``dimensions``, ``slice_steps``)
+
+        species_acf : numpy.ndarray
+            ACF of the electric current of each species. Shape = (``num_species``, ``dimensions``, ``no_lags``)
+
+        total_acf : numpy.ndarray
+            ACF of the total electric current. Shape = (``dimensions``, ``no_lags``)
+
+        """
+        # Store species data
+        for i, sp_name in enumerate(self.species_names):
+            sp_col_str = f"{sp_name} " + self.__long_name__
+            sp_col_str_acf = f"{sp_name} " + self.__long_name__ + " ACF"
+            sp_tot_acf = zeros(species_acf.shape[-1])
+            for d in range(self.dimensions):
+                dl = self.dim_labels[d]
+
+                self.dataframe_slices[sp_col_str + f"_{dl}_slice {isl}"] = species_current[i, d, :]
+                self.dataframe_acf_slices[sp_col_str_acf + f"_{dl}_slice {isl}"] = species_acf[i, d, :]
+
+                sp_tot_acf += species_acf[i, d, :]
+
+            # Store ACF
+            self.dataframe_acf_slices[sp_col_str_acf + f"_Total_slice {isl}"] = sp_tot_acf
+
+        # Total current and its ACF
+        tot_acf = zeros(total_acf.shape[-1])
+        for d in range(self.dimensions):
+            dl = self.dim_labels[d]
+            col_str = self.__long_name__ + f"_{dl}_slice {isl}"
+            col_str_acf = self.__long_name__ + f" ACF_{dl}_slice {isl}"
+            self.dataframe_slices[col_str] = total_current[d, :]
+            tot_acf += total_acf[d, :]
+            self.dataframe_acf_slices[col_str_acf] = total_acf[d, :]
+
+        self.dataframe_acf_slices[self.__long_name__ + f" ACF_Total_slice {isl}"] = tot_acf
+
+    def average_slices_data(self):
+        """Average and std over the slices."""
+
+        # Species data
+        for i, sp_name in enumerate(self.species_names):
+            col_str = f"{sp_name} " + self.__long_name__
+            col_str_acf = f"{sp_name} " + self.__long_name__ + " ACF"
+
+            for d in range(self.dimensions):
+                dl = self.dim_labels[d]
+                dim_col_str = [col_str + f"_{dl}_slice {isl}" for isl in range(self.no_slices)]
+                self.dataframe[col_str + f"_{dl}_Mean"] = self.dataframe_slices[dim_col_str].mean(axis=1)
+                self.dataframe[col_str + f"_{dl}_Std"] = self.dataframe_slices[dim_col_str].std(axis=1)
+
+                # ACF averages
+                dim_col_str_acf = [col_str_acf + f"_{dl}_slice {isl}" for isl in range(self.no_slices)]
+
+                self.dataframe_acf[col_str_acf + f"_{dl}_Mean"] = self.dataframe_acf_slices[dim_col_str_acf].mean(axis=1)
+                self.dataframe_acf[col_str_acf + f"_{dl}_Std"] = self.dataframe_acf_slices[dim_col_str_acf].std(axis=1)
+
+            tot_col_str = [col_str_acf + f"_Total_slice {isl}" for isl in range(self.no_slices)]
+            self.dataframe_acf[col_str + "_Total_Mean"] = self.dataframe_acf_slices[tot_col_str].mean(axis=1)
+            self.dataframe_acf[col_str + "_Total_Std"] = self.dataframe_acf_slices[tot_col_str].std(axis=1)
+
+        # Average and std over the slices
+        # Total Current data
+        for d in range(self.dimensions):
+            dl = self.dim_labels[d]
+            dim_col_str = [self.__long_name__ + f"_{dl}_slice {isl}" for isl in range(self.no_slices)]
+            dim_col_str_acf = [self.__long_name__ + f" ACF_{dl}_slice {isl}" for isl in range(self.no_slices)]
+
+            self.dataframe[self.__long_name__ + f"_{dl}_Mean"] = self.dataframe_slices[dim_col_str].mean(axis=1)
+            self.dataframe[self.__long_name__ + f"_{dl}_Std"] = self.dataframe_slices[dim_col_str].std(axis=1)
+            # ACF
+            self.dataframe_acf[self.__long_name__ + f"_{dl}_Mean"] = self.dataframe_acf_slices[dim_col_str_acf].mean(
+                axis=1
+            )
+            self.dataframe_acf[self.__long_name__ + f"_{dl}_Std"] = self.dataframe_acf_slices[dim_col_str_acf].std(axis=1)
 
         # Total ACF
         tot_col_str = [self.__long_name__ + f" ACF_Total_slice {isl}" for isl in range(self.no_slices)]
         self.dataframe_acf[self.__long_name__ + f" ACF_Total_Mean"] = self.dataframe_acf_slices[tot_col_str].mean(axis=1)
         self.dataframe_acf[self.__long_name__ + f" ACF_Total_Std"] = self.dataframe_acf_slices[tot_col_str].std(axis=1)
 
+    def pretty_print(self):
+        """Print observable parameters for help in choice of simulation parameters."""
+
+        print("\n\n{:=^70} \n".format(" " + self.__long_name__ + " "))
+        print("Data saved in: \n", self.filename_hdf)
+        print("Data accessible at: self.dataframe")
+
+        print("\nNo. of slices = {}".format(self.no_slices))
+        print("No. dumps per slice = {}".format(int(self.slice_steps / self.dump_step)))
+        print(
+            "Time interval of autocorrelation function = {:.4e} [s] ~ {} w_p T".format(
+                self.dt * self.slice_steps, int(self.dt * self.slice_steps * self.total_plasma_frequency)
+            )
+        )
+
+
+class MeanSquaredDisplacement(Observable):
+    """Mean Squared Displacement.
+
+    The MSD of each slice is calculated from the unwrapped positions of the particles, i.e. the dumped positions
+    shifted by the number of periodic boundary crossings, with the FFT algorithm of
+    :func:`sarkas.utilities.maths.mean_squared_displacement`. Being a time correlation function its data is stored in
+    :attr:`dataframe_acf` and :attr:`dataframe_acf_slices`, as the one of the VACF.
+
+    Attributes
+    ----------
+    chunk_size : int
+        Maximum number of particles whose positions are Fourier transformed at once. Default = ``None``, all of them.
+
+    """
+
+    on_the_fly_capable = True
+
+    def __init__(self):
+        super(MeanSquaredDisplacement, self).__init__()
+        self.__name__ = "msd"
+        self.__long_name__ = "Mean Squared Displacement"
+        self.acf_observable = True
+        self.resumable = True
+        self.stream_observable = True
+        self.frame_keys = ["time", "pos", "cntr"]
+        self.chunk_size = None
+        self.parallel_slices = True
+
+    @setup_doc
+    def setup(self, params, phase: str = None, no_slices: int = None, **kwargs):
+
+        super().setup_init(params, phase=phase, no_slices=no_slices)
+        self.update_args(**kwargs)
+
+    @arg_update_doc
+    def update_args(self, **kwargs):
+        # Update the attribute with the passed arguments
+        self.__dict__.update(kwargs.copy())
+        self.update_finish()
+
+    @compute_doc
+    def compute(self):
+
+        stream_dumps([self])
+
+    def init_slice_data(self):
+        """Allocate the array storing the particles' unwrapped positions of a slice."""
+        self.slice_pos = zeros((self.dimensions, self.total_num_ptcls, self.slice_steps))
+
+    def update_slice_data(self, frame: dict, it: int):
+        """Unwrap the particles' positions of a dump and copy them into the slice array.
+
+        Parameters
+        ----------
+        frame : dict
+            Dump's data.
+
+        it : int
+            Index of the dump within the slice.
+
+        """
+        for d in range(self.dimensions):
+            self.slice_pos[d, :, it] = frame["pos"][:, d] + frame["cntr"][:, d] * self.box_lengths[d]
+
+    def calc_slice_data(self, isl: int, time: ndarray):
+        """Calculate the msd of a slice and add the data to the acf_slices dataframe.
+
+        Parameters
+        ----------
+        isl : int
+            Slice index.
+
+        time : numpy.ndarray
+            Time array of the slice.
+
+        """
+        # Return an array of shape( num_species, dim + 1, slice_steps)
+        msd = calc_msd(self.slice_pos, self.species_num, self.chunk_size)
+
+        for i, sp1 in enumerate(self.species_names):
+            sp_msd_str = f"{sp1} " + self.__name__.swapcase()
+            for d in range(self.dimensions):
+                self.dataframe_acf_slices[sp_msd_str + f"_{self.dim_labels[d]}_slice {isl}"] = msd[i, d, :]
+
+            self.dataframe_acf_slices[sp_msd_str + f"_Total_slice {isl}"] = msd[i, -1, :]
+
+    def average_slices_data(self):
+        """Average the data from all the slices and add it to the dataframe."""
+
+        for i, sp1 in enumerate(self.species_names):
+            sp_msd_str = f"{sp1} " + self.__name__.swapcase()
+            for d in range(self.dimensions):
+                dl = self.dim_labels[d]
+                dcol_str = [sp_msd_str + f"_{dl}_slice {isl}" for isl in range(self.no_slices)]
+                self.dataframe_acf[sp_msd_str + f"_{dl}_Mean"] = self.dataframe_acf_slices[dcol_str].mean(axis=1)
+                self.dataframe_acf[sp_msd_str + f"_{dl}_Std"] = self.dataframe_acf_slices[dcol_str].std(axis=1)
+
+            tot_col_str = [sp_msd_str + f"_Total_slice {isl}" for isl in range(self.no_slices)]
+
+            self.dataframe_acf[sp_msd_str + "_Total_Mean"] = self.dataframe_acf_slices[tot_col_str].mean(axis=1)
+            self.dataframe_acf[sp_msd_str + "_Total_Std"] = self.dataframe_acf_slices[tot_col_str].std(axis=1)
+
+    def pretty_print(self):
+        """Print observable parameters for help in choice of simulation parameters."""
+
+        print("\n\n{:=^70} \n".format(" " + self.__long_name__ + " "))
+        print("Data saved in: \n", self.filename_hdf_acf)
+        print("Data accessible at: self.dataframe_acf")
+
+        print("\nNo. of slices = {}".format(self.no_slices))
+        print("No. dumps per slice = {}".format(int(self.slice_steps / self.dump_step)))
+
+        print(
+            "Time interval of mean squared displacement = {:.4e} [s] ~ {} w_p T".format(
+                self.dt * self.slice_steps, int(self.dt * self.slice_steps * self.total_plasma_frequency)
+            )
+        )
+
 
 class PressureTensor(Observable):
     """Pressure Tensor."""
 
+    on_the_fly_capable = True
+
     def __init__(self):
         super().__init__()
         self.__name__ = "pressure_tensor"
         self.__long_name__ = "Pressure Tensor"
         self.acf_observable = True
+        self.stream_observable = True
+        self.frame_keys = ["time", "vel", "virial"]
+        self.correlator_observable = True
+        self.parallel_slices = True
 
     @setup_doc
     def setup(self, params, phase: str = None, no_slices: int = None, **kwargs):
@@ -1957,207 +3139,266 @@ class PressureTensor(Observable):
     @compute_doc
     def compute(self):
 
-        start_slice = 0
-        end_slice = self.slice_steps * self.dump_step
-        time = zeros(self.slice_steps)
-        # Initialize timer
-        t0 = self.timer.current()
+        stream_dumps([self])
 
-        # Dataframes' columns names
-        pt_str_kin = "Pressure Tensor Kinetic"
-        pt_str_pot = "Pressure Tensor Potential"
-        pt_str = "Pressure Tensor"
-        pt_acf_str_kin = "Pressure Tensor Kinetic ACF"
-        pt_acf_str_pot = "Pressure Tensor Potential ACF"
-        pt_acf_str_kinpot = "Pressure Tensor Kin-Pot ACF"
-        pt_acf_str_potkin = "Pressure Tensor Pot-Kin ACF"
-        pt_acf_str = "Pressure Tensor ACF"
+    def init_stream(self):
+        """Reset the streaming counters, pre compute the dataframes' columns names, and allocate the slices arrays."""
+        super().init_stream()
+        self.df_column_names()
+        # Pressure and Delta Pressure
+        self.pressure_slices = zeros((self.no_slices, 2, self.slice_steps))
+        # Kinetic, Potential, and Total pressure tensor
+        self.pt_slices = zeros((self.no_slices, self.dimensions, self.dimensions, 3, self.slice_steps))
+        self.pressure_acf_slices = zeros((self.no_slices, 2, self.slice_steps))
+        # Kinetic, Potential, Kin-Pot, Pot-Kin, and Total ACF
+        self.pt_acf_slices = zeros(
+            (self.no_slices, self.dimensions, self.dimensions, self.dimensions, self.dimensions, 5, self.slice_steps)
+        )
 
-        if self.dimensions == 3:
-            dim_lbl = ["x", "y", "z"]
-        elif self.dimensions == 2:
-            dim_lbl = ["x", "y"]
+    def init_slice_data(self):
+        """Allocate the arrays storing the pressure and the pressure tensor of a slice."""
+        self.slice_pressure = zeros(self.slice_steps)
+        self.slice_pt_kin = zeros((self.dimensions, self.dimensions, self.slice_steps))
+        self.slice_pt_pot = zeros((self.dimensions, self.dimensions, self.slice_steps))
+        self.slice_pt = zeros((self.dimensions, self.dimensions, self.slice_steps))
 
-        # Pre compute the number of columns in the dataframe and make the list of names
-        self.df_column_names()
+    def update_slice_data(self, frame: dict, it: int):
+        """Calculate the pressure tensor of a dump.
 
-        # Initialize timer
-        t0 = self.timer.current()
+        Parameters
+        ----------
+        frame : dict
+            Dump's data.
 
-        # Let's compute
-        for isl in range(self.no_slices):
-            print("\nCalculating stress tensor and the acfs for slice {}/{}.".format(isl + 1, self.no_slices))
-            # Parse the particles from the dump files
-            pressure = zeros(self.slice_steps)
-            pt_kin_temp = zeros((self.dimensions, self.dimensions, self.slice_steps))
-            pt_pot_temp = zeros((self.dimensions, self.dimensions, self.slice_steps))
-            pt_temp = zeros((self.dimensions, self.dimensions, self.slice_steps))
-
-            for it, dump in enumerate(
-                tqdm(
-                    range(start_slice, end_slice, self.dump_step),
-                    desc="Calculating Pressure Tensor",
-                    disable=not self.verbose,
-                )
-            ):
-                datap = load_from_restart(self.dump_dir, dump)
-                time[it] = datap["time"]
+        it : int
+            Index of the dump within the slice.
 
-                pressure[it], pt_kin_temp[:, :, it], pt_pot_temp[:, :, it], pt_temp[:, :, it] = calc_pressure_tensor(
-                    datap["vel"], datap["virial"], self.species_masses, self.species_num, self.box_volume, self.dimensions
-                )
+        """
+        (
+            self.slice_pressure[it],
+            self.slice_pt_kin[:, :, it],
+            self.slice_pt_pot[:, :, it],
+            self.slice_pt[:, :, it],
+        ) = calc_pressure_tensor(
+            frame["vel"], frame["virial"], self.species_masses, self.species_num, self.box_volume, self.dimensions
+        )
 
-            if isl == 0:
-                self.dataframe["Time"] = time.copy()
-                self.dataframe_acf["Time"] = time.copy()
-                self.dataframe_slices["Time"] = time.copy()
-                self.dataframe_acf_slices["Time"] = time.copy()
-
-            self.dataframe_slices["Pressure_slice {}".format(isl)] = pressure
-            self.dataframe_acf_slices["Pressure ACF_slice {}".format(isl)] = correlationfunction(pressure, pressure)
-            # This is needed for the bulk viscosity
-            delta_pressure = pressure - pressure.mean()
-            self.dataframe_slices["Delta Pressure_slice {}".format(isl)] = delta_pressure
-            self.dataframe_acf_slices["Delta Pressure ACF_slice {}".format(isl)] = correlationfunction(
-                delta_pressure, delta_pressure
-            )
+    def calc_slice_data(self, isl: int, time: ndarray):
+        """Calculate the ACFs of the pressure tensor of a slice and store them in the slices arrays.
 
-            for i, ax1 in enumerate(dim_lbl):
-                pt_temp[i, i, :] -= pressure.mean()
+        Parameters
+        ----------
+        isl : int
+            Slice index.
 
-            # The reason for dividing these two loops is that I want a specific order in the dataframe.
-            # Pressure, Stress Tensor, All
-            for i, ax1 in enumerate(dim_lbl):
-                for j, ax2 in enumerate(dim_lbl):
-                    self.dataframe_slices[pt_str_kin + " {}{}_slice {}".format(ax1, ax2, isl)] = pt_kin_temp[i, j, :]
-                    self.dataframe_slices[pt_str_pot + " {}{}_slice {}".format(ax1, ax2, isl)] = pt_pot_temp[i, j, :]
-                    self.dataframe_slices[pt_str + " {}{}_slice {}".format(ax1, ax2, isl)] = pt_temp[i, j, :]
+        time : numpy.ndarray
+            Time array of the slice.
 
-            # Calculate the ACF of the thermal fluctuations of the pressure tensor elements
-            # Note: C_{abcd} = < sigma_{ab} sigma_{cd} >
-            for i, ax1 in enumerate(dim_lbl):
-                for j, ax2 in enumerate(dim_lbl):
-                    for k, ax3 in enumerate(dim_lbl):
-                        for l, ax4 in enumerate(dim_lbl):
-                            C_ijkl_kin = correlationfunction(pt_kin_temp[i, j, :], pt_kin_temp[k, l, :])
-                            C_ijkl_pot = correlationfunction(pt_pot_temp[i, j, :], pt_pot_temp[k, l, :])
-                            C_ijkl_kinpot = correlationfunction(pt_kin_temp[i, j, :], pt_pot_temp[k, l, :])
-                            C_ijkl_potkin = correlationfunction(pt_pot_temp[i, j, :], pt_kin_temp[k, l, :])
-
-                            C_ijkl = correlationfunction(pt_temp[i, j, :], pt_temp[k, l, :])
-
-                            # Kinetic
-                            self.dataframe_acf_slices[
-                                pt_acf_str_kin + " {}{}{}{}_slice {}".format(ax1, ax2, ax3, ax4, isl)
-                            ] = C_ijkl_kin
-                            # Potential
-                            self.dataframe_acf_slices[
-                                pt_acf_str_pot + " {}{}{}{}_slice {}".format(ax1, ax2, ax3, ax4, isl)
-                            ] = C_ijkl_pot
-                            # Kin-Pot
-                            self.dataframe_acf_slices[
-                                pt_acf_str_kinpot + " {}{}{}{}_slice {}".format(ax1, ax2, ax3, ax4, isl)
-                            ] = C_ijkl_kinpot
-                            # Pot-Kin
-                            self.dataframe_acf_slices[
-                                pt_acf_str_potkin + " {}{}{}{}_slice {}".format(ax1, ax2, ax3, ax4, isl)
-                            ] = C_ijkl_potkin
-                            # Total
-                            self.dataframe_acf_slices[
-                                pt_acf_str + " {}{}{}{}_slice {}".format(ax1, ax2, ax3, ax4, isl)
-                            ] = C_ijkl
-
-            start_slice += self.slice_steps * self.dump_step
-            end_slice += self.slice_steps * self.dump_step
-            # end of slice loop
+        """
+        pressure = self.slice_pressure
+        # This is needed for the bulk viscosity
+        delta_pressure = pressure - pressure.mean()
 
-        # Average and std over the slices
-        col_str = ["Pressure_slice {}".format(isl) for isl in range(self.no_slices)]
-        self.dataframe["Pressure_Mean"] = self.dataframe_slices[col_str].mean(axis=1)
-        self.dataframe["Pressure_Std"] = self.dataframe_slices[col_str].std(axis=1)
+        self.pressure_slices[isl, 0] = pressure
+        self.pressure_slices[isl, 1] = delta_pressure
+        self.pressure_acf_slices[isl] = batched_correlationfunction(self.pressure_slices[isl])
 
-        col_str = ["Pressure ACF_slice {}".format(isl) for isl in range(self.no_slices)]
-        self.dataframe_acf["Pressure ACF_Mean"] = self.dataframe_acf_slices[col_str].mean(axis=1)
-        self.dataframe_acf["Pressure ACF_Std"] = self.dataframe_acf_slices[col_str].std(axis=1)
+        for i in range(self.dimensions):
+            self.slice_pt[i, i, :] -= pressure.mean()
 
-        col_str = ["Delta Pressure_slice {}".format(isl) for isl in range(self.no_slices)]
-        self.dataframe["Delta Pressure_Mean"] = self.dataframe_slices[col_str].mean(axis=1)
-        self.dataframe["Delta Pressure_Std"] = self.dataframe_slices[col_str].std(axis=1)
+        self.pt_slices[isl, :, :, 0] = self.slice_pt_kin
+        self.pt_slices[isl, :, :, 1] = self.slice_pt_pot
+        self.pt_slices[isl, :, :, 2] = self.slice_pt
 
-        col_str = ["Delta Pressure ACF_slice {}".format(isl) for isl in range(self.no_slices)]
-        self.dataframe_acf["Delta Pressure ACF_Mean"] = self.dataframe_acf_slices[col_str].mean(axis=1)
-        self.dataframe_acf["Delta Pressure ACF_Std"] = self.dataframe_acf_slices[col_str].std(axis=1)
+        # Calculate the ACF of the thermal fluctuations of the pressure tensor elements
+        # Note: C_{abcd} = < sigma_{ab} sigma_{cd} >
+        self.pt_acf_slices[isl] = calc_pressure_tensor_acf(self.slice_pt_kin, self.slice_pt_pot, self.slice_pt)
 
-        for i, ax1 in enumerate(dim_lbl):
-            for j, ax2 in enumerate(dim_lbl):
-                # Kinetic Terms
-                ij_col_str = [pt_str_kin + f" {ax1}{ax2}_slice {isl}" for isl in range(self.no_slices)]
-                self.dataframe[pt_str_kin + f" {ax1}{ax2}_Mean"] = self.dataframe_slices[ij_col_str].mean(axis=1)
-                self.dataframe[pt_str_kin + f" {ax1}{ax2}_Std"] = self.dataframe_slices[ij_col_str].std(axis=1)
+    def slice_arrays(self):
+        """Return the names of the slices arrays of the pressure and of the pressure tensor.
 
-                # Potential Terms
-                ij_col_str = [pt_str_pot + f" {ax1}{ax2}_slice {isl}" for isl in range(self.no_slices)]
-                self.dataframe[pt_str_pot + f" {ax1}{ax2}_Mean"] = self.dataframe_slices[ij_col_str].mean(axis=1)
-                self.dataframe[pt_str_pot + f" {ax1}{ax2}_Std"] = self.dataframe_slices[ij_col_str].std(axis=1)
+        Returns
+        -------
+        names : list
+            Attributes' names.
 
-                # Full
-                ij_col_str = [pt_str + f" {ax1}{ax2}_slice {isl}" for isl in range(self.no_slices)]
-                self.dataframe[pt_str + f" {ax1}{ax2}_Mean"] = self.dataframe_slices[ij_col_str].mean(axis=1)
-                self.dataframe[pt_str + f" {ax1}{ax2}_Std"] = self.dataframe_slices[ij_col_str].std(axis=1)
+        """
+        return ["pressure_slices", "pt_slices", "pressure_acf_slices", "pt_acf_slices"]
 
-        for i, ax1 in enumerate(dim_lbl):
-            for j, ax2 in enumerate(dim_lbl):
-                for k, ax3 in enumerate(dim_lbl):
-                    for l, ax4 in enumerate(dim_lbl):
-                        # Kinetic Terms
-                        ij_col_acf_str = [
-                            pt_acf_str_kin + f" {ax1}{ax2}{ax3}{ax4}_slice {isl}" for isl in range(self.no_slices)
-                        ]
-                        mean_column = pt_acf_str_kin + f" {ax1}{ax2}{ax3}{ax4}_Mean"
-                        std_column = pt_acf_str_kin + f" {ax1}{ax2}{ax3}{ax4}_Std"
-                        self.dataframe_acf[mean_column] = self.dataframe_acf_slices[ij_col_acf_str].mean(axis=1)
-                        self.dataframe_acf[std_column] = self.dataframe_acf_slices[ij_col_acf_str].std(axis=1)
-
-                        # Potential Terms
-                        ij_col_acf_str = [
-                            pt_acf_str_pot + f" {ax1}{ax2}{ax3}{ax4}_slice {isl}" for isl in range(self.no_slices)
-                        ]
-                        mean_column = pt_acf_str_pot + f" {ax1}{ax2}{ax3}{ax4}_Mean"
-                        std_column = pt_acf_str_pot + f" {ax1}{ax2}{ax3}{ax4}_Std"
-                        self.dataframe_acf[mean_column] = self.dataframe_acf_slices[ij_col_acf_str].mean(axis=1)
-                        self.dataframe_acf[std_column] = self.dataframe_acf_slices[ij_col_acf_str].std(axis=1)
-
-                        # Kinetic-Potential Terms
-                        ij_col_acf_str = [
-                            pt_acf_str_kinpot + f" {ax1}{ax2}{ax3}{ax4}_slice {isl}" for isl in range(self.no_slices)
-                        ]
-                        mean_column = pt_acf_str_kinpot + f" {ax1}{ax2}{ax3}{ax4}_Mean"
-                        std_column = pt_acf_str_kinpot + f" {ax1}{ax2}{ax3}{ax4}_Std"
-                        self.dataframe_acf[mean_column] = self.dataframe_acf_slices[ij_col_acf_str].mean(axis=1)
-                        self.dataframe_acf[std_column] = self.dataframe_acf_slices[ij_col_acf_str].std(axis=1)
-
-                        # Potential-Kinetic Terms
-                        ij_col_acf_str = [
-                            pt_acf_str_potkin + f" {ax1}{ax2}{ax3}{ax4}_slice {isl}" for isl in range(self.no_slices)
-                        ]
-                        mean_column = pt_acf_str_potkin + f" {ax1}{ax2}{ax3}{ax4}_Mean"
-                        std_column = pt_acf_str_potkin + f" {ax1}{ax2}{ax3}{ax4}_Std"
-                        self.dataframe_acf[mean_column] = self.dataframe_acf_slices[ij_col_acf_str].mean(axis=1)
-                        self.dataframe_acf[std_column] = self.dataframe_acf_slices[ij_col_acf_str].std(axis=1)
-
-                        # Full
-                        ij_col_acf_str = [
-                            pt_acf_str + f" {ax1}{ax2}{ax3}{ax4}_slice {isl}" for isl in range(self.no_slices)
-                        ]
-                        mean_column = pt_acf_str + f" {ax1}{ax2}{ax3}{ax4}_Mean"
-                        std_column = pt_acf_str + f" {ax1}{ax2}{ax3}{ax4}_Std"
-                        self.dataframe_acf[mean_column] = self.dataframe_acf_slices[ij_col_acf_str].mean(axis=1)
-                        self.dataframe_acf[std_column] = self.dataframe_acf_slices[ij_col_acf_str].std(axis=1)
+    def calc_correlator_slice_data(self, isl: int, signal: ndarray, correlator: MultipleTauCorrelator):
+        """Calculate the pressure tensor and its ACFs of a slice from the on-the-fly correlator.
 
-        self.save_hdf()
+        The total pressure tensor and the pressure are linear combinations of the kinetic and potential elements, hence
+        their ACFs are the same combinations of the correlation functions of the elements. As in
+        :meth:`calc_slice_data` the average pressure is subtracted from the diagonal elements of the total pressure
+        tensor and from the pressure.
 
-        tend = self.timer.current()
-        self.time_stamp("Stress Tensor and ACF Calculation", self.timer.time_division(tend - t0))
+        Parameters
+        ----------
+        isl : int
+            Slice index.
+
+        signal : numpy.ndarray
+            Unique elements of the kinetic and potential pressure tensors at each dump of the slice.
+            Shape = (``slice_steps``, ``2 * no_elements``)
+
+        correlator : :class:`sarkas.utilities.maths.MultipleTauCorrelator`
+            Correlator of the slice.
+
+        """
+        el_map, diag = self.pressure_tensor_elements()
+        no_el = self.dimensions * (self.dimensions + 1) // 2
+
+        # Expand the unique elements to the full tensors. Shape = (2, dimensions, dimensions, slice_steps)
+        tensors = signal.reshape(-1, 2, no_el).transpose(1, 2, 0)[:, el_map]
+        pt = tensors.sum(axis=0)
+        pressure = pt.trace() / self.dimensions
+        pressure_mean = correlator.mean().reshape(2, no_el).sum(axis=0)[diag].sum() / self.dimensions
+
+        self.pressure_slices[isl, 0] = pressure
+        self.pressure_slices[isl, 1] = pressure - pressure_mean
+        self.pt_slices[isl, :, :, 0] = tensors[0]
+        self.pt_slices[isl, :, :, 1] = tensors[1]
+        self.pt_slices[isl, :, :, 2] = pt - pressure_mean * identity(self.dimensions)[:, :, None]
+
+        # Correlation functions of the (kin, pot) x (kin, pot) pairs of elements. Shape = (2, no_el, 2, no_el, no_lags)
+        corr = correlator.correlation().reshape(2, no_el, 2, no_el, -1)
+        # Shifting the kinetic diagonal elements by the average pressure shifts the total ones.
+        shift = zeros(2 * no_el)
+        shift[diag] = pressure_mean
+        shifted_corr = correlator.correlation(shift).reshape(2, no_el, 2, no_el, -1)
+
+        no_lags = corr.shape[-1]
+        if self.pt_acf_slices.shape[-1] != no_lags:
+            self.pressure_acf_slices = zeros((self.no_slices, 2, no_lags))
+            self.pt_acf_slices = zeros((self.no_slices, *self.pt_acf_slices.shape[1:-1], no_lags))
+
+        # Kinetic, Potential, Kin-Pot, Pot-Kin, Total
+        el_acf = array(
+            [corr[0, :, 0], corr[1, :, 1], corr[0, :, 1], corr[1, :, 0], shifted_corr.sum(axis=(0, 2))]
+        )
+        diag_acf = corr.sum(axis=(0, 2))[diag][:, diag]
+        shifted_diag_acf = el_acf[4][diag][:, diag]
+        self.pressure_acf_slices[isl, 0] = diag_acf.sum(axis=(0, 1)) / self.dimensions**2
+        self.pressure_acf_slices[isl, 1] = shifted_diag_acf.sum(axis=(0, 1)) / self.dimensions**2
+
+        # Shape = (dimensions, dimensions, dimensions, dimensions, 5, no_lags)
+        self.pt_acf_slices[isl] = el_acf[:, el_map[:, :, None, None], el_map[None, None, :, :], :].transpose(
+            1, 2, 3, 4, 0, 5
+        )
+
+    def correlator_pairs(self):
+        """Return the channels of the on-the-fly correlator, i.e. the unique elements of the kinetic and potential
+        pressure tensors, and all their pairs.
+
+        Returns
+        -------
+        no_channels : int
+            Number of channels of the signal.
+
+        pair_a : numpy.ndarray
+            Channel of the later sample of each pair.
+
+        pair_b : numpy.ndarray
+            Channel of the earlier sample of each pair.
+
+        """
+        no_channels = self.dimensions * (self.dimensions + 1)
+        pair_a, pair_b = indices((no_channels, no_channels)).reshape(2, -1)
+
+        return no_channels, pair_a, pair_b
+
+    def correlator_signal(self, ptcls):
+        """Calculate the unique elements of the kinetic and potential pressure tensors.
+
+        Parameters
+        ----------
+        ptcls : :class:`sarkas.particles.Particles`
+            Particles' data.
+
+        Returns
+        -------
+        signal : numpy.ndarray
+            Kinetic elements followed by the potential elements. Shape = (``dimensions * (dimensions + 1)``,)
+
+        """
+        _, pt_kin, pt_pot, _ = calc_pressure_tensor(
+            ptcls.vel[:, : self.dimensions],
+            ptcls.virial[: self.dimensions, : self.dimensions],
+            self.species_masses,
+            self.species_num,
+            self.box_volume,
+            self.dimensions,
+        )
+        iu, ju = triu_indices(self.dimensions)
+
+        # Symmetrized as in calc_pressure_tensor_acf
+        return concatenate((0.5 * (pt_kin[iu, ju] + pt_kin[ju, iu]), 0.5 * (pt_pot[iu, ju] + pt_pot[ju, iu])))
+
+    def pressure_tensor_elements(self):
+        """Return the map from the tensor indices to the unique elements and the unique diagonal elements.
+
+        Returns
+        -------
+        el_map : numpy.ndarray
+            Index of the unique element of each pair of tensor indices. Shape = (``dimensions``, ``dimensions``)
+
+        diag : numpy.ndarray
+            Indices of the diagonal elements among the unique ones.
+
+        """
+        iu, ju = triu_indices(self.dimensions)
+        el_map = zeros((self.dimensions, self.dimensions), dtype=int64)
+        el_map[iu, ju] = arange(iu.size)
+        el_map[ju, iu] = arange(iu.size)
+
+        return el_map, el_map[arange(self.dimensions), arange(self.dimensions)]
+
+    def average_slices_data(self):
+        """Average and std over the slices and build the dataframes from the slices arrays."""
+
+        time = self.dataframe_slices["Time"].to_numpy()
+        acf_time = self.dataframe_acf_slices["Time"].to_numpy()
+        # The on-the-fly ACFs are calculated only at the lags of the multiple-tau correlator
+        no_lags = self.pt_acf_slices.shape[-1]
+
+        # Columns are ordered as in df_column_names: Pressure, Delta Pressure, and then each pressure tensor element.
+        data_slices = concatenate(
+            (self.pressure_slices, self.pt_slices.reshape(self.no_slices, -1, self.slice_steps)), axis=1
+        )
+        acf_slices = concatenate(
+            (self.pressure_acf_slices, self.pt_acf_slices.reshape(self.no_slices, -1, no_lags)), axis=1
+        )
+
+        self.dataframe_slices = DataFrame(
+            column_stack((time, data_slices.reshape(-1, self.slice_steps).transpose())),
+            columns=self.dataframe_slices.columns,
+        )
+        self.dataframe_acf_slices = DataFrame(
+            column_stack((acf_time, acf_slices.reshape(-1, no_lags).transpose())),
+            columns=self.dataframe_acf_slices.columns,
+        )
+
+        # Sample std as in pandas, i.e. NaN for a single slice
+        if self.no_slices > 1:
+            data_std = data_slices.std(axis=0, ddof=1)
+            acf_std = acf_slices.std(axis=0, ddof=1)
+        else:
+            data_std = full(data_slices.shape[1:], nan)
+            acf_std = full(acf_slices.shape[1:], nan)
+
+        # Mean and Std columns alternate for each quantity
+        data_mean_std = array([data_slices.mean(axis=0), data_std]).transpose(1, 0, 2)
+        acf_mean_std = array([acf_slices.mean(axis=0), acf_std]).transpose(1, 0, 2)
+
+        self.dataframe = DataFrame(
+            column_stack((time, data_mean_std.reshape(-1, self.slice_steps).transpose())),
+            columns=self.dataframe.columns,
+        )
+        self.dataframe_acf = DataFrame(
+            column_stack((acf_time, acf_mean_std.reshape(-1, no_lags).transpose())),
+            columns=self.dataframe_acf.columns,
+        )
 
     def sum_rule(self, beta, rdf, potential):
         r"""
@@ -2237,17 +3478,33 @@ class RadialDistributionFunction(Observable):
     Attributes
     ----------
     no_bins : int
-        Number of bins.
+        Number of bins. It equals ``rdf_nbins`` if ``rdf_method = "force_loop"``.
 
     dr_rdf : float
         Size of each bin.
 
+    rdf_method : str
+        Source of the pair distances histograms. Choices = ``["force_loop", "positions"]``. Default = "force_loop",
+        i.e. the histograms accumulated up to the cutoff radius in the force loop and saved in the dumps.
+        "positions" calculates them from the dumped positions with :func:`calc_rdf_hist` up to ``rdf_max_radius``.
+        It works with any force algorithm and with ``rdf_in_loop = False``.
+
+    rdf_max_radius : float
+        Largest distance of the RDF if ``rdf_method = "positions"``. Default = half of the smallest box's side.
+
     """
 
+    on_the_fly_capable = True
+
     def __init__(self):
         super().__init__()
         self.__name__ = "rdf"
         self.__long_name__ = "Radial Distribution Function"
+        self.stream_observable = True
+        self.frame_keys = ["rdf_hist"]
+        self.no_bins = None
+        self.rdf_method = "force_loop"
+        self.rdf_max_radius = None
 
     @setup_doc
     def setup(self, params, phase: str = None, no_slices: int = None, **kwargs):
@@ -2261,9 +3518,24 @@ class RadialDistributionFunction(Observable):
         # Update the attribute with the passed arguments
         self.__dict__.update(kwargs.copy())
 
+        if self.rdf_method not in ["force_loop", "positions"]:
+            raise ValueError("rdf_method not available. Choose from ['force_loop', 'positions']. Note case sensitivity.")
+
         # These definitions are needed for the print out.
-        self.rc = self.cutoff_radius
-        self.no_bins = self.rdf_nbins
+        if self.rdf_method == "positions":
+            # Farther pairs would be counted more than once
+            half_box = 0.5 * self.box_lengths[self.box_lengths > 0.0].min()
+            if self.rdf_max_radius is None:
+                self.rdf_max_radius = half_box
+            elif self.rdf_max_radius > half_box:
+                raise ValueError(f"rdf_max_radius = {self.rdf_max_radius} is larger than half the box {half_box}.")
+            self.rc = self.rdf_max_radius
+            if self.no_bins is None:
+                self.no_bins = self.rdf_nbins
+            self.frame_keys = ["pos", "id"]
+        else:
+            self.rc = self.cutoff_radius
+            self.no_bins = self.rdf_nbins
         self.dr_rdf = self.rc / self.no_bins
 
         self.update_finish()
@@ -2271,10 +3543,11 @@ class RadialDistributionFunction(Observable):
     @compute_doc
     def compute(self):
 
-        # initialize temporary arrays
-        r_values = zeros(self.no_bins)
-        bin_vol = zeros(self.no_bins)
-        pair_density = zeros((self.num_species, self.num_species))
+        if self.rdf_method == "positions":
+            self.compute_from_positions()
+            return
+
+        t0 = self.timer.current()
 
         # This is needed to be certain the number of bins is the same.
         # if not isinstance(rdf_hist, ndarray):
@@ -2284,29 +3557,85 @@ class RadialDistributionFunction(Observable):
         #     name, ext = os.path.splitext(dumps_list[-1])
         #     _, number = name.split('_')
         datap = load_from_restart(self.dump_dir, 0)
+        self.init_histogram_data(datap["rdf_hist"].shape[0])
+
+        for isl in tqdm(range(self.no_slices), disable=not self.verbose):
+
+            # Grab the data from the dumps. The -1 is for '0'-indexing
+            dump_no = (isl + 1) * (self.slice_steps - 1) * self.dump_step
+            datap = load_from_restart(self.dump_dir, int(dump_no))
+            self.calc_slice_data(isl, datap["rdf_hist"], self.slice_steps * self.dump_step)
+
+        self.average_slices_data()
+        self.save_hdf()
+        self.save_pickle()
+        tend = self.timer.current()
+        self.time_stamp(self.__long_name__ + " Calculation", self.timer.time_division(tend - t0))
+
+    def compute_from_positions(self):
+        """Calculate the histograms from the positions of every dump of each slice, and of each run if multi run.
+        Each slice and run is a task of :func:`sarkas.utilities.parallel.process_map` with ``workers`` processes."""
+        t0 = self.timer.current()
+        self.init_histogram_data(self.no_bins)
+
+        tasks = []
+        for isl in range(self.no_slices):
+            slice_dumps = self.slice_steps * self.dump_step
+            dumps = range(isl * slice_dumps, (isl + 1) * slice_dumps, self.dump_step)
+            for dump_dir in self.dump_dirs_list:
+                tasks.append((dump_dir, dumps, self.box_lengths, self.rc, self.no_bins, self.num_species))
+        runs_hist = process_map(calc_rdf_hist_dumps, tasks, self.workers)
 
+        no_runs = len(self.dump_dirs_list)
+        for isl in range(self.no_slices):
+            # Sum over the runs in a fixed order
+            rdf_hist = zeros((self.no_bins, self.num_species, self.num_species))
+            for hist in runs_hist[isl * no_runs : (isl + 1) * no_runs]:
+                rdf_hist += hist
+
+            self.calc_slice_data(isl, rdf_hist, self.slice_steps * no_runs)
+
+        self.average_slices_data()
+        self.save_hdf()
+        self.save_pickle()
+        tend = self.timer.current()
+        self.time_stamp(self.__long_name__ + " Calculation", self.timer.time_division(tend - t0))
+
+    def init_histogram_data(self, no_bins: int):
+        """Calculate the bins' volumes and the pair densities needed for the normalization of the histograms.
+
+        Parameters
+        ----------
+        no_bins : int
+            Number of bins of the histograms saved in the dumps.
+
+        """
         # Make sure you are getting the right number of bins and redefine dr_rdf.
-        self.no_bins = datap["rdf_hist"].shape[0]
+        self.no_bins = no_bins
         self.dr_rdf = self.rc / self.no_bins
 
-        t0 = self.timer.current()
+        # initialize temporary arrays
+        r_values = zeros(self.no_bins)
+        self.bin_vol = zeros(self.no_bins)
+        self.pair_density = zeros((self.num_species, self.num_species))
+
         # No. of pairs per volume
         for i, sp1 in enumerate(self.species_num):
-            pair_density[i, i] = sp1 * (sp1 - 1) / self.box_volume
+            self.pair_density[i, i] = sp1 * (sp1 - 1) / self.box_volume
             if self.num_species > 1:
                 for j, sp2 in enumerate(self.species_num[i + 1 :], i + 1):
-                    pair_density[i, j] = sp1 * sp2 / self.box_volume
+                    self.pair_density[i, j] = sp1 * sp2 / self.box_volume
 
         # Calculate the volume of each bin
         # The formula for the N-dimensional sphere is
         # pi^{N/2}/( factorial( N/2) )
         # from https://en.wikipedia.org/wiki/N-sphere#:~:text=In%20general%2C%20the-,volume,-%2C%20in%20n%2Ddimensional
         sphere_shell_const = (pi ** (self.dimensions / 2.0)) / factorial(self.dimensions / 2.0)
-        bin_vol[0] = sphere_shell_const * self.dr_rdf**self.dimensions
+        self.bin_vol[0] = sphere_shell_const * self.dr_rdf**self.dimensions
         for ir in range(1, self.no_bins):
             r1 = ir * self.dr_rdf
             r2 = (ir + 1) * self.dr_rdf
-            bin_vol[ir] = sphere_shell_const * (r2**self.dimensions - r1**self.dimensions)
+            self.bin_vol[ir] = sphere_shell_const * (r2**self.dimensions - r1**self.dimensions)
             r_values[ir] = (ir + 0.5) * self.dr_rdf
 
         # Save the ra values for simplicity
@@ -2314,18 +3643,30 @@ class RadialDistributionFunction(Observable):
 
         self.dataframe["Distance"] = r_values
         self.dataframe_slices["Distance"] = r_values
-        for isl in tqdm(range(self.no_slices), disable=not self.verbose):
 
-            # Grab the data from the dumps. The -1 is for '0'-indexing
-            dump_no = (isl + 1) * (self.slice_steps - 1) * self.dump_step
-            datap = load_from_restart(self.dump_dir, int(dump_no))
-            for i, sp1 in enumerate(self.species_names):
-                for j, sp2 in enumerate(self.species_names[i:], i):
-                    denom_const = pair_density[i, j] * self.slice_steps * self.dump_step
-                    col_str = "{}-{} RDF_slice {}".format(sp1, sp2, isl)
-                    self.dataframe_slices[col_str] = (
-                        (datap["rdf_hist"][:, i, j] + datap["rdf_hist"][:, j, i]) / denom_const / bin_vol
-                    )
+    def calc_slice_data(self, isl: int, rdf_hist: ndarray, no_samples: int):
+        """Normalize the histograms of a slice and add them to the slices dataframe.
+
+        Parameters
+        ----------
+        isl : int
+            Slice index.
+
+        rdf_hist : numpy.ndarray
+            Pair distances histograms. Shape = (``no_bins``, ``num_species``, ``num_species``).
+
+        no_samples : int
+            Number of configurations accumulated in the histograms.
+
+        """
+        for i, sp1 in enumerate(self.species_names):
+            for j, sp2 in enumerate(self.species_names[i:], i):
+                denom_const = self.pair_density[i, j] * no_samples
+                col_str = "{}-{} RDF_slice {}".format(sp1, sp2, isl)
+                self.dataframe_slices[col_str] = (rdf_hist[:, i, j] + rdf_hist[:, j, i]) / denom_const / self.bin_vol
+
+    def average_slices_data(self):
+        """Average and std over the slices."""
 
         for i, sp1 in enumerate(self.species_names):
             for j, sp2 in enumerate(self.species_names[i:], i):
@@ -2333,10 +3674,59 @@ class RadialDistributionFunction(Observable):
                 self.dataframe["{}-{} RDF_Mean".format(sp1, sp2)] = self.dataframe_slices[col_str].mean(axis=1)
                 self.dataframe["{}-{} RDF_Std".format(sp1, sp2)] = self.dataframe_slices[col_str].std(axis=1)
 
+    def consume(self, frame: dict):
+        """
+        Grab the histograms from the dumps used in :meth:`compute`, i.e. the last dump of each slice.
+        If ``rdf_method = "positions"`` the histograms of every dump are calculated and accumulated instead.
+        Only one run is streamed.
+
+        Parameters
+        ----------
+        frame : dict
+            Dump's data. It must contain the key "rdf_hist", or the keys "pos" and "id".
+
+        """
+        it = self.frames_consumed
+        self.frames_consumed += 1
+
+        if self.rdf_method == "positions":
+            isl, step = divmod(it, self.slice_steps)
+            if it == 0:
+                self.init_histogram_data(self.no_bins)
+            if isl >= self.no_slices:
+                return
+            if step == 0:
+                self.slice_rdf_hist = zeros((self.no_bins, self.num_species, self.num_species))
+
+            self.slice_rdf_hist += calc_rdf_hist(
+                frame["pos"],
+                frame["id"].astype(int64),
+                self.box_lengths,
+                self.rc,
+                self.no_bins,
+                self.num_species,
+                get_num_threads(),
+            )
+            if step == self.slice_steps - 1:
+                self.calc_slice_data(isl, self.slice_rdf_hist, self.slice_steps)
+            return
+
+        if it == 0:
+            self.init_histogram_data(frame["rdf_hist"].shape[0])
+
+        # Same dumps as in compute. The -1 is for '0'-indexing
+        slice_dumps = max(self.slice_steps - 1, 1)
+        isl, rem = divmod(it, slice_dumps)
+        if rem == 0 and 0 < isl <= self.no_slices:
+            self.calc_slice_data(isl - 1, frame["rdf_hist"], self.slice_steps * self.dump_step)
+
+    def finalize(self):
+        """Average the streamed slices and save the data."""
+        self.average_slices_data()
         self.save_hdf()
         self.save_pickle()
         tend = self.timer.current()
-        self.time_stamp(self.__long_name__ + " Calculation", self.timer.time_division(tend - t0))
+        self.time_stamp(self.__long_name__ + " Calculation", self.timer.time_division(tend - self.stream_t0))
 
     def compute_sum_rule_integrals(self, potential):
         """
@@ -2519,12 +3909,17 @@ class RadialDistributionFunction(Observable):
         print("\n\n{:=^70} \n".format(" " + self.__long_name__ + " "))
         print("Data saved in: \n", self.filename_hdf)
         print("Data accessible at: self.ra_values, self.dataframe")
-        print("\nNo. bins = {}".format(self.no_bins))
+        print("\nHistograms from: {}".format(self.rdf_method))
+        print("No. bins = {}".format(self.no_bins))
         print("dr = {:1.4f} a_ws = {:1.4e} ".format(self.dr_rdf / self.a_ws, self.dr_rdf), end="")
         print("[cm]" if self.units == "cgs" else "[m]")
-        print(
-            "Maximum Distance (i.e. potential.rc)= {:1.4f} a_ws = {:1.4e} ".format(self.rc / self.a_ws, self.rc), end=""
-        )
+        if self.rdf_method == "positions":
+            print("Maximum Distance = {:1.4f} a_ws = {:1.4e} ".format(self.rc / self.a_ws, self.rc), end="")
+        else:
+            print(
+                "Maximum Distance (i.e. potential.rc)= {:1.4f} a_ws = {:1.4e} ".format(self.rc / self.a_ws, self.rc),
+                end="",
+            )
         print("[cm]" if self.units == "cgs" else "[m]")
 
 
@@ -2560,12 +3955,18 @@ class StaticStructureFactor(Observable):
 
     """
 
+    on_the_fly_capable = True
+
     def __init__(self):
         super().__init__()
         self.__name__ = "ssf"
         self.__long_name__ = "Static Structure Function"
         self.k_observable = True
         self.kw_observable = False
+        self.stream_observable = True
+        self.nkt_flag = True
+        self.frame_keys = ["time", "pos"]
+        self.parallel_slices = True
 
     @setup_doc
     def setup(self, params, phase: str = None, no_slices: int = None, **kwargs):
@@ -2592,12 +3993,9 @@ class StaticStructureFactor(Observable):
         self.dataframe[k_column] = self.k_values
 
         tinit = self.timer.current()
-        nkt_df = read_hdf(self.nkt_hdf_file, mode="r", key="nkt")
         for isl in tqdm(range(self.no_slices)):
-            # Initialize container
-            nkt = zeros((self.num_species, self.slice_steps, len(self.k_list)), dtype=complex128)
-            for sp, sp_name in enumerate(self.species_names):
-                nkt[sp] = array(nkt_df["slice {}".format(isl + 1)][sp_name])
+            # Shape = (no_species, slice_steps, no_k)
+            nkt = self.kt_data_slice("nkt", isl)
 
             init = isl * self.slice_steps
             fin = (isl + 1) * self.slice_steps
@@ -2794,7 +4192,80 @@ class Thermodynamics(Observable):
             self.dataframe = read_csv(self.mag_energy_filename, index_col=False)
             self.fldr = self.magnetization_dir
 
-        self.beta = 1.0 / (self.dataframe["Temperature"].mean() * self.kB)
+        self.beta = 1.0 / (self.dataframe["Temperature"].mean() * self.kB)
+
+    def statistical_analysis(self, phase: str = None, rel_error: float = 1.0e-3, min_blocks: int = 4, c: float = 5.0):
+        """
+        Estimate the statistical error of the average of every energy and temperature column with the blocking
+        analysis of :func:`sarkas.utilities.maths.blocking_analysis` and the integrated autocorrelation time of
+        :func:`sarkas.utilities.maths.integrated_autocorrelation_time`. All the columns are processed at once in
+        :math:`O(T \\log T)`. The results are saved in ``StatisticalAnalysis_<job_id>.csv`` in the phase directory.
+
+        Parameters
+        ----------
+        phase : str, optional
+            Phase to analyze. Default = ``None``, the phase of the setup.
+
+        rel_error : float
+            Target relative standard error of the averages used for the suggested production length.
+            Default = 1.0e-3.
+
+        min_blocks : int
+            Minimum number of blocks of the blocking analysis. Default = 4.
+
+        c : float
+            Window constant of the autocorrelation time. Default = 5.0.
+
+        Returns
+        -------
+        dataframe_stats : pandas.DataFrame
+            For each column: mean, standard deviation, standard error of the mean and its error, optimal block size in
+            number of samples, statistical inefficiency from the blocking analysis, integrated autocorrelation time in
+            timesteps, number of effective samples, timesteps needed for a standard error of ``rel_error`` times the
+            mean, and the dump step above which the samples are uncorrelated.
+
+        """
+        self.parse(phase)
+        dump_step = {
+            "equilibration": self.eq_dump_step,
+            "production": self.prod_dump_step,
+            "magnetization": self.mag_dump_step,
+        }[self.phase]
+
+        columns = [col for col in self.dataframe.columns if "Energy" in col or "Temperature" in col]
+        series = self.dataframe[columns].to_numpy().transpose()
+        no_samples = series.shape[1]
+
+        block_sizes, variances, errors, optimal = blocking_analysis(series, min_blocks)
+        tau, _ = integrated_autocorrelation_time(series, c)
+
+        rows = arange(len(columns))
+        mean = series.mean(axis=1)
+        var = series.var(axis=1, ddof=1)
+        var_mean = variances[rows, optimal]
+        # Constant columns, e.g. the potential energy of a non-interacting species, are uncorrelated
+        inefficiency = where(var > 0.0, no_samples * var_mean / where(var > 0.0, var, 1.0), 1.0)
+        target_var = (rel_error * mean) ** 2
+        needed_samples = where(target_var > 0.0, inefficiency * var / where(target_var > 0.0, target_var, 1.0), 0.0)
+
+        self.dataframe_stats = DataFrame(
+            {
+                "Mean": mean,
+                "Std": sqrt(var),
+                "Std Error": sqrt(var_mean),
+                "Std Error Error": 0.5 * errors[rows, optimal] / where(var_mean > 0.0, sqrt(var_mean), 1.0),
+                "Block Size": block_sizes[optimal],
+                "Statistical Inefficiency": inefficiency,
+                "Autocorrelation Time": tau * dump_step,
+                "Effective Samples": no_samples / inefficiency,
+                "Production Steps": ceil(needed_samples).astype(int64) * dump_step,
+                "Dump Step": maximum(floor(2.0 * tau), 1).astype(int64) * dump_step,
+            },
+            index=columns,
+        )
+        self.dataframe_stats.to_csv(os_path_join(self.fldr, f"StatisticalAnalysis_{self.job_id}.csv"))
+
+        return self.dataframe_stats
 
     def temp_energy_plot(
         self,
@@ -2829,6 +4300,10 @@ class Thermodynamics(Observable):
             Name with which to save the plot.
 
         """
+        import matplotlib.pyplot as plt
+        import scipy.stats as scp_stats
+        from matplotlib.gridspec import GridSpec
+        from seaborn import histplot as sns_histplot
 
         if phase:
             phase = phase.lower()
@@ -3079,13 +4554,27 @@ class Thermodynamics(Observable):
 
 
 class VelocityAutoCorrelationFunction(Observable):
-    """Velocity Auto-correlation function."""
+    """Velocity Auto-correlation function.
+
+    Attributes
+    ----------
+    chunk_size : int
+        Maximum number of particles whose velocities are Fourier transformed at once. Default = ``None``, all of them.
+
+    """
+
+    on_the_fly_capable = True
 
     def __init__(self):
         super(VelocityAutoCorrelationFunction, self).__init__()
         self.__name__ = "vacf"
         self.__long_name__ = "Velocity AutoCorrelation Function"
         self.acf_observable = True
+        self.resumable = True
+        self.stream_observable = True
+        self.frame_keys = ["time", "vel"]
+        self.chunk_size = None
+        self.parallel_slices = True
 
     @setup_doc
     def setup(self, params, phase: str = None, no_slices: int = None, **kwargs):
@@ -3102,51 +4591,48 @@ class VelocityAutoCorrelationFunction(Observable):
     @compute_doc
     def compute(self):
 
-        t0 = self.timer.current()
-        self.calc_slices_data()
-        self.average_slices_data()
-        self.save_hdf()
-        tend = self.timer.current()
-        self.time_stamp("VACF Calculation", self.timer.time_division(tend - t0))
+        stream_dumps([self])
 
-    def calc_slices_data(self):
-        """Calculate the vacf for each slice and add the data to the acf_slices dataframe."""
+    def init_slice_data(self):
+        """Allocate the array storing the particles' velocities of a slice."""
+        self.slice_vel = zeros((self.dimensions, self.total_num_ptcls, self.slice_steps))
 
-        start_slice = 0
-        end_slice = self.slice_steps * self.dump_step
-        time = zeros(self.slice_steps)
+    def update_slice_data(self, frame: dict, it: int):
+        """Copy the particles' velocities of a dump into the slice array.
 
-        for isl in range(self.no_slices):
-            print(f"\nCalculating vacf for slice {isl + 1}/{self.no_slices}.")
-            # Parse the particles from the dump files
-            vel = zeros((self.dimensions, self.total_num_ptcls, self.slice_steps))
-            #
-            for it, dump in enumerate(
-                tqdm(range(start_slice, end_slice, self.dump_step), desc="Read in data", disable=not self.verbose)
-            ):
-                datap = load_from_restart(self.dump_dir, dump)
-                time[it] = datap["time"]
-                for d in range(self.dimensions):
-                    vel[d, :, it] = datap["vel"][:, d]
-            #
-            if isl == 0:
-                self.dataframe["Time"] = time
-                self.dataframe_slices["Time"] = time
-                self.dataframe_acf["Time"] = time
-                self.dataframe_acf_slices["Time"] = time
+        Parameters
+        ----------
+        frame : dict
+            Dump's data.
 
-            # Return an array of shape( num_species, dim + 1, slice_steps)
-            vacf = calc_vacf(vel, self.species_num)
+        it : int
+            Index of the dump within the slice.
 
-            for i, sp1 in enumerate(self.species_names):
-                sp_vacf_str = f"{sp1} " + self.__name__.swapcase()
-                for d in range(self.dimensions):
-                    self.dataframe_acf_slices[sp_vacf_str + f"_{self.dim_labels[d]}_slice {isl}"] = vacf[i, d, :]
+        """
+        for d in range(self.dimensions):
+            self.slice_vel[d, :, it] = frame["vel"][:, d]
+
+    def calc_slice_data(self, isl: int, time: ndarray):
+        """Calculate the vacf of a slice and add the data to the acf_slices dataframe.
+
+        Parameters
+        ----------
+        isl : int
+            Slice index.
+
+        time : numpy.ndarray
+            Time array of the slice.
+
+        """
+        # Return an array of shape( num_species, dim + 1, slice_steps)
+        vacf = calc_vacf(self.slice_vel, self.species_num, self.chunk_size)
 
-                self.dataframe_acf_slices[sp_vacf_str + f"_Total_slice {isl}"] = vacf[i, -1, :]
+        for i, sp1 in enumerate(self.species_names):
+            sp_vacf_str = f"{sp1} " + self.__name__.swapcase()
+            for d in range(self.dimensions):
+                self.dataframe_acf_slices[sp_vacf_str + f"_{self.dim_labels[d]}_slice {isl}"] = vacf[i, d, :]
 
-            start_slice += self.slice_steps * self.dump_step
-            end_slice += self.slice_steps * self.dump_step
+            self.dataframe_acf_slices[sp_vacf_str + f"_Total_slice {isl}"] = vacf[i, -1, :]
 
     def average_slices_data(self):
         """Average the data from all the slices and add it to the dataframe."""
@@ -3169,7 +4655,7 @@ class VelocityAutoCorrelationFunction(Observable):
         """Print observable parameters for help in choice of simulation parameters."""
 
         print("\n\n{:=^70} \n".format(" " + self.__long_name__ + " "))
-        print("Data saved in: \n", self.filename_acf_hdf)
+        print("Data saved in: \n", self.filename_hdf_acf)
         print("Data accessible at: self.dataframe_acf")
 
         print("\nNo. of slices = {}".format(self.no_slices))
@@ -3205,11 +4691,15 @@ class VelocityDistribution(Observable):
 
     """
 
+    on_the_fly_capable = True
+
     def __init__(self):
         super(VelocityDistribution, self).__init__()
         self.max_no_moment = None
         self.__name__ = "vd"
         self.__long_name__ = "Velocity Distribution"
+        self.stream_observable = True
+        self.frame_keys = ["time", "names", "vel"]
 
     def setup(
         self,
@@ -3351,29 +4841,50 @@ class VelocityDistribution(Observable):
         # Print info to screen
         self.pretty_print()
 
-        # Grab simulation data
-        time, vel_raw = self.grab_sim_data(pva="vel")
-        # Normality test
-        self.normality_tests(time=time, vel_data=vel_raw)
+        # Read the dumps only once and a block at a time.
+        print("\nCollecting data from snapshots and creating velocity distributions ...")
+        tinit = self.timer.current()
+        time, stats_mat, dist_matrix, moments, ratios = [], [], [], [], []
+        for time_block, vel_block in self.iter_sim_data(pva="vel"):
+            time.append(time_block)
+            # Normality test
+            stats_mat.append(self.calc_normality_tests(time_block, vel_block))
+            # Make the velocity distribution
+            dist_block, bin_edges = self.calc_distribution(vel_block, time_block)
+            dist_matrix.append(dist_block)
+            # Calculate velocity moments
+            if compute_moments:
+                mom_block, ratio_block = calc_moments(vel_block, self.max_no_moment, self.species_samples_start())
+                moments.append(mom_block)
+                ratios.append(ratio_block)
+
+        time = concatenate(time)
+        self.normality_dataframe(concatenate(stats_mat))
+        self.save_distribution(concatenate(dist_matrix), bin_edges)
+        if compute_moments:
+            self.save_moments(time, concatenate(moments, axis=1), concatenate(ratios, axis=1))
 
-        # Make the velocity distribution
-        self.create_distribution(vel_raw, time)
+        tend = self.timer.current()
+        self.time_stamp("Velocity distribution calculation", self.timer.time_division(tend - tinit))
 
-        # Calculate velocity moments
-        if compute_moments:
-            self.compute_moments(parse_data=False, vel_raw=vel_raw, time=time)
-        #
         if compute_Grad_expansion:
             self.compute_hermite_expansion(compute_moments=False)
 
+    def finalize(self):
+        """Save the distributions calculated from the streamed dumps."""
+
+        self.save_distribution(self.stream_dist_matrix, self.stream_bin_edges)
+        self.save_pickle()
+
+        tend = self.timer.current()
+        self.time_stamp("Velocity distribution calculation", self.timer.time_division(tend - self.stream_t0))
+
     def normality_tests(self, time, vel_data):
         """
         Calculate the Shapiro-Wilks test for each timestep from the raw velocity data and store it into a dataframe.
 
         Parameters
         ----------
-        Returns
-        -------
         time : numpy.ndarray
             One dimensional array with time data.
 
@@ -3388,7 +4899,56 @@ class VelocityDistribution(Observable):
 
         """
 
+        self.normality_dataframe(self.calc_normality_tests(time, vel_data))
+
+    def calc_normality_tests(self, time, vel_data):
+        """
+        Calculate the Shapiro-Wilks test of each species along each dimension for a block of dumps.
+
+        Parameters
+        ----------
+        time : numpy.ndarray
+            Time of each dump.
+
+        vel_data : numpy.ndarray
+            Velocities of the dumps as arranged by :meth:`sarkas.tools.observables.Observable.grab_sim_data`.
+
+        Returns
+        -------
+        stats_mat : numpy.ndarray
+            Time, statistics, and p-values of each dump.
+
+        """
+        import scipy.stats as scp_stats
+
         no_dim = vel_data.shape[1]
+        samples_start = self.species_samples_start()
+
+        stats_mat = zeros((len(time), len(self.species_num) * no_dim * 2 + 1))
+        for it, tme in enumerate(time):
+            stats_mat[it, 0] = tme
+            for d in range(no_dim):
+                for sp, sp_start in enumerate(samples_start[:-1]):
+                    # Calculate the correct start and end index for storage
+                    sp_end = samples_start[sp + 1]
+
+                    statcs, p_value = scp_stats.shapiro(vel_data[it, d, sp_start:sp_end])
+                    stats_mat[it, 1 + 2 * no_dim * sp + 2 * d] = statcs
+                    stats_mat[it, 1 + 2 * no_dim * sp + 2 * d + 1] = p_value
+
+        return stats_mat
+
+    def normality_dataframe(self, stats_mat):
+        """
+        Store the Shapiro-Wilks tests of :meth:`calc_normality_tests` into :attr:`norm_test_df`.
+
+        Parameters
+        ----------
+        stats_mat : numpy.ndarray
+            Time, statistics, and p-values of each dump.
+
+        """
+        no_dim = (stats_mat.shape[1] - 1) // (2 * len(self.species_num))
 
         stats_df_columns = (
             "Time",
@@ -3400,18 +4960,6 @@ class VelocityDistribution(Observable):
             ],
         )
 
-        stats_mat = zeros((len(time), len(self.species_num) * no_dim * 2 + 1))
-        for it, tme in enumerate(time):
-            stats_mat[it, 0] = tme
-            for d, ds in zip(range(no_dim), ["X", "Y", "Z"]):
-                for sp, sp_start in enumerate(self.species_index_start[:-1]):
-                    # Calculate the correct start and end index for storage
-                    sp_end = self.species_index_start[sp + 1]
-
-                    statcs, p_value = scp_stats.shapiro(vel_data[it, d, sp_start:sp_end])
-                    stats_mat[it, 1 + 6 * sp + 2 * d] = statcs
-                    stats_mat[it, 1 + 6 * sp + 2 * d + 1] = p_value
-
         self.norm_test_df = DataFrame(stats_mat, columns=stats_df_columns)
         self.norm_test_df.columns = MultiIndex.from_tuples([tuple(c.split("_")) for c in stats_df_columns])
 
@@ -3478,6 +5026,122 @@ class VelocityDistribution(Observable):
 
             self.list_hist_kwargs.append(another_dict)
 
+    def fixed_bin_edges(self):
+        """
+        Return the uniform bin edges of each species if the histograms have fixed bins, i.e. ``list_hist_kwargs``
+        contains only integer ``bins``, a ``range`` and ``density``.
+
+        Returns
+        -------
+        bin_edges : numpy.ndarray
+            Bin edges of each species padded to the largest number of bins. ``None`` if the bins are not fixed.
+
+        no_bins : numpy.ndarray
+            Number of bins of each species. ``None`` if the bins are not fixed.
+
+        """
+        for dics in self.list_hist_kwargs:
+            if not isinstance(dics["bins"], (int, int64)) or dics["range"] is None:
+                return None, None
+            if not set(dics) <= {"bins", "range", "density"}:
+                return None, None
+
+        no_bins = array([dics["bins"] for dics in self.list_hist_kwargs], dtype=int64)
+        bin_edges = zeros((self.num_species, no_bins.max() + 1))
+        for sp, dics in enumerate(self.list_hist_kwargs):
+            bin_edges[sp, : no_bins[sp] + 1] = linspace(*dics["range"], no_bins[sp] + 1)
+
+        return bin_edges, no_bins
+
+    def calc_distribution(self, vel: ndarray, time: ndarray):
+        """
+        Calculate the histograms of the velocities of a batch of dumps.
+
+        The histograms of all the dumps, dimensions and species are calculated at once by :func:`calc_vel_histograms`
+        when the bins are fixed and uniform, i.e. ``hist_kwargs`` contains only integer ``bins``, ``range`` and
+        ``density``. Otherwise :func:`numpy.histogram` is called for each of them.
+
+        Parameters
+        ----------
+        vel : numpy.ndarray
+            Velocities of the dumps as arranged by :meth:`sarkas.tools.observables.Observable.grab_sim_data`.
+            Shape = (``no_dumps``, ``dim``, ``runs * inv_dim * total_num_ptcls``).
+
+        time : numpy.ndarray
+            Time of each dump.
+
+        Returns
+        -------
+        dist_matrix : numpy.ndarray
+            Time and bin counts of each species along each dimension for each dump.
+
+        bin_edges : list
+            Bin edges of each species along each dimension.
+
+        """
+        no_dumps, no_dim = vel.shape[0], vel.shape[1]
+        dist_matrix = zeros((no_dumps, no_dim * (sum(self.hist_kwargs["bins"]) + self.num_species)))
+
+        samples_start = self.species_samples_start()
+        fixed_edges, no_bins = self.fixed_bin_edges()
+        if fixed_edges is not None:
+            counts = calc_vel_histograms(vel, samples_start, fixed_edges, no_bins)
+
+        bin_edges = []
+        indx_0 = 0
+        for d in range(no_dim):
+            for indx, sp_start in enumerate(samples_start[:-1]):
+                # Calculate the correct start and end index for storage
+                sp_end = samples_start[indx + 1]
+                hist_kwargs = self.list_hist_kwargs[indx]
+
+                if fixed_edges is not None:
+                    sp_bin_edges = fixed_edges[indx, : no_bins[indx] + 1]
+                    bin_count = counts[:, d, indx, : no_bins[indx]]
+                    if hist_kwargs["density"]:
+                        bin_count = bin_count / (bin_count.sum(axis=1)[:, None] * diff(sp_bin_edges))
+                else:
+                    bin_count = []
+                    for it in range(no_dumps):
+                        it_count, sp_bin_edges = histogram(vel[it, d, sp_start:sp_end], **hist_kwargs)
+                        bin_count.append(it_count)
+                bin_edges.append(sp_bin_edges)
+
+                # Time to insert in the huge matrix.
+                indx_1 = indx_0 + 1 + len(sp_bin_edges) - 1
+                dist_matrix[:, indx_0] = time
+                dist_matrix[:, indx_0 + 1 : indx_1] = bin_count
+                indx_0 = indx_1
+
+        return dist_matrix, bin_edges
+
+    def consume(self, frame: dict):
+        """
+        Push the histograms of the velocities of a single dump into the distribution.
+
+        Only the distributions are calculated, the normality tests and the moments need the whole velocity array.
+
+        Parameters
+        ----------
+        frame : dict
+            Dump's data. It must contain the keys "time", "names", and "vel".
+
+        """
+        it = self.frames_consumed
+        self.frames_consumed += 1
+
+        if it >= self.no_slices * self.slice_steps:
+            return
+
+        # Same arrangement as in grab_sim_data
+        vel = zeros((self.dim, self.runs * self.inv_dim * self.total_num_ptcls), dtype=self.grab_dtype)
+        self.arrange_species_samples(frame["vel"], vel)
+
+        dist_row, self.stream_bin_edges = self.calc_distribution(vel[None], array([frame["time"]]))
+        if it == 0:
+            self.stream_dist_matrix = zeros((self.no_slices * self.slice_steps, dist_row.shape[1]))
+        self.stream_dist_matrix[it] = dist_row[0]
+
     def create_distribution(self, vel_raw: ndarray = None, time: ndarray = None):
         """
         Calculate the velocity distribution of each species and save the corresponding dataframes.
@@ -3485,7 +5149,8 @@ class VelocityDistribution(Observable):
         Parameters
         ----------
         vel_raw: ndarray, optional
-            Container of particles velocity at each time step.
+            Container of particles velocity at each time step. If not passed the dumps are read in blocks by
+            :meth:`sarkas.tools.observables.Observable.iter_sim_data`.
 
         time: ndarray, optional
             Time array.
@@ -3494,84 +5159,17 @@ class VelocityDistribution(Observable):
 
         print("\nCreating velocity distributions ...")
         tinit = self.timer.current()
-        no_dumps = vel_raw.shape[0]
-        no_dim = vel_raw.shape[1]
-        # I want a Hierarchical dataframe
-        # Example:
-        #   Ca	                        Yb	    Ca	                        Yb	    Ca	                        Yb
-        #   X	                        X	    Y	                        Y	    Z	                        Z
-        #   1.54e-03 -2.54e+22 3.54e+00	1 2     1.54e-03 -2.54e+22 3.54e+00	1 2	    1.54e-03 -2.54e+22 3.54e+00 1 2
-        # This has 3 rows of columns. The first identifies the species, The second the axis,
-        # and the third the value of the bin_edge
-        # This can be easily obtained from pandas dataframe MultiIndex. But first I will create a dataframe
-        # from a huge matrix. The columns of this dataframe will be
-        # Ca_X_1.54e-03 Ca_X_-2.54e+22 Ca_X_3.54e+00 Yb_X_1	Yb_X_2 Ca_Y_1.54e-03 Ca_Y_-2.54e+22 Ca_Y_3.54e+00 Yb_Y_1 ...
-        # using MultiIndex.from_tuples([tuple(c.split("_")) for c in df.columns]) I can create a hierarchical df.
-        # This is because I can access the data as
-        # df['Ca']['X']
-        # >>>       1.54e-03	-2.54e+22	3.54e+00
-        # >>> Time
-        # >>>   0   -1.694058	1.217008	-0.260678
-        # with the index = to my time array.
-        # see https://pandas.pydata.org/pandas-docs/stable/user_guide/advanced.html#reconstructing-the-level-labels
-
-        # Columns
-
-        full_df_columns = []
-        # At the first time step I will create the columns list.
-        dist_matrix = zeros((len(time), self.dim * (sum(self.hist_kwargs["bins"]) + self.num_species)))
-        # The +1 at the end is because I decided to add a column containing the timestep
-        # For convenience save the bin edges somewhere else. The columns of the dataframe are string. This will give
-        # problems when plotting.
-        # Use a dictionary since the arrays could be different lengths
-        self.species_bin_edges = {}
-        for k in self.species_names:
-            # Initialize the sub-dictionary
-            self.species_bin_edges[k] = {}
-
-        for it in range(no_dumps):
-            for d, ds in zip(range(no_dim), ["X", "Y", "Z"]):
-                indx_0 = 0
-                for indx, (sp_name, sp_start) in enumerate(zip(self.species_names, self.species_index_start)):
-                    # Calculate the correct start and end index for storage
-                    sp_end = self.species_index_start[indx + 1]
-
-                    bin_count, bin_edges = histogram(vel_raw[it, d, sp_start:sp_end], **self.list_hist_kwargs[indx])
-
-                    # Executive decision: Center the bins
-                    bin_loc = 0.5 * (bin_edges[:-1] + bin_edges[1:])
-                    # Create the second_column_row the dataframe
-                    if it == 0:
-                        # Create the column array
-                        full_df_columns.append(["{}_{}_Time".format(sp_name, ds)])
-                        full_df_columns.append(["{}_{}_{:6e}".format(sp_name, ds, be) for be in bin_loc])
-                        self.species_bin_edges[sp_name][ds] = bin_edges
-                        # Ok. Now I have created the bins columns' names
-                    # Time to insert in the huge matrix.
-                    indx_1 = indx_0 + 1 + len(bin_count)
-                    dist_matrix[it, indx_0] = time[it]
-                    dist_matrix[it, indx_0 + 1 : indx_1] = bin_count
-                    indx_0 = indx_1
-        # Alright. The matrix is filled now onto the dataframe
-        # First let's flatten the columns array. This is because I have something like this
-        # Example: Binary Mixture with 3 H bins per axis and 2 He bins per axis
-        # columns =[['H_X', 'H_X', 'H_X'], ['He_X', 'He_X'], ['H_Y', 'H_Y', 'H_Y'], ['He_Y', 'He_Y'] ... Z-axis]
-        # Flatten with list(concatenate(columns).flat)
-        # Now has become
-        # first_column_row=['H_X', 'H_X', 'H_X', 'He_X', 'He_X', 'H_Y', 'H_Y', 'H_Y', 'He_Y', 'He_Y' ... Z-axis]
-        # I think this is easier to understand than using nested list comprehension
-        # see https://stackabuse.com/python-how-to-flatten-list-of-lists/
-        full_df_columns = list(concatenate(full_df_columns).flat)
-        self.dataframe = DataFrame(dist_matrix, columns=full_df_columns)
-        # Save it
-        self.dataframe.to_csv(self.filename_csv, encoding="utf-8", index=False)
+        # Each species has a column containing the time followed by the bin counts
+        if vel_raw is None:
+            dist_matrix = []
+            for time_block, vel_block in self.iter_sim_data(pva="vel"):
+                dist_block, bin_edges = self.calc_distribution(vel_block, time_block)
+                dist_matrix.append(dist_block)
+            dist_matrix = concatenate(dist_matrix)
+        else:
+            dist_matrix, bin_edges = self.calc_distribution(vel_raw, time)
 
-        # Hierarchical DataFrame
-        self.hierarchical_dataframe = self.dataframe.copy()
-        self.hierarchical_dataframe.columns = MultiIndex.from_tuples(
-            [tuple(c.split("_")) for c in self.hierarchical_dataframe.columns]
-        )
-        self.hierarchical_dataframe.to_hdf(self.filename_hdf, key=self.__name__, encoding="utf-8")
+        self.save_distribution(dist_matrix, bin_edges)
 
         tend = self.timer.current()
         self.time_stamp("Velocity distribution calculation", self.timer.time_division(tend - tinit))
@@ -3583,7 +5181,7 @@ class VelocityDistribution(Observable):
         ----------
         parse_data: bool
             Flag for reading data. Default = False. If False, must pass ``vel_raw`` and ``time``.
-            If True it will parse data from simulations dumps.
+            If True it will parse data from simulations dumps a block at a time.
 
         vel_raw: ndarray, optional
             Container of particles velocity at each time step.
@@ -3592,20 +5190,46 @@ class VelocityDistribution(Observable):
             Time array.
 
         """
-        self.moments_dataframe = DataFrame()
-        self.moments_hdf_dataframe = DataFrame()
-
-        if parse_data:
-            time, vel_raw = self.grab_sim_data()
-
-        self.moments_dataframe["Time"] = time
 
         print("\nCalculating velocity moments ...")
         tinit = self.timer.current()
-        moments, ratios = calc_moments(vel_raw, self.max_no_moment, self.species_index_start)
+        if parse_data:
+            time, moments, ratios = [], [], []
+            for time_block, vel_block in self.iter_sim_data(pva="vel"):
+                mom_block, ratio_block = calc_moments(vel_block, self.max_no_moment, self.species_samples_start())
+                time.append(time_block)
+                moments.append(mom_block)
+                ratios.append(ratio_block)
+            time = concatenate(time)
+            moments = concatenate(moments, axis=1)
+            ratios = concatenate(ratios, axis=1)
+        else:
+            moments, ratios = calc_moments(vel_raw, self.max_no_moment, self.species_samples_start())
         tend = self.timer.current()
         self.time_stamp("Velocity moments calculation", self.timer.time_division(tend - tinit))
 
+        self.save_moments(time, moments, ratios)
+
+    def save_moments(self, time: ndarray, moments: ndarray, ratios: ndarray):
+        """Save the moments of the distribution and their ratios in a csv file and in the hierarchical dataframe.
+
+        Parameters
+        ----------
+        time: ndarray
+            Time array.
+
+        moments: ndarray
+            Moments of the distribution, see :func:`calc_moments`.
+
+        ratios: ndarray
+            Ratios of each moment with respect to the expected Maxwellian value, see :func:`calc_moments`.
+
+        """
+        self.moments_dataframe = DataFrame()
+        self.moments_hdf_dataframe = DataFrame()
+
+        self.moments_dataframe["Time"] = time
+
         # Save the dataframe
         if self.dimensional_average:
             for i, sp in enumerate(self.species_names):
@@ -3734,16 +5358,89 @@ class VelocityDistribution(Observable):
                     else:
                         self.hermite_hdf_dataframe["{}_{}_{} coeff".format(sp_name, ds, h)] = hermite_coeff[sp, d, h, :]
 
-        # Save the CSV
-        self.hermite_dataframe.to_csv(self.herm_df_filename_csv, index=False, encoding="utf-8")
-        # Make the columns
-        self.hermite_hdf_dataframe.columns = MultiIndex.from_tuples(
-            [tuple(c.split("_")) for c in self.hermite_hdf_dataframe.columns]
+        # Save the CSV
+        self.hermite_dataframe.to_csv(self.herm_df_filename_csv, index=False, encoding="utf-8")
+        # Make the columns
+        self.hermite_hdf_dataframe.columns = MultiIndex.from_tuples(
+            [tuple(c.split("_")) for c in self.hermite_hdf_dataframe.columns]
+        )
+        # Save the df in the hierarchical df with a new key/group
+        self.hermite_hdf_dataframe.to_hdf(self.filename_hdf, mode="a", key="hermite_coefficients", encoding="utf-8")
+
+        self.time_stamp("Hermite expansion calculation", self.timer.time_division(tend - tinit))
+
+    def save_distribution(self, dist_matrix: ndarray, bin_edges: list):
+        """
+        Create the dataframes of the distributions and save them.
+
+        Parameters
+        ----------
+        dist_matrix : numpy.ndarray
+            Time and bin counts of each dump, see :meth:`calc_distribution`.
+
+        bin_edges : list
+            Bin edges of each species along each dimension, see :meth:`calc_distribution`.
+
+        """
+        # I want a Hierarchical dataframe
+        # Example:
+        #   Ca	                        Yb	    Ca	                        Yb	    Ca	                        Yb
+        #   X	                        X	    Y	                        Y	    Z	                        Z
+        #   1.54e-03 -2.54e+22 3.54e+00	1 2     1.54e-03 -2.54e+22 3.54e+00	1 2	    1.54e-03 -2.54e+22 3.54e+00 1 2
+        # This has 3 rows of columns. The first identifies the species, The second the axis,
+        # and the third the value of the bin_edge
+        # This can be easily obtained from pandas dataframe MultiIndex. But first I will create a dataframe
+        # from a huge matrix. The columns of this dataframe will be
+        # Ca_X_1.54e-03 Ca_X_-2.54e+22 Ca_X_3.54e+00 Yb_X_1	Yb_X_2 Ca_Y_1.54e-03 Ca_Y_-2.54e+22 Ca_Y_3.54e+00 Yb_Y_1 ...
+        # using MultiIndex.from_tuples([tuple(c.split("_")) for c in df.columns]) I can create a hierarchical df.
+        # This is because I can access the data as
+        # df['Ca']['X']
+        # >>>       1.54e-03	-2.54e+22	3.54e+00
+        # >>> Time
+        # >>>   0   -1.694058	1.217008	-0.260678
+        # with the index = to my time array.
+        # see https://pandas.pydata.org/pandas-docs/stable/user_guide/advanced.html#reconstructing-the-level-labels
+
+        full_df_columns = []
+        # For convenience save the bin edges somewhere else. The columns of the dataframe are string. This will give
+        # problems when plotting.
+        # Use a dictionary since the arrays could be different lengths
+        self.species_bin_edges = {}
+        for k in self.species_names:
+            # Initialize the sub-dictionary
+            self.species_bin_edges[k] = {}
+
+        no_dim = len(bin_edges) // self.num_species
+        for d, ds in zip(range(no_dim), ["X", "Y", "Z"]):
+            for indx, sp_name in enumerate(self.species_names):
+                sp_bin_edges = bin_edges[d * self.num_species + indx]
+                # Executive decision: Center the bins
+                bin_loc = 0.5 * (sp_bin_edges[:-1] + sp_bin_edges[1:])
+                # Create the column array
+                full_df_columns.append(["{}_{}_Time".format(sp_name, ds)])
+                full_df_columns.append(["{}_{}_{:6e}".format(sp_name, ds, be) for be in bin_loc])
+                self.species_bin_edges[sp_name][ds] = sp_bin_edges
+
+        # Alright. The matrix is filled now onto the dataframe
+        # First let's flatten the columns array. This is because I have something like this
+        # Example: Binary Mixture with 3 H bins per axis and 2 He bins per axis
+        # columns =[['H_X', 'H_X', 'H_X'], ['He_X', 'He_X'], ['H_Y', 'H_Y', 'H_Y'], ['He_Y', 'He_Y'] ... Z-axis]
+        # Flatten with list(concatenate(columns).flat)
+        # Now has become
+        # first_column_row=['H_X', 'H_X', 'H_X', 'He_X', 'He_X', 'H_Y', 'H_Y', 'H_Y', 'He_Y', 'He_Y' ... Z-axis]
+        # I think this is easier to understand than using nested list comprehension
+        # see https://stackabuse.com/python-how-to-flatten-list-of-lists/
+        full_df_columns = list(concatenate(full_df_columns).flat)
+        self.dataframe = DataFrame(dist_matrix, columns=full_df_columns)
+        # Save it
+        self.dataframe.to_csv(self.filename_csv, encoding="utf-8", index=False)
+
+        # Hierarchical DataFrame
+        self.hierarchical_dataframe = self.dataframe.copy()
+        self.hierarchical_dataframe.columns = MultiIndex.from_tuples(
+            [tuple(c.split("_")) for c in self.hierarchical_dataframe.columns]
         )
-        # Save the df in the hierarchical df with a new key/group
-        self.hermite_hdf_dataframe.to_hdf(self.filename_hdf, mode="a", key="hermite_coefficients", encoding="utf-8")
-
-        self.time_stamp("Hermite expansion calculation", self.timer.time_division(tend - tinit))
+        self.hierarchical_dataframe.to_hdf(self.filename_hdf, key=self.__name__, encoding="utf-8")
 
     def pretty_print(self):
         """Print information in a user-friendly way."""
@@ -3795,7 +5492,7 @@ class VelocityDistribution(Observable):
             print("RMS Tolerance: {:.3f}".format(self.hermite_rms_tol))
 
 
-@njit
+@njit(cache=True)
 def calc_Sk(nkt, k_list, k_counts, species_np, no_dumps):
     """
     Calculate :math:`S_{ij}(k)` at each saved timestep.
@@ -3878,28 +5575,70 @@ def calc_Skw(nkt, ka_list, species_np, no_dumps, dt, dump_step):
     """
     # Fourier transform normalization: norm = dt / Total time
     norm = dt / sqrt(no_dumps * dt * dump_step)
-    # number of independent observables
-    no_skw = int(len(species_np) * (len(species_np) + 1) / 2)
-    # DSF
-    # Skw = zeros((no_skw, len(ka_counts), no_dumps))
-    Skw_all = zeros((no_skw, len(ka_list), no_dumps))
-    pair_indx = 0
-    for ip, si in enumerate(species_np):
-        for jp in range(ip, len(species_np)):
-            sj = species_np[jp]
-            dens_const = 1.0 / sqrt(si * sj)
-            for ik, ka in enumerate(ka_list):
-                # indx = int(ka[-1])
-                nkw_i = fft(nkt[ip, :, ik]) * norm
-                nkw_j = fft(nkt[jp, :, ik]) * norm
-                Skw_all[pair_indx, ik, :] = fftshift(real(nkw_i.conjugate() * nkw_j) * dens_const)
-                # Skw[pair_indx, indx, :] += Skw_all[pair_indx, ik, :] / ka_counts[indx]
-            pair_indx += 1
+    # Transform all the k vectors of each species at once. Shape = (no_species, no_dumps, no_k)
+    nkw = fft(nkt, axis=1) * norm
+    # Pairs of species (i, j >= i)
+    sp_i, sp_j = triu_indices(len(species_np))
+    dens_const = 1.0 / sqrt(array(species_np)[sp_i] * array(species_np)[sp_j])
+    # DSF of each pair of species by broadcasting. Shape = (no_skw, no_dumps, no_k)
+    Skw_all = real(nkw[sp_i].conjugate() * nkw[sp_j]) * dens_const[:, None, None]
+
+    return fftshift(Skw_all, axes=1).transpose(0, 2, 1)
+
+
+def calc_Skw_welch(nkt, species_np, window, hop, dt, dump_step):
+    """
+    Calculate the tapered periodograms of the overlapping windows of ``nkt`` (Welch's method).
+
+    Parameters
+    ----------
+    nkt :  complex, numpy.ndarray
+        Particles' density or velocity fluctuations of the whole phase.
+        Shape = ( ``no_species``, ``no_dumps``, ``no_k_list``)
 
-    return Skw_all
+    species_np : numpy.ndarray
+        Array with one element giving number of particles.
+
+    window : numpy.ndarray
+        Taper of each window. Shape = (``window_length``,)
+
+    hop : int
+        Number of dumps between the start of consecutive windows.
+
+    dt : float
+        Time interval.
+
+    dump_step : int
+        Snapshot interval.
+
+    Returns
+    -------
+    Skw_all : numpy.ndarray
+        DSF/CCF of each species and pair of species in each window. The Welch estimate is their average over windows.
+        Shape = (``no_windows``, ``no_skw``, ``no_ka_values``, ``window_length``)
 
+    Notes
+    -----
+    The normalization accounts for the power of the taper so that a ``"boxcar"`` window with ``hop = window_length``
+    reproduces :func:`calc_Skw` of each slice.
 
-@njit
+    """
+    window_length = len(window)
+    # Overlapping windows as a strided view. Shape = (no_species, no_windows, no_k, window_length)
+    segments = sliding_window_view(nkt, window_length, axis=1)[:, ::hop]
+    norm = dt / sqrt(window_length * dt * dump_step * (window**2).mean())
+    # Transform all the windows of all the k vectors of each species at once.
+    nkw = fft(segments * window, axis=-1) * norm
+    # Pairs of species (i, j >= i)
+    sp_i, sp_j = triu_indices(len(species_np))
+    dens_const = 1.0 / sqrt(array(species_np)[sp_i] * array(species_np)[sp_j])
+    # Shape = (no_skw, no_windows, no_k, window_length)
+    Skw_all = real(nkw[sp_i].conjugate() * nkw[sp_j]) * dens_const[:, None, None, None]
+
+    return fftshift(Skw_all, axes=-1).transpose(1, 0, 2, 3)
+
+
+@njit(cache=True)
 def calc_elec_current(vel, sp_charge, sp_num):
     """
     Calculate the total electric current and electric current of each species.
@@ -3947,7 +5686,7 @@ def calc_elec_current(vel, sp_charge, sp_num):
 
 def calc_moments(dist, max_moment, species_index_start):
     """
-    Calculate the moments of the (velocity) distribution.
+    Calculate the central moments of the (velocity) distribution from the power sums of :func:`calc_power_sums`.
 
     Parameters
     ----------
@@ -3975,21 +5714,23 @@ def calc_moments(dist, max_moment, species_index_start):
     See these `equations <https://en.wikipedia.org/wiki/Normal_distribution#Moments:~:text=distribution.-,Moments>`_
     """
 
-    # from scipy.stats import moment as scp_moment
+    from scipy.special import comb as scp_comb
     from scipy.special import gamma as scp_gamma
 
-    no_species = len(species_index_start)
-    no_dumps = dist.shape[0]
-    dim = dist.shape[1]
-    moments = zeros((no_species, no_dumps, dim, max_moment))
-    ratios = zeros((no_species, no_dumps, dim, max_moment))
+    # Central moments from the raw moments of the shifted distribution computed in a single pass
+    power_sums, shift = calc_power_sums(dist, asarray(species_index_start, dtype=int64), max_moment)
+    raw = power_sums[..., 1:] / power_sums[..., :1]
+    mean = raw[..., 0]
 
-    for indx, sp_start in enumerate(species_index_start[:-1]):
-        # Calculate the correct start and end index for storage
-        sp_end = species_index_start[indx + 1]
+    moments = zeros(raw.shape)
+    for mom in range(max_moment):
+        pwr = mom + 1
+        # <(v - <v>)^p> = sum_j binom(p, j) <(v - c)^j> (c - <v>)^(p - j)
+        moments[..., mom] = (-mean) ** pwr
+        for j in range(1, pwr + 1):
+            moments[..., mom] += scp_comb(pwr, j) * raw[..., j - 1] * (-mean) ** (pwr - j)
 
-        for mom in range(max_moment):
-            moments[indx, :, :, mom] = scp_stats.moment(dist[:, :, sp_start:sp_end], moment=mom + 1, axis=-1)
+    ratios = zeros(moments.shape)
 
     # sqrt( <v^2> ) = standard deviation = moments[:, :, :, 1] ** (1/2)
     for mom in range(max_moment):
@@ -4000,7 +5741,51 @@ def calc_moments(dist, max_moment, species_index_start):
     return moments, ratios
 
 
-@njit
+def calc_msd(pos, sp_num, chunk_size: int = None):
+    """
+    Calculate the mean squared displacement of each species and in each direction.
+
+    The MSDs of all the particles of a species are computed at once with the FFT algorithm of
+    :func:`sarkas.utilities.maths.mean_squared_displacement` and averaged over the particles.
+
+    Parameters
+    ----------
+    pos : numpy.ndarray
+        Particles' unwrapped positions stored in a 3D array with shape = (D x Np x Nt).
+        D = cartesian dimensions, Np = Number of particles, Nt = number of dumps.
+
+    sp_num: numpy.ndarray
+        Number of particles of each species.
+
+    chunk_size: int, optional
+        Maximum number of particles transformed at once. Default = ``None``, all the particles of a species.
+
+    Returns
+    -------
+    msd: numpy.ndarray
+        Mean squared displacements. Shape= (No_species, D + 1, Nt)
+
+    """
+    no_dim = pos.shape[0]
+    no_dumps = pos.shape[2]
+
+    msd = zeros((len(sp_num), no_dim + 1, no_dumps))
+
+    sp_start = 0
+    sp_end = 0
+    for sp, n_sp in enumerate(sp_num):
+        sp_end += n_sp
+        # Species msd in each dimension averaged over the particles
+        msd[sp, :no_dim, :] = mean_squared_displacement(pos[:, sp_start:sp_end, :], average_axis=1, chunk_size=chunk_size)
+        # Save the total msd
+        msd[sp, -1, :] = msd[sp, :no_dim, :].sum(axis=0)
+        # Move to the next species first particle position
+        sp_start += n_sp
+
+    return msd
+
+
+@njit(cache=True)
 def calc_nk(pos_data, k_list):
     """
     Calculate the instantaneous microscopic density :math:`n(k)` defined as
@@ -4033,14 +5818,138 @@ def calc_nk(pos_data, k_list):
     return nk
 
 
-def calc_nkt(fldr, slices, dump_step, species_np, k_list, verbose):
+@njit(parallel=True, cache=True)
+def calc_nk_frames(pos_frames, species_np, k_list, box_lengths):
+    """
+    Calculate the microscopic density :math:`n_A(k, t)` of each species for several dumps at once.
+
+    The phase factors are built by recurrence from :func:`calc_phase_factors` instead of evaluating
+    :math:`\\exp [ -i \\mathbf k \\cdot \\mathbf r_{i} ]` for each :math:`k` vector. The loop over :math:`k` vectors
+    runs in parallel.
+
+    Parameters
+    ----------
+    pos_frames : numpy.ndarray
+        Particles' positions of each dump. Shape = ( ``no_dumps``, ``tot_no_ptcls``, 3)
+
+    species_np : numpy.ndarray
+        Number of particles of each species.
+
+    k_list : numpy.ndarray
+        List of :math:`k` indices in each direction with corresponding magnitude and index of ``ka_counts``.
+        Shape=(``no_ka_values``, 5)
+
+    box_lengths : numpy.ndarray
+        Length of each box's side.
+
+    Returns
+    -------
+    nkt : numpy.ndarray
+        Microscopic density of each species. Shape = ( ``no_species``, ``no_dumps``, ``no_ka_values``)
+
+    """
+    no_dumps = pos_frames.shape[0]
+    no_species = species_np.shape[0]
+    no_k = k_list.shape[0]
+
+    harmonics, max_harmonic = k_list_harmonics(k_list, box_lengths)
+    sp_start = zeros(no_species + 1, dtype=int64)
+    sp_start[1:] = species_np.cumsum()
+
+    nkt = zeros((no_species, no_dumps, no_k), dtype=complex128)
+    for it in range(no_dumps):
+        eikr = calc_phase_factors(pos_frames[it], box_lengths, max_harmonic)
+        for ik in prange(no_k):
+            nx, ny, nz = harmonics[ik, 0], harmonics[ik, 1], harmonics[ik, 2]
+            for sp in range(no_species):
+                nk = 0.0j
+                for i in range(sp_start[sp], sp_start[sp + 1]):
+                    nk += eikr[0, nx, i] * eikr[1, ny, i] * eikr[2, nz, i]
+                nkt[sp, it, ik] = nk
+
+    return nkt
+
+
+def calc_nk_mesh(pos_frames, species_np, k_list, box_lengths, mesh_sizes, cao):
+    """
+    Calculate the microscopic density :math:`n_A(k, t)` of each species for several dumps at once by assigning the
+    particles to a mesh.
+
+    The particles are spread on the mesh with the same B-spline charge assignment of the PPPM algorithm, see
+    :func:`sarkas.potentials.force_pm.calc_charge_dens`. The density is then Fourier transformed with a single FFT and
+    divided by the Fourier transform of the assignment function,
+
+    .. math::
+        n_{A}(\\mathbf k) \\approx \\frac{\\tilde \\rho_{A}(\\mathbf k)}{\\prod_{\\alpha}
+        \\left [ {\\rm sinc}(n_{\\alpha}/M_{\\alpha}) \\right ]^{p_{\\alpha}}},
+
+    where :math:`M_{\\alpha}` is the number of mesh points and :math:`p_{\\alpha}` the charge assignment order along
+    each direction. The cost is independent of the number of :math:`k` vectors, and the result is accurate as long as
+    the harmonics are well below the Nyquist limit :math:`M_{\\alpha}/2`.
+
+    Parameters
+    ----------
+    pos_frames : numpy.ndarray
+        Particles' positions of each dump. Shape = ( ``no_dumps``, ``tot_no_ptcls``, 3)
+
+    species_np : numpy.ndarray
+        Number of particles of each species.
+
+    k_list : numpy.ndarray
+        List of :math:`k` indices in each direction with corresponding magnitude and index of ``ka_counts``.
+        Shape=(``no_ka_values``, 5)
+
+    box_lengths : numpy.ndarray
+        Length of each box's side.
+
+    mesh_sizes : numpy.ndarray
+        Number of mesh points in each direction.
+
+    cao : numpy.ndarray
+        Charge assignment order in each direction.
+
+    Returns
+    -------
+    nkt : numpy.ndarray
+        Microscopic density of each species. Shape = ( ``no_species``, ``no_dumps``, ``no_ka_values``)
+
+    """
+    harmonics, max_harmonic = k_list_harmonics(k_list, box_lengths)
+    if (2 * harmonics >= mesh_sizes).any():
+        raise ValueError("The mesh is too coarse for the requested k harmonics. Increase mesh_sizes.")
+
+    mesh_spacings = box_lengths / mesh_sizes
+    mid, pshift = mesh_point_shift(cao)
+    # Fourier transform of the assignment function
+    w_k = (sinc(harmonics / mesh_sizes) ** cao).prod(axis=1)
+
+    nkt = zeros((len(species_np), pos_frames.shape[0], len(k_list)), dtype=complex128)
+    for it, pos in enumerate(pos_frames):
+        mesh_pos, mesh_points = calc_mesh_coord(pos, mesh_spacings, cao)
+        sp_start = 0
+        sp_end = 0
+        for i, sp in enumerate(species_np):
+            sp_end += sp
+            rho_r = calc_charge_dens(
+                mesh_pos[sp_start:sp_end], mesh_points[sp_start:sp_end], ones(sp), cao, mesh_sizes, mid, pshift
+            )
+            # The mesh is stored as (z, y, x)
+            rho_k = fftn(rho_r)
+            nkt[i, it, :] = rho_k[harmonics[:, 2], harmonics[:, 1], harmonics[:, 0]] / w_k
+            sp_start += sp
+
+    return nkt
+
+
+def calc_nkt(fldr, slices, dump_step, species_np, k_list, box_lengths, verbose, mesh_sizes=None, cao=None):
     """
     Calculate density fluctuations :math:`n(k,t)` of all species.
 
     .. math::
         n_{A} ( k, t ) = \\sum_i^{N_A} \\exp [ -i \\mathbf k \\cdot \\mathbf r_{i}(t) ]
 
-    where :math:`N_A` is the number of particles of species :math:`A`.
+    where :math:`N_A` is the number of particles of species :math:`A`. The dumps of the slice are read first and then
+    passed all at once to :func:`calc_nk_frames`, or to :func:`calc_nk_mesh` if ``mesh_sizes`` is given.
 
     Parameters
     ----------
@@ -4059,6 +5968,18 @@ def calc_nkt(fldr, slices, dump_step, species_np, k_list, verbose):
     k_list : list
         List of :math: `k` vectors.
 
+    box_lengths : numpy.ndarray
+        Length of each box's side.
+
+    verbose : bool
+        Flag for printing the progress bar.
+
+    mesh_sizes : numpy.ndarray, optional
+        Number of mesh points in each direction. Default = ``None``, i.e. direct sums.
+
+    cao : numpy.ndarray, optional
+        Charge assignment order in each direction. Needed only if ``mesh_sizes`` is given.
+
     Return
     ------
     nkt : numpy.ndarray, complex
@@ -4066,100 +5987,437 @@ def calc_nkt(fldr, slices, dump_step, species_np, k_list, verbose):
     """
 
     # Read particles' position for times in the slice
-    nkt = zeros((len(species_np), slices[2], len(k_list)), dtype=complex128)
+    pos = zeros((slices[2], species_np.sum(), 3))
     for it, dump in enumerate(tqdm(range(slices[0], slices[1], dump_step), disable=not verbose)):
         data = load_from_restart(fldr, dump)
-        pos = data["pos"]
-        sp_start = 0
-        sp_end = 0
-        for i, sp in enumerate(species_np):
-            sp_end += sp
-            nkt[i, it, :] = calc_nk(pos[sp_start:sp_end, :], k_list)
-            sp_start += sp
+        pos[it] = data["pos"]
+
+    if mesh_sizes is None:
+        nkt = calc_nk_frames(pos, species_np, array(k_list), box_lengths)
+    else:
+        nkt = calc_nk_mesh(pos, species_np, array(k_list), box_lengths, mesh_sizes, cao)
 
     return nkt
 
 
+@njit(parallel=True, cache=True)
+def calc_phase_factors(pos_data, box_lengths, max_harmonic):
+    """
+    Calculate the phase factors :math:`\\exp [ -2 \\pi i n r_{i,\\alpha}/L_{\\alpha} ]` for all the harmonics
+    :math:`0 \\leq n \\leq` ``max_harmonic`` along each axis :math:`\\alpha`. The phase factor of the first harmonic is
+    evaluated once per particle and axis, the others are obtained by repeated multiplication as in Ewald sums.
+
+    Parameters
+    ----------
+    pos_data : numpy.ndarray
+        Particles' positions. Shape = ( ``tot_no_ptcls``, 3)
+
+    box_lengths : numpy.ndarray
+        Length of each box's side.
+
+    max_harmonic : int
+        Largest harmonic.
+
+    Returns
+    -------
+    eikr : numpy.ndarray
+        Phase factors. Shape = (3, ``max_harmonic + 1``, ``tot_no_ptcls``)
+
+    """
+    no_ptcls = pos_data.shape[0]
+    eikr = ones((3, max_harmonic + 1, no_ptcls), dtype=complex128)
+
+    for i in prange(no_ptcls):
+        for d in range(3):
+            # Skip the missing dimensions in 2D simulations. Only their zeroth harmonic is used.
+            if box_lengths[d] > 0.0:
+                e_ikr = exp(-2.0j * pi * pos_data[i, d] / box_lengths[d])
+                for n in range(1, max_harmonic + 1):
+                    eikr[d, n, i] = eikr[d, n - 1, i] * e_ikr
+
+    return eikr
+
+
+@njit(parallel=True, cache=True)
+def calc_power_sums(dist, species_index_start, max_power):
+    """
+    Calculate in a single pass the power sums of the (velocity) distribution of each species, dump and dimension
+
+    .. math::
+        S_p = \\sum_i^{N} (v_i - c)^p, \\quad p = 0, ..., p_{\\rm max},
+
+    where the shift :math:`c` is the first value of each group. The shift reduces the round-off errors in the
+    calculation of the central moments when the average is large compared to the spread. Dumps and dimensions are
+    distributed among threads.
+
+    Parameters
+    ----------
+    dist: numpy.ndarray
+        Distribution of each time step. Shape = (``no_dumps``, ``dim``, ``runs * inv_dim * total_num_ptlcs``)
+
+    species_index_start: numpy.ndarray
+        Array containing the start index of each species. The last value is equivalent to dist.shape[-1]
+
+    max_power: int
+        Highest power :math:`p_{\\rm max}`.
+
+    Returns
+    -------
+    power_sums: numpy.ndarray
+        Power sums. Shape = (``no_species``, ``no_dumps``, ``dim``, ``max_power + 1``)
+
+    shift: numpy.ndarray
+        Shift of each group. Shape = (``no_species``, ``no_dumps``, ``dim``)
+
+    """
+    no_dumps = dist.shape[0]
+    no_dim = dist.shape[1]
+    no_species = len(species_index_start) - 1
+    power_sums = zeros((no_species, no_dumps, no_dim, max_power + 1))
+    shift = zeros((no_species, no_dumps, no_dim))
+
+    for idx in prange(no_dumps * no_dim):
+        it = idx // no_dim
+        d = idx % no_dim
+        for sp in range(no_species):
+            sp_start = species_index_start[sp]
+            sp_end = species_index_start[sp + 1]
+            if sp_end == sp_start:
+                continue
+            c = float(dist[it, d, sp_start])
+            shift[sp, it, d] = c
+            for ip in range(sp_start, sp_end):
+                v = dist[it, d, ip] - c
+                v_pow = 1.0
+                for pw in range(max_power + 1):
+                    power_sums[sp, it, d, pw] += v_pow
+                    v_pow *= v
+
+    return power_sums, shift
+
+
 def calc_pressure_tensor(vel, virial, species_mass, species_np, box_volume, dimensions):
     """
     Calculate the pressure tensor.
 
     Parameters
     ----------
-    pos : numpy.ndarray
-        Particles' positions.
+    pos : numpy.ndarray
+        Particles' positions.
+
+    vel : numpy.ndarray
+        Particles' velocities.
+
+    acc : numpy.ndarray
+        Particles' accelerations.
+
+    species_mass : numpy.ndarray
+        Mass of each species.
+
+    species_np : numpy.ndarray
+        Number of particles of each species.
+
+    box_volume : float
+        Volume of simulation's box.
+
+    Returns
+    -------
+    pressure : float
+        Scalar Pressure i.e. trace of the pressure tensor
+
+    pressure_tensor : numpy.ndarray
+        Pressure tensor. Shape(``no_dim``,``no_dim``)
+
+    """
+    sp_start = 0
+    sp_end = 0
+
+    # Rescale vel of each particle by their individual mass.
+    # Work on a copy since the same dump can be shared by several streamed observables.
+    vel = vel.copy()
+    for sp, num in enumerate(species_np):
+        sp_end += num
+        vel[sp_start:sp_end, :] *= sqrt(species_mass[sp])
+        sp_start += num
+
+    pressure_kin = (vel.transpose() @ vel) / box_volume
+    pressure_pot = virial.sum(axis=-1) / box_volume
+    pressure_tensor = pressure_kin + pressure_pot
+
+    # .trace is not supported by numba. hence no njit
+    pressure = pressure_tensor.trace() / dimensions
+
+    return pressure, pressure_kin, pressure_pot, pressure_tensor
+
+
+def calc_pressure_tensor_acf(pt_kin, pt_pot, pt):
+    """
+    Calculate the correlation functions of all the pairs of elements of the pressure tensor,
+    :math:`C_{abcd}(\\tau) = \\langle \\sigma_{ab}(\\tau) \\sigma_{cd}(0) \\rangle`, with a single FFT.
+
+    The pressure tensor is symmetric, hence only its :math:`D(D+1)/2` unique elements are transformed. The cross-spectra
+    are computed only for the unique pairs of elements. The correlation function of the swapped pair is obtained from the
+    negative lags of the same inverse transform, :math:`C_{cdab}(\\tau) = C_{abcd}(-\\tau)`.
+
+    Parameters
+    ----------
+    pt_kin : numpy.ndarray
+        Kinetic pressure tensor. Shape = (``dimensions``, ``dimensions``, ``no_dumps``).
+
+    pt_pot : numpy.ndarray
+        Potential pressure tensor. Shape = (``dimensions``, ``dimensions``, ``no_dumps``).
+
+    pt : numpy.ndarray
+        Total pressure tensor. Shape = (``dimensions``, ``dimensions``, ``no_dumps``).
+
+    Returns
+    -------
+    pt_acf : numpy.ndarray
+        Kinetic, Potential, Kinetic-Potential, Potential-Kinetic, and Total correlation functions.
+        Shape = (``dimensions``, ``dimensions``, ``dimensions``, ``dimensions``, 5, ``no_dumps``).
+
+    """
+    no_dim = pt.shape[0]
+    no_dumps = pt.shape[-1]
+    n_fft = next_fast_len(2 * no_dumps - 1, real=True)
+
+    # Unique elements of the symmetric tensors, symmetrized to be safe against round-off.
+    iu, ju = triu_indices(no_dim)
+    no_el = iu.size
+    el_map = zeros((no_dim, no_dim), dtype=int64)
+    el_map[iu, ju] = arange(no_el)
+    el_map[ju, iu] = arange(no_el)
+
+    tensors = array([pt_kin, pt_pot, pt])
+    elements = 0.5 * (tensors[:, iu, ju, :] + tensors[:, ju, iu, :])
+    elements_k = rfft(elements, n=n_fft, axis=-1)
+    kin_k, pot_k, tot_k = elements_k
+
+    # Cross-spectra of the unique pairs of elements. Kin-Pot pairs are all unique.
+    pu, qu = triu_indices(no_el)
+    spectra = concatenate(
+        (
+            kin_k[pu] * kin_k[qu].conj(),
+            pot_k[pu] * pot_k[qu].conj(),
+            tot_k[pu] * tot_k[qu].conj(),
+            (kin_k[:, None, :] * pot_k[None, :, :].conj()).reshape(no_el * no_el, -1),
+        )
+    )
+    full_corr = irfft(spectra, n=n_fft, axis=-1)
+
+    # Positive and negative lags normalized by the number of time origins
+    norm_corr = arange(no_dumps, 0, -1)
+    pos_corr = full_corr[:, :no_dumps] / norm_corr
+    neg_corr = full_corr[:, (n_fft - arange(no_dumps)) % n_fft] / norm_corr
+
+    no_pairs = pu.size
+    el_acf = zeros((5, no_el, no_el, no_dumps))
+    for ic in range(3):
+        # ic = 0, 1, 4 for Kinetic, Potential, Total
+        acf_indx = [0, 1, 4][ic]
+        el_acf[acf_indx, pu, qu] = pos_corr[ic * no_pairs : (ic + 1) * no_pairs]
+        el_acf[acf_indx, qu, pu] = neg_corr[ic * no_pairs : (ic + 1) * no_pairs]
+
+    kinpot_start = 3 * no_pairs
+    el_acf[2] = pos_corr[kinpot_start:].reshape(no_el, no_el, no_dumps)
+    # C^{pot-kin}_{cdab}(tau) = C^{kin-pot}_{abcd}(-tau)
+    el_acf[3] = neg_corr[kinpot_start:].reshape(no_el, no_el, no_dumps).transpose(1, 0, 2)
+
+    # Expand to the full tensor indices
+    pt_acf = el_acf[:, el_map[:, :, None, None], el_map[None, None, :, :], :]
+
+    return pt_acf.transpose(1, 2, 3, 4, 0, 5)
+
+
+def calc_rdf_hist_dumps(dump_dir: str, dumps: range, box_lengths: ndarray, r_max: float, no_bins: int, num_species: int):
+    """
+    Sum the pair distances histograms of :func:`calc_rdf_hist` over the given dumps.
+
+    Parameters
+    ----------
+    dump_dir : str
+        Directory of the dumps.
 
-    vel : numpy.ndarray
-        Particles' velocities.
+    dumps : range
+        Timesteps of the dumps.
 
-    acc : numpy.ndarray
-        Particles' accelerations.
+    box_lengths : numpy.ndarray
+        Length of each box's side.
 
-    species_mass : numpy.ndarray
-        Mass of each species.
+    r_max : float
+        Largest pair distance.
 
-    species_np : numpy.ndarray
-        Number of particles of each species.
+    no_bins : int
+        Number of bins.
 
-    box_volume : float
-        Volume of simulation's box.
+    num_species : int
+        Number of species.
 
     Returns
     -------
-    pressure : float
-        Scalar Pressure i.e. trace of the pressure tensor
+    rdf_hist : numpy.ndarray
+        Pair distances histograms. Shape = (``no_bins``, ``num_species``, ``num_species``)
 
-    pressure_tensor : numpy.ndarray
-        Pressure tensor. Shape(``no_dim``,``no_dim``)
+    """
+    rdf_hist = zeros((no_bins, num_species, num_species))
+    for dump in dumps:
+        datap = load_from_restart(dump_dir, int(dump))
+        rdf_hist += calc_rdf_hist(
+            datap["pos"], datap["id"].astype(int64), box_lengths, r_max, no_bins, num_species, get_num_threads()
+        )
+
+    return rdf_hist
 
+
+@njit(parallel=True, cache=True)
+def calc_rdf_hist(pos, p_id, box_lengths, r_max, no_bins, num_species, no_threads):
     """
-    sp_start = 0
-    sp_end = 0
+    Calculate the histograms of the pair distances up to ``r_max`` with a linked cell list.
 
-    # Rescale vel of each particle by their individual mass
-    for sp, num in enumerate(species_np):
-        sp_end += num
-        vel[sp_start:sp_end, :] *= sqrt(species_mass[sp])
-        sp_start += num
+    The box is divided in cells of side :math:`\\geq` ``r_max`` so that only neighboring cells need to be searched.
+    Along the sides with less than three cells all the particles are searched. Each thread fills its own histograms
+    which are summed at the end. Each pair is counted once.
 
-    pressure_kin = (vel.transpose() @ vel) / box_volume
-    pressure_pot = virial.sum(axis=-1) / box_volume
-    pressure_tensor = pressure_kin + pressure_pot
+    Parameters
+    ----------
+    pos : numpy.ndarray
+        Particles' positions. Shape = (``tot_no_ptcls``, 3)
 
-    # .trace is not supported by numba. hence no njit
-    pressure = pressure_tensor.trace() / dimensions
+    p_id : numpy.ndarray
+        Species index of each particle.
 
-    return pressure, pressure_kin, pressure_pot, pressure_tensor
+    box_lengths : numpy.ndarray
+        Length of each box's side.
+
+    r_max : float
+        Largest pair distance. It must not be larger than half of the smallest box's side.
+
+    no_bins : int
+        Number of bins.
+
+    num_species : int
+        Number of species.
+
+    no_threads : int
+        Number of threads, i.e. of histograms filled in parallel.
 
+    Returns
+    -------
+    rdf_hist : numpy.ndarray
+        Pair distances histograms. Shape = (``no_bins``, ``num_species``, ``num_species``)
 
-@njit
+    """
+    no_ptcls = pos.shape[0]
+    dr = r_max / no_bins
+    r_max_2 = r_max * r_max
+
+    # Sides with less than three cells are searched entirely
+    cells_per_dim = ones(3, dtype=int64)
+    cell_lengths = box_lengths.copy()
+    for d in range(3):
+        if box_lengths[d] > 0.0 and int(box_lengths[d] / r_max) >= 3:
+            cells_per_dim[d] = int(box_lengths[d] / r_max)
+            cell_lengths[d] = box_lengths[d] / cells_per_dim[d]
+    no_cells = cells_per_dim[0] * cells_per_dim[1] * cells_per_dim[2]
+
+    # Sort the particles by cell
+    cell_id = zeros(no_ptcls, dtype=int64)
+    cell_start = zeros(no_cells + 1, dtype=int64)
+    for i in range(no_ptcls):
+        c = 0
+        stride = 1
+        for d in range(3):
+            cd = 0
+            if cells_per_dim[d] > 1:
+                cd = min(max(int(pos[i, d] / cell_lengths[d]), 0), cells_per_dim[d] - 1)
+            c += cd * stride
+            stride *= cells_per_dim[d]
+        cell_id[i] = c
+        cell_start[c + 1] += 1
+    for c in range(no_cells):
+        cell_start[c + 1] += cell_start[c]
+    cell_ptcls = argsort(cell_id, kind="mergesort")
+
+    threads_hist = zeros((no_threads, no_bins, num_species, num_species))
+    for th in prange(no_threads):
+        for i in range(th, no_ptcls, no_threads):
+            c = cell_id[i]
+            cx = c % cells_per_dim[0]
+            cy = (c // cells_per_dim[0]) % cells_per_dim[1]
+            cz = c // (cells_per_dim[0] * cells_per_dim[1])
+            for iz in range(-1 if cells_per_dim[2] > 1 else 0, 2 if cells_per_dim[2] > 1 else 1):
+                nz = (cz + iz) % cells_per_dim[2]
+                for iy in range(-1 if cells_per_dim[1] > 1 else 0, 2 if cells_per_dim[1] > 1 else 1):
+                    ny = (cy + iy) % cells_per_dim[1]
+                    for ix in range(-1 if cells_per_dim[0] > 1 else 0, 2 if cells_per_dim[0] > 1 else 1):
+                        nx = (cx + ix) % cells_per_dim[0]
+                        nc = nx + ny * cells_per_dim[0] + nz * cells_per_dim[0] * cells_per_dim[1]
+                        for jc in range(cell_start[nc], cell_start[nc + 1]):
+                            j = cell_ptcls[jc]
+                            # Count each pair once
+                            if j <= i:
+                                continue
+                            r2 = 0.0
+                            for d in range(3):
+                                dx = pos[i, d] - pos[j, d]
+                                # Minimum image convention
+                                if box_lengths[d] > 0.0:
+                                    dx -= box_lengths[d] * round(dx / box_lengths[d])
+                                r2 += dx * dx
+                            if r2 < r_max_2:
+                                rdf_bin = int(sqrt(r2) / dr)
+                                threads_hist[th, rdf_bin, p_id[i], p_id[j]] += 1
+
+    return threads_hist.sum(axis=0)
+
+
+@njit(cache=True)
 def calc_statistical_efficiency(observable, run_avg, run_std, max_no_divisions, no_dumps):
     """
-    Todo:
+    Calculate the statistical efficiency of a time series by dividing it in an increasing number of blocks of equal
+    length. The block averages are obtained from the cumulative sum of the series, hence the cost is
+    :math:`O(T + N_{\\rm div}^2)` instead of :math:`O(T N_{\\rm div})`. See
+    :func:`sarkas.utilities.maths.blocking_analysis` for the Flyvbjerg-Petersen analysis.
 
     Parameters
     ----------
-    observable
-    run_avg
-    run_std
-    max_no_divisions
-    no_dumps
+    observable : numpy.ndarray
+        Time series.
+
+    run_avg : float
+        Average of the time series.
+
+    run_std : float
+        Standard deviation of the time series.
+
+    max_no_divisions : int
+        Maximum number of blocks.
+
+    no_dumps : int
+        Number of samples of the time series.
 
     Returns
     -------
+    tau_blk : numpy.ndarray
+        Length of the blocks of each division.
+
+    sigma2_blk : numpy.ndarray
+        Variance of the block averages of each division.
+
+    statistical_efficiency : numpy.ndarray
+        Statistical efficiency :math:`\\tau_{\\rm blk} \\sigma^2_{\\rm blk} / \\sigma^2` of each division.
 
     """
     tau_blk = zeros(max_no_divisions)
     sigma2_blk = zeros(max_no_divisions)
     statistical_efficiency = zeros(max_no_divisions)
+    running_sum = zeros(no_dumps + 1)
+    running_sum[1:] = observable[:no_dumps].cumsum()
     for i in range(2, max_no_divisions):
         tau_blk[i] = int(no_dumps / i)
-        for j in range(i):
-            t_start = int(j * tau_blk[i])
-            t_end = int((j + 1) * tau_blk[i])
-            blk_avg = observable[t_start:t_end].mean()
-            sigma2_blk[i] += (blk_avg - run_avg) ** 2
-        sigma2_blk[i] /= i - 1
+        edges = (arange(i + 1) * tau_blk[i]).astype(int64)
+        blk_avg = (running_sum[edges[1:]] - running_sum[edges[:-1]]) / tau_blk[i]
+        sigma2_blk[i] = ((blk_avg - run_avg) ** 2).sum() / (i - 1)
         statistical_efficiency[i] = tau_blk[i] * sigma2_blk[i] / run_std**2
 
     return tau_blk, sigma2_blk, statistical_efficiency
@@ -4230,7 +6488,7 @@ def calc_diff_flux_acf(vel, sp_num, sp_conc, sp_mass):
     for i, m_alpha in enumerate(sp_mass[:-1]):
         # Flux
         for j, m_beta in enumerate(sp_mass):
-            delta_ab = 1 * (m_beta == m_alpha)
+            delta_ab = 1 * (i == j)
             J_flux[i, :, :] += (m_bar * delta_ab - sp_conc[i] * m_beta) * tot_vel[j, :, :]
             jr_flux[i, :, :] += (delta_ab - sp_conc[i]) * tot_vel[j, :, :]
         J_flux[i, :, :] *= m_alpha / m_bar
@@ -4246,16 +6504,18 @@ def calc_diff_flux_acf(vel, sp_num, sp_conc, sp_mass):
                 jr_acf[indx, d, :] = correlationfunction(sp1_flux[d, :], sp2_flux[d, :])
                 # Calculate the total correlation function by summing the three directions
                 jr_acf[indx, -1, :] += jr_acf[indx, d, :]
-        indx += 1
+            indx += 1
 
     return J_flux, jr_acf
 
 
-# @jit Numba doesn't like Scipy
-def calc_vacf(vel, sp_num):
+def calc_vacf(vel, sp_num, chunk_size: int = None):
     """
     Calculate the velocity autocorrelation function of each species and in each direction.
 
+    The autocorrelation functions of all the particles of a species are computed with a single batched FFT, see
+    :func:`sarkas.utilities.maths.batched_correlationfunction`, and averaged in the frequency domain.
+
     Parameters
     ----------
     vel : numpy.ndarray
@@ -4265,6 +6525,9 @@ def calc_vacf(vel, sp_num):
     sp_num: numpy.ndarray
         Number of particles of each species.
 
+    chunk_size: int, optional
+        Maximum number of particles transformed at once. Default = ``None``, all the particles of a species.
+
     Returns
     -------
     vacf: numpy.ndarray
@@ -4276,33 +6539,81 @@ def calc_vacf(vel, sp_num):
 
     vacf = zeros((len(sp_num), no_dim + 1, no_dumps))
 
-    # Calculate the vacf of each species in each dimension
-    for d in range(no_dim):
-        sp_start = 0
-        sp_end = 0
-        for sp, n_sp in enumerate(sp_num):
-            sp_end += n_sp
-            # Temporary species vacf
-            sp_vacf = zeros(no_dumps)
-            # Calculate the vacf for each particle of species sp
-            for ptcl in range(sp_start, sp_end):
-                # Calculate the correlation function and add it to the array
-                ptcl_vacf = correlationfunction(vel[d, ptcl, :], vel[d, ptcl, :])
+    sp_start = 0
+    sp_end = 0
+    for sp, n_sp in enumerate(sp_num):
+        sp_end += n_sp
+        # Species vacf in each dimension averaged over the particles
+        vacf[sp, :no_dim, :] = batched_correlationfunction(
+            vel[:, sp_start:sp_end, :], average_axis=1, chunk_size=chunk_size
+        )
+        # Save the total vacf
+        vacf[sp, -1, :] = vacf[sp, :no_dim, :].sum(axis=0)
+        # Move to the next species first particle position
+        sp_start += n_sp
 
-                # Add this particle vacf to the species vacf and normalize by the time origins
-                sp_vacf += ptcl_vacf
+    return vacf
 
-            # Save the species vacf for dimension i
-            vacf[sp, d, :] = sp_vacf / n_sp
-            # Save the total vacf
-            vacf[sp, -1, :] += sp_vacf / n_sp
-            # Move to the next species first particle position
-            sp_start += n_sp
 
-    return vacf
+@njit(parallel=True, cache=True)
+def calc_vel_histograms(vel, species_index_start, bin_edges, no_bins):
+    """
+    Calculate the histograms of the velocities of each dump, dimension and species at once with fixed uniform bins
+    for each species. The bin of each velocity is found as in :func:`numpy.histogram`, i.e. all but the last bin are
+    half-open and velocities outside the range are discarded. Dumps and dimensions are distributed among threads.
+
+    Parameters
+    ----------
+    vel: numpy.ndarray
+        Particles' velocities. Shape = (``no_dumps``, ``dim``, ``runs * inv_dim * total_num_ptlcs``)
+
+    species_index_start: numpy.ndarray
+        Array containing the start index of each species. The last value is equivalent to vel.shape[-1]
+
+    bin_edges: numpy.ndarray
+        Uniform bin edges of each species, padded to the largest number of bins. Shape = (``no_species``,
+        ``max(no_bins) + 1``).
 
+    no_bins: numpy.ndarray
+        Number of bins of each species.
+
+    Returns
+    -------
+    counts: numpy.ndarray
+        Bin counts. Shape = (``no_dumps``, ``dim``, ``no_species``, ``max(no_bins)``)
 
-@njit
+    """
+    no_dumps = vel.shape[0]
+    no_dim = vel.shape[1]
+    no_species = len(no_bins)
+    counts = zeros((no_dumps, no_dim, no_species, bin_edges.shape[1] - 1))
+
+    for idx in prange(no_dumps * no_dim):
+        it = idx // no_dim
+        d = idx % no_dim
+        for sp in range(no_species):
+            nb = no_bins[sp]
+            low = bin_edges[sp, 0]
+            high = bin_edges[sp, nb]
+            norm = nb / (high - low)
+            for ip in range(species_index_start[sp], species_index_start[sp + 1]):
+                v = vel[it, d, ip]
+                if v < low or v > high:
+                    continue
+                b = int((v - low) * norm)
+                if b == nb:
+                    b -= 1
+                # Correct round-off errors at the bin edges
+                if v < bin_edges[sp, b]:
+                    b -= 1
+                elif v >= bin_edges[sp, b + 1] and b != nb - 1:
+                    b += 1
+                counts[it, d, sp, b] += 1.0
+
+    return counts
+
+
+@njit(cache=True)
 def calc_vk(pos_data, vel_data, k_list):
     """
     Calculate the instantaneous longitudinal and transverse velocity fluctuations.
@@ -4362,7 +6673,154 @@ def calc_vk(pos_data, vel_data, k_list):
     return vk, vk_i, vk_j, vk_k
 
 
-def calc_vkt(fldr, slices, dump_step, species_np, k_list, verbose):
+@njit(parallel=True, cache=True)
+def calc_vk_frames(pos_frames, vel_frames, species_np, k_list, box_lengths):
+    """
+    Calculate the longitudinal and transverse velocity fluctuations of each species for several dumps at once.
+
+    The phase factors are built by recurrence from :func:`calc_phase_factors`, see :func:`calc_nk_frames`.
+    The loop over :math:`k` vectors runs in parallel.
+
+    Parameters
+    ----------
+    pos_frames : numpy.ndarray
+        Particles' positions of each dump. Shape = ( ``no_dumps``, ``tot_no_ptcls``, 3)
+
+    vel_frames : numpy.ndarray
+        Particles' velocities of each dump. Shape = ( ``no_dumps``, ``tot_no_ptcls``, 3)
+
+    species_np : numpy.ndarray
+        Number of particles of each species.
+
+    k_list : numpy.ndarray
+        List of :math:`k` indices in each direction with corresponding magnitude and index of ``ka_counts``.
+        Shape=(``no_ka_values``, 5)
+
+    box_lengths : numpy.ndarray
+        Length of each box's side.
+
+    Returns
+    -------
+    vkt : numpy.ndarray
+        Longitudinal and transverse velocity fluctuations along the :math:`x`, :math:`y`, :math:`z` axis.
+        Shape = ( 4, ``no_species``, ``no_dumps``, ``no_ka_values``)
+
+    """
+    no_dumps = pos_frames.shape[0]
+    no_species = species_np.shape[0]
+    no_k = k_list.shape[0]
+
+    harmonics, max_harmonic = k_list_harmonics(k_list, box_lengths)
+    sp_start = zeros(no_species + 1, dtype=int64)
+    sp_start[1:] = species_np.cumsum()
+
+    vkt = zeros((4, no_species, no_dumps, no_k), dtype=complex128)
+    for it in range(no_dumps):
+        eikr = calc_phase_factors(pos_frames[it], box_lengths, max_harmonic)
+        vel = vel_frames[it]
+        for ik in prange(no_k):
+            nx, ny, nz = harmonics[ik, 0], harmonics[ik, 1], harmonics[ik, 2]
+            kx, ky, kz = 2.0 * pi * k_list[ik, 0], 2.0 * pi * k_list[ik, 1], 2.0 * pi * k_list[ik, 2]
+            for sp in range(no_species):
+                vk = 0.0j
+                vk_i = 0.0j
+                vk_j = 0.0j
+                vk_k = 0.0j
+                for i in range(sp_start[sp], sp_start[sp + 1]):
+                    e_ikr = eikr[0, nx, i] * eikr[1, ny, i] * eikr[2, nz, i]
+                    # Microscopic longitudinal current
+                    vk += (kx * vel[i, 0] + ky * vel[i, 1] + kz * vel[i, 2]) * e_ikr
+                    # Microscopic transverse current
+                    vk_i += (ky * vel[i, 2] - kz * vel[i, 1]) * e_ikr
+                    vk_j -= (kx * vel[i, 2] - kz * vel[i, 0]) * e_ikr
+                    vk_k += (kx * vel[i, 1] - ky * vel[i, 0]) * e_ikr
+                vkt[0, sp, it, ik] = vk
+                vkt[1, sp, it, ik] = vk_i
+                vkt[2, sp, it, ik] = vk_j
+                vkt[3, sp, it, ik] = vk_k
+
+    return vkt
+
+
+def calc_vk_mesh(pos_frames, vel_frames, species_np, k_list, box_lengths, mesh_sizes, cao):
+    """
+    Calculate the longitudinal and transverse velocity fluctuations of each species for several dumps at once by
+    assigning the particles' momenta to a mesh. See :func:`calc_nk_mesh` for the details of the mesh assignment.
+
+    Parameters
+    ----------
+    pos_frames : numpy.ndarray
+        Particles' positions of each dump. Shape = ( ``no_dumps``, ``tot_no_ptcls``, 3)
+
+    vel_frames : numpy.ndarray
+        Particles' velocities of each dump. Shape = ( ``no_dumps``, ``tot_no_ptcls``, 3)
+
+    species_np : numpy.ndarray
+        Number of particles of each species.
+
+    k_list : numpy.ndarray
+        List of :math:`k` indices in each direction with corresponding magnitude and index of ``ka_counts``.
+        Shape=(``no_ka_values``, 5)
+
+    box_lengths : numpy.ndarray
+        Length of each box's side.
+
+    mesh_sizes : numpy.ndarray
+        Number of mesh points in each direction.
+
+    cao : numpy.ndarray
+        Charge assignment order in each direction.
+
+    Returns
+    -------
+    vkt : numpy.ndarray
+        Longitudinal and transverse velocity fluctuations along the :math:`x`, :math:`y`, :math:`z` axis.
+        Shape = ( 4, ``no_species``, ``no_dumps``, ``no_ka_values``)
+
+    """
+    harmonics, max_harmonic = k_list_harmonics(k_list, box_lengths)
+    if (2 * harmonics >= mesh_sizes).any():
+        raise ValueError("The mesh is too coarse for the requested k harmonics. Increase mesh_sizes.")
+
+    mesh_spacings = box_lengths / mesh_sizes
+    mid, pshift = mesh_point_shift(cao)
+    # Fourier transform of the assignment function
+    w_k = (sinc(harmonics / mesh_sizes) ** cao).prod(axis=1)
+    kx, ky, kz = 2.0 * pi * k_list[:, 0], 2.0 * pi * k_list[:, 1], 2.0 * pi * k_list[:, 2]
+
+    vkt = zeros((4, len(species_np), pos_frames.shape[0], len(k_list)), dtype=complex128)
+    for it, pos in enumerate(pos_frames):
+        mesh_pos, mesh_points = calc_mesh_coord(pos, mesh_spacings, cao)
+        sp_start = 0
+        sp_end = 0
+        for i, sp in enumerate(species_np):
+            sp_end += sp
+            # Current density along each direction
+            jk = zeros((3, len(k_list)), dtype=complex128)
+            for d in range(3):
+                j_r = calc_charge_dens(
+                    mesh_pos[sp_start:sp_end],
+                    mesh_points[sp_start:sp_end],
+                    vel_frames[it, sp_start:sp_end, d].copy(),
+                    cao,
+                    mesh_sizes,
+                    mid,
+                    pshift,
+                )
+                jk[d] = fftn(j_r)[harmonics[:, 2], harmonics[:, 1], harmonics[:, 0]] / w_k
+
+            # Longitudinal
+            vkt[0, i, it, :] = kx * jk[0] + ky * jk[1] + kz * jk[2]
+            # Transverse
+            vkt[1, i, it, :] = ky * jk[2] - kz * jk[1]
+            vkt[2, i, it, :] = -(kx * jk[2] - kz * jk[0])
+            vkt[3, i, it, :] = kx * jk[1] - ky * jk[0]
+            sp_start += sp
+
+    return vkt
+
+
+def calc_vkt(fldr, slices, dump_step, species_np, k_list, box_lengths, verbose, mesh_sizes=None, cao=None):
     r"""
     Calculate the longitudinal and transverse velocities fluctuations of all species.
     Longitudinal
@@ -4375,7 +6833,8 @@ def calc_vkt(fldr, slices, dump_step, species_np, k_list, verbose):
     .. math::
         \\tau_A(\mathbf{k}, t) = \sum_i^{N_A} \mathbf{k} \\times \mathbf{v}_{i}(t) \exp [ - i \mathbf{k} \cdot \mathbf{r}_{i}(t) ]
 
-    where :math:`N_A` is the number of particles of species :math:`A`.
+    where :math:`N_A` is the number of particles of species :math:`A`. The dumps of the slice are read first and then
+    passed all at once to :func:`calc_vk_frames`, or to :func:`calc_vk_mesh` if ``mesh_sizes`` is given.
 
     Parameters
     ----------
@@ -4394,6 +6853,18 @@ def calc_vkt(fldr, slices, dump_step, species_np, k_list, verbose):
     k_list : list
         List of :math: `k` vectors.
 
+    box_lengths : numpy.ndarray
+        Length of each box's side.
+
+    verbose : bool
+        Flag for printing the progress bar.
+
+    mesh_sizes : numpy.ndarray, optional
+        Number of mesh points in each direction. Default = ``None``, i.e. direct sums.
+
+    cao : numpy.ndarray, optional
+        Charge assignment order in each direction. Needed only if ``mesh_sizes`` is given.
+
     Returns
     -------
     vkt : numpy.ndarray, complex
@@ -4414,24 +6885,19 @@ def calc_vkt(fldr, slices, dump_step, species_np, k_list, verbose):
 
     """
 
-    # Read particles' position for all times
-    no_dumps = slices[2]
-    vkt_par = zeros((len(species_np), no_dumps, len(k_list)), dtype=complex128)
-    vkt_perp_i = zeros((len(species_np), no_dumps, len(k_list)), dtype=complex128)
-    vkt_perp_j = zeros((len(species_np), no_dumps, len(k_list)), dtype=complex128)
-    vkt_perp_k = zeros((len(species_np), no_dumps, len(k_list)), dtype=complex128)
+    # Read particles' position and velocities for times in the slice
+    pos = zeros((slices[2], species_np.sum(), 3))
+    vel = zeros((slices[2], species_np.sum(), 3))
     for it, dump in enumerate(tqdm(range(slices[0], slices[1], dump_step), disable=not verbose)):
         data = load_from_restart(fldr, dump)
-        pos = data["pos"]
-        vel = data["vel"]
-        sp_start = 0
-        sp_end = 0
-        for i, sp in enumerate(species_np):
-            sp_end += sp
-            vkt_par[i, it, :], vkt_perp_i[i, it, :], vkt_perp_j[i, it, :], vkt_perp_k[i, it, :] = calc_vk(
-                pos[sp_start:sp_end, :], vel[sp_start:sp_end], k_list
-            )
-            sp_start += sp
+        pos[it] = data["pos"]
+        vel[it] = data["vel"]
+
+    if mesh_sizes is None:
+        vkt = calc_vk_frames(pos, vel, species_np, array(k_list), box_lengths)
+    else:
+        vkt = calc_vk_mesh(pos, vel, species_np, array(k_list), box_lengths, mesh_sizes, cao)
+    vkt_par, vkt_perp_i, vkt_perp_j, vkt_perp_k = vkt
 
     return vkt_par, vkt_perp_i, vkt_perp_j, vkt_perp_k
 
@@ -4501,6 +6967,41 @@ def calculate_herm_coeff(v, distribution, maxpower):
     return coeff
 
 
+@njit(cache=True)
+def k_list_harmonics(k_list, box_lengths):
+    """
+    Recover the integer harmonics :math:`(n_x, n_y, n_z)` of the :math:`k` vectors in ``k_list``.
+
+    Parameters
+    ----------
+    k_list : numpy.ndarray
+        List of :math:`k` indices in each direction with corresponding magnitude and index of ``ka_counts``.
+        Shape=(``no_ka_values``, 5)
+
+    box_lengths : numpy.ndarray
+        Length of each box's side.
+
+    Returns
+    -------
+    harmonics : numpy.ndarray
+        Harmonics of each :math:`k` vector. Shape = (``no_ka_values``, 3)
+
+    max_harmonic : int
+        Largest harmonic.
+
+    """
+    harmonics = zeros((k_list.shape[0], 3), dtype=int64)
+    max_harmonic = 0
+    for ik in range(k_list.shape[0]):
+        for d in range(3):
+            harmonics[ik, d] = int64(round(k_list[ik, d] * box_lengths[d]))
+            if harmonics[ik, d] < 0:
+                raise ValueError("Negative harmonics are not supported.")
+            max_harmonic = max(max_harmonic, harmonics[ik, d])
+
+    return harmonics, max_harmonic
+
+
 def kspace_setup(box_lengths, angle_averaging, max_k_harmonics, max_aa_harmonics):
     """
     Calculate all allowed :math:`k` vectors.
@@ -4662,6 +7163,334 @@ def load_from_restart(fldr, it):
     return data
 
 
+def share_kt_data(observables: list):
+    """
+    Let the Fourier space observables with the same :math:`n(\\mathbf k, t)` or :math:`v(\\mathbf k, t)` calculate it
+    only once. The first observable of each group streams the data, the others point to its array.
+
+    Parameters
+    ----------
+    observables : list
+        List of :class:`sarkas.tools.observables.Observable` whose streams have been initialized.
+
+    """
+    # Observables streaming n(k,t) or v(k,t), identified by their data file and k-space setup.
+    kt_owners = {}
+    for obs in observables:
+        if not obs.k_observable:
+            continue
+
+        kt_setup = (
+            obs.no_slices,
+            obs.slice_steps,
+            obs.dump_step,
+            obs.angle_averaging,
+            tuple(obs.max_k_harmonics),
+            None if obs.max_aa_harmonics is None else tuple(obs.max_aa_harmonics),
+            obs.kt_method,
+        )
+        if obs.kt_method == "mesh":
+            # The mesh approximates n(k,t), hence its parameters change the data, see cache_inputs
+            kt_setup += (tuple(obs.kt_mesh_sizes), obs.kt_cao)
+        if obs.nkt_stream:
+            owner = kt_owners.setdefault((obs.nkt_hdf_file, *kt_setup), obs)
+            if owner is not obs:
+                obs.nkt_stream = False
+                obs.nkt = owner.nkt
+        if obs.vkt_stream:
+            owner = kt_owners.setdefault((obs.vkt_hdf_file, *kt_setup), obs)
+            if owner is not obs:
+                obs.vkt_stream = False
+                obs.vkt = owner.vkt
+
+
+def observable_state(observable, exclude: list = None):
+    """
+    Copy the attributes of an observable for a worker process, see :func:`restore_observable`. Unlike pickling the
+    observable, unpickling the state does not read its data from disk.
+
+    Parameters
+    ----------
+    observable : :class:`sarkas.tools.observables.Observable`
+        Observable to copy.
+
+    exclude : list, optional
+        Attributes not to copy, e.g. those stored in shared memory.
+
+    Returns
+    -------
+    state : tuple
+        Class and dictionary of attributes of the observable.
+
+    """
+    exclude = ["slice_correlator", *(exclude or [])]
+    return observable.__class__, {key: value for key, value in observable.__dict__.items() if key not in exclude}
+
+
+def restore_observable(obs_class, state: dict):
+    """
+    Create an observable from the state copied by :func:`observable_state`.
+
+    Parameters
+    ----------
+    obs_class : type
+        Observable's class.
+
+    state : dict
+        Observable's attributes.
+
+    Returns
+    -------
+    observable : :class:`sarkas.tools.observables.Observable`
+        Copy of the observable.
+
+    """
+    observable = obs_class.__new__(obs_class)
+    observable.__dict__.update(state)
+    return observable
+
+
+def read_sim_data_run(state: tuple, run: int, start: int, stop: int, pva: str, data: SharedArray):
+    """
+    Read a block of dumps of a run and store it in the run's samples of the shared block, see
+    :meth:`Observable.iter_sim_data`.
+
+    Parameters
+    ----------
+    state : tuple
+        Observable's state, see :func:`observable_state`.
+
+    run : int
+        Run index.
+
+    start : int
+        Index of the first dump of the block.
+
+    stop : int
+        Index of the dump after the last one of the block.
+
+    pva : str
+        Key of the data to be collected. Options ["pos", "vel", "acc"].
+
+    data : :class:`sarkas.utilities.parallel.SharedArray`
+        Block of data. Shape = (``stop - start``, ``dim``, ``runs * inv_dim * total_num_ptcls``).
+
+    Returns
+    -------
+    time : numpy.ndarray
+        Time of the dumps in the block.
+
+    """
+    observable = restore_observable(*state)
+    time = zeros(stop - start)
+    for it in range(start, stop):
+        datap = load_from_restart(observable.dump_dirs_list[run], int(it * observable.dump_step))
+        observable.arrange_species_samples(datap[pva], data.array[it - start], run=run)
+        time[it - start] = datap["time"]
+    data.detach()
+
+    return time
+
+
+def stream_slice(states: list, shared_arrays: list, isl: int, dump_dir: str, dump_step: int, frame_keys: set):
+    """
+    Stream the dumps of a slice to copies of the observables in a worker process.
+
+    The slices arrays of the observables, see :meth:`Observable.slice_arrays`, are written in shared memory. The new
+    columns of their dataframes are returned.
+
+    Parameters
+    ----------
+    states : list
+        States of observables with the same slices, see :func:`observable_state`.
+
+    shared_arrays : list
+        Dictionary of the :class:`sarkas.utilities.parallel.SharedArray` of each observable.
+
+    isl : int
+        Slice index.
+
+    dump_dir : str
+        Directory of the dumps.
+
+    dump_step : int
+        Timesteps between two dumps.
+
+    frame_keys : set
+        Keys of the dumps' data needed by the observables.
+
+    Returns
+    -------
+    columns : list
+        Dictionary of the new columns of each dataframe for each observable.
+
+    """
+    df_names = ["dataframe", "dataframe_slices", "dataframe_acf", "dataframe_acf_slices"]
+    observables = []
+    old_columns = []
+    for state, arrays in zip(states, shared_arrays):
+        obs = restore_observable(*state)
+        for name, shared in arrays.items():
+            setattr(obs, name, shared.array)
+        # Calculate only this slice
+        obs.pool_slices = [i for i in range(obs.no_slices) if i != isl]
+        obs.frames_consumed = isl * obs.slice_steps
+        observables.append(obs)
+        old_columns.append({name: set(getattr(obs, name).columns) for name in df_names if getattr(obs, name) is not None})
+
+    slice_steps = observables[0].slice_steps
+    for dump in range(isl * slice_steps * dump_step, (isl + 1) * slice_steps * dump_step, dump_step):
+        datap = load_from_restart(dump_dir, dump)
+        frame = {key: datap[key] for key in frame_keys}
+        for obs in observables:
+            obs.consume(frame)
+
+    columns = []
+    for obs, arrays, old in zip(observables, shared_arrays, old_columns):
+        for shared in arrays.values():
+            shared.detach()
+        obs_columns = {}
+        for name in old:
+            df = getattr(obs, name)
+            obs_columns[name] = {
+                col: df[col].to_numpy() for col in df.columns if col not in old[name] or (isl == 0 and col == "Time")
+            }
+        columns.append(obs_columns)
+
+    return columns
+
+
+def stream_slices(observables: list, workers: int, frame_keys: set):
+    """
+    Calculate the slices of the observables with ``parallel_slices = True`` in a pool of processes, see
+    :func:`stream_slice`. The results are stored in the order of the slices, hence they do not depend on the number
+    of workers. The slices calculated are added to the :attr:`Observable.pool_slices`.
+
+    Parameters
+    ----------
+    observables : list
+        Observables whose streams have been initialized by :func:`stream_dumps`.
+
+    workers : int
+        Number of processes.
+
+    frame_keys : set
+        Keys of the dumps' data needed by the observables.
+
+    """
+    # Observables with the same slices read the dumps only once
+    groups = {}
+    for obs in observables:
+        if obs.parallel_slices:
+            groups.setdefault((obs.no_slices, obs.slice_steps), []).append(obs)
+
+    tasks = []
+    tasks_slices = []
+    shared_arrays = {}
+    for (no_slices, _), group in groups.items():
+        group_arrays = []
+        states = []
+        for obs in group:
+            arrays = {}
+            for name in obs.slice_arrays():
+                array = getattr(obs, name)
+                arrays[name] = SharedArray(array.shape, array.dtype)
+                # Cached slices included
+                arrays[name].array[...] = array
+            group_arrays.append(arrays)
+            states.append(observable_state(obs, exclude=list(arrays)))
+            shared_arrays[id(obs)] = arrays
+
+        for isl in range(no_slices):
+            if any(isl not in obs.cached_slices for obs in group):
+                tasks.append((states, group_arrays, isl, group[0].dump_dir, group[0].dump_step, frame_keys))
+                tasks_slices.append((group, isl))
+
+    results = process_map(stream_slice, tasks, workers)
+
+    for (group, isl), columns in zip(tasks_slices, results):
+        for obs, obs_columns in zip(group, columns):
+            for name, df_columns in obs_columns.items():
+                df = getattr(obs, name)
+                for col, values in df_columns.items():
+                    df[col] = values
+            if isl not in obs.cached_slices:
+                obs.pool_slices.append(isl)
+
+    # Copy back into the same arrays, other observables may point to them, see share_kt_data
+    for group in groups.values():
+        for obs in group:
+            for name, shared in shared_arrays[id(obs)].items():
+                getattr(obs, name)[...] = shared.close()
+
+
+def stream_dumps(observables: list, workers: int = None):
+    """
+    Read each dump only once and push it to every observable via :meth:`Observable.consume`.
+    Once all the dumps have been read :meth:`Observable.finalize` is called on each observable.
+
+    If ``workers > 1`` the slices of the observables with ``parallel_slices = True`` are calculated first by a pool
+    of processes, see :func:`stream_slices`. The other observables are fed in this process.
+
+    Parameters
+    ----------
+    observables : list
+        List of :class:`sarkas.tools.observables.Observable` with ``stream_observable = True``.
+        All of them must read from the same dump directory with the same dump step.
+
+    workers : int, optional
+        Number of processes. Default = ``None``, i.e. the largest :attr:`Observable.workers` of the observables.
+
+    Raises
+    ------
+    ValueError
+        If the observables do not share the same dump directory and dump step.
+
+    """
+
+    dump_dir = observables[0].dump_dir
+    dump_step = observables[0].dump_step
+
+    if workers is None:
+        workers = max(obs.workers for obs in observables)
+
+    frame_keys = set()
+    no_frames = 0
+    verbose = False
+    for obs in observables:
+        if obs.dump_dir != dump_dir or obs.dump_step != dump_step:
+            raise ValueError(f"{obs.__long_name__} does not read from {dump_dir} with dump step {dump_step}.")
+
+        obs.init_stream()
+        frame_keys.update(obs.frame_keys)
+        no_frames = max(no_frames, obs.no_slices * obs.slice_steps)
+        verbose = verbose or obs.verbose
+
+    share_kt_data(observables)
+
+    if workers > 1:
+        stream_slices(observables, workers, frame_keys)
+
+    # Skip the dumps of the slices that every observable has read from disk or calculated in the pool
+    first_frame = no_frames
+    for obs in observables:
+        obs.skip_to_first_slice()
+        first_frame = min(first_frame, obs.frames_consumed)
+    for obs in observables:
+        obs.frames_consumed = first_frame
+
+    dumps = range(first_frame * dump_step, no_frames * dump_step, dump_step)
+    for dump in tqdm(dumps, desc="Read in data", disable=not verbose):
+        datap = load_from_restart(dump_dir, dump)
+        # Load each array only once, npz files are read from disk at every access.
+        frame = {key: datap[key] for key in frame_keys}
+        for obs in observables:
+            obs.consume(frame)
+
+    for obs in observables:
+        obs.finalize()
+
+
 def plot_labels(xdata, ydata, xlbl, ylbl, units):
     """
     Create plot labels with correct units and prefixes.
@@ -0,0 +1,88 @@
+from os.path import join
+
+import pytest
+
+# Binary Yukawa mixture small enough to run in a few seconds. The production phase dumps every timestep and the
+# transport observables are also calculated on the fly.
+TINY_INPUT = """
+Particles:
+    - Species:
+        name: C
+        number_density: 1.0e+30
+        num: 32
+        Z: 6.0
+        atomic_weight: 12.011
+        temperature: 1.02e+5
+
+    - Species:
+        name: O
+        number_density: 1.0e+30
+        num: 32
+        Z: 8.0
+        atomic_weight: 16
+        temperature: 1.02e+5
+
+Potential:
+    type: Yukawa
+    method: PP
+    rc: 2.0e-10
+    electron_temperature_eV: 10.0
+
+Integrator:
+    type: Verlet
+    equilibration_steps: 20
+    production_steps: 64
+    eq_dump_step: 5
+    prod_dump_step: 1
+    dt: 1.074182e-17
+    thermostat_type: Berendsen
+    thermalization_timestep: 0
+    berendsen_tau: 10.0
+    boundary_conditions: periodic
+
+Parameters:
+    units: mks
+    load_method: random_no_reject
+    boundary_conditions: periodic
+    rand_seed: 123
+
+IO:
+    verbose: no
+    simulations_dir: {simulations_dir}
+    job_dir: tiny
+    job_id: tiny
+
+Observables:
+  - ElectricCurrent:
+      on_the_fly: yes
+      no_slices: 2
+  - DiffusionFlux:
+      on_the_fly: yes
+      no_slices: 2
+  - PressureTensor:
+      on_the_fly: yes
+      no_slices: 2
+"""
+
+
+@pytest.fixture(scope="session")
+def tiny_input(tmp_path_factory):
+    """Write the input file of the tiny simulation."""
+    tmp_dir = tmp_path_factory.mktemp("tiny")
+    input_file = join(tmp_dir, "tiny.yaml")
+    with open(input_file, "w") as f_yaml:
+        f_yaml.write(TINY_INPUT.format(simulations_dir=join(tmp_dir, "Simulations")))
+
+    return input_file
+
+
+@pytest.fixture(scope="session")
+def tiny_simulation(tiny_input):
+    """Run the tiny simulation once for all the tests."""
+    from ...processes import Simulation
+
+    sim = Simulation(tiny_input)
+    sim.setup(read_yaml=True)
+    sim.run()
+
+    return sim
@@ -0,0 +1,56 @@
+from copy import deepcopy
+from os.path import join
+
+import pytest
+import yaml
+from numpy import allclose
+
+from ...processes import Simulation
+from .. import observables
+from .conftest import TINY_INPUT
+
+# Observables without a multiple-tau correlator, which treat each sample as a dump
+IN_SITU_OBSERVABLES = {
+    "RadialDistributionFunction": {"no_bins": 20},
+    "StaticStructureFactor": {"max_k_harmonics": [2, 2, 2], "angle_averaging": "principal_axis"},
+    "VelocityAutoCorrelationFunction": {"no_slices": 2},
+    # The default range depends on the mean temperature of the production phase, unknown during the run
+    "VelocityDistribution": {
+        "hist_kwargs": {"bins": [40, 40], "range": [[-1.0e05, 1.0e05], [-1.0e05, 1.0e05]], "density": [True, True]}
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def in_situ_simulation(tmp_path_factory):
+    """Run the tiny simulation with the in-situ accumulators."""
+    tmp_dir = tmp_path_factory.mktemp("in_situ")
+    input_text = TINY_INPUT.format(simulations_dir=join(tmp_dir, "Simulations"))
+    obs_list = [{key: {"on_the_fly": True, **options}} for key, options in IN_SITU_OBSERVABLES.items()]
+    input_file = join(tmp_dir, "in_situ.yaml")
+    with open(input_file, "w") as f_yaml:
+        f_yaml.write(input_text[: input_text.index("Observables:")])
+        yaml.dump({"Observables": obs_list}, f_yaml, sort_keys=False)
+
+    sim = Simulation(input_file)
+    sim.setup(read_yaml=True)
+    sim.run()
+    return sim
+
+
+def test_accumulators_against_dumps(in_situ_simulation):
+    """Test that the observables accumulated during the production match the ones calculated from the dumps."""
+    accumulators = in_situ_simulation.accumulators
+    assert [type(acc).__name__ for acc in accumulators] == list(IN_SITU_OBSERVABLES)
+
+    for acc, (key, options) in zip(accumulators, IN_SITU_OBSERVABLES.items()):
+        # Every sample_step timesteps from the initial configuration
+        assert acc.frames_consumed == in_situ_simulation.parameters.production_steps // acc.sample_step + 1
+
+        obs = getattr(observables, key)()
+        obs.from_dict(deepcopy(options))
+        obs.setup(in_situ_simulation.parameters, phase="production")
+        obs.resume = False
+        obs.compute()
+        assert obs.dataframe.columns.equals(acc.dataframe.columns), key
+        assert allclose(obs.dataframe.to_numpy(), acc.dataframe.to_numpy(), equal_nan=True), key
@@ -0,0 +1,100 @@
+from os import stat, utime
+from os.path import join
+
+import pytest
+from numpy import allclose
+from shutil import copytree
+
+from ..observables import DynamicStructureFactor, ElectricCurrent
+
+
+@pytest.fixture
+def copied_simulation(tiny_simulation, tiny_input, tmp_path):
+    """Copy the dumps of the tiny simulation, so that they can be touched."""
+    from ...processes import Simulation
+
+    simulations_dir = join(tmp_path, "Simulations")
+    copytree(tiny_simulation.parameters.simulations_dir, simulations_dir)
+    with open(tiny_input, "r") as f_yaml:
+        inputs = f_yaml.read()
+    input_file = join(tmp_path, "copy.yaml")
+    with open(input_file, "w") as f_yaml:
+        f_yaml.write(inputs.replace(str(tiny_simulation.parameters.simulations_dir), simulations_dir))
+
+    sim = Simulation(input_file)
+    sim.setup(read_yaml=True)
+    return sim
+
+
+def touch_dump(obs, it):
+    """Change the modification time of a dump, as if the simulation had been re-run."""
+    dump = join(obs.dump_dir, f"checkpoint_{it * obs.dump_step}.npz")
+    mtime = stat(dump).st_mtime_ns + 1_000_000_000
+    utime(dump, ns=(mtime, mtime))
+
+
+def electric_current(params, **kwargs):
+    ec = ElectricCurrent()
+    ec.setup(params, phase="production", no_slices=2, **kwargs)
+    ec.compute()
+    return ec
+
+
+def dynamic_structure_factor(params, max_k_harmonics=(2, 2, 2), **kwargs):
+    dsf = DynamicStructureFactor()
+    dsf.from_dict({"max_k_harmonics": list(max_k_harmonics), "angle_averaging": "principal_axis", **kwargs})
+    dsf.setup(params, phase="production", no_slices=2)
+    dsf.compute()
+    return dsf
+
+
+def test_slices_cache(copied_simulation):
+    """Test that touching a dump recalculates only its slice and that a change of the inputs recalculates all."""
+    params = copied_simulation.parameters
+    # The slices saved by the original simulation were calculated from other dumps
+    first = electric_current(params)
+    assert first.cached_slices == []
+
+    second = electric_current(params)
+    assert second.cached_slices == [0, 1]
+    assert allclose(second.dataframe_acf.to_numpy(), first.dataframe_acf.to_numpy())
+
+    touch_dump(second, second.slice_steps + 3)
+    third = electric_current(params)
+    assert third.cached_slices == [0]
+    assert allclose(third.dataframe_acf.to_numpy(), first.dataframe_acf.to_numpy())
+
+    assert electric_current(params, resume=False).cached_slices == []
+    # A different slice length changes the inputs of every slice
+    ec = ElectricCurrent()
+    ec.setup(params, phase="production", no_slices=4)
+    assert ec.read_cached_slices() == []
+
+
+def test_kt_data_cache(copied_simulation, capsys):
+    """Test that touching a dump recalculates only its slice of n(k,t) and that new k vectors recalculate all."""
+    params = copied_simulation.parameters
+    first = dynamic_structure_factor(params)
+    assert first.kt_cached_slices("nkt") == [0, 1]
+
+    touch_dump(first, 5)
+    assert first.kt_cached_slices("nkt") == [1]
+    assert not first.kt_data_is_current("nkt")
+
+    capsys.readouterr()
+    second = dynamic_structure_factor(params)
+    output = capsys.readouterr().out
+    assert "n(k,t) for slice 1/2" in output and "n(k,t) for slice 2/2" not in output
+    assert allclose(second.nkt, first.nkt)
+    assert allclose(second.dataframe.to_numpy(), first.dataframe.to_numpy())
+
+    # The k vectors are part of the inputs of every slice
+    dynamic_structure_factor(params, max_k_harmonics=(3, 3, 3))
+    assert "n(k,t) for slice 2/2" in capsys.readouterr().out
+
+    # Without resume, the data on disk is recalculated even if it is current
+    assert dynamic_structure_factor(params).kt_data_is_current("nkt")
+    capsys.readouterr()
+    dynamic_structure_factor(params, resume=False)
+    output = capsys.readouterr().out
+    assert "n(k,t) for slice 1/2" in output and "n(k,t) for slice 2/2" in output
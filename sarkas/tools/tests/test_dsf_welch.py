@@ -0,0 +1,87 @@
+from numpy import abs, allclose, arange, argmax, exp, ones, pi
+from numpy.random import default_rng
+from pytest import raises
+from scipy.signal import get_window
+
+from ..observables import calc_Skw, calc_Skw_welch, DynamicStructureFactor
+
+SPECIES_NP = [20, 12]
+DT = 1.0e-16
+DUMP_STEP = 2
+
+
+def random_nkt(no_dumps=64, no_k=3):
+    rng = default_rng(11)
+    shape = (len(SPECIES_NP), no_dumps, no_k)
+    return rng.normal(size=shape) + 1j * rng.normal(size=shape)
+
+
+def test_welch_boxcar_segments():
+    """Test that non overlapping boxcar windows reproduce the periodogram of each segment."""
+    nkt = random_nkt()
+    window_length = 16
+    Skw_all = calc_Skw_welch(nkt, SPECIES_NP, ones(window_length), window_length, DT, DUMP_STEP)
+    assert Skw_all.shape == (4, 3, 3, window_length)
+
+    for iw in range(4):
+        segment = nkt[:, iw * window_length : (iw + 1) * window_length]
+        Skw = calc_Skw(segment, None, SPECIES_NP, window_length, DT, DUMP_STEP)
+        assert allclose(Skw_all[iw], Skw)
+
+
+def test_welch_parseval():
+    """Test that the sum over frequencies of each tapered periodogram is the weighted power of its window."""
+    nkt = random_nkt()
+    window_length, hop = 16, 8
+    window = get_window("hann", window_length)
+    Skw_all = calc_Skw_welch(nkt, SPECIES_NP, window, hop, DT, DUMP_STEP)
+    # Overlapping windows start every hop dumps
+    assert Skw_all.shape[0] == (nkt.shape[1] - window_length) // hop + 1
+
+    for iw in range(Skw_all.shape[0]):
+        segment = nkt[:, iw * hop : iw * hop + window_length]
+        # Pair (0, 0) is the first, pair (1, 1) the last
+        for isk, sp in [(0, 0), (2, 1)]:
+            power = (abs(segment[sp]) ** 2 * window[:, None] ** 2).mean(axis=0) / (window**2).mean()
+            expected = DT / DUMP_STEP * power / SPECIES_NP[sp]
+            assert allclose(Skw_all[iw, isk].sum(axis=-1), expected)
+
+
+def test_welch_tone():
+    """Test that the spectrum of a single oscillation peaks at its frequency."""
+    no_dumps, window_length, cycles = 64, 16, 3
+    tone = exp(-2.0j * pi * cycles * arange(no_dumps) / window_length)
+    nkt = tone[None, :, None].repeat(len(SPECIES_NP), axis=0)
+    Skw = calc_Skw_welch(nkt, SPECIES_NP, get_window("hann", window_length), 8, DT, DUMP_STEP).mean(axis=0)
+
+    # fftshift moves the zero frequency to window_length // 2
+    assert argmax(Skw[0, 0]) == window_length // 2 - cycles
+
+
+def test_welch_bartlett_dsf(tiny_simulation):
+    """Test that the Bartlett DSF, i.e. boxcar windows without overlap, equals the periodogram of each slice."""
+    dsfs = []
+    for estimator in ["periodogram", "welch"]:
+        dsf = DynamicStructureFactor()
+        dsf.from_dict(
+            {
+                "max_k_harmonics": [2, 2, 2],
+                "angle_averaging": "principal_axis",
+                "estimator": estimator,
+                "window_taper": "boxcar",
+                "window_overlap": 0.0,
+            }
+        )
+        dsf.setup(tiny_simulation.parameters, phase="production", no_slices=2)
+        dsf.compute()
+        dsfs.append(dsf)
+
+    periodogram, bartlett = dsfs
+    assert bartlett.no_windows == 2
+    assert allclose(bartlett.frequencies, periodogram.frequencies)
+    assert allclose(bartlett.dataframe_slices.to_numpy(), periodogram.dataframe_slices.to_numpy())
+    assert allclose(bartlett.dataframe.to_numpy(), periodogram.dataframe.to_numpy())
+
+    with raises(ValueError):
+        dsf.window_overlap = 1.0
+        dsf.update_welch_window()
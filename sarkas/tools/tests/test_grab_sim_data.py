@@ -0,0 +1,74 @@
+from numpy import allclose, memmap, zeros
+from os import remove
+from os.path import exists
+
+from ..observables import load_from_restart, VelocityDistribution
+
+HIST_KWARGS = {"bins": [20, 20], "range": [[-1.0e05, 1.0e05], [-1.0e05, 1.0e05]], "density": [True, True]}
+
+
+def velocity_distribution(params, runs, **options):
+    """Velocity distribution with dimensional average reading the same dumps as ``runs`` runs."""
+    vd = VelocityDistribution()
+    vd.from_dict({"hist_kwargs": dict(HIST_KWARGS), **options})
+    vd.setup(params, phase="production", dimensional_average=True)
+    vd.runs = runs
+    vd.dump_dirs_list = [vd.dump_dir] * runs
+    return vd
+
+
+def expected_data(vd):
+    """Samples of each species, run after run, read one dump at a time."""
+    data = zeros((vd.no_dumps, 1, vd.runs * vd.dimensions * vd.total_num_ptcls))
+    start = 0
+    for sp, sp_num in enumerate(vd.species_num):
+        for r in range(vd.runs):
+            for it in range(vd.no_dumps):
+                vel = load_from_restart(vd.dump_dirs_list[r], it * vd.dump_step)["vel"]
+                ptcls = vel[vd.species_index_start[sp] : vd.species_index_start[sp + 1], : vd.dimensions]
+                data[it, 0, start : start + vd.dimensions * sp_num] = ptcls.flatten("F")
+            start += vd.dimensions * sp_num
+    return data
+
+
+def test_grab_sim_data_layouts(tiny_simulation):
+    """Test the blocked, memory-mapped, float32 and parallel reads against a single full read."""
+    params = tiny_simulation.parameters
+    runs = 2
+    full = velocity_distribution(params, runs)
+    full.grab_block_size = full.no_dumps
+    time, data = full.grab_sim_data()
+
+    assert data.shape == (full.no_dumps, 1, runs * full.dimensions * full.total_num_ptcls)
+    assert allclose(data, expected_data(full))
+    # Each species starts after all the runs of the previous one
+    assert (full.species_samples_start() == runs * full.dimensions * full.species_index_start).all()
+
+    # The number of dumps is not a multiple of the block size
+    blocked = velocity_distribution(params, runs, grab_block_size=7)
+    assert blocked.no_dumps % 7
+    blocked_time, blocked_data = blocked.grab_sim_data()
+    assert allclose(blocked_time, time)
+    assert (blocked_data == data).all()
+
+    mapped = velocity_distribution(params, runs, grab_memmap=True)
+    mapped_time, mapped_data = mapped.grab_sim_data()
+    assert isinstance(mapped_data, memmap)
+    assert exists(mapped_data.filename)
+    assert allclose(mapped_time, time)
+    assert (mapped_data == data).all()
+    # The file is left in saving_dir
+    filename = mapped_data.filename
+    del mapped_data
+    remove(filename)
+
+    single = velocity_distribution(params, runs, grab_dtype="float32", grab_block_size=5)
+    single_data = single.grab_sim_data()[1]
+    assert single_data.dtype == "float32"
+    assert allclose(single_data, data, rtol=1.0e-6, atol=0.0)
+
+    # Each run read by a worker. Two blocks as a pool is started for each block
+    parallel = velocity_distribution(params, runs, workers=2, grab_block_size=40)
+    parallel_time, parallel_data = parallel.grab_sim_data()
+    assert allclose(parallel_time, time)
+    assert (parallel_data == data).all()
@@ -0,0 +1,112 @@
+from numpy import allclose, array, load
+from os.path import join
+from tables import open_file as tables_open_file
+
+from ..observables import (
+    calc_nk_frames,
+    CurrentCorrelationFunction,
+    DynamicStructureFactor,
+    share_kt_data,
+    stream_dumps,
+)
+
+
+def setup_k_observable(obs_class, params, no_slices=2):
+    obs = obs_class()
+    obs.from_dict({"max_k_harmonics": [2, 2, 2], "angle_averaging": "principal_axis"})
+    obs.setup(params, phase="production", no_slices=no_slices)
+    # Calculate the slices from the dumps instead of reading them from a previous run
+    obs.resume = False
+    return obs
+
+
+def test_nkt_storage(tiny_simulation):
+    """Test that n(k,t) is saved per slice and species and read back as it was calculated."""
+    dsf = setup_k_observable(DynamicStructureFactor, tiny_simulation.parameters)
+    dsf.compute()
+    no_k = len(dsf.k_list)
+    assert dsf.nkt.shape == (2, dsf.num_species, dsf.slice_steps, no_k)
+
+    assert allclose(dsf.read_kt_data("nkt"), dsf.nkt)
+    assert allclose(dsf.read_kt_data("nkt", 1), dsf.nkt[1])
+    with tables_open_file(dsf.nkt_hdf_file, mode="r") as h5file:
+        kt_array = h5file.get_node("/", "nkt")
+        assert kt_array.chunkshape == (1, 1, dsf.slice_steps, no_k)
+        assert kt_array.attrs.metadata["no_slices"] == 2
+        assert kt_array.attrs.species_names == list(dsf.species_names)
+        assert allclose(h5file.get_node("/", "k_harmonics").read(), dsf.k_harmonics)
+
+    # The first slice starts from the first dump
+    pos = array([load(join(dsf.dump_dir, f"checkpoint_{it}.npz"))["pos"] for it in range(dsf.slice_steps)])
+    nkt = calc_nk_frames(pos, dsf.species_num, dsf.k_list, dsf.box_lengths)
+    assert allclose(dsf.nkt[0], nkt)
+
+    kt_df = dsf.kt_dataframe("nkt")
+    assert kt_df.shape == (dsf.slice_steps, 2 * dsf.num_species * no_k)
+    assert kt_df.columns.names == ["slices", "species", "harmonics"]
+    assert allclose(kt_df[("slice 2", dsf.species_names[1], "k = [0, 1, 0]")], dsf.nkt[1, 1, :, 1])
+
+    assert dsf.kt_data_is_current("nkt")
+    # Data calculated with a different number of slices is not reused
+    one_slice = setup_k_observable(DynamicStructureFactor, tiny_simulation.parameters, no_slices=1)
+    assert not one_slice.kt_data_is_current("nkt")
+
+
+def test_vkt_storage(tiny_simulation):
+    """Test that v(k,t) is saved per slice, direction and species and read back as it was calculated."""
+    ccf = setup_k_observable(CurrentCorrelationFunction, tiny_simulation.parameters)
+    ccf.compute()
+    no_k = len(ccf.k_list)
+    assert ccf.vkt.shape == (2, 4, ccf.num_species, ccf.slice_steps, no_k)
+
+    assert allclose(ccf.read_kt_data("vkt"), ccf.vkt)
+    assert allclose(ccf.read_kt_data("vkt", 0), ccf.vkt[0])
+    with tables_open_file(ccf.vkt_hdf_file, mode="r") as h5file:
+        assert h5file.get_node("/", "vkt").chunkshape == (1, 1, 1, ccf.slice_steps, no_k)
+
+    kt_df = ccf.kt_dataframe("vkt")
+    assert kt_df.columns.names == ["slices", "direction", "species", "harmonics"]
+    column = ("slice 1", "Transverse j", ccf.species_names[0], "k = [0, 0, 1]")
+    assert allclose(kt_df[column], ccf.vkt[0, 2, 0, :, 2])
+
+
+def test_share_kt_data_mesh(tiny_simulation):
+    """Test that only the observables with the same mesh parameters share n(k,t)."""
+    params = tiny_simulation.parameters
+    observables = []
+    for mesh_sizes, cao in [([16, 16, 16], 7), ([16, 16, 16], 7), ([32, 32, 32], 7), ([16, 16, 16], 5)]:
+        obs = DynamicStructureFactor()
+        obs.from_dict(
+            {
+                "max_k_harmonics": [2, 2, 2],
+                "angle_averaging": "principal_axis",
+                "kt_method": "mesh",
+                "kt_mesh_sizes": mesh_sizes,
+                "kt_cao": cao,
+                "resume": False,
+            }
+        )
+        obs.setup(params, phase="production", no_slices=2)
+        observables.append(obs)
+    # Same file for all of them
+    assert len({obs.nkt_hdf_file for obs in observables}) == 1
+
+    for obs in observables:
+        obs.init_stream()
+    share_kt_data(observables)
+    assert [obs.nkt_stream for obs in observables] == [True, False, True, True]
+
+    stream_dumps(observables)
+    assert allclose(observables[1].nkt, observables[0].nkt)
+    # The mesh approximations are close but not equal
+    assert (observables[2].nkt != observables[0].nkt).any()
+    assert (observables[3].nkt != observables[0].nkt).any()
+
+    # Each one as if it were alone
+    for obs in observables[2:]:
+        alone = DynamicStructureFactor()
+        alone.from_dict({key: getattr(obs, key) for key in ["max_k_harmonics", "angle_averaging", "kt_method"]})
+        alone.from_dict({"kt_mesh_sizes": list(obs.kt_mesh_sizes), "kt_cao": obs.kt_cao, "resume": False})
+        alone.setup(params, phase="production", no_slices=2)
+        stream_dumps([alone])
+        assert allclose(alone.nkt, obs.nkt)
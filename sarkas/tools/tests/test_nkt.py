@@ -0,0 +1,80 @@
+from numpy import abs, allclose, array, exp, pi, zeros
+from numpy.random import default_rng
+from pytest import raises
+
+from ..observables import calc_nk_frames, calc_nk_mesh, calc_vk_frames, calc_vk_mesh
+
+BOX_LENGTHS = array([2.0, 3.0, 2.5])
+SPECIES_NP = array([20, 12])
+HARMONICS = array([[1, 0, 0], [0, 2, 0], [0, 0, 3], [1, 1, 0], [2, 1, 3], [0, 0, 1]])
+
+
+def k_list_from_harmonics(harmonics, box_lengths):
+    """Build a k_list as in kspace_setup, with the magnitude and the ka_counts index in the last two columns."""
+    k_list = zeros((len(harmonics), 5))
+    k_list[:, :3] = harmonics / box_lengths
+    k_list[:, 3] = 2.0 * pi * ((harmonics / box_lengths) ** 2).sum(axis=1) ** 0.5
+    return k_list
+
+
+def frames(no_dumps=3):
+    rng = default_rng(7)
+    pos = rng.uniform(0.0, 1.0, (no_dumps, SPECIES_NP.sum(), 3)) * BOX_LENGTHS
+    vel = rng.normal(0.0, 1.0, (no_dumps, SPECIES_NP.sum(), 3))
+    return pos, vel
+
+
+def direct_nkt(pos_frames, vel_frames, k_list):
+    """Direct sums of n(k, t) and of the longitudinal and transverse currents of each species."""
+    sp_start = array([0, *SPECIES_NP.cumsum()])
+    k_vecs = 2.0 * pi * k_list[:, :3]
+    nkt = zeros((len(SPECIES_NP), len(pos_frames), len(k_list)), dtype=complex)
+    vkt = zeros((4, len(SPECIES_NP), len(pos_frames), len(k_list)), dtype=complex)
+    for it, (pos, vel) in enumerate(zip(pos_frames, vel_frames)):
+        for sp in range(len(SPECIES_NP)):
+            sp_pos = pos[sp_start[sp] : sp_start[sp + 1]]
+            sp_vel = vel[sp_start[sp] : sp_start[sp + 1]]
+            for ik, k in enumerate(k_vecs):
+                e_ikr = exp(-1j * sp_pos @ k)
+                k_cross_v = [k[1] * sp_vel[:, 2] - k[2] * sp_vel[:, 1]]
+                k_cross_v.append(-(k[0] * sp_vel[:, 2] - k[2] * sp_vel[:, 0]))
+                k_cross_v.append(k[0] * sp_vel[:, 1] - k[1] * sp_vel[:, 0])
+                nkt[sp, it, ik] = e_ikr.sum()
+                vkt[0, sp, it, ik] = (sp_vel @ k * e_ikr).sum()
+                for d in range(3):
+                    vkt[d + 1, sp, it, ik] = (k_cross_v[d] * e_ikr).sum()
+
+    return nkt, vkt
+
+
+def test_calc_nk_frames():
+    """Test the phase factor recurrences against the direct sum of the exponentials."""
+    pos, vel = frames()
+    k_list = k_list_from_harmonics(HARMONICS, BOX_LENGTHS)
+    nkt_ref, vkt_ref = direct_nkt(pos, vel, k_list)
+
+    assert allclose(calc_nk_frames(pos, SPECIES_NP, k_list, BOX_LENGTHS), nkt_ref, rtol=1.0e-10, atol=1.0e-10)
+    assert allclose(calc_vk_frames(pos, vel, SPECIES_NP, k_list, BOX_LENGTHS), vkt_ref, rtol=1.0e-10, atol=1.0e-10)
+
+
+def test_calc_nk_mesh():
+    """Test the mesh assignment against the direct sum and its convergence with the mesh size."""
+    pos, vel = frames()
+    k_list = k_list_from_harmonics(HARMONICS, BOX_LENGTHS)
+    nkt_ref, vkt_ref = direct_nkt(pos, vel, k_list)
+    cao = array([7, 7, 7])
+
+    errors = []
+    for mesh_size in [16, 32]:
+        mesh_sizes = array([mesh_size] * 3)
+        nkt = calc_nk_mesh(pos, SPECIES_NP, k_list, BOX_LENGTHS, mesh_sizes, cao)
+        vkt = calc_vk_mesh(pos, vel, SPECIES_NP, k_list, BOX_LENGTHS, mesh_sizes, cao)
+        errors.append(abs(nkt - nkt_ref).max() / abs(nkt_ref).max())
+        errors.append(abs(vkt - vkt_ref).max() / abs(vkt_ref).max())
+
+    assert max(errors[2:]) < 1.0e-06
+    assert errors[2] < 1.0e-02 * errors[0] and errors[3] < 1.0e-02 * errors[1]
+
+    # The largest harmonic, 3, must be below the Nyquist limit
+    with raises(ValueError):
+        calc_nk_mesh(pos, SPECIES_NP, k_list, BOX_LENGTHS, array([6, 6, 6]), cao)
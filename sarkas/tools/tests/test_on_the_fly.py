@@ -0,0 +1,100 @@
+from numpy import abs, allclose, full
+from numpy.random import default_rng
+from pytest import raises, warns
+from shutil import copytree
+from types import SimpleNamespace
+
+from ...utilities.exceptions import AlgorithmWarning
+from ..observables import DiffusionFlux
+
+
+def test_correlator_acf_against_dumps(tiny_simulation):
+    """Test the ACFs of the multiple-tau correlators against the ACFs calculated from the dumps."""
+    assert len(tiny_simulation.accumulators) == 3
+
+    for acc in tiny_simulation.accumulators:
+        dumps_obs = type(acc)()
+        dumps_obs.from_dict({"no_slices": acc.no_slices})
+        dumps_obs.setup(tiny_simulation.parameters, phase="production")
+        dumps_obs.compute()
+
+        otf_acf = acc.dataframe_acf_slices
+        dumps_acf = dumps_obs.dataframe_acf_slices
+        assert (otf_acf.columns == dumps_acf.columns).all()
+        # The lags shorter than the block length of the correlator are exact
+        for col in otf_acf.columns:
+            otf = otf_acf[col].to_numpy()[:8]
+            ref = dumps_acf[col].to_numpy()[:8]
+            assert abs(otf - ref).max() <= 1.0e-8 * abs(ref).max(), (acc.__long_name__, col)
+
+
+def test_diffusion_flux_equal_masses(tiny_simulation):
+    """Test the diffusion flux of two species with the same mass from the dumps and from the correlator."""
+    params = tiny_simulation.parameters
+    vel = default_rng(0).normal(size=(params.production_steps + 1, params.total_num_ptcls, 3))
+    sp_end = params.species_num[0]
+
+    dataframes = []
+    for on_the_fly in [False, True]:
+        diff_flux = DiffusionFlux()
+        diff_flux.from_dict({"no_slices": 1, "on_the_fly": on_the_fly})
+        diff_flux.setup(params, phase="production")
+        diff_flux.species_masses = full(2, diff_flux.species_masses[0])
+        if on_the_fly:
+            diff_flux.init_on_the_fly()
+            for it in range(diff_flux.slice_samples):
+                diff_flux.sample(SimpleNamespace(vel=vel[it]), it)
+        else:
+            diff_flux.init_stream()
+            for it in range(diff_flux.slice_steps):
+                diff_flux.consume({"time": it * diff_flux.dt, "vel": vel[it]})
+        dataframes.append((diff_flux.dataframe_slices, diff_flux.dataframe_acf_slices))
+
+        # Equal concentrations: J = m/2 (j_C - j_O)
+        vel_x = vel[: diff_flux.slice_steps, :, 0]
+        j_diff = vel_x[:, :sp_end].sum(axis=1) - vel_x[:, sp_end:].sum(axis=1)
+        flux_x = diff_flux.dataframe_slices.iloc[:, 1].to_numpy()
+        assert allclose(flux_x, 0.5 * diff_flux.species_masses[0] * j_diff)
+
+    assert allclose(dataframes[0][0].to_numpy(), dataframes[1][0].to_numpy())
+    assert allclose(dataframes[0][1].to_numpy()[:8], dataframes[1][1].to_numpy()[:8])
+
+
+def test_on_the_fly_not_capable(tiny_input, tmp_path):
+    """Test that an observable that cannot be calculated on the fly is rejected when the input is parsed."""
+    from ...processes import Simulation
+
+    with open(tiny_input, "r") as f_yaml:
+        inputs = f_yaml.read()
+    input_file = tmp_path / "thermo.yaml"
+    input_file.write_text(inputs + "  - Thermodynamics:\n      on_the_fly: yes\n")
+
+    with raises(ValueError, match="Thermodynamics cannot be calculated on the fly"):
+        Simulation(str(input_file)).setup(read_yaml=True)
+
+
+def test_on_the_fly_restart(tiny_simulation, tiny_input, tmp_path):
+    """Test that a production restart does not overwrite the on-the-fly observables of the previous run."""
+    from ...processes import Simulation
+
+    simulations_dir = tmp_path / "Simulations"
+    copytree(tiny_simulation.parameters.simulations_dir, simulations_dir)
+    acf_file = simulations_dir / "tiny" / "PostProcessing" / "ElectricCurrent" / "Production"
+    acf_file = acf_file / "ElectricCurrentACF_tiny.h5"
+    acf_mtime = acf_file.stat().st_mtime_ns
+
+    with open(tiny_input, "r") as f_yaml:
+        inputs = f_yaml.read()
+    inputs = inputs.replace(str(tiny_simulation.parameters.simulations_dir), str(simulations_dir))
+    inputs = inputs.replace("load_method: random_no_reject", "load_method: prod_restart\n    restart_step: 32")
+    input_file = tmp_path / "restart.yaml"
+    input_file.write_text(inputs)
+
+    restart = Simulation(str(input_file))
+    restart.setup(read_yaml=True, other_inputs={"Parameters": {"equilibration_phase": False}})
+    assert len(restart.accumulators) == 3
+    with warns(AlgorithmWarning, match="cannot be resumed"):
+        restart.run()
+
+    assert restart.accumulators == []
+    assert acf_file.stat().st_mtime_ns == acf_mtime
@@ -0,0 +1,44 @@
+from numpy import allclose
+from os import getpid
+
+from .. import observables
+from ..observables import DynamicStructureFactor, ElectricCurrent, stream_dumps, stream_slice
+from ...utilities.parallel import process_map
+
+
+def stream_slice_pid(*args):
+    """Slice task returning also the process that ran it."""
+    return getpid(), stream_slice(*args)
+
+
+def compute(obs_class, params, workers, options=None):
+    obs = obs_class()
+    obs.from_dict({"workers": workers, "resume": False, **(options or {})})
+    obs.setup(params, phase="production", no_slices=2)
+    # The pool is used by the stream of PostProcess.run, the DSF alone calculates n(k,t) in compute
+    stream_dumps([obs])
+    return obs
+
+
+def test_parallel_slices_equal_to_serial(tiny_simulation, monkeypatch):
+    """Test that the slices streamed by a pool of two processes are the same as the serial ones."""
+    pids = []
+
+    def process_map_pids(function, tasks, workers=1):
+        assert function is stream_slice
+        results = process_map(stream_slice_pid, tasks, workers)
+        pids.extend(pid for pid, _ in results)
+        return [columns for _, columns in results]
+
+    monkeypatch.setattr(observables, "process_map", process_map_pids)
+
+    k_options = {"max_k_harmonics": [2, 2, 2], "angle_averaging": "principal_axis"}
+    for obs_class, options in [(ElectricCurrent, None), (DynamicStructureFactor, k_options)]:
+        serial = compute(obs_class, tiny_simulation.parameters, 1, options)
+        parallel = compute(obs_class, tiny_simulation.parameters, 2, options)
+        assert parallel.pool_slices == [0, 1], obs_class.__name__
+        # The slices were calculated in worker processes
+        assert len(pids) == 2 and getpid() not in pids, obs_class.__name__
+        pids.clear()
+        assert allclose(parallel.dataframe_slices.to_numpy(), serial.dataframe_slices.to_numpy())
+        assert allclose(parallel.dataframe.to_numpy(), serial.dataframe.to_numpy())
@@ -0,0 +1,101 @@
+from itertools import product
+from numpy import allclose, array, triu_indices
+from numpy.random import default_rng
+
+from ..observables import calc_pressure_tensor_acf, PressureTensor
+from ...utilities.maths import correlationfunction
+
+# Kinetic, Potential, Kin-Pot, Pot-Kin, Total
+ACF_NAMES = ["Kinetic ACF", "Potential ACF", "Kin-Pot ACF", "Pot-Kin ACF", "ACF"]
+
+
+def reference_acf(pt_kin, pt_pot, pt):
+    """Correlation functions of all the pairs of elements of the symmetrized tensors, one at a time."""
+    no_dim = pt.shape[0]
+    kin, pot, tot = [0.5 * (a + a.transpose(1, 0, 2)) for a in [pt_kin, pt_pot, pt]]
+    acf = []
+    for i, j, k, l in product(range(no_dim), repeat=4):
+        acf.append(
+            [
+                correlationfunction(kin[i, j], kin[k, l]),
+                correlationfunction(pot[i, j], pot[k, l]),
+                correlationfunction(kin[i, j], pot[k, l]),
+                correlationfunction(pot[i, j], kin[k, l]),
+                correlationfunction(tot[i, j], tot[k, l]),
+            ]
+        )
+    return array(acf).reshape(no_dim, no_dim, no_dim, no_dim, 5, -1)
+
+
+def test_pressure_tensor_acf_equal_to_correlationfunction():
+    """Test all the elements and combinations of the batched FFT against correlationfunction on random tensors."""
+    rng = default_rng(7)
+    for no_dim in [2, 3]:
+        # Not symmetric, the off-diagonal elements are symmetrized
+        pt_kin, pt_pot = rng.normal(size=(2, no_dim, no_dim, 50))
+        pt = pt_kin + pt_pot
+
+        pt_acf = calc_pressure_tensor_acf(pt_kin, pt_pot, pt)
+        assert pt_acf.shape == (no_dim, no_dim, no_dim, no_dim, 5, 50)
+        assert allclose(pt_acf, reference_acf(pt_kin, pt_pot, pt))
+
+
+def test_pressure_tensor_acf_symmetrization():
+    """Test that the off-diagonal elements are correlated as 0.5 * (a + a^T) and not as given."""
+    rng = default_rng(11)
+    pt_kin, pt_pot = rng.normal(size=(2, 3, 3, 40))
+    pt = pt_kin + pt_pot
+    pt_acf = calc_pressure_tensor_acf(pt_kin, pt_pot, pt)
+
+    sym_xy = 0.5 * (pt_kin[0, 1] + pt_kin[1, 0])
+    assert allclose(pt_acf[0, 1, 0, 1, 0], correlationfunction(sym_xy, sym_xy))
+    assert allclose(pt_acf[1, 0, 0, 1, 0], pt_acf[0, 1, 0, 1, 0])
+    assert not allclose(pt_acf[0, 1, 0, 1, 0], correlationfunction(pt_kin[0, 1], pt_kin[0, 1]))
+    # The diagonal elements are unchanged
+    assert allclose(pt_acf[0, 0, 2, 2, 0], correlationfunction(pt_kin[0, 0], pt_kin[2, 2]))
+
+    # A symmetric tensor is correlated as given
+    sym_kin = 0.5 * (pt_kin + pt_kin.transpose(1, 0, 2))
+    iu, ju = triu_indices(3, k=1)
+    assert allclose(
+        calc_pressure_tensor_acf(sym_kin, sym_kin, sym_kin)[iu, ju, ju, iu, 0],
+        array([correlationfunction(sym_kin[i, j], sym_kin[j, i]) for i, j in zip(iu, ju)]),
+    )
+
+
+def test_pressure_tensor_dataframes(tiny_simulation):
+    """Test the columns of the ACF dataframes of the dumps against correlationfunction of the slices' data."""
+    params = tiny_simulation.parameters
+    pt = PressureTensor()
+    pt.from_dict({"on_the_fly": False, "resume": False})
+    pt.setup(params, phase="production", no_slices=2)
+    pt.compute()
+
+    dim_lbl = ["x", "y", "z"][: params.dimensions]
+    df = pt.dataframe_slices
+    df_acf = pt.dataframe_acf_slices
+    for isl in range(pt.no_slices):
+        pressure = df[("Pressure", f"slice {isl}")].to_numpy()
+        delta_pressure = df[("Delta Pressure", f"slice {isl}")].to_numpy()
+        assert allclose(df_acf[("Pressure ACF", f"slice {isl}")], correlationfunction(pressure, pressure))
+        assert allclose(
+            df_acf[("Delta Pressure ACF", f"slice {isl}")], correlationfunction(delta_pressure, delta_pressure)
+        )
+
+        tensors = []
+        for name in ["Pressure Tensor Kinetic", "Pressure Tensor Potential", "Pressure Tensor"]:
+            tensors.append(
+                array([[df[(f"{name} {ax1}{ax2}", f"slice {isl}")].to_numpy() for ax2 in dim_lbl] for ax1 in dim_lbl])
+            )
+        expected = reference_acf(*tensors)
+        for (i, ax1), (j, ax2), (k, ax3), (l, ax4) in product(enumerate(dim_lbl), repeat=4):
+            for ic, name in enumerate(ACF_NAMES):
+                column = (f"Pressure Tensor {name} {ax1}{ax2}{ax3}{ax4}", f"slice {isl}")
+                assert allclose(df_acf[column], expected[i, j, k, l, ic]), column
+
+    # Mean over the slices
+    column = "Pressure Tensor ACF xyxy"
+    assert allclose(
+        pt.dataframe_acf[(column, "Mean")],
+        df_acf[[(column, f"slice {isl}") for isl in range(pt.no_slices)]].mean(axis=1),
+    )
@@ -0,0 +1,47 @@
+import pytest
+from numpy import array, int64, round, sqrt, zeros
+from numpy.random import default_rng
+
+from ..observables import calc_rdf_hist
+
+
+def brute_force_rdf_hist(pos, p_id, box_lengths, r_max, no_bins, num_species):
+    """Histogram of the minimum image distances of all the pairs."""
+    rdf_hist = zeros((no_bins, num_species, num_species))
+    for i in range(len(pos)):
+        dx = pos[i + 1 :] - pos[i]
+        dx -= box_lengths * round(dx / box_lengths)
+        r = sqrt((dx**2).sum(axis=1))
+        for j, rj in zip(range(i + 1, len(pos)), r):
+            if rj < r_max:
+                rdf_hist[int(rj / (r_max / no_bins)), p_id[i], p_id[j]] += 1
+
+    return rdf_hist
+
+
+@pytest.mark.parametrize(
+    "box_lengths, r_max",
+    [
+        # Three or more cells per side
+        (array([10.0, 12.0, 9.0]), 3.0),
+        # Less than three cells along every side, all the particles are searched
+        (array([5.0, 6.0, 5.5]), 2.5),
+        # Mixed
+        (array([10.0, 4.0, 9.0]), 2.0),
+    ],
+)
+@pytest.mark.parametrize("no_threads", [1, 3])
+def test_calc_rdf_hist(box_lengths, r_max, no_threads):
+    """Test the linked cell histograms against the brute force histograms of the pair distances."""
+    rng = default_rng(3)
+    no_ptcls = 150
+    pos = rng.uniform(0.0, 1.0, (no_ptcls, 3)) * box_lengths
+    p_id = array([0] * 100 + [1] * 50, dtype=int64)
+    no_bins = 25
+
+    rdf_hist = calc_rdf_hist(pos, p_id, box_lengths, r_max, no_bins, 2, no_threads)
+    ref = brute_force_rdf_hist(pos, p_id, box_lengths, r_max, no_bins, 2)
+
+    assert rdf_hist.shape == (no_bins, 2, 2)
+    assert (rdf_hist == ref).all()
+    assert rdf_hist.sum() > 0
@@ -0,0 +1,89 @@
+from numpy import allclose, arange, array, exp, fft, pi, real, sqrt
+from numpy.random import default_rng
+
+from ..observables import calc_Skw, DynamicStructureFactor
+
+SPECIES_NP = [20, 12, 8]
+DT = 1.0e-16
+DUMP_STEP = 2
+
+
+def loop_Skw(nkt, species_np, no_dumps, dt, dump_step):
+    """Previous implementation of calc_Skw, one FFT per k vector and pair of species."""
+    norm = dt / sqrt(no_dumps * dt * dump_step)
+    Skw_all = []
+    for ip, si in enumerate(species_np):
+        for jp in range(ip, len(species_np)):
+            dens_const = 1.0 / sqrt(si * species_np[jp])
+            pair = []
+            for ik in range(nkt.shape[2]):
+                nkw_i = fft.fft(nkt[ip, :, ik]) * norm
+                nkw_j = fft.fft(nkt[jp, :, ik]) * norm
+                pair.append(fft.fftshift(real(nkw_i.conjugate() * nkw_j) * dens_const))
+            Skw_all.append(pair)
+    return array(Skw_all)
+
+
+def test_calc_Skw_equal_to_loop():
+    """Test the batched FFTs of a multi-species n(k,t) against one FFT per k vector and pair of species."""
+    rng = default_rng(3)
+    shape = (len(SPECIES_NP), 40, 5)
+    nkt = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+
+    Skw_all = calc_Skw(nkt, None, SPECIES_NP, 40, DT, DUMP_STEP)
+    # Pairs (0, 0), (0, 1), (0, 2), (1, 1), (1, 2), (2, 2)
+    assert Skw_all.shape == (6, 5, 40)
+    assert allclose(Skw_all, loop_Skw(nkt, SPECIES_NP, 40, DT, DUMP_STEP))
+
+
+def test_calc_Skw_direct():
+    """Test calc_Skw against the direct Fourier sum of n(k,t)."""
+    rng = default_rng(5)
+    no_dumps = 24
+    shape = (len(SPECIES_NP), no_dumps, 2)
+    nkt = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+    Skw_all = calc_Skw(nkt, None, SPECIES_NP, no_dumps, DT, DUMP_STEP)
+
+    # Frequencies in the order of fftshift
+    w_indx = arange(no_dumps) - no_dumps // 2
+    phases = exp(-2.0j * pi * w_indx[:, None] * arange(no_dumps)[None, :] / no_dumps)
+    norm = DT / sqrt(no_dumps * DT * DUMP_STEP)
+    nkw = (phases @ nkt) * norm
+    isk = 0
+    for i in range(len(SPECIES_NP)):
+        for j in range(i, len(SPECIES_NP)):
+            expected = real(nkw[i].conjugate() * nkw[j]) / sqrt(SPECIES_NP[i] * SPECIES_NP[j])
+            assert allclose(Skw_all[isk], expected.T)
+            isk += 1
+    # The DSF of a species is |n(k, w)|^2 / N
+    assert allclose(Skw_all[0], (abs(nkw[0]) ** 2).T / SPECIES_NP[0])
+
+
+def test_dsf_angle_average(tiny_simulation):
+    """Test the mean and std of the DSF over the slices and the k vectors of the same magnitude."""
+    dsf = DynamicStructureFactor()
+    dsf.from_dict({"max_k_harmonics": [2, 2, 2], "angle_averaging": "principal_axis", "resume": False})
+    dsf.setup(tiny_simulation.parameters, phase="production", no_slices=2)
+    dsf.compute()
+
+    # Several k vectors for each magnitude
+    ka_indx = dsf.k_harmonics[:, -1].astype(int)
+    assert len(ka_indx) > len(dsf.ka_values)
+
+    # Shape = (no_slices, no_skw, no_k, slice_steps)
+    skw_slices = array(
+        [
+            loop_Skw(dsf.kt_data_slice("nkt", isl), dsf.species_num, dsf.slice_steps, dsf.dt, dsf.dump_step)
+            for isl in range(dsf.no_slices)
+        ]
+    )
+    isk = 0
+    for i, sp1 in enumerate(dsf.species_names):
+        for sp2 in dsf.species_names[i:]:
+            for ik, ka in enumerate(dsf.ka_values):
+                # All the slices and all the k vectors of this magnitude
+                samples = skw_slices[:, isk, ka_indx == ik].reshape(-1, dsf.slice_steps)
+                column = f"ka{ik + 1} = {ka:.4f}"
+                assert allclose(dsf.dataframe[(f"{sp1}-{sp2}", "Mean", column)], samples.mean(axis=0))
+                assert allclose(dsf.dataframe[(f"{sp1}-{sp2}", "Std", column)], samples.std(axis=0, ddof=1))
+            isk += 1
@@ -0,0 +1,63 @@
+from numpy import allclose, cumsum, load
+from os.path import join
+from pytest import raises
+
+from ..observables import ElectricCurrent, RadialDistributionFunction, stream_dumps, VelocityAutoCorrelationFunction
+
+
+def setup_observable(obs_class, params, phase="production", no_slices=2):
+    obs = obs_class()
+    obs.setup(params, phase=phase, no_slices=no_slices)
+    # Calculate the slices from the dumps instead of reading them from a previous run
+    obs.resume = False
+    return obs
+
+
+def test_electric_current_from_dumps(tiny_simulation):
+    """Test the streamed electric current against the sum of the charges times the velocities of each dump."""
+    params = tiny_simulation.parameters
+    ec = setup_observable(ElectricCurrent, params)
+    ec.compute()
+
+    sp_start = cumsum([0, *params.species_num])
+    for it in range(ec.slice_steps):
+        dump = load(join(ec.dump_dir, f"checkpoint_{it * ec.dump_step}.npz"))
+        total = 0.0
+        for sp, (name, charge) in enumerate(zip(params.species_names, params.species_charges)):
+            current = charge * dump["vel"][sp_start[sp] : sp_start[sp + 1]].sum(axis=0)
+            total += current
+            for d, ds in enumerate(["X", "Y", "Z"]):
+                assert allclose(ec.dataframe_slices[(f"{name} Electric Current", ds, "slice 0")].iloc[it], current[d])
+        for d, ds in enumerate(["X", "Y", "Z"]):
+            assert allclose(ec.dataframe_slices[("Electric Current", ds, "slice 0")].iloc[it], total[d])
+
+
+def test_stream_dumps_shared(tiny_simulation):
+    """Test that observables fed by a single pass over the dumps match the ones reading the dumps on their own."""
+    params = tiny_simulation.parameters
+    classes = [ElectricCurrent, VelocityAutoCorrelationFunction, RadialDistributionFunction]
+
+    alone = []
+    for obs_class in classes:
+        obs = setup_observable(obs_class, params)
+        obs.compute()
+        alone.append(obs)
+
+    shared = [setup_observable(obs_class, params) for obs_class in classes]
+    stream_dumps(shared)
+
+    for obs, ref in zip(shared, alone):
+        assert obs.frames_consumed == ref.no_slices * ref.slice_steps
+        assert allclose(obs.dataframe_slices.to_numpy(), ref.dataframe_slices.to_numpy(), equal_nan=True)
+        assert allclose(obs.dataframe.to_numpy(), ref.dataframe.to_numpy(), equal_nan=True)
+
+
+def test_stream_dumps_different_dirs(tiny_simulation):
+    """Test that observables reading different dump directories cannot share a stream."""
+    params = tiny_simulation.parameters
+    observables = [
+        setup_observable(ElectricCurrent, params, phase="production"),
+        setup_observable(ElectricCurrent, params, phase="equilibration", no_slices=1),
+    ]
+    with raises(ValueError):
+        stream_dumps(observables)
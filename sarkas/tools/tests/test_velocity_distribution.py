@@ -0,0 +1,70 @@
+from numpy import allclose, arange, array, concatenate, histogram, linspace
+from numpy.random import default_rng
+
+from ..observables import calc_vel_histograms, VelocityDistribution
+
+
+def velocity_samples(ranges, species_num, no_dumps=3, no_dim=3):
+    """Random velocities of each species with some of them exactly on the bin edges and outside of the range."""
+    rng = default_rng(2)
+    vel = []
+    for (low, high), num in zip(ranges, species_num):
+        sp_vel = rng.uniform(1.2 * low, 1.2 * high, (no_dumps, no_dim, num))
+        # Interior edges, both ends of the range and values just outside of it
+        edges = linspace(low, high, 11)
+        sp_vel[:, :, : len(edges)] = edges
+        sp_vel[:, :, len(edges)] = high * (1.0 + 1.0e-12)
+        sp_vel[:, :, len(edges) + 1] = low * (1.0 + 1.0e-12)
+        vel.append(sp_vel)
+
+    return concatenate(vel, axis=-1)
+
+
+def test_calc_vel_histograms():
+    """Test the histograms against numpy.histogram, including the velocities on the bin edges."""
+    ranges = [(-1.0, 1.0), (-3.0, 2.0)]
+    species_num = [40, 24]
+    no_bins = array([10, 7])
+    vel = velocity_samples(ranges, species_num)
+    species_start = concatenate(([0], species_num)).cumsum()
+    bin_edges = linspace(ranges[0][0], ranges[0][1], 11)[None, :].repeat(2, axis=0)
+    bin_edges[1, :8] = linspace(ranges[1][0], ranges[1][1], 8)
+
+    counts = calc_vel_histograms(vel, species_start, bin_edges, no_bins)
+
+    for it in range(vel.shape[0]):
+        for d in range(vel.shape[1]):
+            for sp in range(len(species_num)):
+                sp_vel = vel[it, d, species_start[sp] : species_start[sp + 1]]
+                ref, _ = histogram(sp_vel, bins=no_bins[sp], range=ranges[sp])
+                assert (counts[it, d, sp, : no_bins[sp]] == ref).all()
+                assert (counts[it, d, sp, no_bins[sp] :] == 0.0).all()
+
+
+def test_calc_distribution(tiny_simulation):
+    """Test that the histograms of every dimension and species are stored in their own columns."""
+    ranges = [(-1.0, 1.0), (-3.0, 2.0)]
+    vdist = VelocityDistribution()
+    vdist.setup(
+        tiny_simulation.parameters,
+        phase="production",
+        hist_kwargs={"bins": [10, 7], "range": ranges, "density": [False, True]},
+    )
+    vel = velocity_samples(ranges, vdist.species_num)
+    time = arange(vel.shape[0]) * 1.0e-15
+
+    dist_matrix, bin_edges = vdist.calc_distribution(vel, time)
+
+    samples_start = vdist.species_samples_start()
+    indx_0 = 0
+    for d in range(vel.shape[1]):
+        for sp, hist_kwargs in enumerate(vdist.list_hist_kwargs):
+            no_bins = hist_kwargs["bins"]
+            assert allclose(bin_edges[d * vdist.num_species + sp], linspace(*ranges[sp], no_bins + 1))
+            assert allclose(dist_matrix[:, indx_0], time)
+            for it in range(vel.shape[0]):
+                ref, _ = histogram(vel[it, d, samples_start[sp] : samples_start[sp + 1]], **hist_kwargs)
+                assert allclose(dist_matrix[it, indx_0 + 1 : indx_0 + 1 + no_bins], ref)
+            indx_0 += 1 + no_bins
+
+    assert indx_0 == dist_matrix.shape[1]
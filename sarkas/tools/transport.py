@@ -1,21 +1,20 @@
 """
 Transport Module.
 """
-from IPython import get_ipython
+from ..utilities.io import in_notebook
 
-if get_ipython().__class__.__name__ == "ZMQInteractiveShell":
+if in_notebook():
     from tqdm import tqdm_notebook as tqdm
 else:
     from tqdm import tqdm
 
-from matplotlib.pyplot import subplots
-from numpy import array, column_stack
+from numpy import column_stack, nan, zeros
 from os import mkdir as os_mkdir
 from os.path import exists as os_path_exists
 from os.path import join as os_path_join
 from pandas import DataFrame, MultiIndex, read_hdf
 
-from ..utilities.maths import fast_integral_loop
+from ..utilities.maths import CumulativeIntegrator, einstein_relation, find_plateau
 
 # Sarkas Modules
 from .observables import plot_labels, Thermodynamics
@@ -35,6 +34,25 @@ class TransportCoefficients:
 
     no_slices : str, optional
         Number of slices in which the phase has been divided. Default = 1.
+
+    Attributes
+    ----------
+    integration_block : int
+        Number of ACF lags read and integrated at once. Default = ``None``, all of them.
+
+    plateau_df : pandas.DataFrame
+        Plateau value, standard deviation over the slices and time of each calculated transport coefficient.
+
+    plateau_rtol : float
+        Relative tolerance of the plateau search, see :func:`sarkas.utilities.maths.find_plateau`. Default = 1.0e-2.
+
+    plateau_window : int
+        Number of lags averaged in each window of the plateau search. Default = ``None``, 5% of the lags.
+
+    stop_at_plateau : bool
+        Flag for not reading further ACF lags once the plateau of every coefficient has been reached. The running
+        coefficients are then truncated at the last integrated block. Default = False.
+
     """
 
     def __init__(self, params, phase: str = "production", no_slices: int = 1):
@@ -71,6 +89,12 @@ class TransportCoefficients:
         self.viscosity_df_slices = None
         self.conductivity_df = None
         self.conductivity_df_slices = None
+        # Cumulative integration engine
+        self.integration_block = None
+        self.stop_at_plateau = False
+        self.plateau_window = None
+        self.plateau_rtol = 1.0e-2
+        self.plateau_df = DataFrame(columns=["Value", "Std", "Time", "Converged"])
 
         self.create_dir()
 
@@ -93,6 +117,116 @@ class TransportCoefficients:
         if not os_path_exists(self.saving_dir):
             os_mkdir(self.saving_dir)
 
+    @staticmethod
+    def acf_reader(dataframe: DataFrame, columns: list):
+        """
+        Create the function reading blocks of lags of the slices' ACFs from a dataframe.
+
+        Parameters
+        ----------
+        dataframe: pandas.DataFrame
+            Dataframe containing the ACF of each slice.
+
+        columns: list
+            Column of each slice and coefficient, i.e. ``columns[isl][i]``. If ``columns[isl][i]`` is a list the
+            average of its columns is read, e.g. the ACF perpendicular to the magnetic field.
+
+        Returns
+        -------
+        read_integrand : callable
+            Function returning the ACFs of the lags ``start:stop``. Shape = (no_slices, no_coefficients, stop - start).
+
+        """
+
+        def read_integrand(start: int, stop: int):
+            block = dataframe.iloc[start:stop]
+            integrand = zeros((len(columns), len(columns[0]), stop - start))
+            for isl, slice_columns in enumerate(columns):
+                for i, col in enumerate(slice_columns):
+                    integrand[isl, i] = block[col if isinstance(col, list) else [col]].to_numpy().mean(axis=1)
+
+            return integrand
+
+        return read_integrand
+
+    def running_integral(self, time, read_integrand, names: list, const: float = 1.0):
+        """
+        Calculate the running integrals of the slices' ACFs with a
+        :class:`sarkas.utilities.maths.CumulativeIntegrator` and store their plateau in :attr:`plateau_df`.
+
+        The ACFs are read in blocks of :attr:`integration_block` lags. If :attr:`stop_at_plateau` is ``True`` no
+        further lags are read once the plateau of every coefficient has been reached.
+
+        Parameters
+        ----------
+        time: numpy.ndarray
+            Time array of the ACFs.
+
+        read_integrand: callable
+            Function returning the ACFs of the lags ``start:stop``, see :meth:`acf_reader`.
+
+        names: list
+            Name of each transport coefficient.
+
+        const: float
+            Multiplicative constant of the integrals. Default = 1.0.
+
+        Returns
+        -------
+        integral: numpy.ndarray
+            Running integrals. Shape = (no_slices, len(names), no_lags), with ``no_lags <= len(time)``.
+
+        """
+        no_lags = len(time)
+        block = no_lags if self.integration_block is None else max(int(self.integration_block), 1)
+        integrator = CumulativeIntegrator(window=self.get_plateau_window(no_lags), rtol=self.plateau_rtol)
+
+        for start in tqdm(range(0, no_lags, block), disable=not self.verbose):
+            stop = min(start + block, no_lags)
+            integrator.add(time[start:stop], const * read_integrand(start, stop))
+            if self.stop_at_plateau and integrator.converged:
+                break
+
+        integral = integrator.integral
+        self.store_plateau(time, integral, names, integrator.window)
+
+        return integral
+
+    def get_plateau_window(self, no_lags: int):
+        """Return the number of lags of each window of the plateau search, see :attr:`plateau_window`."""
+        return self.plateau_window if self.plateau_window else max(no_lags // 20, 1)
+
+    def store_plateau(self, time, running, names: list, window: int = None):
+        """
+        Find the plateau of running transport coefficients, store it in :attr:`plateau_df` and print it if verbose.
+
+        Parameters
+        ----------
+        time: numpy.ndarray
+            Time array of the running coefficients.
+
+        running: numpy.ndarray
+            Running coefficients of each slice. Shape = (no_slices, len(names), no_lags).
+
+        names: list
+            Name of each transport coefficient.
+
+        window: int, optional
+            Number of lags of each window of the plateau search. Default = ``None``, see :attr:`plateau_window`.
+
+        """
+        window = window if window else self.get_plateau_window(running.shape[-1])
+        index, value, std = find_plateau(running, window, self.plateau_rtol)
+
+        for name, idx, val, err in zip(names, index, value, std):
+            self.plateau_df.loc[name] = [val, err, time[idx] if idx >= 0 else nan, idx >= 0]
+            if not self.verbose:
+                continue
+            if idx >= 0:
+                print(f"{name} plateau = {val:.4e} +/- {err:.4e} reached at tau = {time[idx]:.4e} [s]")
+            else:
+                print(f"{name} plateau not reached. Last window = {val:.4e} +/- {err:.4e}")
+
     def save_hdf(self, df: DataFrame = None, df_slices: DataFrame = None, tc_name: str = None):
         """
         Save the HDF dataframes to disk in the TransportCoefficient folder.
@@ -197,7 +331,9 @@ class TransportCoefficients:
         # Print some info
         self.pretty_print(tc_name=tc_name)
 
-    def plot_tc(self, time, acf_data, tc_data, acf_name, tc_name, figname, show: bool = False):
+    def plot_tc(
+        self, time, acf_data, tc_data, acf_name, tc_name, figname, show: bool = False, normalize_acf: bool = True
+    ):
         """
         Make dual plots with ACF and transport coefficient.
 
@@ -226,6 +362,9 @@ class TransportCoefficients:
         show: bool
             Flag for displaying the plot if using IPython or terminal.
 
+        normalize_acf: bool
+            Flag for normalizing the ACF by its initial value. Default = True.
+
         Returns
         -------
         fig : matplotlib.figure.Figure
@@ -236,6 +375,8 @@ class TransportCoefficients:
             ax1 = ACF axes, ax2 = transport coefficient axes, ax3 = ax1.twiny(), ax4 = ax2.twiny()
 
         """
+        from matplotlib.pyplot import subplots
+
         # Make the plot
         fig, (ax1, ax2) = subplots(1, 2, figsize=(16, 7))
         ax3 = ax1.twiny()
@@ -245,18 +386,23 @@ class TransportCoefficients:
         xmul, ymul, _, _, xlbl, ylbl = plot_labels(time, tc_data[:, 0], "Time", tc_name, self.units)
 
         # ACF
-        ax1.plot(xmul * time, acf_data[:, 0] / acf_data[0, 0])
+        if normalize_acf:
+            norm, norm_low, norm_high = acf_data[0, 0], acf_data[0, 0] - acf_data[0, 1], acf_data[0, 0] + acf_data[0, 1]
+        else:
+            norm = norm_low = norm_high = 1.0
+        ax1.plot(xmul * time, acf_data[:, 0] / norm)
         ax1.fill_between(
             xmul * time,
-            (acf_data[:, 0] - acf_data[:, 1]) / (acf_data[0, 0] - acf_data[0, 1]),
-            (acf_data[:, 0] + acf_data[:, 1]) / (acf_data[0, 0] + acf_data[0, 1]),
+            (acf_data[:, 0] - acf_data[:, 1]) / norm_low,
+            (acf_data[:, 0] + acf_data[:, 1]) / norm_high,
             alpha=0.2,
         )
 
-        # Coefficient
-        ax2.plot(xmul * time, ymul * tc_data[:, 0])
+        # Coefficient. It is shorter than the ACF if the integration stopped at the plateau.
+        tc_time = time[: tc_data.shape[0]]
+        ax2.plot(xmul * tc_time, ymul * tc_data[:, 0])
         ax2.fill_between(
-            xmul * time, ymul * (tc_data[:, 0] - tc_data[:, 1]), ymul * (tc_data[:, 0] + tc_data[:, 1]), alpha=0.2
+            xmul * tc_time, ymul * (tc_data[:, 0] - tc_data[:, 1]), ymul * (tc_data[:, 0] + tc_data[:, 1]), alpha=0.2
         )
 
         xlims = (xmul * time[1], xmul * time[-1] * 1.5)
@@ -346,39 +492,40 @@ class TransportCoefficients:
         # to_numpy creates a 2d-array, hence the [:,0]
         time = observable.dataframe_acf["Time"].iloc[:, 0].to_numpy()
 
-        self.conductivity_df["Time"] = time.copy()
-        self.conductivity_df_slices["Time"] = time.copy()
-
         jc_str = "Electric Current ACF"
         sigma_str = "Electrical Conductivity"
         const = self.beta / observable.box_volume
         if not observable.magnetized:
-            for isl in tqdm(range(observable.no_slices), disable=not observable.verbose):
-                integrand = array(observable.dataframe_acf_slices[(jc_str, "Total", "slice {}".format(isl))])
-                self.conductivity_df_slices[sigma_str + "_slice {}".format(isl)] = const * fast_integral_loop(
-                    time, integrand
-                )
+            columns = [[(jc_str, "Total", "slice {}".format(isl))] for isl in range(observable.no_slices)]
+            reader = self.acf_reader(observable.dataframe_acf_slices, columns)
+            sigma = self.running_integral(time, reader, [sigma_str], const)
+
+            self.conductivity_df["Time"] = time[: sigma.shape[-1]].copy()
+            self.conductivity_df_slices["Time"] = time[: sigma.shape[-1]].copy()
+            for isl in range(observable.no_slices):
+                self.conductivity_df_slices[sigma_str + "_slice {}".format(isl)] = sigma[isl, 0]
 
             col_str = [sigma_str + "_slice {}".format(isl) for isl in range(observable.no_slices)]
             self.conductivity_df[sigma_str + "_Mean"] = self.conductivity_df_slices[col_str].mean(axis=1)
             self.conductivity_df[sigma_str + "_Std"] = self.conductivity_df_slices[col_str].std(axis=1)
         else:
-
-            for isl in tqdm(range(observable.no_slices), disable=not observable.verbose):
-                # Parallel
-                par_str = (jc_str, "Z", "slice {}".format(isl))
-                sigma_par_str = sigma_str + "_Parallel_slice {}".format(isl)
-                integrand = observable.dataframe_acf_slices[par_str].to_numpy()
-                self.conductivity_df_slices[sigma_par_str] = const * fast_integral_loop(time, integrand)
-                # Perpendicular
-                x_col_str = (jc_str, "X", "slice {}".format(isl))
-                y_col_str = (jc_str, "Y", "slice {}".format(isl))
-                perp_integrand = 0.5 * (
-                    observable.dataframe_acf_slices[x_col_str].to_numpy()
-                    + observable.dataframe_acf_slices[y_col_str].to_numpy()
-                )
-                sigma_perp_str = sigma_str + "_Perpendicular_slice {}".format(isl)
-                self.conductivity_df_slices[sigma_perp_str] = const * fast_integral_loop(time, perp_integrand)
+            # Parallel and Perpendicular
+            columns = [
+                [
+                    (jc_str, "Z", "slice {}".format(isl)),
+                    [(jc_str, "X", "slice {}".format(isl)), (jc_str, "Y", "slice {}".format(isl))],
+                ]
+                for isl in range(observable.no_slices)
+            ]
+            reader = self.acf_reader(observable.dataframe_acf_slices, columns)
+            names = [sigma_str + " Parallel", sigma_str + " Perpendicular"]
+            sigma = self.running_integral(time, reader, names, const)
+
+            self.conductivity_df["Time"] = time[: sigma.shape[-1]].copy()
+            self.conductivity_df_slices["Time"] = time[: sigma.shape[-1]].copy()
+            for isl in range(observable.no_slices):
+                self.conductivity_df_slices[sigma_str + "_Parallel_slice {}".format(isl)] = sigma[isl, 0]
+                self.conductivity_df_slices[sigma_str + "_Perpendicular_slice {}".format(isl)] = sigma[isl, 1]
 
             par_col_str = [(jc_str, "Z", "slice {}".format(isl)) for isl in range(self.no_slices)]
             observable.dataframe_acf[(jc_str, "Parallel", "Mean")] = observable.dataframe_acf_slices[par_col_str].mean(
@@ -484,13 +631,24 @@ class TransportCoefficients:
         where :math:`\\mathbf v_{i}^{(\\alpha)}(t)` is the velocity of particle :math:`i` of species
         :math:`\\alpha`. Notice that the diffusion coefficient is averaged over all :math:`N_{\\alpha}` particles.
 
+        If ``observable`` is a :class:`sarkas.tools.observables.MeanSquaredDisplacement` the Einstein relation
+
+        .. math::
+
+            D_{\\alpha}(\\tau) = \\frac{1}{6 N_{\\alpha} \\tau} \\sum_{i}^{N_{\\alpha}}
+                \\langle \\left | \\mathbf r^{(\\alpha)}_{i}(\\tau) - \\mathbf r^{(\\alpha)}_{i}(0) \\right |^2 \\rangle
+
+        is used instead. The two estimators converge to the same value at long times.
+
         Data is retrievable at :attr:`~.diffusion_df` and
         :attr:`~.diffusion_df_slices`.
 
         Parameters
         ----------
-        observable : :class:`sarkas.tools.observables.VelocityAutoCorrelationFunction`
-            Observable object containing the ACF whose time integral leads to the self diffusion coefficient.
+        observable : :class:`sarkas.tools.observables.VelocityAutoCorrelationFunction`, \
+            :class:`sarkas.tools.observables.MeanSquaredDisplacement`
+            Observable object containing the ACF whose time integral leads to the self diffusion coefficient, or the
+            MSD whose slope leads to it.
 
         plot : bool, optional
             Flag for making the dual plot of the ACF and transport coefficient. Default = True.
@@ -516,23 +674,43 @@ class TransportCoefficients:
         # to_numpy creates a 2d-array, hence the [:,0]
         time = observable.dataframe_acf["Time"].iloc[:, 0].to_numpy()
 
-        self.diffusion_df["Time"] = time.copy()
-        self.diffusion_df_slices["Time"] = time.copy()
-
-        vacf_str = "VACF"
-        const = 1.0 / self.dimensions
+        vacf_str = "MSD" if observable.__name__ == "msd" else "VACF"
 
         if not observable.magnetized:
-            # Loop over time slices
-            for isl in tqdm(range(self.no_slices), disable=not observable.verbose):
+            const = 1.0 / self.dimensions
+            columns = [
+                [(f"{sp} " + vacf_str, "Total", f"slice {isl}") for sp in observable.species_names]
+                for isl in range(self.no_slices)
+            ]
+            names = [f"{sp} Diffusion" for sp in observable.species_names]
+        else:
+            const = 1.0
+            # Parallel and Perpendicular of each species
+            columns = []
+            for isl in range(self.no_slices):
+                slice_columns = []
+                for sp in observable.species_names:
+                    sp_vacf_str = f"{sp} " + vacf_str
+                    slice_columns.append((sp_vacf_str, "Z", f"slice {isl}"))
+                    slice_columns.append([(sp_vacf_str, "X", f"slice {isl}"), (sp_vacf_str, "Y", f"slice {isl}")])
+                columns.append(slice_columns)
+            names = [f"{sp} Diffusion {d}" for sp in observable.species_names for d in ["Parallel", "Perpendicular"]]
+
+        reader = self.acf_reader(observable.dataframe_acf_slices, columns)
+        if observable.__name__ == "msd":
+            # Einstein relation. It does not need any integration.
+            coefficient = einstein_relation(time, const * reader(0, len(time)))
+            self.store_plateau(time, coefficient, names)
+        else:
+            coefficient = self.running_integral(time, reader, names, const)
+
+        self.diffusion_df["Time"] = time[: coefficient.shape[-1]].copy()
+        self.diffusion_df_slices["Time"] = time[: coefficient.shape[-1]].copy()
 
-                # Iterate over the number of species
+        if not observable.magnetized:
+            for isl in range(self.no_slices):
                 for i, sp in enumerate(observable.species_names):
-                    sp_vacf_str = f"{sp} " + vacf_str
-                    # Grab vacf data of each slice
-                    integrand = array(observable.dataframe_acf_slices[(sp_vacf_str, "Total", f"slice {isl}")])
-                    df_str = f"{sp} Diffusion_slice {isl}"
-                    self.diffusion_df_slices[df_str] = const * fast_integral_loop(time=time, integrand=integrand)
+                    self.diffusion_df_slices[f"{sp} Diffusion_slice {isl}"] = coefficient[isl, i]
 
             # Average and std of each diffusion coefficient.
             for isp, sp in enumerate(observable.species_names):
@@ -542,28 +720,12 @@ class TransportCoefficients:
                 self.diffusion_df[f"{sp} Diffusion_Std"] = self.diffusion_df_slices[col_str].std(axis=1)
 
         else:
-            # Loop over time slices
-            for isl in tqdm(range(observable.no_slices), disable=not observable.verbose):
-
-                # Iterate over the number of species
+            for isl in range(observable.no_slices):
                 for i, sp in enumerate(observable.species_names):
-                    sp_vacf_str = f"{sp} " + vacf_str
-
-                    # Parallel
-                    par_vacf_str = (sp_vacf_str, "Z", "slice {}".format(isl))
-                    integrand_par = observable.dataframe_acf_slices[par_vacf_str].to_numpy()
                     par_slice_str = "{} Diffusion_Parallel_slice {}".format(sp, isl)
-                    self.diffusion_df_slices[par_slice_str] = fast_integral_loop(time=time, integrand=integrand_par)
-                    # Perpendicular
-                    x_vacf_str = (sp_vacf_str, "X", "slice {}".format(isl))
-                    y_vacf_str = (sp_vacf_str, "Y", "slice {}".format(isl))
+                    self.diffusion_df_slices[par_slice_str] = coefficient[isl, 2 * i]
                     perp_slice_str = "{} Diffusion_Perpendicular_slice {}".format(sp, isl)
-                    integrand_perp = 0.5 * (
-                        observable.dataframe_acf_slices[x_vacf_str].to_numpy()
-                        + observable.dataframe_acf_slices[y_vacf_str].to_numpy()
-                    )
-
-                    self.diffusion_df_slices[perp_slice_str] = fast_integral_loop(time=time, integrand=integrand_perp)
+                    self.diffusion_df_slices[perp_slice_str] = coefficient[isl, 2 * i + 1]
 
             # Add the average and std of perp and par VACF to its dataframe
             for isp, sp in enumerate(observable.species_names):
@@ -607,6 +769,8 @@ class TransportCoefficients:
         self.diffusion_df, self.diffusion_df_slices = self.save_hdf(
             df=self.diffusion_df, df_slices=self.diffusion_df_slices, tc_name="diffusion"
         )
+        # The MSD starts from zero and grows in time hence it is not normalized
+        normalize_acf = observable.__name__ != "msd"
 
         if plot or display_plot:
 
@@ -630,6 +794,7 @@ class TransportCoefficients:
                         tc_name=sp_diff_str + " Parallel",
                         figname="{}_Parallel_Diffusion_Plot.png".format(sp),
                         show=display_plot,
+                        normalize_acf=normalize_acf,
                     )
 
                     # Perpendicular
@@ -647,6 +812,7 @@ class TransportCoefficients:
                         tc_name=sp_diff_str + " Perpendicular",
                         figname="{}_Perpendicular_Diffusion_Plot.png".format(sp),
                         show=display_plot,
+                        normalize_acf=normalize_acf,
                     )
             else:
                 for isp, sp in enumerate(observable.species_names):
@@ -666,6 +832,7 @@ class TransportCoefficients:
                         tc_name=d_str,
                         figname="{}_Diffusion_Plot.png".format(sp),
                         show=display_plot,
+                        normalize_acf=normalize_acf,
                     )
 
     def interdiffusion(self, observable, plot: bool = True, display_plot: bool = False):
@@ -712,8 +879,6 @@ class TransportCoefficients:
 
         # to_numpy creates a 2d-array, hence the [:,0]
         time = observable.dataframe_acf["Time"].to_numpy()[:, 0]
-        self.interdiffusion_df["Time"] = time.copy()
-        self.interdiffusion_df_slices["Time"] = time.copy()
 
         no_fluxes_acf = observable.no_fluxes_acf
         # Normalization constant
@@ -721,15 +886,19 @@ class TransportCoefficients:
 
         df_str = "Diffusion Flux ACF"
         id_str = "Inter Diffusion Flux"
-        for isl in tqdm(range(self.no_slices), disable=not self.verbose):
-            # D_ij = zeros((no_fluxes_acf, jc_acf.slice_steps))
+        columns = [
+            [(df_str + " {}".format(ij), "Total", "slice {}".format(isl)) for ij in range(no_fluxes_acf)]
+            for isl in range(self.no_slices)
+        ]
+        reader = self.acf_reader(observable.dataframe_acf_slices, columns)
+        names = [id_str + " {}".format(ij) for ij in range(no_fluxes_acf)]
+        inter_diffusion = self.running_integral(time, reader, names, const)
 
+        self.interdiffusion_df["Time"] = time[: inter_diffusion.shape[-1]].copy()
+        self.interdiffusion_df_slices["Time"] = time[: inter_diffusion.shape[-1]].copy()
+        for isl in range(self.no_slices):
             for ij in range(no_fluxes_acf):
-                acf_df_str = (df_str + " {}".format(ij), "Total", "slice {}".format(isl))
-                integrand = observable.dataframe_acf_slices[acf_df_str].to_numpy()
-
-                id_df_str = id_str + " {}_slice {}".format(ij, isl)
-                self.interdiffusion_df_slices[id_df_str] = const * fast_integral_loop(time=time, integrand=integrand)
+                self.interdiffusion_df_slices[id_str + " {}_slice {}".format(ij, isl)] = inter_diffusion[isl, ij]
 
         # Average and Std of slices
         for ij in range(no_fluxes_acf):
@@ -820,8 +989,6 @@ class TransportCoefficients:
 
         # to_numpy creates a 2d-array, hence the [:,0]
         time = observable.dataframe_acf["Time"].iloc[:, 0].to_numpy()
-        self.viscosity_df["Time"] = time.copy()
-        self.viscosity_df_slices["Time"] = time.copy()
 
         dim_lbl = ["x", "y", "z"]
 
@@ -840,28 +1007,31 @@ class TransportCoefficients:
             "Shear Viscosity Tensor Total",
         ]
 
-        start_steps = 0
-        end_steps = 0
-
-        for isl in tqdm(range(self.no_slices), disable=not observable.verbose):
-            end_steps += observable.slice_steps
-
-            const = observable.box_volume * self.beta
-            # Calculate Bulk Viscosity
-            # It is calculated from the fluctuations of the pressure eq. 2.124a Allen & Tilsdeley
-            integrand = observable.dataframe_acf_slices[("Delta Pressure ACF", "slice {}".format(isl))].to_numpy()
-            self.viscosity_df_slices["Bulk Viscosity_slice {}".format(isl)] = const * fast_integral_loop(time, integrand)
-
-            # Calculate the Shear Viscosity Elements
-            for _, ax1 in enumerate(dim_lbl):
-                for _, ax2 in enumerate(dim_lbl):
-                    for _, (pt_str, eta_str) in enumerate(zip(pt_str_list, eta_str_list)):
-                        pt_str_temp = (pt_str + " {}{}{}{}".format(ax1, ax2, ax1, ax2), "slice {}".format(isl))
-                        integrand = observable.dataframe_acf_slices[pt_str_temp].to_numpy()
-                        eta_str_temp = eta_str + " {}{}_slice {}".format(ax1, ax2, isl)
-                        self.viscosity_df_slices[eta_str_temp] = const * fast_integral_loop(time, integrand)
-
-            start_steps += observable.slice_steps
+        const = observable.box_volume * self.beta
+        # The Bulk Viscosity is calculated from the fluctuations of the pressure eq. 2.124a Allen & Tilsdeley
+        names = ["Bulk Viscosity"]
+        columns = [[("Delta Pressure ACF", "slice {}".format(isl))] for isl in range(self.no_slices)]
+        # Shear Viscosity Elements
+        for ax1 in dim_lbl:
+            for ax2 in dim_lbl:
+                for pt_str, eta_str in zip(pt_str_list, eta_str_list):
+                    names.append(eta_str + " {}{}".format(ax1, ax2))
+                    for isl in range(self.no_slices):
+                        columns[isl].append((pt_str + " {}{}{}{}".format(ax1, ax2, ax1, ax2), "slice {}".format(isl)))
+
+        reader = self.acf_reader(observable.dataframe_acf_slices, columns)
+        viscosity = self.running_integral(time, reader, names, const)
+
+        self.viscosity_df["Time"] = time[: viscosity.shape[-1]].copy()
+        self.viscosity_df_slices["Time"] = time[: viscosity.shape[-1]].copy()
+        for isl in range(self.no_slices):
+            for i, name in enumerate(names):
+                self.viscosity_df_slices[name + "_slice {}".format(isl)] = viscosity[isl, i]
+
+        # Plateau of the Shear Viscosity from the off-diagonal elements of each slice
+        list_coord = ["xy", "xz", "yx", "yz", "zx", "zy"]
+        shear = viscosity[:, [names.index(eta_str_list[-1] + " " + coord) for coord in list_coord]].mean(axis=1)
+        self.store_plateau(time, shear[:, None], ["Shear Viscosity"])
 
         # Now average the slices
         col_str = ["Bulk Viscosity_slice {}".format(isl) for isl in range(observable.no_slices)]
@@ -879,7 +1049,6 @@ class TransportCoefficients:
                         axis=1
                     )
 
-        list_coord = ["xy", "xz", "yx", "yz", "zx", "zy"]
         col_str = [eta_str + " {}_Mean".format(coord) for coord in list_coord]
         self.viscosity_df["Shear Viscosity_Mean"] = self.viscosity_df[col_str].mean(axis=1)
         self.viscosity_df["Shear Viscosity_Std"] = self.viscosity_df[col_str].std(axis=1)
@@ -177,7 +177,7 @@ def fermidirac_integral(p: float, eta: float) -> float:
         raise SarkasError(f"Fermi-Dirac Integral of order {p} not yet implemented.")
 
 
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def invfd1h(u: float) -> float:
     """Approximate the inverse of the Fermi-Dirac integral :math:`I_{-1/2}(\\eta)` using the fits provided by Fukushima.
     Function translated from Fukushima's code, see :cite:`Fukushima2015a`.
@@ -389,7 +389,7 @@ def invfd1h(u: float) -> float:
 
 
 @fd_doc_hparams(order=-9 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fdm9h(x: float) -> float:
     factor = -2.0 / 7.0
     if x < -2.0:
@@ -829,7 +829,7 @@ def fdm9h(x: float) -> float:
 
 
 @fd_doc_hparams(order=-7 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fdm7h(x: float) -> float:
     factor = -2.0 / 5.0
     if x < -2.0:
@@ -1227,7 +1227,7 @@ def fdm7h(x: float) -> float:
 
 
 @fd_doc_hparams(order=-5 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fdm5h(x: float) -> float:
     factor = -2.0 / 3.0
 
@@ -1550,7 +1550,7 @@ def fdm5h(x: float) -> float:
 
 
 @fd_doc_hparams(order=-3 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fdm3h(x: float) -> float:
     factor = -2.0
 
@@ -1839,7 +1839,7 @@ def fdm3h(x: float) -> float:
 
 
 @fd_doc_hparams(order=-1 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fdm1h(x: float) -> float:
     """!
     ! double precision rational minimax approximation of Fermi-Dirac integral of order k=-1/2
@@ -2116,7 +2116,7 @@ def fdm1h(x: float) -> float:
 
 
 @fd_doc_iparams(order=0)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd0h(y: float) -> float:
     x = -abs(y)
     if x < -2.0:
@@ -2182,7 +2182,7 @@ def fd0h(y: float) -> float:
 
 
 @fd_doc_hparams(order=1 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd1h(x: float) -> float:
     if x < -2.0:
         ex = exp(x)
@@ -2446,7 +2446,7 @@ def fd1h(x: float) -> float:
 
 
 @fd_doc_iparams(order=1)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd2h(y: float) -> float:
     x = -abs(y)
     if x < -2.0:
@@ -2519,7 +2519,7 @@ def fd2h(y: float) -> float:
 
 
 @fd_doc_hparams(order=3 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd3h(x: float) -> float:
     if x < -2.0:
         ex = exp(x)
@@ -2804,7 +2804,7 @@ def fd3h(x: float) -> float:
 
 
 @fd_doc_iparams(order=2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd4h(y: float) -> float:
     x = -abs(y)
     if x < -2.0:
@@ -2870,7 +2870,7 @@ def fd4h(y: float) -> float:
 
 
 @fd_doc_hparams(order=5 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd5h(x: float) -> float:
     factor = 2 / 7.0
 
@@ -3138,7 +3138,7 @@ def fd5h(x: float) -> float:
 
 
 @fd_doc_iparams(order=3)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd6h(y: float) -> float:
     x = -abs(y)
     if x < -2.0:
@@ -3197,7 +3197,7 @@ def fd6h(y: float) -> float:
 
 
 @fd_doc_hparams(order=7 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd7h(x: float) -> float:
     factor = 2.0 / 9.0
 
@@ -3474,7 +3474,7 @@ def fd7h(x: float) -> float:
 
 
 @fd_doc_iparams(order=4)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd8h(y: float) -> float:
     x = -abs(y)
     if x < -2.0:
@@ -3533,7 +3533,7 @@ def fd8h(y: float) -> float:
 
 
 @fd_doc_hparams(order=9 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd9h(x: float) -> float:
     factor = 2.0 / 11.0
 
@@ -3811,7 +3811,7 @@ def fd9h(x: float) -> float:
 
 
 @fd_doc_iparams(order=5)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd10h(y: float) -> float:
 
     x = -abs(y)
@@ -3875,7 +3875,7 @@ def fd10h(y: float) -> float:
 
 
 @fd_doc_hparams(order=11 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd11h(x: float) -> float:
     factor = 2.0 / 13.0
 
@@ -4162,7 +4162,7 @@ def fd11h(x: float) -> float:
 
 
 @fd_doc_iparams(order=6)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd12h(y: float) -> float:
     x = -abs(y)
     if x < -2.0:
@@ -4223,7 +4223,7 @@ def fd12h(y: float) -> float:
 
 
 @fd_doc_hparams(order=13 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd13h(x: float) -> float:
     factor = 2.0 / 15.0
 
@@ -4550,7 +4550,7 @@ def fd13h(x: float) -> float:
 
 
 @fd_doc_iparams(order=7)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd14h(y: float) -> float:
 
     x = -abs(y)
@@ -4625,7 +4625,7 @@ def fd14h(y: float) -> float:
 
 
 @fd_doc_hparams(order=15 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd15h(x: float) -> float:
     factor = 2.0 / 17.0
 
@@ -4945,7 +4945,7 @@ def fd15h(x: float) -> float:
 
 
 @fd_doc_iparams(order=8)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd16h(y: float) -> float:
     x = -abs(y)
     if x < -2.0:
@@ -5003,7 +5003,7 @@ def fd16h(y: float) -> float:
 
 
 @fd_doc_hparams(order=17 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd17h(x: float) -> float:
     factor = 2.0 / 19.0
 
@@ -5200,7 +5200,7 @@ def fd17h(x: float) -> float:
 
 
 @fd_doc_iparams(order=9)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd18h(y: float) -> float:
     x = -abs(y)
     if x < -2.0:
@@ -5260,7 +5260,7 @@ def fd18h(y: float) -> float:
 
 
 @fd_doc_hparams(order=19 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd19h(x: float) -> float:
     factor = 2.0 / 21.0
 
@@ -5606,7 +5606,7 @@ def fd19h(x: float) -> float:
 
 
 @fd_doc_iparams(order=10)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd20h(y: float) -> float:
     x = -abs(y)
     if x < -2.0:
@@ -5675,7 +5675,7 @@ def fd20h(y: float) -> float:
 
 
 @fd_doc_hparams(order=21 / 2)
-@jit(float64(float64), nopython=True)
+@jit(float64(float64), nopython=True, cache=True)
 def fd21h(x: float) -> float:
     factor = 2.0 / 23.0
 
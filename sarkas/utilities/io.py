@@ -2,22 +2,39 @@
 Module handling the I/O for an MD run.
 """
 import csv
+import json
 import pickle
 import re
 import sys
 import yaml
 from copy import copy, deepcopy
-from IPython import get_ipython
 from numpy import c_, float64
 from numpy import load as np_load
 from numpy import savetxt, savez, zeros
 from numpy.random import randint
 from os import listdir, mkdir
 from os.path import basename, exists, join
-from pyfiglet import Figlet, print_figlet
 from warnings import warn
 
-if get_ipython().__class__.__name__ == "ZMQInteractiveShell":
+
+def in_notebook() -> bool:
+    """
+    Check if the code is running in a Jupyter Notebook.
+
+    IPython is not imported if it is not loaded already, since a notebook kernel always loads it.
+
+    Returns
+    -------
+    : bool
+        True if the shell is a Jupyter kernel.
+
+    """
+    ipython = sys.modules.get("IPython")
+
+    return ipython is not None and ipython.get_ipython().__class__.__name__ == "ZMQInteractiveShell"
+
+
+if in_notebook():
     # If you are using Jupyter Notebook
     from tqdm.notebook import trange
 else:
@@ -248,6 +265,7 @@ class InputOutput:
                 pos=ptcls.pos,
                 vel=ptcls.vel,
                 acc=ptcls.acc,
+                cntr=ptcls.pbc_cntr,
                 virial=ptcls.virial,
                 time=tme,
             )
@@ -264,6 +282,7 @@ class InputOutput:
                 pos=ptcls.pos,
                 vel=ptcls.vel,
                 acc=ptcls.acc,
+                cntr=ptcls.pbc_cntr,
                 virial=ptcls.virial,
                 time=tme,
             )
@@ -459,6 +478,8 @@ class InputOutput:
         """Create the log file and print the figlet if not a restart run."""
 
         if not self.restart:
+            from pyfiglet import Figlet
+
             with open(self.log_file, "w+") as f_log:
                 figlet_obj = Figlet(font="starwars")
                 print(figlet_obj.renderText("Sarkas"), file=f_log)
@@ -591,11 +612,11 @@ class InputOutput:
 
         observable : str
             Observable whose info to print. Default = None.
-            Choices = ['header','rdf', 'ccf', 'dsf', 'ssf', 'vm']
+            Choices = ['header','rdf', 'ccf', 'dsf', 'ssf', 'vd', 'vacf', 'msd', 'ec', 'diff_flux', 'p_tensor']
 
         """
 
-        choices = ["header", "rdf", "ccf", "dsf", "ssf", "vd"]
+        choices = ["header", "rdf", "ccf", "dsf", "ssf", "vd", "vacf", "msd", "ec", "diff_flux", "p_tensor"]
         msg = (
             "Observable not defined. \n "
             "Please choose an observable from this list \n"
@@ -603,7 +624,12 @@ class InputOutput:
             "'ccf' = Current Correlation Function, \n"
             "'dsf' = Dynamic Structure Function, \n"
             "'ssf' = Static Structure Factor, \n"
-            "'vd' = Velocity Distribution"
+            "'vd' = Velocity Distribution, \n"
+            "'vacf' = Velocity AutoCorrelation Function, \n"
+            "'msd' = Mean Squared Displacement, \n"
+            "'ec' = Electric Current, \n"
+            "'diff_flux' = Diffusion Flux, \n"
+            "'p_tensor' = Pressure Tensor"
         )
         if observable is None:
             raise ValueError(msg)
@@ -643,6 +669,8 @@ class InputOutput:
                 print("\nVelocity Moments:")
                 print("Maximum no. of moments = {}".format(simulation.vm.max_no_moment))
                 print("Maximum velocity moment = {}".format(int(2 * simulation.vm.max_no_moment)))
+            elif observable in ["vacf", "msd", "ec", "diff_flux", "p_tensor"]:
+                simulation.__dict__[observable].pretty_print()
 
             repeat -= 1
 
@@ -771,6 +799,62 @@ class InputOutput:
 
         f_log.close()
 
+    def profile_summary(self, phase: str, breakdown: dict, total: int, steps: int, num_ptcls: int):
+        """
+        Print the breakdown of the time of a phase to screen and log file and save it to a JSON file in the directory
+        of the phase.
+
+        Parameters
+        ----------
+        phase : str
+            Simulation phase.
+
+        breakdown : dict
+            Profiled sections, see :meth:`sarkas.utilities.timing.SarkasProfiler.breakdown`.
+
+        total : int
+            Time of the phase in nanoseconds.
+
+        steps : int
+            Number of timesteps of the phase.
+
+        num_ptcls : int
+            Total number of particles.
+
+        """
+        ns_per_step = total / (steps * num_ptcls) if steps else 0.0
+        lines = [
+            "\n\n{:-^70} \n".format(f" {phase.capitalize()} Profile "),
+            f"Timesteps: {steps}, {ns_per_step:.2f} ns/particle/step",
+            "Nested sections are indented. Their percentage is of the time of the enclosing section.\n",
+            f"{'Section':<24}{'Calls':>10}{'Time [s]':>12}{'Per Call [us]':>15}{'[%]':>11}",
+        ]
+        for label, sec in breakdown.items():
+            name = "  " * sec["depth"] + label
+            lines.append(
+                f"{name:<24}{sec['calls']:>10}{sec['time_s']:>12.4f}"
+                f"{sec['time_per_call_us']:>15.2f}{sec['percentage']:>11.2f}"
+            )
+        self.write_to_logger("\n".join(lines))
+
+        if phase == "equilibration":
+            fldr = self.equilibration_dir
+        elif phase == "magnetization":
+            fldr = self.magnetization_dir
+        else:
+            fldr = self.production_dir
+
+        data = {
+            "phase": phase,
+            "timesteps": steps,
+            "num_ptcls": num_ptcls,
+            "time_s": total * 1.0e-09,
+            "ns_per_particle_step": ns_per_step,
+            "sections": breakdown,
+        }
+        with open(join(fldr, phase.capitalize() + "Profile_" + self.job_id + ".json"), "w") as f:
+            json.dump(data, f, indent=2)
+
     @staticmethod
     def read_npz(fldr: str, filename: str):
         """
@@ -924,7 +1008,9 @@ class InputOutput:
         """
         Print a colored figlet of Sarkas to screen.
         """
-        if get_ipython().__class__.__name__ == "ZMQInteractiveShell":
+        from pyfiglet import print_figlet
+
+        if in_notebook():
             # Assume white background in Jupyter Notebook
             clr = DARK_COLORS[randint(0, len(DARK_COLORS))]
         else:
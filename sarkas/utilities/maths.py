@@ -1,12 +1,53 @@
 """Module of mathematical functions."""
 
-import scipy.signal as scp_signal
 from numba import njit
-from numpy import arange, array, exp, inf, ndarray, pi, sqrt, trapz, zeros_like
+from numpy import (
+    arange,
+    array,
+    asarray,
+    concatenate,
+    cumsum,
+    diff,
+    exp,
+    float64,
+    full,
+    inf,
+    int64,
+    ndarray,
+    pi,
+    sqrt,
+    take_along_axis,
+    where,
+    zeros,
+    zeros_like,
+)
+from numpy.polynomial.polynomial import polyval
+from scipy.fft import irfft, next_fast_len, rfft
 from scipy.integrate import quad
+from scipy.special import erfc
 
 TWOPI = 2.0 * pi
 
+# Coefficients of the approximation erfc(x) ~ t P(t) exp(-x^2), t = 1/(1 + p x), of :func:`erfc_exp_approx`.
+# Minimax fit of degree 9 in the form of eq.(7.1.26) of Abramowitz & Stegun with P(1) = 1, i.e. exact at x = 0.
+ERFC_APPROX_P = 0.47047
+ERFC_APPROX_COEFFS = array(
+    [
+        0.26543424979472935,
+        0.2654384421525501,
+        0.23594205312525743,
+        0.17843929380607113,
+        0.09470198426322035,
+        0.020462235626440804,
+        0.012674121674170731,
+        -0.1935849610520905,
+        0.16074462323941113,
+        -0.040252042629760454,
+    ]
+)
+# Bound of the relative error of the approximation for x >= 0
+ERFC_APPROX_RTOL = 1.0e-7
+
 
 def correlationfunction(At, Bt):
     """
@@ -42,26 +83,161 @@ def correlationfunction(At, Bt):
     >>> corr_t = correlationfunction(At, Bt)
 
     """
+    import scipy.signal as scp_signal
+
     no_steps = At.size
 
     # Calculate the full correlation function.
     full_corr = scp_signal.correlate(At, Bt, mode="full")
     # Normalization of the full correlation function, Similar to norm_counter
-    norm_corr = array([no_steps - ii for ii in range(no_steps)])
+    norm_corr = arange(no_steps, 0, -1)
     # Find the mid point of the array
     mid = full_corr.size // 2
     # I want only the second half of the array, i.e. the positive lags only
     return full_corr[mid:] / norm_corr
 
 
-@njit
+def batched_correlationfunction(At, Bt=None, average_axis: int = None, chunk_size: int = None):
+    """
+    Calculate the correlation functions of a batch of time series at once using a single zero-padded real FFT along
+    the last (time) axis. Each series is correlated as in :func:`correlationfunction`
+
+    .. math::
+        C_{AB}(\\tau) = \\frac{1}{T - \\tau} \\sum_i^{T - \\tau} A(t_i + \\tau)B(t_i).
+
+    When ``average_axis`` is given the correlation functions are averaged along that axis. The average is done in
+    the frequency domain, which is exact because the inverse transform is linear, so that only one inverse FFT is
+    needed. In this case the FFTs are computed in chunks of ``chunk_size`` elements along ``average_axis`` to limit
+    the memory footprint.
+
+    Parameters
+    ----------
+    At : numpy.ndarray
+        Observables to correlate. The last axis is the time axis.
+
+    Bt : numpy.ndarray, optional
+        Observables to correlate. It must have the same shape as ``At``. Default = ``None``, i.e. autocorrelation.
+
+    average_axis : int, optional
+        Axis along which to average the correlation functions. Default = ``None``, no average.
+
+    chunk_size : int, optional
+        Number of elements along ``average_axis`` transformed at once. Default = ``None``, all of them.
+
+    Returns
+    -------
+    corr : numpy.ndarray
+        Correlation functions. Shape = ``At.shape`` without ``average_axis`` if this is given.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> vel = np.random.default_rng(0).normal(size = (3, 1000, 500))
+    >>> vacf = batched_correlationfunction(vel, average_axis = 1, chunk_size = 250)
+    >>> vacf.shape
+    (3, 500)
+
+    """
+    At = asarray(At)
+    Bt = At if Bt is None else asarray(Bt)
+    no_steps = At.shape[-1]
+    # Zero padding to at least 2T - 1 avoids the wrap around of the circular correlation
+    n_fft = next_fast_len(2 * no_steps - 1, real=True)
+
+    if average_axis is None:
+        At_k = rfft(At, n=n_fft, axis=-1)
+        Bt_k = At_k if Bt is At else rfft(Bt, n=n_fft, axis=-1)
+        spectrum = At_k * Bt_k.conj()
+    else:
+        average_axis = average_axis % At.ndim
+        if average_axis == At.ndim - 1:
+            raise ValueError("The average axis cannot be the time axis.")
+
+        no_items = At.shape[average_axis]
+        chunk_size = no_items if chunk_size is None else max(int(chunk_size), 1)
+        chunk = [slice(None)] * At.ndim
+        spectrum = 0.0
+        for start in range(0, no_items, chunk_size):
+            chunk[average_axis] = slice(start, start + chunk_size)
+            At_k = rfft(At[tuple(chunk)], n=n_fft, axis=-1)
+            Bt_k = At_k if Bt is At else rfft(Bt[tuple(chunk)], n=n_fft, axis=-1)
+            spectrum = spectrum + (At_k * Bt_k.conj()).sum(axis=average_axis)
+        spectrum /= no_items
+
+    # Keep only the positive lags and normalize by the number of time origins
+    full_corr = irfft(spectrum, n=n_fft, axis=-1)[..., :no_steps]
+
+    return full_corr / arange(no_steps, 0, -1)
+
+
+def mean_squared_displacement(rt, average_axis: int = None, chunk_size: int = None):
+    """
+    Calculate the mean squared displacement of a batch of trajectories with the FFT algorithm of :cite:`Kneller1995`.
+    The time averaged MSD of each trajectory is split as
+
+    .. math::
+        \\Delta r^2(\\tau) = \\frac{1}{T - \\tau} \\sum_i^{T - \\tau} \\left [ r(t_i + \\tau) - r(t_i) \\right ]^2
+        = S_1(\\tau) - 2 C_{rr}(\\tau),
+
+    where :math:`C_{rr}(\\tau)` is the position autocorrelation function computed by
+    :func:`batched_correlationfunction` and
+
+    .. math::
+        S_1(\\tau) = \\frac{1}{T - \\tau} \\sum_i^{T - \\tau} \\left [ r^2(t_i + \\tau) + r^2(t_i) \\right ]
+
+    is obtained from the cumulative sum of :math:`r^2(t)`. The cost is :math:`O(T \\log T)` instead of the
+    :math:`O(T^2)` of the direct double loop.
+
+    Parameters
+    ----------
+    rt : numpy.ndarray
+        Unwrapped positions. The last axis is the time axis.
+
+    average_axis : int, optional
+        Axis along which to average the MSDs, e.g. the particles' axis. Default = ``None``, no average.
+
+    chunk_size : int, optional
+        Number of elements along ``average_axis`` transformed at once. Default = ``None``, all of them.
+
+    Returns
+    -------
+    msd : numpy.ndarray
+        Mean squared displacements. Shape = ``rt.shape`` without ``average_axis`` if this is given.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> pos = np.random.default_rng(0).normal(size = (3, 1000, 500)).cumsum(axis = -1)
+    >>> msd = mean_squared_displacement(pos, average_axis = 1, chunk_size = 250)
+    >>> msd.shape
+    (3, 500)
+
+    """
+    rt = asarray(rt)
+    no_steps = rt.shape[-1]
+    r_sq = rt * rt
+    if average_axis is not None:
+        r_sq = r_sq.mean(axis=average_axis)
+
+    # r_sq_sum[..., k] = sum_{t < k} r^2(t) with r_sq_sum[..., 0] = 0
+    r_sq_sum = zeros(r_sq.shape[:-1] + (no_steps + 1,))
+    r_sq_sum[..., 1:] = cumsum(r_sq, axis=-1)
+    # sum_{t = tau}^{T - 1} r^2(t) + sum_{t = 0}^{T - tau - 1} r^2(t)
+    s1 = (r_sq_sum[..., -1:] - r_sq_sum[..., :no_steps]) + r_sq_sum[..., :0:-1]
+    s1 /= arange(no_steps, 0, -1)
+
+    return s1 - 2.0 * batched_correlationfunction(rt, average_axis=average_axis, chunk_size=chunk_size)
+
+
+@njit(cache=True)
 def fast_integral_loop(time, integrand):
     """Numba'd function to compute the following integral with a varying upper limit
 
     .. math::
         I(\\tau) = \\int_0^{\\tau} f(t) dt
 
-    It uses :func:`numpy.trapz`. This function is used in the calculation of the transport coefficients.
+    It uses the trapezoidal rule with a running sum, hence its cost is :math:`O(T)`. Notice that ``integral[it]`` is
+    the integral up to ``time[it - 1]``. See :func:`cumulative_integral` for the integral of a batch of time series.
 
     Parameters
     ----------
@@ -79,12 +255,364 @@ def fast_integral_loop(time, integrand):
 
     """
     integral = zeros_like(integrand)
-    for it in range(1, len(time)):
-        integral[it] = trapz(integrand[:it], x=time[:it])
+    for it in range(2, len(time)):
+        integral[it] = integral[it - 1] + 0.5 * (integrand[it - 1] + integrand[it - 2]) * (time[it - 1] - time[it - 2])
+
+    return integral
+
+
+def cumulative_integral(time, integrand, initial: ndarray = None):
+    """
+    Calculate the running integrals of a batch of time series at once with the trapezoidal rule
+
+    .. math::
+        I(t_i) = I_0 + \\int_{t_0}^{t_i} f(t) dt
+
+    The cost is :math:`O(T)` for each time series.
+
+    Parameters
+    ----------
+    time: numpy.ndarray
+        Domain of integration. Shape = (T,).
+
+    integrand: numpy.ndarray
+        Integrands. The last axis is the time axis.
+
+    initial: numpy.ndarray, optional
+        Value of the integrals at ``time[0]``, :math:`I_0`. Shape = ``integrand.shape[:-1]``. Default = ``None``, zero.
+
+    Returns
+    -------
+    integral : numpy.ndarray
+        Running integrals. Shape = ``integrand.shape``.
+
+    """
+    integrand = asarray(integrand, dtype=float64)
+    integral = zeros(integrand.shape)
+    integral[..., 1:] = cumsum(0.5 * (integrand[..., 1:] + integrand[..., :-1]) * diff(time), axis=-1)
+    if initial is not None:
+        integral += asarray(initial)[..., None]
 
     return integral
 
 
+def find_plateau(running, window: int, rtol: float = 1.0e-2, start: int = 0):
+    """
+    Find the plateau of running transport coefficients calculated in several slices.
+
+    The running coefficients are averaged over windows of ``window`` lags ending at each lag. The plateau is reached
+    at the first lag where the slice average of the window differs from the one of the previous window by less than
+    ``rtol`` times its value or less than its standard error over the slices, whichever is larger. The cost is
+    :math:`O(T)` for each coefficient.
+
+    Parameters
+    ----------
+    running : numpy.ndarray
+        Running coefficients of each slice. Shape = (no_slices, ..., T).
+
+    window : int
+        Number of lags averaged in each window.
+
+    rtol : float
+        Relative tolerance of the change between consecutive windows. Default = 1.0e-2.
+
+    start : int
+        Only the windows ending at lag ``start`` or later are checked. Default = 0.
+
+    Returns
+    -------
+    index : numpy.ndarray
+        Lag at which each plateau is reached, -1 if it is not reached. Shape = ``running.shape[1:-1]``.
+
+    value : numpy.ndarray
+        Slice average of the window ending at the plateau, or of the last window if the plateau is not reached.
+
+    std : numpy.ndarray
+        Standard deviation over the slices of the window ending at the plateau, or of the last window.
+
+    """
+    running = asarray(running, dtype=float64)
+    no_slices, no_lags = running.shape[0], running.shape[-1]
+    ddof = 1 if no_slices > 1 else 0
+    window = max(int(window), 1)
+
+    if no_lags < 2 * window:
+        index = full(running.shape[1:-1], -1, dtype=int64)
+        return index, running[..., -1].mean(axis=0), running[..., -1].std(axis=0, ddof=ddof)
+
+    # Window averages from the cumulative sums. win_avg[..., j] is the window ending at lag j + window - 1
+    running_sum = zeros(running.shape[:-1] + (no_lags + 1,))
+    running_sum[..., 1:] = cumsum(running, axis=-1)
+    win_avg = (running_sum[..., window:] - running_sum[..., :-window]) / window
+    slice_avg = win_avg.mean(axis=0)
+    slice_err = win_avg.std(axis=0, ddof=ddof) / sqrt(no_slices) if no_slices > 1 else zeros(slice_avg.shape)
+
+    # Change between consecutive windows. converged[..., k] refers to the window ending at lag k + 2 * window - 1
+    change = abs(slice_avg[..., window:] - slice_avg[..., :-window])
+    tolerance = rtol * abs(slice_avg[..., window:])
+    converged = change <= where(tolerance > slice_err[..., window:], tolerance, slice_err[..., window:])
+    converged[..., : max(start - 2 * window + 1, 0)] = False
+
+    found = converged.any(axis=-1)
+    first = converged.argmax(axis=-1)
+    index = where(found, first + 2 * window - 1, -1)
+    win_index = where(found, first + window, win_avg.shape[-1] - 1)[..., None]
+
+    value = take_along_axis(slice_avg, win_index, axis=-1)[..., 0]
+    std = take_along_axis(win_avg, win_index[None], axis=-1)[..., 0].std(axis=0, ddof=ddof)
+
+    return index, value, std
+
+
+class CumulativeIntegrator:
+    """
+    Running integrals of a batch of time series fed in consecutive blocks of lags.
+
+    Each block is integrated with :func:`cumulative_integral` starting from the last value of the previous block, so
+    that the total cost is :math:`O(T)`. The plateau of the integrals is searched in the new lags of each block with
+    :func:`find_plateau`, hence the caller can stop adding lags once every integral has converged.
+
+    Parameters
+    ----------
+    window : int
+        Number of lags averaged in each window of the plateau search.
+
+    rtol : float
+        Relative tolerance of the plateau search. Default = 1.0e-2.
+
+    Attributes
+    ----------
+    plateau_index : numpy.ndarray
+        Lag at which each plateau is reached, -1 if it has not been reached yet.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> time = np.linspace(0.0, 20.0, 2001)
+    >>> acf = np.exp(-time)[None, None, :] * np.ones((4, 1, 1))
+    >>> integrator = CumulativeIntegrator(window = 50)
+    >>> for start in range(0, 2001, 200):
+    ...     integrator.add(time[start:start + 200], acf[..., start:start + 200])
+    ...     if integrator.converged:
+    ...         break
+    >>> integrator.no_lags, integrator.plateau_index
+    (600, array([445]))
+
+    """
+
+    def __init__(self, window: int, rtol: float = 1.0e-2):
+        self.window = max(int(window), 1)
+        self.rtol = rtol
+        self.blocks = []
+        self.no_lags = 0
+        self.plateau_index = None
+        self.last_time = None
+        self.last_integrand = None
+
+    def add(self, time, integrand):
+        """
+        Integrate the next block of lags.
+
+        Parameters
+        ----------
+        time : numpy.ndarray
+            Time of the lags of the block. Shape = (n,).
+
+        integrand : numpy.ndarray
+            Integrands at the lags of the block. Shape = (no_slices, ..., n).
+
+        """
+        time = asarray(time, dtype=float64)
+        integrand = asarray(integrand, dtype=float64)
+        if self.no_lags == 0:
+            block = cumulative_integral(time, integrand)
+            self.plateau_index = full(integrand.shape[1:-1], -1, dtype=int64)
+        else:
+            # Prepend the last lag of the previous block to continue the integration
+            block = cumulative_integral(
+                concatenate(([self.last_time], time)),
+                concatenate((self.last_integrand[..., None], integrand), axis=-1),
+                initial=self.blocks[-1][..., -1],
+            )[..., 1:]
+
+        self.blocks.append(block)
+        self.last_time = time[-1]
+        self.last_integrand = integrand[..., -1]
+        previous_lags = self.no_lags
+        self.no_lags += time.size
+
+        # Search the plateau only in the windows ending in the new lags
+        offset = max(previous_lags - 2 * self.window + 1, 0)
+        index, _, _ = find_plateau(self.tail(self.no_lags - offset), self.window, self.rtol, previous_lags - offset)
+        new_plateau = (self.plateau_index < 0) & (index >= 0)
+        self.plateau_index[new_plateau] = index[new_plateau] + offset
+
+    def tail(self, no_lags: int):
+        """Return the running integrals of the last ``no_lags`` lags."""
+        blocks = []
+        stored = 0
+        for block in reversed(self.blocks):
+            blocks.insert(0, block)
+            stored += block.shape[-1]
+            if stored >= no_lags:
+                break
+
+        return concatenate(blocks, axis=-1)[..., stored - no_lags :]
+
+    @property
+    def converged(self):
+        """Whether the plateau of every integral has been reached."""
+        return self.plateau_index is not None and bool((self.plateau_index >= 0).all())
+
+    @property
+    def integral(self):
+        """Running integrals of the lags added so far. Shape = (no_slices, ..., no_lags)."""
+        return concatenate(self.blocks, axis=-1)
+
+
+def einstein_relation(time, msd):
+    """Compute the running diffusion coefficient of the Einstein relation
+
+    .. math::
+        D(\\tau) = \\frac{\\Delta r^2(\\tau)}{2 \\tau}
+
+    from the one dimensional mean squared displacements. It is the counterpart of :func:`cumulative_integral` for the
+    calculation of the diffusion coefficient from the MSD.
+
+    Parameters
+    ----------
+    time: numpy.ndarray
+        Time differences.
+
+    msd: numpy.ndarray
+        Mean squared displacements. The last axis is the time axis.
+
+    Returns
+    -------
+    coefficient : numpy.ndarray
+        Running diffusion coefficients. Their value at :math:`\\tau = 0` is set to zero. Shape = ``msd.shape``.
+
+    """
+    coefficient = zeros(msd.shape)
+    coefficient[..., 1:] = 0.5 * msd[..., 1:] / time[1:]
+
+    return coefficient
+
+
+def blocking_analysis(series, min_blocks: int = 4):
+    """
+    Flyvbjerg-Petersen blocking analysis of a batch of correlated time series.
+
+    At each level the consecutive pairs of samples of the previous level are averaged, halving the number of samples.
+    The variance of the mean estimated from the samples of a level grows with the level until the blocks are longer
+    than the correlation time. The optimal level is the first one satisfying the criterion of Lee et al.,
+    Phys. Rev. E 83, 066706 (2011)
+
+    .. math::
+        B^3 > 2 T \\left ( \\frac{\\sigma_B}{\\sigma_0} \\right )^4,
+
+    where :math:`B` is the block size, :math:`T` the number of samples and :math:`\\sigma_B` the standard error of
+    the mean estimated from the block averages. Each level costs half the previous one, hence the total cost is
+    :math:`O(T)`.
+
+    Parameters
+    ----------
+    series : numpy.ndarray
+        Time series. The last axis is the time axis.
+
+    min_blocks : int
+        Minimum number of blocks of the last level. Default = 4.
+
+    Returns
+    -------
+    block_sizes : numpy.ndarray
+        Block size of each level.
+
+    variances : numpy.ndarray
+        Variance of the mean estimated at each level. Shape = ``series.shape[:-1] + (no_levels,)``.
+
+    errors : numpy.ndarray
+        Standard error of ``variances``.
+
+    optimal : numpy.ndarray
+        Optimal level of each series, the last one if the criterion is never satisfied. Shape = ``series.shape[:-1]``.
+
+    """
+    blocks = asarray(series, dtype=float64)
+    no_samples = blocks.shape[-1]
+    if no_samples < max(min_blocks, 2):
+        raise ValueError(f"At least {max(min_blocks, 2)} samples are needed for the blocking analysis.")
+
+    no_levels = 1
+    while no_samples // 2**no_levels >= max(min_blocks, 2):
+        no_levels += 1
+
+    block_sizes = 2 ** arange(no_levels)
+    variances = zeros(blocks.shape[:-1] + (no_levels,))
+    errors = zeros(variances.shape)
+    lee_criterion = zeros(variances.shape, dtype=bool)
+    for level in range(no_levels):
+        no_blocks = blocks.shape[-1]
+        block_var = blocks.var(axis=-1, ddof=1)
+        variances[..., level] = block_var / no_blocks
+        errors[..., level] = variances[..., level] * sqrt(2.0 / (no_blocks - 1))
+        if level == 0:
+            sample_var = where(variances[..., 0] > 0.0, variances[..., 0], 1.0)
+        lee_criterion[..., level] = block_sizes[level] ** 3 > 2.0 * no_samples * (variances[..., level] / sample_var) ** 2
+        # Average consecutive pairs, an odd last sample is dropped
+        half = no_blocks // 2
+        blocks = 0.5 * (blocks[..., 0 : 2 * half : 2] + blocks[..., 1 : 2 * half : 2])
+
+    optimal = where(lee_criterion.any(axis=-1), lee_criterion.argmax(axis=-1), no_levels - 1)
+
+    return block_sizes, variances, errors, optimal
+
+
+def integrated_autocorrelation_time(series, c: float = 5.0):
+    """
+    Calculate the integrated autocorrelation time of a batch of time series
+
+    .. math::
+        \\tau_{\\rm int} = \\frac{1}{2} + \\sum_{t = 1}^{M} \\rho(t),
+
+    where :math:`\\rho(t)` is the normalized autocorrelation function, computed via FFT by
+    :func:`batched_correlationfunction` in :math:`O(T \\log T)`. The window :math:`M` is chosen with the self-consistent
+    criterion of Sokal, i.e. the smallest :math:`M \\geq c \\tau_{\\rm int}(M)`. The statistical inefficiency of the
+    series is :math:`g = 2 \\tau_{\\rm int}`.
+
+    Parameters
+    ----------
+    series : numpy.ndarray
+        Time series. The last axis is the time axis.
+
+    c : float
+        Window constant. Default = 5.0.
+
+    Returns
+    -------
+    tau : numpy.ndarray
+        Integrated autocorrelation time in units of the sampling interval. Shape = ``series.shape[:-1]``.
+
+    window : numpy.ndarray
+        Window :math:`M` of each series.
+
+    """
+    series = asarray(series, dtype=float64)
+    acf = batched_correlationfunction(series - series.mean(axis=-1, keepdims=True))
+    # Constant series are uncorrelated
+    acf_0 = acf[..., :1]
+    rho = where(acf_0 > 0.0, acf / where(acf_0 > 0.0, acf_0, 1.0), 0.0)
+    rho[..., 0] = 1.0
+
+    running_tau = cumsum(rho, axis=-1) - 0.5
+    lags = arange(rho.shape[-1])
+    converged = lags >= c * running_tau
+    window = where(converged.any(axis=-1), converged.argmax(axis=-1), rho.shape[-1] - 1)
+    tau = take_along_axis(running_tau, window[..., None], axis=-1)[..., 0]
+
+    return tau, window
+
+
 def yukawa_green_function(k: float, alpha: float, kappa: float) -> float:
     """
     Evaluate the Green's function of Coulomb/Yukawa potential.
@@ -156,6 +684,73 @@ def betamp(m: int, p: int, alpha: float, kappa: float) -> float:
     return intgrl
 
 
+@njit(cache=True)
+def erfc_exp_approx(x):
+    """
+    Numba'd function to approximate the complementary error function and the gaussian that it shares with its
+    derivative, using the form of eq.(7.1.26) in Abramowitz & Stegun
+
+    .. math::
+
+        {\\rm erfc}(x) \\approx t P(t) e^{-x^2}, \\quad t = \\frac{1}{1 + p x}, \\quad x \\geq 0,
+
+    where :math:`P` is a polynomial of degree 9 with coefficients :data:`ERFC_APPROX_COEFFS`. The relative error is
+    smaller than :data:`ERFC_APPROX_RTOL` for :math:`x \\geq 0`. Negative arguments use
+    :math:`{\\rm erfc}(-x) = 2 - {\\rm erfc}(x)`.
+
+    Parameters
+    ----------
+    x : float
+        Argument.
+
+    Returns
+    -------
+    erfc_x : float
+        Approximation of :math:`{\\rm erfc}(x)`.
+
+    gauss : float
+        :math:`e^{-x^2}`.
+
+    Examples
+    --------
+    >>> erfc_exp_approx(1.0)
+    (0.15729919697200964, 0.36787944117144233)
+
+    """
+    t = 1.0 / (1.0 + ERFC_APPROX_P * abs(x))
+    poly = ERFC_APPROX_COEFFS[-1]
+    for c in ERFC_APPROX_COEFFS[-2::-1]:
+        poly = poly * t + c
+    gauss = exp(-x * x)
+    erfc_x = t * poly * gauss
+    # Branchless programming
+    erfc_x += (x < 0.0) * (2.0 - 2.0 * erfc_x)
+
+    return erfc_x, gauss
+
+
+def erfc_approx(x):
+    """
+    Approximation of the complementary error function of :func:`erfc_exp_approx` for numpy arrays.
+
+    Parameters
+    ----------
+    x : float, numpy.ndarray
+        Argument.
+
+    Returns
+    -------
+    _ : float, numpy.ndarray
+        Approximation of :math:`{\\rm erfc}(x)`.
+
+    """
+    x = asarray(x)
+    t = 1.0 / (1.0 + ERFC_APPROX_P * abs(x))
+    erfc_x = t * polyval(t, ERFC_APPROX_COEFFS) * exp(-x * x)
+
+    return where(x < 0.0, 2.0 - erfc_x, erfc_x)
+
+
 def force_error_approx_pppm(potential):
     r"""
      Calculates the force error, :math:`\Delta F_{\rm {pm}}, for the PPPM algorithm using approximations given in :cite:`Dharuman2017`.
@@ -169,7 +764,8 @@ def force_error_approx_pppm(potential):
      Returns
      -------
     tot_force_error: float
-        Total force error given by the L2 norm of the PP and PM force errors.
+        Total force error given by the L2 norm of the PP and PM force errors, and of the error of the approximation of
+        erfc if :attr:`sarkas.potentials.core.Potential.precision` is `"fast"`, see :func:`force_error_approx_erfc`.
 
     pppm_pm_err: float
         PM force error.
@@ -196,6 +792,17 @@ def force_error_approx_pppm(potential):
     pppm_pm_err *= sqrt(potential.total_num_density * potential.a_ws**3)
     force_error_tot = sqrt(pppm_pm_err**2 + pppm_pp_err**2)
 
+    if potential.precision == "fast":
+        pppm_approx_err = force_error_approx_erfc(
+            potential.type,
+            potential.rc,
+            potential.screening_length,
+            potential.pppm_alpha_ewald,
+            potential.a_rs,
+            rescaling_constant,
+        )
+        force_error_tot = sqrt(force_error_tot**2 + pppm_approx_err**2)
+
     return force_error_tot, pppm_pm_err, pppm_pp_err
 
 
@@ -321,6 +928,89 @@ def force_error_analytic_pp(
     return pppm_pp_err
 
 
+def force_error_approx_erfc(
+    potential_type: str,
+    cutoff_length: float,
+    screening_length: float,
+    alpha_ewald: float,
+    short_cutoff: float,
+    rescaling_const: float,
+    no_points: int = 2000,
+):
+    """
+    Calculate the force error due to the approximation of erfc, :func:`erfc_exp_approx`, in the short-range forces of
+    the PPPM algorithm. In analogy to :cite:`Dharuman2017` the error is the root mean square of the difference between
+    the approximated and the exact pair force, :math:`\\delta f(r)`, over a uniform distribution of particles
+
+    .. math::
+
+        \\Delta F_{\\rm approx} = \\left [ 4 \\pi n \\int_0^{r_c} dr \\, r^2 \\delta f(r)^2 \\right ]^{1/2}.
+
+    The integral is calculated with the midpoint rule. The forces are evaluated at :math:`\\max(r, a_{\\rm rs})` as in
+    the kernels. The arguments can be numpy arrays that broadcast together.
+
+    Parameters
+    ----------
+    potential_type: str
+        Choice of potential. Choices = [`"coulomb"`, `"yukawa"`].
+
+    cutoff_length: float, numpy.ndarray
+        Short range cutoff.
+
+    screening_length: float
+        Screening length in case of yukawa.
+
+    alpha_ewald: float, numpy.ndarray
+        Ewald screening parameter.
+
+    short_cutoff: float
+        Short-range cutoff of the divergence of the potential, :attr:`sarkas.potentials.core.Potential.a_rs`.
+
+    rescaling_const: float
+        Constant by which to rescale the force error. \n
+        In case of electric forces = :math:`Q^2/(4 \\pi \\epsilon_0) 1/a^2`.
+
+    no_points: int
+        Number of points of the integral. Default = 2000.
+
+    Returns
+    -------
+    approx_err: float, numpy.ndarray
+        Force error of the approximation in units of `rescaling_const`.
+
+    Raises
+    ------
+    ValueError
+        If the potential has no approximated short-range force.
+
+    """
+    # Last axis is the integration variable
+    rc = asarray(cutoff_length, dtype=float64)[..., None]
+    alpha = asarray(alpha_ewald, dtype=float64)[..., None]
+    r_grid = rc * (arange(no_points) + 0.5) / no_points
+    r = where(r_grid > short_cutoff, r_grid, short_cutoff)
+
+    if potential_type == "yukawa":
+        kappa = 1.0 / screening_length
+        x_plus = alpha * r + 0.5 * kappa / alpha
+        x_minus = alpha * r - 0.5 * kappa / alpha
+        # Only the erfc terms are approximated, the gaussians are exact.
+        delta_f = (0.5 / r) * (
+            exp(kappa * r) * (erfc_approx(x_plus) - erfc(x_plus)) * (1.0 / r - kappa)
+            + exp(-kappa * r) * (erfc_approx(x_minus) - erfc(x_minus)) * (1.0 / r + kappa)
+        )
+    elif potential_type == "coulomb":
+        delta_f = (erfc_approx(alpha * r) - erfc(alpha * r)) / r**2
+    else:
+        raise ValueError(f"The {potential_type} potential has no approximated short-range force.")
+
+    approx_err = sqrt(4.0 * pi * rc[..., 0] * (r_grid**2 * delta_f**2).mean(axis=-1))
+    # Renormalize
+    approx_err *= rescaling_const
+
+    return approx_err
+
+
 def force_error_analytic_lcl(
     potential_type: str, cutoff_length: float, potential_matrix: ndarray, rescaling_const: float
 ):
@@ -422,3 +1112,267 @@ def force_error_analytic_lcl(
     force_error *= rescaling_const
 
     return force_error
+
+
+class MultipleTauCorrelator:
+    """
+    On-the-fly multiple-tau correlator of a multichannel signal :cite:`Ramirez2010`.
+
+    The signal is stored in ``no_levels`` blocks of ``block_length`` samples. The samples of level :math:`k` are the
+    averages of ``averaging`` consecutive samples of level :math:`k - 1`, hence level :math:`k` covers the lags
+    :math:`j m^k`, with :math:`m` = ``averaging``. The memory needed to reach a lag of :math:`T` steps is
+    :math:`O(\\log T)`. Lags shorter than ``block_length`` are calculated exactly, longer lags are coarse-grained.
+
+    Each pair of channels :math:`(a, b)` is correlated as in :func:`correlationfunction`
+
+    .. math::
+        C_{ab}(\\tau) = \\langle [x_a(t + \\tau) - c_a] [x_b(t) - c_b] \\rangle ,
+
+    where the shifts :math:`c_a` are chosen when the correlation is requested, e.g. the averages of the channels for the
+    correlation of the fluctuations. The samples are stored relative to the first one to avoid round-off errors when
+    the fluctuations are small compared to the averages.
+
+    Parameters
+    ----------
+    no_channels : int
+        Number of channels of the signal.
+
+    pair_a : numpy.ndarray
+        Channel of the later sample of each pair.
+
+    pair_b : numpy.ndarray
+        Channel of the earlier sample of each pair.
+
+    no_steps : int
+        Largest lag, in number of samples, that must be reached.
+
+    block_length : int
+        Number of samples stored in each level. It must be a multiple of ``averaging``. Default = 16.
+
+    averaging : int
+        Number of samples averaged when passing to the next level. Default = 2.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> x = np.random.default_rng(0).normal(size = (1000, 2))
+    >>> corr = MultipleTauCorrelator(2, np.array([0, 1]), np.array([0, 1]), no_steps = 1000)
+    >>> for sample in x:
+    ...     corr.add(sample)
+    >>> corr.correlation().shape == (2, len(corr.lags()))
+    True
+
+    """
+
+    def __init__(
+        self, no_channels: int, pair_a, pair_b, no_steps: int, block_length: int = 16, averaging: int = 2
+    ):
+        if averaging < 2 or block_length % averaging != 0:
+            raise ValueError("block_length must be a multiple of averaging and averaging must be at least 2.")
+
+        self.block_length = int(block_length)
+        self.averaging = int(averaging)
+        self.pair_a = asarray(pair_a, dtype=int64)
+        self.pair_b = asarray(pair_b, dtype=int64)
+        # Levels needed so that the last one reaches a lag of no_steps
+        self.no_levels = 1
+        while self.block_length * self.averaging ** (self.no_levels - 1) < no_steps:
+            self.no_levels += 1
+
+        self.shift = zeros((self.no_levels, self.block_length, no_channels))
+        self.shift_count = zeros(self.no_levels, dtype=int64)
+        self.insert_index = zeros(self.no_levels, dtype=int64)
+        self.accumulator = zeros((self.no_levels, no_channels))
+        self.accumulator_count = zeros(self.no_levels, dtype=int64)
+        self.corr = zeros((self.no_levels, self.block_length, len(self.pair_a)))
+        self.corr_count = zeros((self.no_levels, self.block_length), dtype=int64)
+        # Sums of the later and earlier samples at each lag, needed for shifting the correlation functions
+        self.later_sum = zeros((self.no_levels, self.block_length, no_channels))
+        self.earlier_sum = zeros((self.no_levels, self.block_length, no_channels))
+        self.offset = None
+        self.signal_sum = zeros(no_channels)
+        self.no_samples = 0
+
+    def add(self, sample):
+        """
+        Push a new sample of the signal into the correlator.
+
+        Parameters
+        ----------
+        sample : numpy.ndarray
+            Value of each channel. Shape = (``no_channels``,)
+
+        """
+        sample = asarray(sample, dtype=float64)
+        if self.offset is None:
+            self.offset = sample.copy()
+
+        sample = sample - self.offset
+        self.signal_sum += sample
+        self.no_samples += 1
+        multiple_tau_add(
+            sample,
+            self.shift,
+            self.shift_count,
+            self.insert_index,
+            self.accumulator,
+            self.accumulator_count,
+            self.corr,
+            self.corr_count,
+            self.later_sum,
+            self.earlier_sum,
+            self.pair_a,
+            self.pair_b,
+            self.averaging,
+        )
+
+    def correlation(self, shift: ndarray = None):
+        """
+        Return the correlation functions.
+
+        Parameters
+        ----------
+        shift : numpy.ndarray, optional
+            Value :math:`c_a` subtracted from each channel. Default = ``None``, i.e. zero. Pass :meth:`mean` for the
+            correlation functions of the fluctuations.
+
+        Returns
+        -------
+        corr : numpy.ndarray
+            Correlation function of each pair at each of :meth:`lags`. Shape = (``no_pairs``, ``no_lags``)
+
+        """
+        mask = self.lag_mask()
+        count = self.corr_count[mask][:, None]
+        later_mean = self.later_sum[mask] / count
+        earlier_mean = self.earlier_sum[mask] / count
+
+        # Shift of the stored samples, which are relative to the first sample
+        d = -self.offset if shift is None else asarray(shift) - self.offset
+        d_a = d[self.pair_a]
+        d_b = d[self.pair_b]
+        corr = (
+            self.corr[mask] / count
+            - later_mean[:, self.pair_a] * d_b
+            - d_a * earlier_mean[:, self.pair_b]
+            + d_a * d_b
+        )
+
+        return corr.transpose()
+
+    def lag_mask(self):
+        """Return the mask of the (level, index) lags that have been sampled at least once."""
+        mask = self.corr_count > 0
+        # Lags shorter than block_length / averaging of the higher levels are already covered by the level below
+        mask[1:, : self.block_length // self.averaging] = False
+
+        return mask
+
+    def lags(self):
+        """
+        Return the lags of the correlation functions.
+
+        Returns
+        -------
+        lags : numpy.ndarray
+            Lags in number of samples.
+
+        """
+        level_lags = arange(self.block_length)[None, :] * self.averaging ** arange(self.no_levels)[:, None]
+
+        return level_lags[self.lag_mask()]
+
+    def mean(self):
+        """Return the average of each channel over all the samples added so far."""
+        return self.offset + self.signal_sum / max(self.no_samples, 1)
+
+
+@njit(cache=True)
+def multiple_tau_add(
+    sample,
+    shift,
+    shift_count,
+    insert_index,
+    accumulator,
+    accumulator_count,
+    corr,
+    corr_count,
+    later_sum,
+    earlier_sum,
+    pair_a,
+    pair_b,
+    averaging,
+):
+    """
+    Numba'd kernel of :meth:`MultipleTauCorrelator.add`. See the class for the meaning of the arrays.
+
+    Parameters
+    ----------
+    sample : numpy.ndarray
+        Value of each channel.
+
+    shift : numpy.ndarray
+        Last ``block_length`` samples of each level. Shape = (``no_levels``, ``block_length``, ``no_channels``)
+
+    shift_count : numpy.ndarray
+        Number of samples stored in each level.
+
+    insert_index : numpy.ndarray
+        Position of the next sample in the circular buffer of each level.
+
+    accumulator : numpy.ndarray
+        Running sum of the samples to be averaged into the next level. Shape = (``no_levels``, ``no_channels``)
+
+    accumulator_count : numpy.ndarray
+        Number of samples in ``accumulator``.
+
+    corr : numpy.ndarray
+        Sum of the products of each pair at each lag. Shape = (``no_levels``, ``block_length``, ``no_pairs``)
+
+    corr_count : numpy.ndarray
+        Number of products summed in ``corr``. Shape = (``no_levels``, ``block_length``)
+
+    later_sum : numpy.ndarray
+        Sum of the later samples at each lag. Shape = (``no_levels``, ``block_length``, ``no_channels``)
+
+    earlier_sum : numpy.ndarray
+        Sum of the earlier samples at each lag. Shape = (``no_levels``, ``block_length``, ``no_channels``)
+
+    pair_a : numpy.ndarray
+        Channel of the later sample of each pair.
+
+    pair_b : numpy.ndarray
+        Channel of the earlier sample of each pair.
+
+    averaging : int
+        Number of samples averaged when passing to the next level.
+
+    """
+    no_levels, block_length, no_channels = shift.shape
+    new = sample.copy()
+
+    for k in range(no_levels):
+        ind = insert_index[k]
+        shift[k, ind, :] = new
+        if shift_count[k] < block_length:
+            shift_count[k] += 1
+        insert_index[k] = (ind + 1) % block_length
+
+        # Correlate the new sample with the ones stored. The smallest lags of the higher levels are not needed.
+        j_min = 0 if k == 0 else block_length // averaging
+        for j in range(j_min, shift_count[k]):
+            old = (ind - j) % block_length
+            for ip in range(pair_a.shape[0]):
+                corr[k, j, ip] += new[pair_a[ip]] * shift[k, old, pair_b[ip]]
+            later_sum[k, j, :] += new
+            earlier_sum[k, j, :] += shift[k, old, :]
+            corr_count[k, j] += 1
+
+        # Pass the average of the last samples to the next level
+        accumulator[k, :] += new
+        accumulator_count[k] += 1
+        if accumulator_count[k] < averaging:
+            break
+        new = accumulator[k, :] / averaging
+        accumulator[k, :] = 0.0
+        accumulator_count[k] = 0
@@ -0,0 +1,136 @@
+"""
+Module for distributing independent units of work, e.g. the slices or the runs of an observable, over a pool of
+processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+from multiprocessing.shared_memory import SharedMemory
+from numba import config as nb_config
+from numba import set_num_threads, threading_layer
+from numpy import dtype as np_dtype
+from numpy import ndarray, prod
+
+
+class SharedArray:
+    """
+    Numpy array stored in shared memory. The workers of :func:`process_map` receive a pickled copy of this object
+    that points to the same memory, hence they can write their results directly in it.
+
+    Parameters
+    ----------
+    shape : tuple
+        Shape of the array.
+
+    dtype : str, numpy.dtype
+        Data type of the array. Default = "float64".
+
+    name : str, optional
+        Name of an existing shared memory block. Default = ``None``, i.e. create a new block.
+
+    Attributes
+    ----------
+    array : numpy.ndarray
+        View of the shared memory.
+
+    """
+
+    def __init__(self, shape: tuple, dtype="float64", name: str = None):
+        self.shape = tuple(shape)
+        self.dtype = np_dtype(dtype)
+        self.owner = name is None
+        size = max(int(prod(self.shape)) * self.dtype.itemsize, 1)
+        self.shm = SharedMemory(name=name, create=self.owner, size=size)
+        self.array = ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+
+    def __getstate__(self):
+        return {"shape": self.shape, "dtype": self.dtype, "name": self.shm.name}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def detach(self):
+        """Release the memory view of a copy received by a worker. Nothing is done in the process that created the
+        block, so that the tasks of :func:`process_map` can also run sequentially."""
+        if not self.owner:
+            del self.array
+            self.shm.close()
+
+    def close(self):
+        """Copy the data out of the shared memory and release it. The process that created the block unlinks it.
+
+        Returns
+        -------
+        array : numpy.ndarray
+            Copy of the data.
+
+        """
+        array = self.array.copy()
+        del self.array
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+        return array
+
+
+def start_method() -> str:
+    """
+    Start method of the processes of :func:`process_map`.
+
+    Returns
+    -------
+    method : str
+        ``"fork"`` if it is available and the tbb threading layer of numba has not been launched yet, otherwise
+        ``"forkserver"`` or, if it is not available either, ``"spawn"``.
+
+    """
+    try:
+        launched_layer = threading_layer()
+    except ValueError:
+        launched_layer = None
+
+    methods = get_all_start_methods()
+    if "fork" in methods and launched_layer != "tbb":
+        return "fork"
+
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+def process_map(function, tasks: list, workers: int = 1):
+    """
+    Apply ``function`` to each task in a pool of ``workers`` processes.
+
+    The results are returned in the order of the tasks, hence any reduction over them does not depend on the number
+    of workers. The numba threads are divided among the workers. Processes are forked, so that the workers do not
+    compile again the numba functions already compiled. A process that has already launched the tbb threading layer of
+    numba cannot be forked safely, in that case, and on platforms without ``fork``, the workers are started by a
+    ``forkserver``, or spawned, and load the numba functions from the cache, see :mod:`sarkas.precompile`. These
+    workers import the ``__main__`` module of a script again, hence its code must be protected by
+    ``if __name__ == "__main__":``.
+
+    Parameters
+    ----------
+    function : callable
+        Function to apply. It must be defined at module level.
+
+    tasks : list
+        Arguments of each call of ``function``.
+
+    workers : int
+        Number of processes. If 1, or if there is only one task, the tasks are run in this process. Default = 1.
+
+    Returns
+    -------
+    results : list
+        Return value of each task.
+
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        return [function(*task) for task in tasks]
+
+    context = get_context(start_method())
+    threads = max(1, nb_config.NUMBA_NUM_THREADS // workers)
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)), mp_context=context, initializer=set_num_threads, initargs=(threads,)
+    ) as executor:
+        return list(executor.map(function, *zip(*tasks)))
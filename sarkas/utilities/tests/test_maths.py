@@ -1,7 +1,26 @@
-from numpy import array, isclose, linspace, pi, sqrt, zeros
+from numpy import allclose, arange, array, cos, exp, isclose, linspace, ones, pi, sin, sqrt, trapz, zeros
+from numpy.random import default_rng
 from scipy.constants import elementary_charge, epsilon_0, pi
-
-from ..maths import force_error_analytic_lcl, yukawa_green_function
+from scipy.integrate import quad
+from scipy.special import erfc
+
+from ..maths import (
+    batched_correlationfunction,
+    blocking_analysis,
+    correlationfunction,
+    cumulative_integral,
+    CumulativeIntegrator,
+    ERFC_APPROX_RTOL,
+    erfc_approx,
+    erfc_exp_approx,
+    find_plateau,
+    force_error_analytic_lcl,
+    force_error_approx_erfc,
+    integrated_autocorrelation_time,
+    mean_squared_displacement,
+    MultipleTauCorrelator,
+    yukawa_green_function,
+)
 
 # def test_fd_integral():
 #     """Test the calculation of the unnormalized FD integral."""
@@ -25,6 +44,139 @@ def test_yukawa_gk():
     assert isclose(G_k[0], 10.53621750372248)
 
 
+def test_batched_correlationfunction():
+    """Test the batched FFT correlation against the direct one."""
+
+    t = linspace(0.0, 6.0 * pi, 300)
+    At = array([cos(0.5 * t), sin(0.5 * t), cos(1.5 * t)])
+    Bt = array([sin(0.5 * t), cos(2.0 * t), sin(1.5 * t)])
+
+    corr = batched_correlationfunction(At, Bt)
+    corr_avg = batched_correlationfunction(At, Bt, average_axis=0, chunk_size=2)
+
+    direct = array([correlationfunction(At[i], Bt[i]) for i in range(3)])
+
+    assert allclose(corr, direct)
+    assert allclose(corr_avg, direct.mean(axis=0))
+
+
+def test_mean_squared_displacement():
+    """Test the FFT mean squared displacement against the direct double loop."""
+
+    t = linspace(0.0, 6.0 * pi, 200)
+    rt = array([[t + sin(t), cos(2.0 * t)], [0.5 * t, t * cos(t)]])
+    no_steps = t.size
+
+    direct = zeros(rt.shape)
+    for m in range(no_steps):
+        direct[..., m] = ((rt[..., m:] - rt[..., : no_steps - m]) ** 2).mean(axis=-1)
+
+    msd = mean_squared_displacement(rt)
+    msd_avg = mean_squared_displacement(rt, average_axis=1, chunk_size=1)
+
+    assert allclose(msd, direct)
+    assert allclose(msd_avg, direct.mean(axis=1))
+
+
+def test_cumulative_integral():
+    """Test the running integral, fed at once and in blocks, against trapz and the plateau of an exponential ACF."""
+
+    time = linspace(0.0, 20.0, 2001)
+    acf = exp(-time)[None, None, :] * ones((3, 2, 1))
+    acf[1] *= 1.01
+
+    integral = cumulative_integral(time, acf)
+    assert allclose(integral[0, 0, 1:], [trapz(acf[0, 0, : it + 1], x=time[: it + 1]) for it in range(1, 2001)])
+
+    integrator = CumulativeIntegrator(window=50)
+    for start in range(0, 2001, 150):
+        integrator.add(time[start : start + 150], acf[..., start : start + 150])
+    assert allclose(integrator.integral, integral)
+
+    index, value, std = find_plateau(integral, window=50)
+    assert (index == integrator.plateau_index).all()
+    assert (index > 0).all()
+    assert allclose(value, 1.0, rtol=2.0e-2)
+    assert (std > 0.0).all()
+
+
+def test_multiple_tau_correlator():
+    """Test the exact lags of the multiple-tau correlator against the direct correlation."""
+
+    t = linspace(0.0, 6.0 * pi, 300)
+    signal = array([10.0 + cos(0.5 * t), 10.0 + sin(0.5 * t)])
+
+    corr = MultipleTauCorrelator(2, array([0, 0]), array([0, 1]), no_steps=300, block_length=8)
+    for sample in signal.transpose():
+        corr.add(sample)
+
+    lags = corr.lags()
+    raw = corr.correlation()
+    fluct = corr.correlation(shift=corr.mean())
+    fluct_signal = signal - signal.mean(axis=1)[:, None]
+
+    assert lags[-1] < 300 <= 8 * 2 ** (corr.no_levels - 1)
+    assert allclose(raw[1, :8], correlationfunction(signal[0], signal[1])[:8])
+    assert allclose(fluct[0, :8], correlationfunction(fluct_signal[0], fluct_signal[0])[:8])
+
+
+def test_blocking_analysis():
+    """Test the statistical inefficiency of the blocking analysis and of the autocorrelation time on AR(1) series."""
+
+    phi = 0.8
+    noise = default_rng(0).normal(size=(2, 2**15))
+    series = zeros(noise.shape)
+    for it in range(1, noise.shape[1]):
+        series[:, it] = phi * series[:, it - 1] + noise[:, it]
+    # Exact statistical inefficiency of an AR(1) process
+    g_exact = (1.0 + phi) / (1.0 - phi)
+
+    block_sizes, variances, errors, optimal = blocking_analysis(series)
+    assert (block_sizes[1:] == 2 * block_sizes[:-1]).all()
+    assert allclose(variances[:, 0], series.var(axis=1, ddof=1) / series.shape[1])
+    g_blocking = series.shape[1] * variances[arange(2), optimal] / series.var(axis=1, ddof=1)
+    assert allclose(g_blocking, g_exact, rtol=0.2)
+
+    tau, window = integrated_autocorrelation_time(series)
+    assert allclose(2.0 * tau, g_exact, rtol=0.1)
+    assert (window >= 5.0 * tau).all()
+
+    tau, _ = integrated_autocorrelation_time(ones(100))
+    assert tau == 0.5
+
+
+def test_erfc_exp_approx():
+    """Test the approximation of erfc against scipy."""
+    x = linspace(-4.0, 26.0, 30001)
+    approx = array([erfc_exp_approx(v) for v in x])
+
+    assert (abs(approx[:, 0] / erfc(x) - 1.0) < ERFC_APPROX_RTOL).all()
+    assert allclose(approx[:, 1], exp(-(x**2)), rtol=1.0e-15)
+    assert allclose(erfc_approx(x), approx[:, 0], rtol=1.0e-14)
+    # Exact at x = 0
+    assert erfc_exp_approx(0.0)[0] == 1.0
+
+
+def test_force_error_approx_erfc():
+    """Test the force error of the approximation of erfc against the integral with scipy."""
+    rc = 5.0
+    alpha = 0.6
+
+    def delta_f2(r):
+        return ((erfc_approx(alpha * r) - erfc(alpha * r)) / r**2) ** 2 * r**2
+
+    integral, _ = quad(delta_f2, 0.0, rc, limit=500)
+    err = force_error_approx_erfc("coulomb", rc, 0.0, alpha, 0.0, 1.0)
+
+    assert isclose(err, sqrt(4.0 * pi * integral), rtol=1.0e-3)
+    assert err < ERFC_APPROX_RTOL * 100.0
+
+    # Broadcasting over alpha and rc
+    errs = force_error_approx_erfc("yukawa", array([4.0, 5.0])[None, :], 1.0, array([0.5, 0.6, 0.7])[:, None], 0.0, 1.0)
+    assert errs.shape == (3, 2)
+    assert isclose(errs[1, 0], force_error_approx_erfc("yukawa", 4.0, 1.0, 0.6, 0.0, 1.0))
+
+
 def test_yukawa_force_analytic_lcl():
 
     # Look more about potential matrix
@@ -0,0 +1,75 @@
+from numba import njit, prange, threading_layer
+from numpy import allclose, arange, ones, zeros
+from numpy.random import default_rng
+from os import getpid
+
+from ..parallel import process_map, SharedArray, start_method
+
+
+def moments(seed, size):
+    """Task returning values that depend only on its arguments and the process that ran it."""
+    sample = default_rng(seed).normal(size=size)
+    return sample.mean(), (sample**2).mean(), getpid()
+
+
+def fill_row(shared, row, value):
+    """Task writing its result in a shared array."""
+    shared.array[row] = value * arange(shared.shape[1])
+    shared.detach()
+    return getpid()
+
+
+@njit(parallel=True)
+def parallel_sum(array):
+    """Kernel launching the threading layer of numba."""
+    total = 0.0
+    for i in prange(array.shape[0]):
+        total += array[i]
+    return total
+
+
+def test_process_map_equal_to_serial():
+    """Test that the results of two worker processes are the same, and in the same order, as the serial ones."""
+    tasks = [(seed, 1000) for seed in range(7)]
+    serial = process_map(moments, tasks, workers=1)
+    parallel = process_map(moments, tasks, workers=2)
+
+    assert len(parallel) == len(tasks)
+    assert allclose([res[:2] for res in parallel], [res[:2] for res in serial])
+    assert {res[2] for res in serial} == {getpid()}
+    assert getpid() not in {res[2] for res in parallel}
+
+
+def test_process_map_after_parallel_kernel():
+    """Test that the tasks still run in worker processes once the threading layer of numba has been launched."""
+    assert parallel_sum(ones(1000)) == 1000.0
+    if threading_layer() == "tbb":
+        # The tbb threads cannot be forked
+        assert start_method() != "fork"
+
+    pids = [res[2] for res in process_map(moments, [(seed, 10) for seed in range(4)], workers=2)]
+    assert getpid() not in pids
+
+
+def test_shared_array():
+    """Test that the workers write in the shared memory of the array created by this process."""
+    shared = SharedArray((5, 4), dtype="float64")
+    assert shared.owner
+    shared.array[:] = -1.0
+
+    pids = process_map(fill_row, [(shared, row, row + 1.0) for row in range(5)], workers=2)
+    assert getpid() not in pids
+    result = shared.close()
+
+    expected = zeros((5, 4))
+    for row in range(5):
+        expected[row] = (row + 1.0) * arange(4)
+    assert allclose(result, expected)
+
+
+def test_shared_array_serial():
+    """Test that the serial tasks do not release the memory of the array created by this process."""
+    shared = SharedArray((3, 2), dtype="complex128")
+    process_map(fill_row, [(shared, row, 2.0j) for row in range(3)], workers=1)
+
+    assert allclose(shared.close(), 2.0j * arange(2)[None, :].repeat(3, axis=0))
@@ -0,0 +1,58 @@
+from numpy import isclose
+
+from ..timing import SarkasProfiler
+
+
+class _Integrator:
+    def update(self):
+        self.update_accelerations()
+        return 1
+
+    def update_accelerations(self):
+        return 2
+
+
+def test_profiler_counters():
+    """Test that the wrapped methods are counted, restored and nested."""
+    integrator = _Integrator()
+    profiler = SarkasProfiler()
+    profiler.wrap(integrator, "update", "Integrator")
+    profiler.wrap(integrator, "update_accelerations", "Accelerations", parent="Integrator")
+    for _ in range(5):
+        assert integrator.update() == 1
+    profiler.unwrap()
+
+    assert "update" not in vars(integrator)
+    assert profiler.sections["Integrator"][1] == 5
+    assert profiler.sections["Accelerations"][1] == 5
+    assert profiler.sections["Accelerations"][0] <= profiler.sections["Integrator"][0]
+
+
+def test_profiler_breakdown():
+    """Test the percentages of the nested sections are relative to the enclosing section."""
+    profiler = SarkasProfiler()
+    profiler.record("Integrator", 800, 10)
+    profiler.record("Accelerations", 600, 10, parent="Integrator")
+    profiler.record("PP Force", 150, 10, parent="Accelerations")
+    profiler.record("Other", 200, 1)
+    breakdown = profiler.breakdown(1000)
+
+    assert list(breakdown["PP Force"]) == [
+        "calls",
+        "time_s",
+        "time_per_call_us",
+        "parent",
+        "depth",
+        "percentage",
+        "percentage_of_total",
+    ]
+    assert isclose(breakdown["Integrator"]["percentage"], 80.0)
+    assert isclose(breakdown["Accelerations"]["percentage"], 75.0)
+    assert isclose(breakdown["PP Force"]["percentage"], 25.0)
+    assert isclose(breakdown["PP Force"]["percentage_of_total"], 15.0)
+    assert [sec["depth"] for sec in breakdown.values()] == [0, 1, 2, 0]
+    assert breakdown["Accelerations"]["parent"] == "Integrator"
+    assert breakdown["Other"]["parent"] is None
+    # The top level sections add up to the total
+    assert isclose(sum(sec["percentage"] for sec in breakdown.values() if sec["parent"] is None), 100.0)
+    assert isclose(breakdown["Integrator"]["time_per_call_us"], 0.08)
@@ -71,3 +71,129 @@ class SarkasTimer:
         t_nsec, _ = divmod(rem_us, 1)
 
         return [t_hrs, t_min, t_sec, t_msec, t_usec, t_nsec]
+
+
+class SarkasProfiler:
+    """
+    Low overhead profiler of the hot path of the evolve loop. It replaces methods of the simulation's classes with
+    wrappers that accumulate the time spent in each of them and the number of calls.
+
+    Attributes
+    ----------
+    sections : dict
+        Accumulated time in nanoseconds and number of calls of each section, ``{label: [time, calls]}``.
+
+    parents : dict
+        Section enclosing each nested section, ``{label: parent}``. Top level sections are not in it.
+
+    """
+
+    def __init__(self):
+        self.sections = {}
+        self.parents = {}
+        self._wrapped = []
+
+    def wrap(self, obj, method: str, label: str = None, parent: str = None):
+        """
+        Replace ``obj.method`` with a timed wrapper.
+
+        Parameters
+        ----------
+        obj : object
+            Instance whose method is timed.
+
+        method : str
+            Name of the method.
+
+        label : str, optional
+            Name of the section. Default = ``method``.
+
+        parent : str, optional
+            Name of the section calling this one. Default = ``None``, i.e. a top level section.
+
+        """
+        func = getattr(obj, method)
+        label = label if label else method
+        stats = self.sections.setdefault(label, [0, 0])
+        if parent:
+            self.parents[label] = parent
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            out = func(*args, **kwargs)
+            stats[0] += clock() - start
+            stats[1] += 1
+            return out
+
+        self._wrapped.append((obj, method, func, method in obj.__dict__))
+        setattr(obj, method, timed)
+
+    def unwrap(self):
+        """Restore the original methods."""
+        for obj, method, func, instance_attribute in reversed(self._wrapped):
+            if instance_attribute:
+                setattr(obj, method, func)
+            else:
+                delattr(obj, method)
+        self._wrapped.clear()
+
+    def record(self, label: str, tme: int, calls: int, parent: str = None):
+        """
+        Add a section measured elsewhere, e.g. the difference of other sections.
+
+        Parameters
+        ----------
+        label : str
+            Name of the section.
+
+        tme : int
+            Time in nanoseconds.
+
+        calls : int
+            Number of calls.
+
+        parent : str, optional
+            Name of the enclosing section. Default = ``None``, i.e. a top level section.
+
+        """
+        self.sections[label] = [tme, calls]
+        if parent:
+            self.parents[label] = parent
+
+    def breakdown(self, total: int) -> dict:
+        """
+        Collect the accumulated times.
+
+        Parameters
+        ----------
+        total : int
+            Time of the whole profiled run in nanoseconds.
+
+        Returns
+        -------
+        : dict
+            Calls, time in seconds, time per call in microseconds, enclosing section, nesting depth, percentage of the
+            time of the enclosing section (of ``total`` for the top level sections) and percentage of ``total`` of
+            each section. The times are inclusive of the nested sections.
+
+        """
+        breakdown = {}
+        for label, (tme, calls) in self.sections.items():
+            parent = self.parents.get(label)
+            parent_time = self.sections[parent][0] if parent else total
+            depth = 0
+            while parent:
+                depth += 1
+                parent = self.parents.get(parent)
+            breakdown[label] = {
+                "calls": calls,
+                "time_s": tme * 1.0e-09,
+                "time_per_call_us": tme * 1.0e-03 / calls if calls else 0.0,
+                "parent": self.parents.get(label),
+                "depth": depth,
+                "percentage": 100.0 * tme / parent_time if parent_time else 0.0,
+                "percentage_of_total": 100.0 * tme / total if total else 0.0,
+            }
+
+        return breakdown